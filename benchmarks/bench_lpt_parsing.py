@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+"""
+Benchmark of SAMMY LPT parsing throughput.
+
+Parses the LPT files of the test fixtures (or of a given directory) over and
+over, as a per-pixel campaign parses the LPT file of every job, and reports
+files, fit blocks and megabytes per second. Blocks are parsed once with the
+section headers found in a single pass shared by all extractors, and once with
+every extractor looking for its own section.
+
+Usage:
+    python benchmarks/bench_lpt_parsing.py --repeat 200 --lpt-dir tests/data/ex012/answers
+"""
+
+import argparse
+import time
+from pathlib import Path
+
+from pleiades.sammy.io.lpt_manager import LptManager
+from pleiades.sammy.io.lpt_stream import iter_lpt_blocks
+from pleiades.sammy.results.models import FitResults, RunResults
+
+DEFAULT_LPT_DIR = Path(__file__).parents[1] / "tests" / "data" / "ex012" / "answers"
+
+
+def parse_dispatch(manager: LptManager, path: Path) -> int:
+    """Parse a file with LptManager.process_lpt_file, return the number of blocks."""
+    run_results = RunResults()
+    manager.process_lpt_file(str(path), run_results)
+    return len(run_results.fit_results)
+
+
+def parse_per_extractor(manager: LptManager, path: Path) -> int:
+    """Parse a file with every extractor scanning the whole block for its section."""
+    with open(path) as file:
+        blocks = list(iter_lpt_blocks(file))
+    for _, block_text in blocks:
+        lines = block_text.splitlines()
+        fit_results = FitResults()
+        manager.extract_isotope_info(lines, fit_results.nuclear_data)
+        manager.extract_radius_info(lines, fit_results.nuclear_data)
+        manager.extract_broadening_info(lines, fit_results.physics_data)
+        manager.extract_normalization_info(lines, fit_results.physics_data)
+        manager.extract_chi_squared_info(lines, fit_results.chi_squared_results)
+    return len(blocks)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=200, help="number of times every file is parsed")
+    parser.add_argument("--lpt-dir", type=Path, default=DEFAULT_LPT_DIR, help="directory holding *.lpt files")
+    args = parser.parse_args()
+
+    # Keep the logger quiet, it would otherwise dominate the measurement
+    from pleiades.utils.logger import loguru_logger
+
+    loguru_logger.remove()
+
+    paths = sorted(args.lpt_dir.glob("*.lpt")) + sorted(args.lpt_dir.glob("*.LPT"))
+    if not paths:
+        parser.error(f"No LPT files in {args.lpt_dir}")
+    megabytes = sum(path.stat().st_size for path in paths) * args.repeat / 1e6
+
+    manager = LptManager()
+    print(f"{'parser':<15} {'files/s':>10} {'blocks/s':>10} {'MB/s':>8}")
+    for label, parse in (("dispatch", parse_dispatch), ("per-extractor", parse_per_extractor)):
+        start = time.perf_counter()
+        blocks = sum(parse(manager, path) for _ in range(args.repeat) for path in paths)
+        elapsed = time.perf_counter() - start
+        files = len(paths) * args.repeat
+        print(f"{label:<15} {files / elapsed:>10.1f} {blocks / elapsed:>10.1f} {megabytes / elapsed:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+"""
+Benchmark of float parsing for SAMMY pseudo scientific notation.
+
+Writes a Card 1 parameter file with one resonance per line, a share of the
+widths in pseudo scientific notation (e.g. 1.23456-5), and parses its float
+columns field by field with check_pseudo_scientific and column by column with
+parse_pseudo_scientific.
+
+Usage:
+    python benchmarks/bench_pseudo_scientific.py --lines 100000 --pseudo 0.2
+"""
+
+import argparse
+import random
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from pleiades.sammy.io.card_formats.par01_resonance_table import FLOAT_COLUMNS
+from pleiades.utils.helper import check_pseudo_scientific, parse_pseudo_scientific
+
+
+def make_par_file(path: Path, n_lines: int, pseudo: float, seed: int = 0) -> None:
+    """Write n_lines resonance lines, a fraction pseudo of the widths without E."""
+    rng = random.Random(seed)
+    lines = []
+    for _ in range(n_lines):
+        fields = [f"{rng.uniform(-1e6, 1e6):<11.4f}"[:11]]
+        for _ in range(3):
+            mantissa, exponent = rng.uniform(1, 9.99), rng.randint(-9, 9)
+            if rng.random() < pseudo:
+                fields.append(f"{mantissa:.5f}{exponent:+d}".ljust(11))
+            else:
+                fields.append(f"{mantissa:.4E}".ljust(11))
+        fields.append(" " * 11)
+        lines.append("".join(fields) + " 0 0 1 0   1")
+    path.write_text("\n".join(lines) + "\n")
+
+
+def parse_per_field(lines) -> dict:
+    """Parse the float columns with one check_pseudo_scientific call per field."""
+    columns = {}
+    for name, columns_slice in FLOAT_COLUMNS.items():
+        columns[name] = np.array(
+            [
+                check_pseudo_scientific(field) if field.strip() else np.nan
+                for field in (line[columns_slice] for line in lines)
+            ]
+        )
+    return columns
+
+
+def parse_bulk(lines) -> dict:
+    """Parse the float columns with one parse_pseudo_scientific call per column."""
+    return {
+        name: parse_pseudo_scientific([line[columns_slice] for line in lines])
+        for name, columns_slice in FLOAT_COLUMNS.items()
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lines", type=int, default=100_000, help="number of resonance lines")
+    parser.add_argument("--pseudo", type=float, default=0.2, help="fraction of widths in pseudo scientific notation")
+    parser.add_argument("--repeat", type=int, default=3, help="number of timed runs, the best is reported")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "bench.par"
+        make_par_file(path, args.lines, args.pseudo)
+        lines = path.read_text().splitlines()
+
+    results = {}
+    print(f"{'parser':<28} {'best [s]':>10} {'per line [us]':>14}")
+    for label, parse in (("check_pseudo_scientific", parse_per_field), ("parse_pseudo_scientific", parse_bulk)):
+        timings = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            results[label] = parse(lines)
+            timings.append(time.perf_counter() - start)
+        best = min(timings)
+        print(f"{label:<28} {best:>10.3f} {1e6 * best / args.lines:>14.3f}")
+
+    reference, bulk = results.values()
+    for name in FLOAT_COLUMNS:
+        np.testing.assert_array_equal(reference[name], bulk[name])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+#!/usr/bin/env python
+"""
+Benchmark of reopening SAMMY results with and without the results sidecar.
+
+Writes an LPT file of the test fixtures and a synthetic LST file of the given
+number of rows to a temporary directory, then times ResultsManager parsing the
+output files and ResultsManager reading the sidecar written by the first run.
+
+Usage:
+    python benchmarks/bench_results_sidecar.py --rows 500000 --repeat 5
+"""
+
+import argparse
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from pleiades.sammy.results.manager import ResultsManager
+
+DEFAULT_LPT_FILE = Path(__file__).parents[1] / "tests" / "data" / "ex012" / "answers" / "ex012aa.lpt"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=500_000, help="number of rows of the LST file")
+    parser.add_argument("--repeat", type=int, default=5, help="number of times the results are reopened")
+    parser.add_argument("--lpt-file", type=Path, default=DEFAULT_LPT_FILE, help="LPT file of the results")
+    args = parser.parse_args()
+
+    # Keep the logger quiet, it would otherwise dominate the measurement
+    from pleiades.utils.logger import loguru_logger
+
+    loguru_logger.remove()
+
+    with tempfile.TemporaryDirectory() as directory:
+        lpt_file = Path(directory) / "SAMMY.LPT"
+        lst_file = Path(directory) / "SAMMY.LST"
+        shutil.copy(args.lpt_file, lpt_file)
+        rng = np.random.default_rng(0)
+        np.savetxt(lst_file, rng.random((args.rows, 11)), fmt="%15.7E")
+
+        print(f"{'load':<10} {'seconds':>10}")
+        for label, use_sidecar in (("parse", False), ("sidecar", True)):
+            if use_sidecar:
+                # Written once, as after the fit
+                ResultsManager(lpt_file_path=lpt_file, lst_file_path=lst_file, write_sidecar=True)
+            start = time.perf_counter()
+            for _ in range(args.repeat):
+                ResultsManager(lpt_file_path=lpt_file, lst_file_path=lst_file, use_sidecar=use_sidecar)
+            elapsed = (time.perf_counter() - start) / args.repeat
+            print(f"{label:<10} {elapsed:>10.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+"""
+Benchmark of SAMMY working-directory staging.
+
+Runs many tiny jobs without SAMMY: each job stages its inputs into a working
+directory, writes fake SAM* outputs, collects them into an output directory and
+cleans up. Only filesystem work is measured, for every staging strategy, with
+and without a /dev/shm scratch working directory.
+
+Usage:
+    python benchmarks/bench_staging.py --jobs 500 --root /path/on/network/fs
+"""
+
+import argparse
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+from pleiades.sammy.interface import BaseSammyConfig, SammyExecutionResult, SammyFiles, SammyRunner
+from pleiades.sammy.staging import StagingStrategy, default_scratch_root, scratch_directory
+
+OUTPUT_FILES = ("SAMMY.LPT", "SAMMY.LST", "SAMMY.ODF", "SAMNDF.PAR", "SAMNDF.INP", "SAMMY.IO")
+
+
+class BenchConfig(BaseSammyConfig):
+    """Configuration without backend-specific settings."""
+
+
+class BenchRunner(SammyRunner):
+    """Runner writing fake outputs instead of running SAMMY."""
+
+    def prepare_environment(self, files):
+        files.move_to_working_dir(self.config.working_dir)
+
+    def execute_sammy(self, files):
+        for name in OUTPUT_FILES:
+            (self.config.working_dir / name).write_text("x\n")
+        now = datetime.now()
+        return SammyExecutionResult(success=True, execution_id="bench", start_time=now, end_time=now, console_output="")
+
+    def cleanup(self, files=None):
+        pass
+
+    def validate_config(self):
+        return self.config.validate()
+
+
+def make_inputs(root: Path, par_size: int) -> SammyFiles:
+    """Write one set of input files shared by all jobs."""
+    inputs = root / "inputs"
+    inputs.mkdir()
+    (inputs / "job.inp").write_text("input\n" * 50)
+    (inputs / "job.par").write_text("p" * par_size)
+    (inputs / "job.dat").write_text("data\n" * 1000)
+    return SammyFiles(inputs / "job.inp", inputs / "job.par", inputs / "job.dat")
+
+
+def run_jobs(root: Path, inputs: SammyFiles, n_jobs: int, strategy: StagingStrategy, scratch_root) -> float:
+    """Run n_jobs staging cycles and return the elapsed time in seconds."""
+    start = time.perf_counter()
+    for i in range(n_jobs):
+        output_dir = root / f"{strategy.value}_{scratch_root is not None}" / f"job{i}"
+        files = SammyFiles(inputs.input_file, inputs.parameter_file, inputs.data_file, staging=strategy)
+        if scratch_root is None:
+            working_dir = output_dir / "work"
+            _cycle(working_dir, output_dir, files)
+        else:
+            with scratch_directory(scratch_root) as working_dir:
+                _cycle(working_dir, output_dir, files)
+    return time.perf_counter() - start
+
+
+def _cycle(working_dir: Path, output_dir: Path, files: SammyFiles) -> None:
+    runner = BenchRunner(BenchConfig(working_dir=working_dir, output_dir=output_dir))
+    runner.config.prepare_directories()
+    runner.prepare_environment(files)
+    result = runner.execute_sammy(files)
+    runner.collect_outputs(result)
+    files.cleanup_working_files()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=200, help="number of jobs per configuration")
+    parser.add_argument("--par-size", type=int, default=200_000, help="size of the parameter file in bytes")
+    parser.add_argument("--root", type=Path, default=None, help="directory holding inputs and outputs")
+    args = parser.parse_args()
+
+    # Keep the logger quiet, it would otherwise dominate the measurement
+    from pleiades.utils.logger import loguru_logger
+
+    loguru_logger.remove()
+
+    shm = default_scratch_root()
+    with tempfile.TemporaryDirectory(dir=args.root) as tmp:
+        root = Path(tmp)
+        inputs = make_inputs(root, args.par_size)
+        print(f"{'strategy':<10} {'scratch':<10} {'total [s]':>10} {'per job [ms]':>13}")
+        for strategy in StagingStrategy:
+            for scratch_root in (None, shm) if shm is not None else (None,):
+                elapsed = run_jobs(root, inputs, args.jobs, strategy, scratch_root)
+                label = "/dev/shm" if scratch_root is not None else "-"
+                print(f"{strategy.value:<10} {label:<10} {elapsed:>10.3f} {1000 * elapsed / args.jobs:>13.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+"""
+Benchmark of writing and reading SAMMY twenty format data.
+
+Formats random (energy, transmission, uncertainty) spectra as a per-pixel
+campaign writes the data file of every pixel, once with the vectorized writer
+and once row by row with Python formatting, then reads them back with the
+vectorized reader and line by line.
+
+Usage:
+    python benchmarks/bench_twenty_format.py --rows 3000 --files 200
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from pleiades.sammy.io.data_manager import encode_sammy_twenty, parse_sammy_twenty
+
+
+def encode_rows(data: np.ndarray) -> bytes:
+    """Format the rows one at a time, as data files used to be written."""
+    return "".join(
+        f"{energy:20.10f}{transmission:20.10f}{uncertainty:20.10f}\n" for energy, transmission, uncertainty in data
+    ).encode()
+
+
+def parse_rows(content: bytes) -> np.ndarray:
+    """Parse the lines one at a time, as data files used to be validated."""
+    rows = []
+    for line in content.decode().splitlines():
+        if len(line) != 60:
+            raise ValueError(f"Expected 60 characters, got {len(line)}")
+        rows.append([float(line[0:20]), float(line[20:40]), float(line[40:60])])
+    return np.array(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=3000, help="number of energy points per file")
+    parser.add_argument("--files", type=int, default=200, help="number of files formatted and parsed")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    energy = np.linspace(1.0, 1000.0, args.rows)
+    spectra = [
+        np.column_stack([energy, rng.random(args.rows), rng.random(args.rows) * 0.01]) for _ in range(args.files)
+    ]
+
+    print(f"{'operation':<20} {'files/s':>10}")
+    for label, encode in (("write vectorized", encode_sammy_twenty), ("write rows", encode_rows)):
+        start = time.perf_counter()
+        contents = [encode(data) for data in spectra]
+        print(f"{label:<20} {args.files / (time.perf_counter() - start):>10.1f}")
+    for label, parse in (("read vectorized", parse_sammy_twenty), ("read rows", parse_rows)):
+        start = time.perf_counter()
+        for content in contents:
+            parse(content)
+        print(f"{label:<20} {args.files / (time.perf_counter() - start):>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -18,14 +18,24 @@ except ImportError:
 __all__ = ["loguru_logger", "configure_logger"]
 
 
-def main():
+def main(argv=None):
     """Main entry point for the application."""
     parser = argparse.ArgumentParser(
         description="PLEIADES - Python Libraries Extensions for Isotopic Analysis via Detailed Examination of SAMMY",
         prog="pleiades",
     )
     parser.add_argument("--version", action="store_true", help="Print version information")
-    args = parser.parse_args()
+    subparsers = parser.add_subparsers(dest="command")
+
+    # Imported here so that `import pleiades` stays light
+    from pleiades.sammy.orchestration.batch import add_batch_parser
+    from pleiades.sammy.orchestration.telemetry import add_telemetry_parser
+
+    add_batch_parser(subparsers)
+    add_telemetry_parser(subparsers)
+    args = parser.parse_args(argv)
 
     if args.version:
         print(f"PLEIADES version {__version__}")
+    elif args.command is not None:
+        return args.func(args)
@@ -13,13 +13,36 @@ from pleiades.sammy.interface import (
     EnvironmentPreparationError,
     SammyExecutionError,
     SammyExecutionResult,
+    SammyFailureType,
     SammyFiles,
     SammyRunner,
+    TransientBackendError,
 )
 from pleiades.utils.logger import loguru_logger
 
 logger = loguru_logger.bind(name=__name__)
 
+# Exit code of `docker run` when the Docker daemon itself failed
+DOCKER_DAEMON_ERROR_CODE = 125
+# Exit code of a container killed by SIGKILL, typically by the OOM killer
+DOCKER_KILLED_CODE = 137
+# Daemon messages indicating a temporary problem worth retrying
+DOCKER_TRANSIENT_MESSAGES = (
+    "Cannot connect to the Docker daemon",
+    "connection refused",
+    "i/o timeout",
+    "TLS handshake timeout",
+    "too many requests",
+    "Client.Timeout exceeded",
+)
+
+
+def _decode(output) -> str:
+    """Decode partial output attached to subprocess.TimeoutExpired."""
+    if output is None:
+        return ""
+    return output.decode(errors="replace") if isinstance(output, bytes) else output
+
 
 class DockerSammyRunner(SammyRunner):
     """Implementation of SAMMY runner for Docker container."""
@@ -84,12 +107,17 @@ class DockerSammyRunner(SammyRunner):
         container_params = str(self.config.container_data_dir / files.parameter_file.name)
         container_data = str(self.config.container_data_dir / files.data_file.name)
 
+        # Named container, so that it can be killed on timeout
+        container_name = f"sammy-{execution_id}"
+
         # Construct docker run command
         docker_cmd = [
             "docker",
             "run",
             "--rm",  # Remove container after execution
             "-i",  # Interactive mode for heredoc input
+            "--name",
+            container_name,
             # Mount working directory
             "-v",
             f"{self.config.working_dir}:{self.config.container_working_dir}",
@@ -99,6 +127,10 @@ class DockerSammyRunner(SammyRunner):
             # Set working directory
             "-w",
             str(self.config.container_working_dir),
+        ]
+        if self.config.memory_limit is not None:
+            docker_cmd += ["--memory", str(self.config.memory_limit)]
+        docker_cmd += [
             # Image name
             self.config.image_name,
             # SAMMY command (will receive input via stdin)
@@ -113,13 +145,31 @@ class DockerSammyRunner(SammyRunner):
             """)
 
         try:
-            process = subprocess.run(docker_cmd, input=sammy_input, text=True, capture_output=True)
+            try:
+                process = subprocess.run(
+                    docker_cmd, input=sammy_input, text=True, capture_output=True, timeout=self.config.timeout
+                )
+            except subprocess.TimeoutExpired as e:
+                logger.error(f"Docker execution timed out after {self.config.timeout}s, killing {container_name}")
+                self._kill_container(container_name)
+                return SammyExecutionResult(
+                    success=False,
+                    execution_id=execution_id,
+                    start_time=start_time,
+                    end_time=datetime.now(),
+                    console_output=_decode(e.stdout) + _decode(e.stderr),
+                    error_message=f"Docker execution timed out after {self.config.timeout}s",
+                    failure_type=SammyFailureType.TIMEOUT,
+                )
 
             end_time = datetime.now()
             console_output = process.stdout + process.stderr
 
             if process.returncode != 0:
                 logger.error(f"Docker execution failed with code {process.returncode}")
+                failure_type = self._classify_exit(process.returncode, process.stderr)
+                if failure_type == SammyFailureType.BACKEND_TRANSIENT:
+                    raise TransientBackendError(f"Docker daemon error (code {process.returncode}): {process.stderr}")
                 return SammyExecutionResult(
                     success=False,
                     execution_id=execution_id,
@@ -127,6 +177,7 @@ class DockerSammyRunner(SammyRunner):
                     end_time=end_time,
                     console_output=console_output,
                     error_message=f"Docker execution failed with code {process.returncode}",
+                    failure_type=failure_type,
                 )
 
             # Check SAMMY output for success
@@ -145,12 +196,43 @@ class DockerSammyRunner(SammyRunner):
                 end_time=end_time,
                 console_output=console_output,
                 error_message=error_message,
+                failure_type=None if success else SammyFailureType.SAMMY_FAILURE,
             )
 
+        except TransientBackendError:
+            raise  # Reraise unchanged so that it can be retried
         except Exception as e:
             logger.exception(f"Docker execution failed for {execution_id}")
             raise SammyExecutionError(f"Docker execution failed: {str(e)}")
 
+    def _classify_exit(self, returncode: int, stderr: str) -> SammyFailureType:
+        """
+        Classify a non-zero exit code of `docker run`.
+
+        Args:
+            returncode: Exit code of the docker client
+            stderr: Error output of the docker client
+
+        Returns:
+            SammyFailureType: Failure classification
+        """
+        if returncode == DOCKER_DAEMON_ERROR_CODE:
+            lowered = stderr.lower()
+            if any(message.lower() in lowered for message in DOCKER_TRANSIENT_MESSAGES):
+                return SammyFailureType.BACKEND_TRANSIENT
+            return SammyFailureType.BACKEND_ERROR
+        if returncode == DOCKER_KILLED_CODE and self.config.memory_limit is not None:
+            return SammyFailureType.RESOURCE_LIMIT
+        return SammyFailureType.SAMMY_FAILURE
+
+    @staticmethod
+    def _kill_container(container_name: str) -> None:
+        """Kill a running container, ignoring containers that already exited."""
+        try:
+            subprocess.run(["docker", "kill", container_name], capture_output=True, text=True, timeout=60)
+        except Exception as e:
+            logger.error(f"Failed to kill container {container_name}: {str(e)}")
+
     def cleanup(self) -> None:
         """Clean up after execution."""
         logger.debug("Performing cleanup")
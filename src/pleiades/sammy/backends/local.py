@@ -2,17 +2,20 @@
 """Local backend implementation for SAMMY execution."""
 
 import os
+import signal
 import subprocess
 from datetime import datetime
 from pathlib import Path
-from typing import List, Union
+from typing import Callable, List, Optional, Union
 from uuid import uuid4
 
+from pleiades.sammy.backends.streaming import ConsoleStream, ProgressCallback, run_streaming
 from pleiades.sammy.config import LocalSammyConfig
 from pleiades.sammy.interface import (
     EnvironmentPreparationError,
     SammyExecutionError,
     SammyExecutionResult,
+    SammyFailureType,
     SammyFiles,
     SammyFilesMultiMode,
     SammyRunner,
@@ -21,13 +24,25 @@ from pleiades.utils.logger import loguru_logger
 
 logger = loguru_logger.bind(name=__name__)
 
+# Signals delivered by the kernel when a process exceeds its CPU time rlimit
+_CPU_LIMIT_SIGNALS = {getattr(signal, "SIGXCPU", None), signal.SIGKILL} - {None}
+
 
 class LocalSammyRunner(SammyRunner):
     """Implementation of SAMMY runner for local installation."""
 
-    def __init__(self, config: LocalSammyConfig):
+    def __init__(self, config: LocalSammyConfig, progress_callback: Optional[ProgressCallback] = None):
+        """
+        Initialize the runner.
+
+        Args:
+            config: Local backend configuration
+            progress_callback: Optional callable receiving SammyProgress updates parsed
+                live from the SAMMY console (iteration count, chi-squared)
+        """
         super().__init__(config)
         self.config: LocalSammyConfig = config
+        self.progress_callback = progress_callback
         self._moved_files: List[Path] = []
 
     def prepare_environment(self, files: Union[SammyFiles, SammyFilesMultiMode]) -> None:
@@ -93,6 +108,64 @@ class LocalSammyRunner(SammyRunner):
         except json.JSONDecodeError as e:
             raise ValueError(f"Invalid JSON configuration file: {e}")
 
+    def _resource_limiter(self) -> Optional[Callable[[subprocess.Popen], None]]:
+        """
+        Build the callable applying CPU and memory rlimits to the started SAMMY process.
+
+        The limits are set from the parent with resource.prlimit (Linux) rather than
+        in a preexec_fn, which can deadlock the child when the runner is used from
+        a thread pool. They are in place before SAMMY does any work, since it waits
+        for the file names written to its stdin after the callable returns.
+
+        Returns:
+            Callable taking the started process, or None if no limit is configured
+            or the platform does not support prlimit
+        """
+        cpu_time_limit = self.config.cpu_time_limit
+        memory_limit = self.config.memory_limit
+        if cpu_time_limit is None and memory_limit is None:
+            return None
+
+        try:
+            from resource import RLIMIT_AS, RLIMIT_CPU, prlimit
+        except ImportError:
+            logger.warning("Resource limits are not supported on this platform, ignoring them")
+            return None
+
+        def _apply_limits(process: subprocess.Popen):
+            if cpu_time_limit is not None:
+                prlimit(process.pid, RLIMIT_CPU, (cpu_time_limit, cpu_time_limit))
+            if memory_limit is not None:
+                prlimit(process.pid, RLIMIT_AS, (memory_limit, memory_limit))
+
+        return _apply_limits
+
+    def _classify_failure(self, stream: ConsoleStream, returncode: int, aborted: bool, timed_out: bool):
+        """
+        Classify a failed execution.
+
+        Returns:
+            Tuple of (SammyFailureType, error message)
+        """
+        if timed_out:
+            return SammyFailureType.TIMEOUT, f"SAMMY execution timed out after {self.config.timeout}s"
+        if self.config.cpu_time_limit is not None and -returncode in _CPU_LIMIT_SIGNALS and not aborted:
+            return (
+                SammyFailureType.RESOURCE_LIMIT,
+                f"SAMMY execution exceeded the CPU time limit of {self.config.cpu_time_limit}s",
+            )
+        if self.config.memory_limit is not None and "memory" in (stream.fatal_error or "").lower():
+            return (
+                SammyFailureType.RESOURCE_LIMIT,
+                f"SAMMY execution exceeded the memory limit: {stream.fatal_error}",
+            )
+        if aborted:
+            return SammyFailureType.FATAL_ERROR, f"SAMMY execution aborted on fatal error: {stream.fatal_error}"
+        return (
+            SammyFailureType.SAMMY_FAILURE,
+            f"SAMMY execution failed with return code {returncode}. Check console output for details.",
+        )
+
     def execute_sammy(self, files: Union[SammyFiles, SammyFilesMultiMode]) -> SammyExecutionResult:
         """Execute SAMMY using local installation."""
         execution_id = str(uuid4())
@@ -121,37 +194,44 @@ class LocalSammyRunner(SammyRunner):
             else:
                 env["LD_LIBRARY_PATH"] = "/usr/lib64"
 
-            # Use safer subprocess call without shell
-            process = subprocess.run(
+            # Stream console output line by line instead of buffering it all in memory
+            console_log_file = self.config.console_log_file or (self.config.output_dir / "sammy_console.log")
+            stream = ConsoleStream(
+                log_file=console_log_file,
+                tail_lines=self.config.console_tail_lines,
+                progress_callback=self.progress_callback,
+            )
+            run = run_streaming(
                 [str(self.config.sammy_executable)],
-                input=sammy_input,
-                shell=False,
-                text=True,
+                input_text=sammy_input,
+                cwd=self.config.working_dir,
                 env=env,
-                cwd=str(self.config.working_dir),
-                capture_output=True,
+                stream=stream,
+                abort_on_fatal=self.config.abort_on_fatal_error,
+                timeout=self.config.timeout,
+                on_start=self._resource_limiter(),
             )
 
             end_time = datetime.now()
-            console_output = process.stdout + process.stderr
-            success = " Normal finish to SAMMY" in console_output
+            success = stream.normal_finish and not run.aborted and not run.timed_out
 
             if not success:
-                logger.error(f"SAMMY execution failed for {execution_id}")
-                error_message = (
-                    f"SAMMY execution failed with return code {process.returncode}. Check console output for details."
-                )
+                failure_type, error_message = self._classify_failure(stream, run.returncode, run.aborted, run.timed_out)
+                logger.error(f"SAMMY execution failed for {execution_id} ({failure_type.value})")
             else:
                 logger.info(f"SAMMY execution completed successfully for {execution_id}")
-                error_message = None
+                failure_type, error_message = None, None
 
             return SammyExecutionResult(
                 success=success,
                 execution_id=execution_id,
                 start_time=start_time,
                 end_time=end_time,
-                console_output=console_output,
+                console_output=stream.tail,
                 error_message=error_message,
+                console_log_file=console_log_file,
+                failure_type=failure_type,
+                peak_rss_mb=run.peak_rss_kb / 1024 if run.peak_rss_kb is not None else None,
             )
 
         except Exception as e:
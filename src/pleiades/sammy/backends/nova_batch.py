@@ -0,0 +1,334 @@
+#!/usr/bin/env python
+"""
+Concurrent submission of many SAMMY runs to the NOVA web service.
+
+NovaSammyRunner executes one run at a time: it blocks in tool.run until the
+remote job has finished and then downloads its outputs. For fitting campaigns
+of hundreds of spectra this serializes the client while the service sits idle.
+
+NovaBatchRunner instead starts the tools without waiting (wait=False), keeps up
+to `max_in_flight` remote jobs running, polls the status of all of them every
+`poll_interval` seconds, and downloads the outputs of each finished job in a
+pool of download workers while the other jobs keep running:
+
+    runner = NovaBatchRunner(config, max_in_flight=32)
+    runner.prepare_environment()
+    results = runner.run([NovaBatchItem("p000", files, Path("fits/p000")), ...])
+    runner.cleanup()
+
+Every item produces a SammyExecutionResult; submission, remote and download
+failures are reported in the result instead of being raised, so one broken job
+does not stop the others.
+"""
+
+import threading
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextlib import ExitStack
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from time import monotonic
+from typing import Callable, Dict, List, Optional, Sequence
+
+from nova.galaxy import Connection, Dataset, Parameters, Tool
+from nova.galaxy.connection import ConnectionHelper
+
+from pleiades.sammy.backends.nova_ornl import extract_sammy_outputs, is_transient_error
+from pleiades.sammy.config import NovaSammyConfig
+from pleiades.sammy.interface import (
+    EnvironmentPreparationError,
+    SammyExecutionResult,
+    SammyFailureType,
+    SammyFiles,
+)
+from pleiades.utils.logger import loguru_logger
+
+logger = loguru_logger.bind(name=__name__)
+
+# Remote job states, as reported by Tool.get_status (nova.galaxy WorkState values)
+STATE_FINISHED = "finished"
+STATE_FAILED = {"error", "deleted"}
+
+
+def _state_name(state) -> str:
+    """Normalize a WorkState (or plain string) to its lower-case value."""
+    return str(getattr(state, "value", state)).lower()
+
+
+@dataclass
+class NovaBatchItem:
+    """One SAMMY run of a NOVA batch."""
+
+    item_id: str
+    files: SammyFiles
+    output_dir: Path
+
+    def __post_init__(self):
+        self.output_dir = Path(self.output_dir)
+
+
+@dataclass
+class _Submission:
+    """Bookkeeping of a remote job in flight."""
+
+    item: NovaBatchItem
+    tool: Tool
+    start_time: datetime
+    submitted_at: float
+
+
+class NovaBatchRunner:
+    """
+    Run many SAMMY jobs on NOVA concurrently.
+
+    Attributes:
+        config: NOVA configuration; config.timeout applies to each job from its submission
+        max_in_flight: Maximum number of remote jobs submitted and not yet finished
+        poll_interval: Seconds between two status polls of the running jobs
+        workers: Threads used for submissions, status polls and downloads
+        tool_factory: Callable creating one Tool per job (defaults to the configured NOVA tool)
+    """
+
+    def __init__(
+        self,
+        config: NovaSammyConfig,
+        max_in_flight: int = 16,
+        poll_interval: float = 5.0,
+        workers: int = 4,
+        tool_factory: Optional[Callable[[], Tool]] = None,
+    ):
+        if max_in_flight < 1:
+            raise ValueError(f"Invalid max_in_flight: {max_in_flight}")
+        if poll_interval <= 0:
+            raise ValueError(f"Invalid poll_interval: {poll_interval}")
+        if workers < 1:
+            raise ValueError(f"Invalid number of workers: {workers}")
+        self.config = config
+        self.max_in_flight = max_in_flight
+        self.poll_interval = poll_interval
+        self.workers = workers
+        self.tool_factory = tool_factory
+        self._session: Optional[ExitStack] = None
+        self._connection: Optional[ConnectionHelper] = None
+        self._temp_dir: Optional[TemporaryDirectory] = None
+        self._lock = threading.Lock()
+
+    def prepare_environment(self) -> None:
+        """
+        Open the NOVA connection and the temporary download directory.
+
+        The connection stays open until cleanup, which also deletes the data stores
+        of the jobs.
+
+        Raises:
+            EnvironmentPreparationError: If preparation fails
+        """
+        session = ExitStack()
+        try:
+            self._connection = session.enter_context(Connection(self.config.url, self.config.api_key).connect())
+            self._temp_dir = TemporaryDirectory()
+        except Exception as e:
+            session.close()
+            self._connection = None
+            raise EnvironmentPreparationError(f"NOVA environment preparation failed: {str(e)}")
+        self._session = session
+
+    def cleanup(self) -> None:
+        """Release the temporary directory and the NOVA connection."""
+        try:
+            if self._temp_dir is not None:
+                self._temp_dir.cleanup()
+                self._temp_dir = None
+            if self._session is not None:
+                self._connection = None
+                self._session.close()
+                self._session = None
+        except Exception as e:
+            logger.error(f"Error during cleanup: {str(e)}")
+
+    def _new_tool(self) -> Tool:
+        if self.tool_factory is not None:
+            return self.tool_factory()
+        return Tool(self.config.tool_id)
+
+    def _submit(self, item: NovaBatchItem) -> _Submission:
+        """Start the remote job of an item without waiting for it."""
+        item.files.validate()
+        start_time = datetime.now()
+        with self._lock:
+            # The connection is shared by the worker threads
+            data_store = self._connection.create_data_store(f"sammy_{item.item_id}")
+            data_store.mark_for_cleanup()
+        tool = self._new_tool()
+
+        params = Parameters()
+        params.add_input("inp", Dataset(str(item.files.input_file)))
+        params.add_input("par", Dataset(str(item.files.parameter_file)))
+        params.add_input("data", Dataset(str(item.files.data_file)))
+        tool.run(data_store, params, wait=False)
+
+        logger.debug(f"Submitted NOVA job {item.item_id}")
+        return _Submission(item=item, tool=tool, start_time=start_time, submitted_at=monotonic())
+
+    @staticmethod
+    def _poll(submission: _Submission) -> Optional[str]:
+        """Return the state of a remote job, or None if it could not be queried this time."""
+        try:
+            return _state_name(submission.tool.get_status())
+        except Exception as e:
+            if is_transient_error(e):
+                logger.warning(f"Transient error polling {submission.item.item_id}: {str(e)}")
+                return None
+            raise
+
+    def _fetch(self, submission: _Submission) -> SammyExecutionResult:
+        """Download and extract the outputs of a finished job."""
+        item = submission.item
+        results = submission.tool.get_results()
+        console_output = results.get_dataset("sammy_console_output").get_content()
+
+        output_zip = Path(self._temp_dir.name) / f"{item.item_id}_outputs.zip"
+        results.get_dataset("sammy_output_files").download(str(output_zip))
+        item.output_dir.mkdir(parents=True, exist_ok=True)
+        extract_sammy_outputs(output_zip, item.output_dir)
+        output_zip.unlink()
+
+        success = " Normal finish to SAMMY" in console_output
+        if success:
+            logger.info(f"SAMMY execution completed successfully for {item.item_id}")
+        else:
+            logger.error(f"SAMMY execution failed for {item.item_id}")
+        return SammyExecutionResult(
+            success=success,
+            execution_id=item.item_id,
+            start_time=submission.start_time,
+            end_time=datetime.now(),
+            console_output=console_output,
+            error_message=None if success else "SAMMY execution failed",
+            failure_type=None if success else SammyFailureType.SAMMY_FAILURE,
+        )
+
+    @staticmethod
+    def _cancel(submission: _Submission) -> None:
+        """Cancel a remote job, logging instead of raising on failure."""
+        try:
+            submission.tool.cancel()
+        except Exception as e:
+            logger.error(f"Failed to cancel NOVA job {submission.item.item_id}: {str(e)}")
+
+    @staticmethod
+    def _failure(
+        item: NovaBatchItem, start_time: datetime, message: str, failure_type: SammyFailureType
+    ) -> SammyExecutionResult:
+        logger.error(f"NOVA job {item.item_id} failed: {message}")
+        return SammyExecutionResult(
+            success=False,
+            execution_id=item.item_id,
+            start_time=start_time,
+            end_time=datetime.now(),
+            console_output="",
+            error_message=message,
+            failure_type=failure_type,
+        )
+
+    @classmethod
+    def _error_result(cls, item: NovaBatchItem, start_time: datetime, error: Exception) -> SammyExecutionResult:
+        failure_type = (
+            SammyFailureType.BACKEND_TRANSIENT if is_transient_error(error) else SammyFailureType.BACKEND_ERROR
+        )
+        return cls._failure(item, start_time, f"NOVA execution failed: {str(error)}", failure_type)
+
+    def run(
+        self,
+        items: Sequence[NovaBatchItem],
+        on_result: Optional[Callable[[NovaBatchItem, SammyExecutionResult], None]] = None,
+    ) -> Dict[str, SammyExecutionResult]:
+        """
+        Submit, monitor and download all items.
+
+        Args:
+            items: Runs to execute; item ids must be unique
+            on_result: Optional callback invoked (from the calling thread) as soon as
+                each item has its result, in completion order
+
+        Returns:
+            Dict mapping item id -> SammyExecutionResult, in the order of `items`
+
+        Raises:
+            EnvironmentPreparationError: If prepare_environment was not called
+            ValueError: If item ids are not unique
+        """
+        if self._connection is None or self._temp_dir is None:
+            raise EnvironmentPreparationError("NOVA environment is not prepared")
+        item_ids = [item.item_id for item in items]
+        if len(set(item_ids)) != len(item_ids):
+            raise ValueError("NOVA batch item ids must be unique")
+
+        results: Dict[str, SammyExecutionResult] = {}
+
+        def _record(item: NovaBatchItem, result: SammyExecutionResult) -> None:
+            results[item.item_id] = result
+            if on_result is not None:
+                on_result(item, result)
+
+        pending = deque(items)
+        submitting: Dict[Future, NovaBatchItem] = {}
+        running: List[_Submission] = []
+        downloading: Dict[Future, _Submission] = {}
+        logger.info(f"Running {len(items)} SAMMY jobs on NOVA, {self.max_in_flight} at a time")
+
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="nova") as executor:
+            while pending or submitting or running or downloading:
+                # Keep the service busy up to the in-flight limit
+                while pending and len(submitting) + len(running) < self.max_in_flight:
+                    item = pending.popleft()
+                    submitting[executor.submit(self._submit, item)] = item
+
+                for future in [future for future in submitting if future.done()]:
+                    item = submitting.pop(future)
+                    try:
+                        running.append(future.result())
+                    except Exception as e:
+                        _record(item, self._error_result(item, datetime.now(), e))
+
+                # Poll every running job concurrently
+                polls = {executor.submit(self._poll, submission): submission for submission in running}
+                still_running = []
+                for future, submission in polls.items():
+                    item = submission.item
+                    try:
+                        state = future.result()
+                    except Exception as e:
+                        _record(item, self._error_result(item, submission.start_time, e))
+                        continue
+
+                    if state == STATE_FINISHED:
+                        downloading[executor.submit(self._fetch, submission)] = submission
+                    elif state in STATE_FAILED:
+                        message = f"NOVA job ended in state '{state}'"
+                        _record(
+                            item, self._failure(item, submission.start_time, message, SammyFailureType.SAMMY_FAILURE)
+                        )
+                    elif monotonic() - submission.submitted_at > self.config.timeout:
+                        self._cancel(submission)
+                        message = f"NOVA execution timed out after {self.config.timeout}s"
+                        _record(item, self._failure(item, submission.start_time, message, SammyFailureType.TIMEOUT))
+                    else:
+                        still_running.append(submission)
+                running = still_running
+
+                for future in [future for future in downloading if future.done()]:
+                    submission = downloading.pop(future)
+                    try:
+                        _record(submission.item, future.result())
+                    except Exception as e:
+                        _record(submission.item, self._error_result(submission.item, submission.start_time, e))
+
+                if pending or submitting or running or downloading:
+                    # Wake up early when a submission or download completes
+                    wait(list(submitting) + list(downloading), timeout=self.poll_interval, return_when=FIRST_COMPLETED)
+
+        logger.info(f"NOVA batch finished: {sum(result.success for result in results.values())}/{len(items)} succeeded")
+        return {item_id: results[item_id] for item_id in item_ids}
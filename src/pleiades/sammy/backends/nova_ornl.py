@@ -2,7 +2,10 @@
 """NOVA web service backend implementation for SAMMY execution."""
 
 import os
+import shutil
 import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
 from datetime import datetime
 from pathlib import Path
 from tempfile import TemporaryDirectory
@@ -21,13 +24,69 @@ from pleiades.sammy.interface import (
     EnvironmentPreparationError,
     SammyExecutionError,
     SammyExecutionResult,
+    SammyFailureType,
     SammyFiles,
     SammyRunner,
+    TransientBackendError,
 )
 from pleiades.utils.logger import loguru_logger
 
 logger = loguru_logger.bind(name=__name__)
 
+# HTTP status codes of temporary server-side problems
+TRANSIENT_HTTP_STATUS = {408, 429, 500, 502, 503, 504}
+
+
+def is_transient_error(error: Exception) -> bool:
+    """
+    Check whether an exception raised while talking to NOVA is temporary.
+
+    Connection problems, HTTP timeouts and 5xx/429 responses are considered
+    transient; anything else (authentication, missing tool, bad inputs) is not.
+
+    Args:
+        error: Exception raised by the NOVA client
+
+    Returns:
+        bool: True if retrying the execution may succeed
+    """
+    if isinstance(error, (ConnectionError, TimeoutError)):
+        return True
+
+    try:
+        import requests
+    except ImportError:
+        return False
+
+    if isinstance(error, (requests.ConnectionError, requests.Timeout)):
+        return True
+    if isinstance(error, requests.HTTPError) and error.response is not None:
+        return error.response.status_code in TRANSIENT_HTTP_STATUS
+    return False
+
+
+def extract_sammy_outputs(output_zip: Path, output_dir: Path) -> None:
+    """
+    Extract the SAMMY output files of a NOVA output archive.
+
+    The archive may nest the files in directories; only the SAM* files are
+    extracted, flat, into the output directory.
+
+    Args:
+        output_zip: Archive downloaded from NOVA
+        output_dir: Directory receiving the output files
+    """
+    with zipfile.ZipFile(output_zip) as zf:
+        for zip_info in zf.filelist:
+            # Get just the filename, ignoring directory structure in ZIP
+            filename = Path(zip_info.filename).name
+            # Extract if it's a file (not directory) and starts with SAM
+            if not zip_info.is_dir() and filename.startswith("SAM"):
+                # Stream the file from zip to the output directory
+                with zf.open(zip_info) as source, open(output_dir / filename, "wb") as target:
+                    shutil.copyfileobj(source, target)
+                logger.debug(f"Extracted {filename} to output directory")
+
 
 class NovaConnectionError(Exception):
     """Raised when NOVA connection fails."""
@@ -89,8 +148,25 @@ class NovaSammyRunner(SammyRunner):
             params.add_input("par", Dataset(str(files.parameter_file)))
             params.add_input("data", Dataset(str(files.data_file)))
 
-            # Run SAMMY
-            results = tool.run(datastore=self._datastore_name, parameters=params)
+            # Run SAMMY, giving up once the configured timeout expires
+            executor = ThreadPoolExecutor(max_workers=1)
+            future = executor.submit(tool.run, datastore=self._datastore_name, parameters=params)
+            try:
+                results = future.result(timeout=self.config.timeout)
+            except FutureTimeoutError:
+                logger.error(f"NOVA execution timed out after {self.config.timeout}s for {execution_id}")
+                self._cancel(tool)
+                return SammyExecutionResult(
+                    success=False,
+                    execution_id=execution_id,
+                    start_time=start_time,
+                    end_time=datetime.now(),
+                    console_output="",
+                    error_message=f"NOVA execution timed out after {self.config.timeout}s",
+                    failure_type=SammyFailureType.TIMEOUT,
+                )
+            finally:
+                executor.shutdown(wait=False)
 
             # Get console output
             if self._temp_dir is None:
@@ -101,19 +177,7 @@ class NovaSammyRunner(SammyRunner):
             console_output = results.outputs["sammy_console_output"].get_content()
             results.outputs["sammy_output_files"].download(str(output_zip))
 
-            # Extract files to output directory, handling nested structure
-            with zipfile.ZipFile(output_zip) as zf:
-                for zip_info in zf.filelist:
-                    # Get just the filename, ignoring directory structure in ZIP
-                    filename = Path(zip_info.filename).name
-                    # Extract if it's a file (not directory) and starts with SAM
-                    if not zip_info.is_dir() and (filename.startswith("SAM") or filename == "SAMMY.LPT"):
-                        # Read the file from zip
-                        with zf.open(zip_info) as source:
-                            # Write to output directory
-                            output_file = self.config.output_dir / filename
-                            output_file.write_bytes(source.read())
-                            logger.debug(f"Extracted {filename} to output directory")
+            extract_sammy_outputs(output_zip, self.config.output_dir)
 
             end_time = datetime.now()
             success = " Normal finish to SAMMY" in console_output
@@ -131,12 +195,24 @@ class NovaSammyRunner(SammyRunner):
                 end_time=end_time,
                 console_output=console_output,
                 error_message=error_message,
+                failure_type=None if success else SammyFailureType.SAMMY_FAILURE,
             )
 
         except Exception as e:
+            if is_transient_error(e):
+                logger.warning(f"Transient NOVA error for {execution_id}: {str(e)}")
+                raise TransientBackendError(f"NOVA execution failed: {str(e)}")
             logger.exception(f"NOVA execution failed for {execution_id}")
             raise SammyExecutionError(f"NOVA execution failed: {str(e)}")
 
+    @staticmethod
+    def _cancel(tool: Tool) -> None:
+        """Cancel a running NOVA tool, logging instead of raising on failure."""
+        try:
+            tool.cancel()
+        except Exception as e:
+            logger.error(f"Failed to cancel NOVA tool: {str(e)}")
+
     def cleanup(self, files: Optional[SammyFiles] = None) -> None:
         """Clean up NOVA resources."""
         logger.debug("Performing NOVA cleanup")
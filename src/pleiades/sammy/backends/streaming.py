@@ -0,0 +1,265 @@
+#!/usr/bin/env python
+"""
+Streaming capture of SAMMY console output.
+
+SAMMY can print a lot to the terminal during long fits. Instead of buffering the
+whole output in memory, the console is consumed line by line: every line goes to a
+log file, only a bounded tail is kept in memory, fit progress (iteration blocks and
+chi-squared values) is reported live through a callback, and the process can be
+aborted as soon as a fatal error is recognized or a wall-clock timeout expires.
+"""
+
+import os
+import re
+import subprocess
+import sys
+import threading
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, TextIO, Tuple
+
+from pleiades.utils.logger import loguru_logger
+
+logger = loguru_logger.bind(name=__name__)
+
+# Message printed by SAMMY on successful completion
+NORMAL_FINISH = " Normal finish to SAMMY"
+
+# Console messages after which SAMMY cannot produce useful results
+FATAL_ERROR_PATTERNS = (
+    "Fortran runtime error",
+    "forrtl: severe",
+    "Program received signal",
+    "Segmentation fault",
+    "Floating point exception",
+)
+
+# Markers starting a new block of parameter values (same as the LPT file)
+ITERATION_MARKERS = (
+    "***** INTERMEDIATE VALUES FOR RESONANCE PARAMETERS",
+    "***** NEW VALUES FOR RESONANCE PARAMETERS",
+)
+
+CHI_SQUARED_PATTERN = re.compile(r"CUSTOMARY CHI SQUARED\s*=\s*([-\d.Ee+]+)")
+REDUCED_CHI_SQUARED_PATTERN = re.compile(r"CUSTOMARY CHI SQUARED DIVIDED BY NDAT\s*=\s*([-\d.Ee+]+)")
+
+
+@dataclass
+class SammyProgress:
+    """Progress information parsed from the SAMMY console."""
+
+    iteration: int  # Number of parameter update blocks seen so far
+    chi_squared: Optional[float] = None
+    reduced_chi_squared: Optional[float] = None
+    line: str = ""  # Console line that triggered the update
+
+
+ProgressCallback = Callable[[SammyProgress], None]
+
+
+class StreamingRun(NamedTuple):
+    """Outcome of a streamed process execution."""
+
+    returncode: int
+    aborted: bool  # Killed after a fatal error line
+    timed_out: bool  # Killed after the wall-clock timeout
+    peak_rss_kb: Optional[int] = None  # Peak resident set size of the process, where available
+
+
+class ConsoleStream:
+    """
+    Line-by-line consumer of SAMMY console output.
+
+    Attributes:
+        log_file: Optional file receiving every console line
+        tail_lines: Maximum number of lines kept in memory
+        progress_callback: Optional callable notified on iteration/chi-squared updates
+        fatal_patterns: Substrings identifying fatal errors
+    """
+
+    def __init__(
+        self,
+        log_file: Optional[Path] = None,
+        tail_lines: int = 1000,
+        progress_callback: Optional[ProgressCallback] = None,
+        fatal_patterns: Sequence[str] = FATAL_ERROR_PATTERNS,
+    ):
+        self.log_file = Path(log_file) if log_file is not None else None
+        self.progress_callback = progress_callback
+        self.fatal_patterns = tuple(fatal_patterns)
+        self.normal_finish = False
+        self.fatal_error: Optional[str] = None
+        self.line_count = 0
+        self.progress = SammyProgress(iteration=0)
+        self._tail = deque(maxlen=tail_lines)
+        self._handle: Optional[TextIO] = None
+
+        if self.log_file is not None:
+            self.log_file.parent.mkdir(parents=True, exist_ok=True)
+            self._handle = open(self.log_file, "w")
+
+    @property
+    def tail(self) -> str:
+        """Last lines of console output kept in memory."""
+        return "".join(self._tail)
+
+    def feed(self, line: str) -> Optional[str]:
+        """
+        Consume one console line.
+
+        Args:
+            line: Console line, including its line terminator
+
+        Returns:
+            The fatal error line if one was detected, None otherwise
+        """
+        self.line_count += 1
+        self._tail.append(line)
+        if self._handle is not None:
+            self._handle.write(line)
+
+        if NORMAL_FINISH in line:
+            self.normal_finish = True
+
+        self._update_progress(line)
+
+        if self.fatal_error is None and any(pattern in line for pattern in self.fatal_patterns):
+            self.fatal_error = line.strip()
+            return self.fatal_error
+        return None
+
+    def _update_progress(self, line: str) -> None:
+        """Parse iteration and chi-squared information and notify the callback."""
+        updated = False
+        if any(marker in line for marker in ITERATION_MARKERS):
+            self.progress.iteration += 1
+            updated = True
+
+        match = CHI_SQUARED_PATTERN.search(line)
+        if match:
+            self.progress.chi_squared = float(match.group(1))
+            updated = True
+        match = REDUCED_CHI_SQUARED_PATTERN.search(line)
+        if match:
+            self.progress.reduced_chi_squared = float(match.group(1))
+            updated = True
+
+        if updated and self.progress_callback is not None:
+            self.progress.line = line.rstrip("\n")
+            try:
+                self.progress_callback(
+                    SammyProgress(
+                        iteration=self.progress.iteration,
+                        chi_squared=self.progress.chi_squared,
+                        reduced_chi_squared=self.progress.reduced_chi_squared,
+                        line=self.progress.line,
+                    )
+                )
+            except Exception as e:
+                # A broken callback must not kill the SAMMY run
+                logger.warning(f"Progress callback raised an exception: {str(e)}")
+
+    def close(self) -> None:
+        """Close the log file."""
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+
+
+def _wait_with_rusage(process: subprocess.Popen) -> Tuple[int, Optional[int]]:
+    """
+    Wait for a process and return its exit code and peak resident set size in kB.
+
+    os.wait4 reports the resource usage of this single child, unlike
+    getrusage(RUSAGE_CHILDREN) which aggregates every child ever waited for.
+    The peak RSS is None where this information is unavailable.
+    """
+    if not hasattr(os, "wait4") or process.returncode is not None:
+        # No wait4, or already reaped by Popen: no usage information left
+        return process.wait(), None
+    try:
+        _, status, rusage = os.wait4(process.pid, 0)
+    except ChildProcessError:
+        return process.wait(), None
+    process.returncode = os.waitstatus_to_exitcode(status)
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+    peak_rss_kb = rusage.ru_maxrss // 1024 if sys.platform == "darwin" else rusage.ru_maxrss
+    return process.returncode, peak_rss_kb
+
+
+def run_streaming(
+    command: List[str],
+    input_text: str,
+    cwd: Path,
+    env: Dict[str, str],
+    stream: ConsoleStream,
+    abort_on_fatal: bool = True,
+    timeout: Optional[float] = None,
+    on_start: Optional[Callable[[subprocess.Popen], None]] = None,
+) -> StreamingRun:
+    """
+    Run a command, feeding its merged stdout/stderr to a ConsoleStream line by line.
+
+    Args:
+        command: Command and arguments
+        input_text: Text written to the process stdin
+        cwd: Working directory of the process
+        env: Environment of the process
+        stream: Consumer of the console lines
+        abort_on_fatal: Kill the process as soon as a fatal error line is seen
+        timeout: Wall-clock limit in seconds after which the process is killed
+        on_start: Callable receiving the process right after it started, before its
+            input is written (e.g. to set rlimits with resource.prlimit)
+
+    Returns:
+        StreamingRun: Return code, aborted and timed-out flags, and peak memory usage
+    """
+    aborted = False
+    timed_out = threading.Event()
+    process = subprocess.Popen(
+        command,
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        bufsize=1,
+        env=env,
+        cwd=str(cwd),
+    )
+
+    def _kill_on_timeout():
+        timed_out.set()
+        logger.error(f"Process exceeded timeout of {timeout}s, killing it")
+        process.kill()
+
+    # The timer kills the process, which closes stdout and ends the read loop
+    timer = threading.Timer(timeout, _kill_on_timeout) if timeout is not None else None
+    try:
+        if on_start is not None:
+            on_start(process)
+        if timer is not None:
+            timer.daemon = True
+            timer.start()
+
+        process.stdin.write(input_text)
+        process.stdin.close()
+
+        for line in process.stdout:
+            fatal = stream.feed(line)
+            if fatal is not None and abort_on_fatal:
+                logger.error(f"Fatal SAMMY error detected, aborting: {fatal}")
+                process.kill()
+                aborted = True
+                break
+
+        returncode, peak_rss_kb = _wait_with_rusage(process)
+    finally:
+        if timer is not None:
+            timer.cancel()
+        if process.poll() is None:
+            process.kill()
+            process.wait()
+        stream.close()
+
+    return StreamingRun(returncode=returncode, aborted=aborted, timed_out=timed_out.is_set(), peak_rss_kb=peak_rss_kb)
@@ -9,11 +9,18 @@ inheriting from the base configuration defined in the interface module.
 import shutil
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict
+from typing import Dict, Optional
 
 from pleiades.sammy.interface import BaseSammyConfig, ConfigurationError
 
 
+def _validate_limits(**limits: Optional[float]) -> None:
+    """Check that every execution limit that is set is strictly positive."""
+    for name, value in limits.items():
+        if value is not None and value <= 0:
+            raise ConfigurationError(f"Invalid {name.replace('_', ' ')}: {value}")
+
+
 @dataclass
 class LocalSammyConfig(BaseSammyConfig):
     """Configuration for local SAMMY installation."""
@@ -21,6 +28,12 @@ class LocalSammyConfig(BaseSammyConfig):
     sammy_executable: Path
     shell_path: Path = Path("/bin/bash")
     env_vars: Dict[str, str] = field(default_factory=dict)
+    console_log_file: Optional[Path] = None  # Defaults to output_dir / "sammy_console.log"
+    console_tail_lines: int = 1000  # Console lines kept in SammyExecutionResult
+    abort_on_fatal_error: bool = True  # Kill SAMMY as soon as a fatal error is printed
+    timeout: Optional[float] = None  # Wall-clock limit in seconds, no limit if None
+    cpu_time_limit: Optional[int] = None  # CPU time rlimit in seconds (Linux only)
+    memory_limit: Optional[int] = None  # Address space rlimit in bytes (Linux only)
 
     def validate(self) -> bool:
         """Validate local SAMMY configuration."""
@@ -37,6 +50,13 @@ class LocalSammyConfig(BaseSammyConfig):
         if not self.shell_path.exists():
             raise ConfigurationError(f"Shell not found: {self.shell_path}")
 
+        # Validate console capture settings
+        if self.console_tail_lines <= 0:
+            raise ConfigurationError(f"Invalid console tail length: {self.console_tail_lines}")
+
+        # Validate execution limits
+        _validate_limits(timeout=self.timeout, cpu_time_limit=self.cpu_time_limit, memory_limit=self.memory_limit)
+
         return True
 
 
@@ -47,6 +67,8 @@ class DockerSammyConfig(BaseSammyConfig):
     image_name: str
     container_working_dir: Path = Path("/sammy/work")
     container_data_dir: Path = Path("/sammy/data")
+    timeout: Optional[float] = None  # Wall-clock limit in seconds, no limit if None
+    memory_limit: Optional[int] = None  # Container memory limit in bytes (docker run --memory)
 
     def validate(self) -> bool:
         """
@@ -75,6 +97,9 @@ class DockerSammyConfig(BaseSammyConfig):
         if self.container_working_dir == self.container_data_dir:
             raise ConfigurationError("Container working and data directories must be different")
 
+        # Validate execution limits
+        _validate_limits(timeout=self.timeout, memory_limit=self.memory_limit)
+
         return True
 
 
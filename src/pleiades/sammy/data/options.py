@@ -2,11 +2,11 @@ from enum import Enum
 from pathlib import Path
 from typing import Optional
 
-import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
 from pydantic import BaseModel, Field
 
+from pleiades.sammy.io.lst_reader import LST_COLUMN_NAMES, read_lst
 from pleiades.utils.logger import loguru_logger
 from pleiades.utils.units import CrossSectionUnitOptions, EnergyUnitOptions
 
@@ -35,7 +35,7 @@ class DataTypeOptions(str, Enum):
 
 class SammyData(BaseModel):
     """
-    Container for LST data, loaded from a SAMMY .LST file using pandas.
+    Container for LST data, loaded from a SAMMY .LST file into a pandas DataFrame.
 
     Attributes:
         data_file: Path to the LST file.
@@ -53,22 +53,8 @@ class SammyData(BaseModel):
     )
     data: Optional[pd.DataFrame] = Field(default=None, exclude=True)
 
-    # All possible columns in a SAMMY.LPT file (always in this order)
-    _all_column_names = [
-        "Energy",
-        "Experimental cross section (barns)",
-        "Absolute uncertainty in experimental cross section (barns)",
-        "Zeroth-order theoretical cross section as evaluated by SAMMY (barns)",
-        "Final theoretical cross section as evaluated by SAMMY (barns)",
-        "Experimental transmission (dimensionless)",
-        "Absolute uncertainty in experimental transmission",
-        "Zeroth-order theoretical transmission as evaluated by SAMMY (dimensionless)",
-        "Final theoretical transmission as evaluated by SAMMY (dimensionless)",
-        "Theoretical uncertainty on Zeroth-order theoretical cross section or transmission",
-        "Theoretical uncertainty on Final theoretical cross section or transmission",
-        "Adjusted energy initially",
-        "Adjusted energy finally",
-    ]
+    # All possible columns in a SAMMY.LST file (always in this order)
+    _all_column_names = list(LST_COLUMN_NAMES)
 
     def model_post_init(self, __context):
         if self.data_file is not None:
@@ -76,9 +62,8 @@ class SammyData(BaseModel):
 
     def load(self):
         """Load the LST file into a pandas DataFrame and validate columns."""
-        self.data = pd.read_csv(self.data_file, sep=r"\s+", header=None, comment="#")
-        n_cols = self.data.shape[1]
-        self.data.columns = self._all_column_names[:n_cols]
+        # Parsed by NumPy, the DataFrame is built from the columns (see lst_reader)
+        self.data = read_lst(self.data_file).to_dataframe()
         self.validate_columns()
 
     def validate_columns(self):
@@ -144,6 +129,9 @@ class SammyData(BaseModel):
         if self.data is None:
             raise ValueError("No data loaded to plot.")
 
+        # Imported here so that loading data does not pull in matplotlib
+        import matplotlib.pyplot as plt
+
         data = self.data
         initial_color = "#003f5c"
 
@@ -282,6 +270,8 @@ class SammyData(BaseModel):
 
     def plot_cross_section(self, show_diff=False, plot_uncertainty=False):
         """Plot the cross-section data."""
+        import matplotlib.pyplot as plt
+
         if self.data is not None:
             plt.figure(figsize=(10, 6))
             plt.plot(
@@ -5,9 +5,11 @@ import os
 import re
 import shutil
 import subprocess
+import threading
+import time
 from enum import Enum
 from pathlib import Path
-from typing import Dict, Optional, Union
+from typing import Dict, Optional, Tuple, Union
 
 import yaml
 
@@ -48,61 +50,156 @@ class ConfigurationError(FactoryError):
 
 
 class SammyFactory:
-    """Factory for creating and managing SAMMY runners."""
+    """
+    Factory for creating and managing SAMMY runners.
 
-    @staticmethod
-    def list_available_backends() -> Dict[BackendType, bool]:
-        """
-        Check which backends are available in the current environment.
+    Backend availability probes (`shutil.which`, `docker info`) are cached for
+    probe_ttl seconds, and only the backend actually requested is probed, so
+    creating many runners costs a single probe per backend. Call
+    invalidate_cache() after installing or starting a backend.
+    """
 
-        Returns:
-            Dict mapping backend types to their availability status
+    # Seconds a probe result stays valid, None caches until invalidated
+    probe_ttl: Optional[float] = 300.0
 
-        Example:
-            >>> SammyFactory.list_available_backends()
-            {
-                BackendType.LOCAL: True,
-                BackendType.DOCKER: True,
-                BackendType.NOVA: False
-            }
-        """
-        available = {}
+    # Cached probe results: backend -> (available, monotonic time of the probe)
+    _probe_cache: Dict[BackendType, Tuple[bool, float]] = {}
+    # Runners returned by get_runner, keyed by backend and configuration
+    _runner_cache: Dict[tuple, SammyRunner] = {}
+    _cache_lock = threading.RLock()
 
-        # Check Local backend
+    @staticmethod
+    def _probe_local() -> bool:
+        """Check for a SAMMY executable in PATH."""
         try:
             sammy_path = shutil.which("sammy")
-            available[BackendType.LOCAL] = sammy_path is not None
             if sammy_path:
                 logger.debug(f"Local SAMMY found at: {sammy_path}")
+            return sammy_path is not None
         except Exception as e:
             logger.debug(f"Error checking local backend: {str(e)}")
-            available[BackendType.LOCAL] = False
+            return False
 
-        # Check Docker backend
+    @staticmethod
+    def _probe_docker() -> bool:
+        """Check that docker is installed and its daemon answers."""
         try:
             docker_available = shutil.which("docker") is not None
             if docker_available:
                 # Check if we can run docker
                 result = subprocess.run(["docker", "info"], capture_output=True, text=True)
                 docker_available = result.returncode == 0
-            available[BackendType.DOCKER] = docker_available
             if docker_available:
                 logger.debug("Docker backend available")
+            return docker_available
         except Exception as e:
             logger.debug(f"Error checking docker backend: {str(e)}")
-            available[BackendType.DOCKER] = False
+            return False
 
-        # Check NOVA backend
+    @staticmethod
+    def _probe_nova() -> bool:
+        """Check for NOVA credentials in the environment."""
         try:
             nova_available = all(k in os.environ for k in ["NOVA_URL", "NOVA_API_KEY"])
-            available[BackendType.NOVA] = nova_available
             if nova_available:
                 logger.debug("NOVA credentials found")
+            return nova_available
         except Exception as e:
             logger.debug(f"Error checking NOVA backend: {str(e)}")
-            available[BackendType.NOVA] = False
+            return False
 
-        return available
+    @classmethod
+    def is_backend_available(cls, backend: BackendType, use_cache: bool = True) -> bool:
+        """
+        Check whether a single backend is available, probing it only if needed.
+
+        Args:
+            backend: Backend to check
+            use_cache: Reuse a probe result younger than probe_ttl
+
+        Returns:
+            bool: True if the backend is available
+        """
+        with cls._cache_lock:
+            cached = cls._probe_cache.get(backend)
+            if use_cache and cached is not None:
+                available, probed_at = cached
+                if cls.probe_ttl is None or time.monotonic() - probed_at < cls.probe_ttl:
+                    return available
+
+            probes = {
+                BackendType.LOCAL: cls._probe_local,
+                BackendType.DOCKER: cls._probe_docker,
+                BackendType.NOVA: cls._probe_nova,
+            }
+            available = probes[backend]()
+            cls._probe_cache[backend] = (available, time.monotonic())
+            return available
+
+    @classmethod
+    def invalidate_cache(cls, backend: Optional[BackendType] = None) -> None:
+        """
+        Forget cached probe results and runners.
+
+        Args:
+            backend: Backend to invalidate, all backends if None
+        """
+        with cls._cache_lock:
+            if backend is None:
+                cls._probe_cache.clear()
+                cls._runner_cache.clear()
+                return
+            cls._probe_cache.pop(backend, None)
+            for key in [key for key in cls._runner_cache if key[0] == backend]:
+                del cls._runner_cache[key]
+
+    @classmethod
+    def list_available_backends(cls, use_cache: bool = True) -> Dict[BackendType, bool]:
+        """
+        Check which backends are available in the current environment.
+
+        Args:
+            use_cache: Reuse probe results younger than probe_ttl
+
+        Returns:
+            Dict mapping backend types to their availability status
+
+        Example:
+            >>> SammyFactory.list_available_backends()
+            {
+                BackendType.LOCAL: True,
+                BackendType.DOCKER: True,
+                BackendType.NOVA: False
+            }
+        """
+        return {backend: cls.is_backend_available(backend, use_cache=use_cache) for backend in BackendType}
+
+    @classmethod
+    def get_runner(
+        cls, backend_type: str, working_dir: Path, output_dir: Optional[Path] = None, **kwargs
+    ) -> SammyRunner:
+        """
+        Return a configured runner, reusing the one created by a previous identical call.
+
+        Takes the same arguments as create_runner. Runners are cached until
+        invalidate_cache() is called for their backend.
+
+        Returns:
+            Configured SammyRunner instance
+        """
+        try:
+            backend = BackendType(backend_type.lower())
+        except ValueError:
+            raise ConfigurationError(f"Invalid backend type: {backend_type}")
+
+        output_dir = Path(output_dir) if output_dir is not None else Path(working_dir) / "output"
+        key = (backend, Path(working_dir), output_dir, tuple(sorted((k, repr(v)) for k, v in kwargs.items())))
+        with cls._cache_lock:
+            runner = cls._runner_cache.get(key)
+            if runner is None:
+                runner = cls.create_runner(backend.value, working_dir, output_dir, **kwargs)
+                cls._runner_cache[key] = runner
+            return runner
 
     @classmethod
     def create_runner(
@@ -119,10 +216,15 @@ class SammyFactory:
                 Local backend:
                     sammy_executable: Path to SAMMY executable
                     shell_path: Path to shell
+                    timeout: Wall-clock limit in seconds
+                    cpu_time_limit: CPU time limit in seconds
+                    memory_limit: Memory limit in bytes
                 Docker backend:
                     image_name: Docker image name
                     container_working_dir: Working directory in container
                     container_data_dir: Data directory in container
+                    timeout: Wall-clock limit in seconds
+                    memory_limit: Container memory limit in bytes
                 NOVA backend:
                     url: NOVA service URL
                     api_key: NOVA API key
@@ -143,18 +245,18 @@ class SammyFactory:
             except ValueError:
                 raise ConfigurationError(f"Invalid backend type: {backend_type}")
 
-            # Check backend availability
-            available_backends = cls.list_available_backends()
+            # Check availability of the requested backend only
+            backend_available = cls.is_backend_available(backend)
 
             # For local backend, also check if explicit sammy_executable was provided
-            if backend == BackendType.LOCAL and not available_backends[backend]:
+            if backend == BackendType.LOCAL and not backend_available:
                 explicit_sammy = kwargs.get("sammy_executable")
                 if explicit_sammy and Path(explicit_sammy).exists():
                     # Explicit executable provided and exists - allow local backend
                     pass
                 else:
                     raise BackendNotAvailableError(f"Backend {backend.value} is not available")
-            elif not available_backends[backend]:
+            elif not backend_available:
                 raise BackendNotAvailableError(f"Backend {backend.value} is not available")
 
             # Set default output directory if not specified
@@ -172,6 +274,9 @@ class SammyFactory:
                     output_dir=output_dir,
                     sammy_executable=kwargs.get("sammy_executable", "sammy"),
                     shell_path=kwargs.get("shell_path", Path("/bin/bash")),
+                    timeout=kwargs.get("timeout"),
+                    cpu_time_limit=kwargs.get("cpu_time_limit"),
+                    memory_limit=kwargs.get("memory_limit"),
                 )
                 runner = LocalSammyRunner(config)
 
@@ -182,6 +287,8 @@ class SammyFactory:
                     image_name=kwargs.get("image_name", "kedokudo/sammy-docker"),
                     container_working_dir=Path(kwargs.get("container_working_dir", "/sammy/work")),
                     container_data_dir=Path(kwargs.get("container_data_dir", "/sammy/data")),
+                    timeout=kwargs.get("timeout"),
+                    memory_limit=kwargs.get("memory_limit"),
                 )
                 runner = DockerSammyRunner(config)
 
@@ -346,15 +453,11 @@ class SammyFactory:
             ...     image_name="custom/sammy:latest"
             ... )
         """
-        # Check available backends
-        available = cls.list_available_backends()
-        logger.debug(f"Available backends: {[b.value for b, v in available.items() if v]}")
-
         # If preferred backend specified, try it first
         if preferred_backend:
             try:
                 preferred = BackendType(preferred_backend.lower())
-                if available[preferred]:
+                if cls.is_backend_available(preferred):
                     logger.info(f"Using preferred backend: {preferred.value}")
                     return cls.create_runner(
                         backend_type=preferred.value, working_dir=working_dir, output_dir=output_dir, **kwargs
@@ -373,7 +476,8 @@ class SammyFactory:
 
         errors = []
         for backend in backend_priority:
-            if available[backend]:
+            # Backends are probed lazily, in priority order
+            if cls.is_backend_available(backend):
                 try:
                     logger.info(f"Attempting to use {backend.value} backend")
                     return cls.create_runner(
@@ -8,13 +8,15 @@ all SAMMY backend implementations.
 
 import os
 import shutil
+import time
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum, auto
 from pathlib import Path
-from typing import Optional
+from typing import FrozenSet, Optional
 
+from pleiades.sammy.staging import StagingStrategy, move_file, stage_file
 from pleiades.utils.logger import loguru_logger
 
 logger = loguru_logger.bind(name=__name__)
@@ -37,6 +39,22 @@ class SammyBackendType(Enum):
     NOVA = auto()
 
 
+class SammyFailureType(Enum):
+    """Classification of failed SAMMY executions."""
+
+    SAMMY_FAILURE = "sammy_failure"  # SAMMY ran to completion without a normal finish
+    FATAL_ERROR = "fatal_error"  # SAMMY printed a fatal runtime error
+    TIMEOUT = "timeout"  # Wall-clock timeout reached, execution was killed
+    RESOURCE_LIMIT = "resource_limit"  # CPU or memory limit reached
+    BACKEND_TRANSIENT = "backend_transient"  # Temporary backend problem (Docker daemon, NOVA HTTP), retryable
+    BACKEND_ERROR = "backend_error"  # Permanent backend problem
+
+
+def _is_in(path: Path, directory: Path) -> bool:
+    """Check whether a file is directly inside a directory."""
+    return path.absolute().parent.resolve() == Path(directory).resolve()
+
+
 @dataclass
 class SammyFiles:
     """Container for SAMMY input files."""
@@ -50,6 +68,12 @@ class SammyFiles:
     _original_parameter_file: Optional[Path] = None
     _original_data_file: Optional[Path] = None
 
+    # How input and parameter files are placed into the working directory
+    staging: StagingStrategy = StagingStrategy.COPY
+
+    # Files found in the working directory by move_to_working_dir, used in place
+    _in_place: FrozenSet[Path] = frozenset()
+
     def validate(self) -> None:
         """
         Validate that all required input files exist.
@@ -57,9 +81,8 @@ class SammyFiles:
         Raises:
             FileNotFoundError: If any required file is missing
         """
-        for field_name, file_path in self.__dict__.items():
-            if field_name.startswith("_"):
-                continue
+        for field_name in ("input_file", "parameter_file", "data_file"):
+            file_path = getattr(self, field_name)
             if not file_path.exists():
                 raise FileNotFoundError(f"{field_name.replace('_', ' ').title()} not found: {file_path}")
             if not file_path.is_file():
@@ -68,10 +91,13 @@ class SammyFiles:
     def move_to_working_dir(self, working_dir: Path) -> None:
         """
         Move files to the working directory according to the desired strategy:
-        - input_file: copy to working directory
-        - parameter_file: copy to working directory
+        - input_file: copy to working directory (or hardlink/reflink, see staging)
+        - parameter_file: copy to working directory (or hardlink/reflink, see staging)
         - data_file: symlink to working directory
 
+        Files already in the working directory (e.g. inputs rendered there by the job layer)
+        are used in place: they are neither staged nor removed by cleanup_working_files.
+
         Updates the object's file path attributes to point to the files in the working directory.
         Can be safely called multiple times - will clean up previous working files first.
 
@@ -92,32 +118,34 @@ class SammyFiles:
         self._original_input_file = self.input_file
         self._original_parameter_file = self.parameter_file
         self._original_data_file = self.data_file
+        self._in_place = frozenset(
+            path for path in (self.input_file, self.parameter_file, self.data_file) if _is_in(path, working_dir)
+        )
 
-        # Copy input file
+        # Stage input file
         working_input = working_dir / self.input_file.name
-        if working_input.exists():
-            logger.debug(f"Removing existing file: {working_input}")
-            working_input.unlink()
-        logger.debug(f"Copying input file: {self._original_input_file} -> {working_input}")
-        shutil.copy2(self._original_input_file, working_input)
+        if self.input_file not in self._in_place:
+            working_input.unlink(missing_ok=True)
+            logger.debug(f"Staging input file ({self.staging.value}): {self._original_input_file} -> {working_input}")
+            stage_file(self._original_input_file, working_input, self.staging)
         self.input_file = working_input
 
-        # Copy parameter file
+        # Stage parameter file
         working_param = working_dir / self.parameter_file.name
-        if working_param.exists():
-            logger.debug(f"Removing existing file: {working_param}")
-            working_param.unlink()
-        logger.debug(f"Copying parameter file: {self._original_parameter_file} -> {working_param}")
-        shutil.copy2(self._original_parameter_file, working_param)
+        if self.parameter_file not in self._in_place:
+            working_param.unlink(missing_ok=True)
+            logger.debug(
+                f"Staging parameter file ({self.staging.value}): {self._original_parameter_file} -> {working_param}"
+            )
+            stage_file(self._original_parameter_file, working_param, self.staging)
         self.parameter_file = working_param
 
         # Symlink data file
         working_data = working_dir / self.data_file.name
-        if working_data.exists():
-            logger.debug(f"Removing existing file: {working_data}")
-            working_data.unlink()
-        logger.debug(f"Creating symlink for data file: {self._original_data_file} -> {working_data}")
-        working_data.symlink_to(self._original_data_file)
+        if self.data_file not in self._in_place:
+            working_data.unlink(missing_ok=True)
+            logger.debug(f"Creating symlink for data file: {self._original_data_file} -> {working_data}")
+            working_data.symlink_to(self._original_data_file)
         self.data_file = working_data
 
     def cleanup_working_files(self) -> None:
@@ -132,17 +160,25 @@ class SammyFiles:
             return
 
         # Remove symlinked data file
-        if self.data_file.exists() and self.data_file.is_symlink():
+        if self._original_data_file not in self._in_place and self.data_file.is_symlink():
             logger.debug(f"Removing symlink: {self.data_file}")
             self.data_file.unlink()
 
         # Remove copied input file
-        if self.input_file.exists() and not self.input_file.is_symlink():
+        if (
+            self._original_input_file not in self._in_place
+            and self.input_file.exists()
+            and not self.input_file.is_symlink()
+        ):
             logger.debug(f"Removing file: {self.input_file}")
             self.input_file.unlink()
 
         # Remove copied parameter file
-        if self.parameter_file.exists() and not self.parameter_file.is_symlink():
+        if (
+            self._original_parameter_file not in self._in_place
+            and self.parameter_file.exists()
+            and not self.parameter_file.is_symlink()
+        ):
             logger.debug(f"Removing file: {self.parameter_file}")
             self.parameter_file.unlink()
 
@@ -155,6 +191,7 @@ class SammyFiles:
         self._original_input_file = None
         self._original_parameter_file = None
         self._original_data_file = None
+        self._in_place = frozenset()
 
 
 @dataclass
@@ -292,6 +329,10 @@ class SammyExecutionResult:
     end_time: datetime
     console_output: str
     error_message: Optional[str] = None
+    console_log_file: Optional[Path] = None  # Full console output, when streamed to disk
+    failure_type: Optional[SammyFailureType] = None  # Set when success is False
+    attempts: int = 1  # Number of executions, including retries
+    peak_rss_mb: Optional[float] = None  # Peak resident memory of SAMMY, when the backend can measure it
 
     @property
     def runtime_seconds(self) -> float:
@@ -299,6 +340,33 @@ class SammyExecutionResult:
         return (self.end_time - self.start_time).total_seconds()
 
 
+@dataclass
+class RetryPolicy:
+    """Retry policy for transient SAMMY execution failures."""
+
+    max_attempts: int = 3  # Total number of executions, including the first one
+    backoff_seconds: float = 5.0  # Delay before the first retry
+    backoff_factor: float = 2.0  # Multiplier applied to the delay after each retry
+    max_backoff_seconds: float = 300.0
+    retry_on: FrozenSet[SammyFailureType] = field(
+        default_factory=lambda: frozenset({SammyFailureType.BACKEND_TRANSIENT})
+    )
+
+    def __post_init__(self):
+        if self.max_attempts < 1:
+            raise ConfigurationError(f"Invalid number of attempts: {self.max_attempts}")
+        if self.backoff_seconds < 0 or self.backoff_factor < 1:
+            raise ConfigurationError("Backoff delay must be non-negative and backoff factor at least 1")
+
+    def delay(self, attempt: int) -> float:
+        """Delay in seconds before retrying after the given (1-based) attempt."""
+        return min(self.backoff_seconds * self.backoff_factor ** (attempt - 1), self.max_backoff_seconds)
+
+    def should_retry(self, result: SammyExecutionResult) -> bool:
+        """Whether a finished execution should be retried."""
+        return not result.success and result.failure_type in self.retry_on
+
+
 @dataclass
 class BaseSammyConfig(ABC):
     """Base configuration for all SAMMY backends."""
@@ -409,6 +477,45 @@ class SammyRunner(ABC):
         """
         raise NotImplementedError
 
+    def execute_with_retry(self, files: SammyFiles, policy: Optional[RetryPolicy] = None) -> SammyExecutionResult:
+        """
+        Execute SAMMY, retrying transient failures according to a retry policy.
+
+        Failed results whose failure_type is listed in policy.retry_on, and
+        TransientBackendError exceptions, are retried with exponential backoff.
+        Any other failure is returned (or raised) immediately.
+
+        Args:
+            files: Container with validated and prepared files
+            policy: Retry policy, defaults to RetryPolicy()
+
+        Returns:
+            Result of the last execution, with the number of attempts recorded
+
+        Raises:
+            SammyExecutionError: If execution fails and retries are exhausted
+        """
+        policy = policy if policy is not None else RetryPolicy()
+
+        for attempt in range(1, policy.max_attempts + 1):
+            try:
+                result = self.execute_sammy(files)
+            except TransientBackendError as e:
+                if attempt == policy.max_attempts:
+                    raise
+                reason = str(e)
+            else:
+                result.attempts = attempt
+                if attempt == policy.max_attempts or not policy.should_retry(result):
+                    return result
+                reason = result.error_message
+
+            delay = policy.delay(attempt)
+            self.logger.warning(
+                f"Transient failure on attempt {attempt}/{policy.max_attempts} ({reason}), retrying in {delay:.1f}s"
+            )
+            time.sleep(delay)
+
     def collect_outputs(self, result: SammyExecutionResult) -> None:
         """
         Collect and validate output files after execution.
@@ -424,20 +531,17 @@ class SammyRunner(ABC):
 
         try:
             self._moved_files = []
-            found_outputs = set()
 
-            # First check for known output files
-            for known_file in SAMMY_OUTPUT_FILES:
-                output_file = self.config.working_dir / known_file
-                if output_file.is_file():
-                    found_outputs.add(output_file)
-                    logger.debug(f"Found known output file: {known_file}")
-
-            # Then look for any additional SAM* files
-            for output_file in self.config.working_dir.glob("SAM*"):
-                if output_file.is_file() and output_file not in found_outputs:
-                    found_outputs.add(output_file)
-                    logger.debug(f"Found additional output file: {output_file.name}")
+            # Single directory scan: every known output file starts with SAM as well
+            found_outputs = []
+            with os.scandir(self.config.working_dir) as entries:
+                for entry in entries:
+                    if entry.name.startswith("SAM") and entry.is_file():
+                        found_outputs.append(Path(entry.path))
+                        logger.debug(
+                            f"Found {'known' if entry.name in SAMMY_OUTPUT_FILES else 'additional'} "
+                            f"output file: {entry.name}"
+                        )
 
             if not found_outputs:
                 logger.warning("No SAMMY output files found")
@@ -445,14 +549,11 @@ class SammyRunner(ABC):
                     logger.error("SAMMY reported success but produced no output files")
                 return
 
-            # Move all found outputs
+            # Move all found outputs, replacing existing files with a single rename
             for output_file in found_outputs:
                 dest = self.config.output_dir / output_file.name
                 try:
-                    if dest.exists():
-                        logger.debug(f"Removing existing output file: {dest}")
-                        dest.unlink()
-                    output_file.rename(dest)
+                    move_file(output_file, dest)
                     self._moved_files.append(dest)
                     logger.debug(f"Moved {output_file} to {dest}")
                 except OSError as e:
@@ -473,7 +574,7 @@ class SammyRunner(ABC):
         for moved_file in self._moved_files:
             try:
                 original = self.config.working_dir / moved_file.name
-                moved_file.rename(original)
+                move_file(moved_file, original)
             except Exception as e:
                 logger.error(f"Failed to rollback move for {moved_file}: {str(e)}")
 
@@ -497,6 +598,12 @@ class SammyExecutionError(SammyError):
     pass
 
 
+class TransientBackendError(SammyExecutionError):
+    """Raised when SAMMY execution fails for a temporary, retryable backend reason."""
+
+    pass
+
+
 class OutputCollectionError(SammyError):
     """Raised when output collection fails."""
 
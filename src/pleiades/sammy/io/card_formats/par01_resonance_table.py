@@ -0,0 +1,201 @@
+#!/usr/bin/env python
+"""
+Columnar store of Card 1 resonances.
+
+ENDF-derived parameter files hold tens of thousands of resonances. Instead of one
+validated ResonanceEntry per line, ResonanceTable keeps them in a structured NumPy
+array (energy, widths, vary flags, spin group) parsed and formatted column by
+column from the fixed-width Card 1 layout. ResonanceEntry objects are built only
+when asked for, without re-validating values the parser already checked; rows
+missing a required value are validated, so that they raise as ResonanceEntry does.
+"""
+
+import math
+from typing import Iterable, List, Sequence
+
+import numpy as np
+
+from pleiades.nuclear.models import ResonanceEntry
+from pleiades.utils.helper import VaryFlag, format_float, parse_pseudo_scientific
+from pleiades.utils.logger import loguru_logger
+
+logger = loguru_logger.bind(name=__name__)
+
+# Fixed-width layout of a Card 1 line (columns, 0-based)
+FLOAT_COLUMNS = {
+    "resonance_energy": slice(0, 11),
+    "capture_width": slice(11, 22),
+    "channel1_width": slice(22, 33),
+    "channel2_width": slice(33, 44),
+    "channel3_width": slice(44, 55),
+}
+FLAG_COLUMNS = {
+    "vary_energy": slice(55, 57),
+    "vary_capture_width": slice(57, 59),
+    "vary_channel1": slice(59, 61),
+    "vary_channel2": slice(61, 63),
+    "vary_channel3": slice(63, 65),
+}
+IGROUP_COLUMNS = slice(65, 67)
+LINE_WIDTH = 67  # Columns beyond the spin group are not read
+FLOAT_WIDTH = 11
+
+RESONANCE_DTYPE = np.dtype(
+    [(name, np.float64) for name in FLOAT_COLUMNS] + [(name, np.int8) for name in FLAG_COLUMNS] + [("igroup", np.int32)]
+)
+VARY_FLAG_VALUES = np.array([flag.value for flag in VaryFlag])
+
+
+def _char_matrix(lines: Sequence[str]) -> np.ndarray:
+    """Lines as an (n, LINE_WIDTH) array of single bytes, padded with blanks."""
+    text = "".join(f"{line.rstrip(chr(10) + chr(13)):<{LINE_WIDTH}.{LINE_WIDTH}}" for line in lines)
+    return np.frombuffer(text.encode("ascii", errors="replace"), dtype="S1").reshape(len(lines), LINE_WIDTH)
+
+
+def _fields(matrix: np.ndarray, columns: slice) -> np.ndarray:
+    """Fixed-width fields of a column range, stripped, as a 1-D bytes array."""
+    width = columns.stop - columns.start
+    return np.char.strip(np.ascontiguousarray(matrix[:, columns]).view(f"S{width}").ravel())
+
+
+def _parse_ints(fields: np.ndarray, default: int = 0) -> np.ndarray:
+    """Parse a column of integer fields; blank fields take the default."""
+    return np.where(fields == b"", str(default).encode(), fields).astype(np.int64)
+
+
+def _format_floats(values: np.ndarray) -> np.ndarray:
+    """Format a column of floats as format_float does; NaN is blank."""
+    formatted = np.char.mod(f"%.{FLOAT_WIDTH - 6}E", values).astype(f"U{FLOAT_WIDTH + 2}")
+    # Values whose scientific notation does not fit (e.g. negative ones) fall back to fixed notation
+    for row in np.flatnonzero(np.char.str_len(formatted) > FLOAT_WIDTH):
+        formatted[row] = format_float(float(values[row]), FLOAT_WIDTH)
+    formatted[np.isnan(values)] = ""
+    return np.char.ljust(formatted, FLOAT_WIDTH)
+
+
+class ResonanceTable:
+    """
+    Card 1 resonances stored column by column.
+
+    Attributes:
+        data: Structured array with one record per resonance (see RESONANCE_DTYPE);
+            blank widths are NaN, vary flags hold VaryFlag values
+    """
+
+    def __init__(self, data: np.ndarray = None):
+        self.data = np.zeros(0, dtype=RESONANCE_DTYPE) if data is None else np.asarray(data, dtype=RESONANCE_DTYPE)
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __getitem__(self, index: int) -> ResonanceEntry:
+        return self._entry(self.data[index].tolist())
+
+    @classmethod
+    def from_lines(cls, lines: Sequence[str]) -> "ResonanceTable":
+        """
+        Parse resonance lines (without header) in one pass per column.
+
+        Args:
+            lines: Card 1 data lines
+
+        Returns:
+            ResonanceTable: Parsed resonances
+
+        Raises:
+            ValueError: If a field cannot be parsed, the resonance energy or capture
+                width is blank, or a vary flag is invalid
+        """
+        data = np.zeros(len(lines), dtype=RESONANCE_DTYPE)
+        if not lines:
+            return cls(data)
+
+        matrix = _char_matrix(lines)
+        for name, columns in FLOAT_COLUMNS.items():
+            data[name] = parse_pseudo_scientific(_fields(matrix, columns))
+        for name, label in (("resonance_energy", "resonance energy"), ("capture_width", "capture width")):
+            missing = np.flatnonzero(np.isnan(data[name]))
+            if len(missing):
+                raise ValueError(f"Missing {label} on line {missing[0] + 1}")
+        for name, columns in FLAG_COLUMNS.items():
+            flags = _parse_ints(_fields(matrix, columns))
+            invalid = ~np.isin(flags, VARY_FLAG_VALUES)
+            if invalid.any():
+                raise ValueError(f"Invalid {name} flag {flags[invalid][0]}")
+            data[name] = flags
+        data["igroup"] = _parse_ints(_fields(matrix, IGROUP_COLUMNS))
+        return cls(data)
+
+    @classmethod
+    def from_entries(cls, entries: Iterable[ResonanceEntry]) -> "ResonanceTable":
+        """Build a table from resonance entries."""
+        records = [
+            (
+                entry.resonance_energy,
+                *(
+                    np.nan if width is None else width
+                    for width in (entry.capture_width, entry.channel1_width, entry.channel2_width, entry.channel3_width)
+                ),
+                *(
+                    flag.value
+                    for flag in (
+                        entry.vary_energy,
+                        entry.vary_capture_width,
+                        entry.vary_channel1,
+                        entry.vary_channel2,
+                        entry.vary_channel3,
+                    )
+                ),
+                entry.igroup,
+            )
+            for entry in entries
+        ]
+        return cls(np.array(records, dtype=RESONANCE_DTYPE))
+
+    @staticmethod
+    def _entry(record: tuple) -> ResonanceEntry:
+        energy, capture, channel1, channel2, channel3, *flags, igroup = record
+        widths = [None if math.isnan(width) else width for width in (capture, channel1, channel2, channel3)]
+        values = dict(
+            resonance_energy=None if math.isnan(energy) else energy,
+            capture_width=widths[0],
+            channel1_width=widths[1],
+            channel2_width=widths[2],
+            channel3_width=widths[3],
+            vary_energy=VaryFlag(flags[0]),
+            vary_capture_width=VaryFlag(flags[1]),
+            vary_channel1=VaryFlag(flags[2]),
+            vary_channel2=VaryFlag(flags[3]),
+            vary_channel3=VaryFlag(flags[4]),
+            igroup=igroup,
+        )
+        if values["resonance_energy"] is None or values["capture_width"] is None:
+            # Not produced by from_lines or from_entries: raise the ValidationError of ResonanceEntry
+            return ResonanceEntry(**values)
+        # Values were checked by the parser, skip validation
+        return ResonanceEntry.model_construct(**values)
+
+    def entries(self) -> List[ResonanceEntry]:
+        """Resonance entries of all rows, built on demand."""
+        return [self._entry(record) for record in self.data.tolist()]
+
+    def select(self, mask: np.ndarray) -> "ResonanceTable":
+        """Rows selected by a boolean mask or index array."""
+        return ResonanceTable(self.data[mask])
+
+    def to_lines(self) -> List[str]:
+        """
+        Format the resonances as Card 1 lines (without header), column by column.
+
+        Returns:
+            List[str]: One line per resonance, as Card01.to_lines writes them
+        """
+        if not len(self.data):
+            return []
+        line = _format_floats(self.data["resonance_energy"])
+        for name in list(FLOAT_COLUMNS)[1:]:
+            line = np.char.add(line, _format_floats(self.data[name]))
+        for name in FLAG_COLUMNS:
+            line = np.char.add(line, np.char.mod("%2d ", self.data[name]))
+        line = np.char.add(line, np.char.mod("%2d", self.data["igroup"]))
+        return line.tolist()
@@ -1,34 +1,17 @@
 #!/usr/bin/env python
 from typing import List
 
+import numpy as np
 from pydantic import BaseModel
 
 from pleiades.nuclear.isotopes.models import IsotopeInfo, IsotopeMassData
-from pleiades.nuclear.models import IsotopeParameters, ResonanceEntry, SpinGroups  # Needed to store resonance data
+from pleiades.nuclear.models import IsotopeParameters, SpinGroups  # Needed to store resonance data
 from pleiades.sammy.fitting.config import FitConfig  # FitConfig object to contain list of resonance entries
-from pleiades.utils.helper import (  # VaryFlag and check_pseudo_scientific for parameter parsing
-    VaryFlag,
-    check_pseudo_scientific,
-    format_float,
-    format_vary,
-)
+from pleiades.sammy.io.card_formats.par01_resonance_table import ResonanceTable  # Columnar parsing and formatting
 from pleiades.utils.logger import loguru_logger  # Logger for debugging
 
 logger = loguru_logger.bind(name=__name__)
 
-# Column ranges for parsing resonance data from fixed-width format
-RESONANCE_ENERGY_RANGE = slice(0, 11)
-CAPTURE_WIDTH_RANGE = slice(11, 22)
-CHANNEL1_WIDTH_RANGE = slice(22, 33)
-CHANNEL2_WIDTH_RANGE = slice(33, 44)
-CHANNEL3_WIDTH_RANGE = slice(44, 55)
-VARY_ENERGY_RANGE = slice(55, 57)
-VARY_CAPTURE_WIDTH_RANGE = slice(57, 59)
-VARY_CHANNEL1_RANGE = slice(59, 61)
-VARY_CHANNEL2_RANGE = slice(61, 63)
-VARY_CHANNEL3_RANGE = slice(63, 65)
-IGROUP_RANGE = slice(65, 67)
-
 
 class Card01(BaseModel):
     """
@@ -51,6 +34,25 @@ class Card01(BaseModel):
 
         return line.strip().upper().startswith("RESONANCES")
 
+    @staticmethod
+    def data_lines(lines: List[str]) -> List[str]:
+        """Resonance lines of Card 1, up to the first blank line, without comments and lines holding no digits.
+
+        Args:
+            lines: Card 1 lines, without the header line
+
+        Returns:
+            List[str]: Lines holding one resonance each
+        """
+        data_lines = []
+        for line in lines:
+            if not line.strip():
+                break
+            if line.strip().startswith("#") or not any(c.isdigit() for c in line):
+                continue
+            data_lines.append(line)
+        return data_lines
+
     @classmethod
     def from_lines(cls, lines: List[str], fit_config: FitConfig = None) -> None:
         """Parse a complete isotope parameter card set from lines.
@@ -107,104 +109,63 @@ class Card01(BaseModel):
                 )
             )
 
-        for line in lines:
-            if not line.strip():
-                break
-            if line.strip().startswith("#") or not any(c.isdigit() for c in line):
-                continue
+        table = cls.parse_table(cls.data_lines(lines))
+
+        # If multiple isotopes are present, add the resonance entries to corresponding isotopes by
+        # matching spin group in the fit_config with the igroup in the resonance entry
+        if multiple_isotopes:
+            isotope_of_group = {}
+            for position, isotope in enumerate(fit_config.nuclear_params.isotopes):
+                # Check if the igroup is one of the spin group numbers in  the isotope's spin groups
+                if not hasattr(isotope, "spin_groups"):
+                    logger.warning(f"Isotope {isotope.isotope_information.name} has no spin groups defined.")
+                    continue
+
+                if not isinstance(isotope.spin_groups, list) or not all(
+                    isinstance(sg, SpinGroups) for sg in isotope.spin_groups
+                ):
+                    logger.warning(f"Isotope {isotope.isotope_information.name} has no valid spin groups defined.")
+                    continue
+                if not isotope.spin_groups:
+                    logger.warning(f"Isotope {isotope.isotope_information.name} has an empty spin group list.")
+                    continue
+
+                for sg in isotope.spin_groups:
+                    isotope_of_group.setdefault(sg.spin_group_number, position)
+
+            owners = np.array([isotope_of_group.get(igroup, -1) for igroup in table.data["igroup"].tolist()])
+            for position, isotope in enumerate(fit_config.nuclear_params.isotopes):
+                if (owners == position).any():
+                    isotope.resonances.extend(table.select(owners == position).entries())
+        else:
+            # If only one isotope, add the resonance entries to that isotope's resonance list
+            # This assumes that there is only one isotope in the fit_config
+            # and that it has a single spin group.
+            fit_config.nuclear_params.isotopes[0].resonances.extend(table.entries())
+
+    @classmethod
+    def parse_table(cls, lines: List[str]) -> ResonanceTable:
+        """Parse resonance data lines into a columnar table, skipping lines that cannot be parsed.
 
+        Args:
+            lines: Resonance data lines, without header
+
+        Returns:
+            ResonanceTable: Parsed resonances
+        """
+        try:
+            return ResonanceTable.from_lines(lines)
+        except ValueError:
+            pass
+
+        # Find the offending lines and parse the others
+        tables = []
+        for line in lines:
             try:
-                resonance_energy = check_pseudo_scientific(line[RESONANCE_ENERGY_RANGE].strip())
-                capture_width = (
-                    check_pseudo_scientific(line[CAPTURE_WIDTH_RANGE].strip())
-                    if line[CAPTURE_WIDTH_RANGE].strip()
-                    else None
-                )
-                channel1_width = (
-                    check_pseudo_scientific(line[CHANNEL1_WIDTH_RANGE].strip())
-                    if line[CHANNEL1_WIDTH_RANGE].strip()
-                    else None
-                )
-                channel2_width = (
-                    check_pseudo_scientific(line[CHANNEL2_WIDTH_RANGE].strip())
-                    if line[CHANNEL2_WIDTH_RANGE].strip()
-                    else None
-                )
-                channel3_width = (
-                    check_pseudo_scientific(line[CHANNEL3_WIDTH_RANGE].strip())
-                    if line[CHANNEL3_WIDTH_RANGE].strip()
-                    else None
-                )
-                vary_energy = (
-                    VaryFlag(int(line[VARY_ENERGY_RANGE].strip())) if line[VARY_ENERGY_RANGE].strip() else VaryFlag.NO
-                )
-                vary_capture_width = (
-                    VaryFlag(int(line[VARY_CAPTURE_WIDTH_RANGE].strip()))
-                    if line[VARY_CAPTURE_WIDTH_RANGE].strip()
-                    else VaryFlag.NO
-                )
-                vary_channel1 = (
-                    VaryFlag(int(line[VARY_CHANNEL1_RANGE].strip()))
-                    if line[VARY_CHANNEL1_RANGE].strip()
-                    else VaryFlag.NO
-                )
-                vary_channel2 = (
-                    VaryFlag(int(line[VARY_CHANNEL2_RANGE].strip()))
-                    if line[VARY_CHANNEL2_RANGE].strip()
-                    else VaryFlag.NO
-                )
-                vary_channel3 = (
-                    VaryFlag(int(line[VARY_CHANNEL3_RANGE].strip()))
-                    if line[VARY_CHANNEL3_RANGE].strip()
-                    else VaryFlag.NO
-                )
-                igroup = int(line[IGROUP_RANGE].strip()) if line[IGROUP_RANGE].strip() else 0
+                tables.append(ResonanceTable.from_lines([line]).data)
             except Exception as e:
                 logger.warning(f"Failed to parse resonance line: {line.strip()} ({e})")
-                continue
-
-            resonance = ResonanceEntry(
-                resonance_energy=resonance_energy,
-                capture_width=capture_width,
-                channel1_width=channel1_width,
-                channel2_width=channel2_width,
-                channel3_width=channel3_width,
-                vary_energy=vary_energy,
-                vary_capture_width=vary_capture_width,
-                vary_channel1=vary_channel1,
-                vary_channel2=vary_channel2,
-                vary_channel3=vary_channel3,
-                igroup=igroup,
-            )
-
-            # If multiple isotopes are present, add the resonance entry to corresponding isotopes by
-            # matching spin group in the fit_config with the igroup in the resonance entry
-            if multiple_isotopes:
-                # Check if igroup is in the spin groups of any isotope
-                for isotope in fit_config.nuclear_params.isotopes:
-                    # Check if the igroup is one of the spin group numbers in  the isotope's spin groups
-                    if not hasattr(isotope, "spin_groups"):
-                        logger.warning(f"Isotope {isotope.isotope_information.name} has no spin groups defined.")
-                        continue
-
-                    if not isinstance(isotope.spin_groups, list) or not all(
-                        isinstance(sg, SpinGroups) for sg in isotope.spin_groups
-                    ):
-                        logger.warning(f"Isotope {isotope.isotope_information.name} has no valid spin groups defined.")
-                        continue
-                    if not isotope.spin_groups:
-                        logger.warning(f"Isotope {isotope.isotope_information.name} has an empty spin group list.")
-                        continue
-
-                    if igroup in [sg.spin_group_number for sg in isotope.spin_groups]:
-                        # Add the resonance entry to the isotope's resonance list
-                        isotope.resonances.append(resonance)
-                        break
-            else:
-                # If only one isotope, add the resonance entry to that isotope's resonance list
-                # This assumes that there is only one isotope in the fit_config
-                # and that it has a single spin group.
-                fit_config.nuclear_params.isotopes[0].resonances.append(resonance)
+        return ResonanceTable(np.concatenate(tables) if tables else None)
 
     @classmethod
     def to_lines(cls, fit_config: FitConfig) -> List[str]:
@@ -230,21 +191,7 @@ class Card01(BaseModel):
                 logger.warning(f"No resonances found for isotope {isotope.isotope_information.name}, skipping.")
                 continue
 
-            for resonance in isotope.resonances:
-                line = (
-                    f"{format_float(resonance.resonance_energy, 11)}"
-                    f"{format_float(resonance.capture_width, 11)}"
-                    f"{format_float(resonance.channel1_width, 11)}"
-                    f"{format_float(resonance.channel2_width, 11)}"
-                    f"{format_float(resonance.channel3_width, 11)}"
-                    f"{format_vary(resonance.vary_energy):>2} "
-                    f"{format_vary(resonance.vary_capture_width):>2} "
-                    f"{format_vary(resonance.vary_channel1):>2} "
-                    f"{format_vary(resonance.vary_channel2):>2} "
-                    f"{format_vary(resonance.vary_channel3):>2} "
-                    f"{resonance.igroup:2d}"
-                )
-                lines.append(line)
+            lines.extend(ResonanceTable.from_entries(isotope.resonances).to_lines())
 
         lines.append("")  # Blank line to terminate the card
         return lines
@@ -15,43 +15,36 @@ from pleiades.utils.logger import loguru_logger
 
 logger = loguru_logger.bind(name="sammy_data_manager")
 
+# Twenty format: every row holds energy, transmission and uncertainty as "%20.10f"
+TWENTY_WIDTH = 20
+TWENTY_DECIMALS = 10
+TWENTY_COLUMNS = 3
+TWENTY_LINE_LENGTH = TWENTY_WIDTH * TWENTY_COLUMNS
 
-def convert_csv_to_sammy_twenty(csv_file: Union[str, Path], twenty_file: Union[str, Path]) -> None:
+# Magnitudes formatted with integer arithmetic: their integer digits fit in an int64
+# once scaled by 10**TWENTY_DECIMALS, and their field in TWENTY_WIDTH characters
+_INTEGER_DIGITS = 8
+_POWERS_OF_TEN = 10 ** np.arange(max(_INTEGER_DIGITS, TWENTY_DECIMALS), dtype=np.int64)
+
+
+def read_transmission_csv(csv_file: Union[str, Path]) -> np.ndarray:
     """
-    Convert transmission spectra from CSV to SAMMY twenty format.
+    Read transmission spectra from a CSV file.
 
-    This function supports tab-, comma-, and space-separated files, with either two columns
+    Tab-, comma- and space-separated files are supported, with either two columns
     (energy, transmission) or three columns (energy, transmission, uncertainty).
-    If only two columns are present, the uncertainty column will be filled with 0.0.
+    Comment and header lines are skipped. If only two columns are present, the
+    uncertainty column is filled with 0.0.
 
     Args:
         csv_file: Path to input CSV file with columns: energy_eV, transmission, [uncertainty]
-        twenty_file: Path to output SAMMY twenty format file
 
-    File Formats:
-        Input CSV (tab, comma, or space separated):
-            "energy_eV,transmission,uncertainty\n6.673,0.932,0.272\n"
-            or
-            "energy_eV\ttransmission\tuncertainty\n6.673\t0.932\t0.272\n"
-            or
-            "# Energy(eV)  Transmission  Uncertainty\n6.673240e+00 1.003460e+00 7.242967e-03\n"
-            or
-            "energy_eV,transmission\n6.673,0.932\n"
-        Output twenty:
-            "        6.6732397079        0.9323834777        0.2727669477\n"
+    Returns:
+        np.ndarray: Array of shape (n, 3) with energy, transmission and uncertainty
 
-    Example:
-        >>> convert_csv_to_sammy_twenty(
-        ...     "transmission.txt",
-        ...     "transmission.twenty"
-        ... )
-        >>> convert_csv_to_sammy_twenty(
-        ...     "ineuit.csv",
-        ...     "ineuit_transmission.twenty"
-        ... )
+    Raises:
+        ValueError: If the file holds no valid data
     """
-    logger.info(f"Converting {csv_file} to SAMMY twenty format: {twenty_file}")
-
     data = []
 
     with open(csv_file, "r") as f:
@@ -112,13 +105,228 @@ def convert_csv_to_sammy_twenty(csv_file: Union[str, Path], twenty_file: Union[s
     elif data.shape[1] != 3:
         raise ValueError(f"Expected 2 or 3 columns (energy, transmission, [uncertainty]), got {data.shape[1]}")
 
+    return data
+
+
+def _format_fields(values: np.ndarray) -> np.ndarray:
+    """
+    Format floats as "%20.10f" into a (n, 20) character matrix.
+
+    Digits are computed from the integer and fractional parts with integer
+    arithmetic. Values the arithmetic cannot format exactly like Python (not
+    finite, too large, or a fractional part too close to a rounding tie) are
+    formatted by Python.
+    """
+    magnitude = np.abs(values)
+    with np.errstate(invalid="ignore"):
+        integer = np.floor(magnitude)
+        scaled = (magnitude - integer) * 10.0**TWENTY_DECIMALS
+        slow = ~np.isfinite(values) | (magnitude >= 10.0**_INTEGER_DIGITS)
+        # The scaled fraction is off by ~1e-6 at most, ties may round either way
+        slow |= np.abs(scaled - np.floor(scaled) - 0.5) < 1e-5
+    integer = np.where(slow, 0, integer).astype(np.int64)
+    fraction = np.where(slow, 0, np.rint(scaled)).astype(np.int64)
+    carry = fraction == _POWERS_OF_TEN[TWENTY_DECIMALS - 1] * 10
+    integer += carry
+    fraction[carry] = 0
+
+    fields = np.full((len(values), TWENTY_WIDTH), ord(" "), dtype=np.uint8)
+    point = TWENTY_WIDTH - TWENTY_DECIMALS - 1
+    fields[:, point] = ord(".")
+    fractional_digits = fraction[:, None] // _POWERS_OF_TEN[TWENTY_DECIMALS - 1 :: -1] % 10
+    fields[:, point + 1 :] = ord("0") + fractional_digits
+    # At least one integer digit ("0.1"), the sign right before the first one
+    digits = 1 + np.count_nonzero(integer[:, None] >= _POWERS_OF_TEN[1:_INTEGER_DIGITS], axis=1)
+    for position in range(_INTEGER_DIGITS):
+        shown = digits > position
+        fields[shown, point - 1 - position] = ord("0") + integer[shown] // _POWERS_OF_TEN[position] % 10
+    negative = np.signbit(values)
+    fields[negative, point - 1 - digits[negative]] = ord("-")
+
+    for index in np.flatnonzero(slow):
+        text = f"{values[index]:{TWENTY_WIDTH}.{TWENTY_DECIMALS}f}".encode()
+        if len(text) != TWENTY_WIDTH:
+            raise ValueError(f"Value {values[index]} does not fit in {TWENTY_WIDTH} characters")
+        fields[index] = np.frombuffer(text, dtype=np.uint8)
+    return fields
+
+
+def _format_twenty_rows(data: np.ndarray) -> str:
+    """Render twenty format rows one at a time with Python formatting."""
+    return "".join(
+        f"{energy:20.10f}{transmission:20.10f}{uncertainty:20.10f}\n" for energy, transmission, uncertainty in data
+    )
+
+
+def encode_sammy_twenty(data: np.ndarray) -> bytes:
+    """
+    Render (energy, transmission, uncertainty) rows in SAMMY twenty format, as bytes.
+
+    The whole array is formatted at once into a fixed-width buffer (see
+    _format_fields), which is much faster than formatting row by row for the data
+    files of per-pixel campaigns.
+
+    Args:
+        data: Array of shape (n, 3)
+
+    Returns:
+        bytes: Twenty format content, one fixed-width line per row
+    """
+    data = np.asarray(data, dtype=np.float64)
+    if data.ndim != 2 or data.shape[1] != TWENTY_COLUMNS:
+        raise ValueError(f"Expected an array of shape (n, {TWENTY_COLUMNS}), got {data.shape}")
+    try:
+        fields = _format_fields(data.ravel())
+    except ValueError:
+        # Values wider than a field make wider lines, as Python formats them
+        return _format_twenty_rows(data).encode()
+    lines = np.empty((len(data), TWENTY_LINE_LENGTH + 1), dtype=np.uint8)
+    lines[:, :TWENTY_LINE_LENGTH] = fields.reshape(len(data), TWENTY_LINE_LENGTH)
+    lines[:, TWENTY_LINE_LENGTH] = ord("\n")
+    return lines.tobytes()
+
+
+def format_sammy_twenty(data: np.ndarray) -> str:
+    """
+    Render (energy, transmission, uncertainty) rows in SAMMY twenty format.
+
+    Args:
+        data: Array of shape (n, 3)
+
+    Returns:
+        str: Twenty format content, one fixed-width line per row
+    """
+    return encode_sammy_twenty(data).decode()
+
+
+def write_sammy_twenty(data: np.ndarray, twenty_file: Union[str, Path]) -> None:
+    """
+    Write (energy, transmission, uncertainty) rows to a SAMMY twenty format file.
+
+    Args:
+        data: Array of shape (n, 3)
+        twenty_file: Path to output SAMMY twenty format file
+    """
+    Path(twenty_file).write_bytes(encode_sammy_twenty(data))
+
+
+def parse_sammy_twenty(content: bytes) -> np.ndarray:
+    """
+    Parse SAMMY twenty format content.
+
+    Lines are checked and converted all at once when every line has exactly 60
+    characters; only an invalid file is looked at line by line, to report the
+    first invalid line.
+
+    Args:
+        content: Twenty format content
+
+    Returns:
+        np.ndarray: Array of shape (n, 3) with energy, transmission and uncertainty
+
+    Raises:
+        ValueError: If a line does not have 60 characters or three numbers
+    """
+    if b"\r" in content:
+        content = content.replace(b"\r\n", b"\n")
+    if content and not content.endswith(b"\n"):
+        content += b"\n"
+    buffer = np.frombuffer(content, dtype=np.uint8)
+    rows, rest = divmod(len(buffer), TWENTY_LINE_LENGTH + 1)
+    newlines = buffer[TWENTY_LINE_LENGTH :: TWENTY_LINE_LENGTH + 1]
+    if rest or np.count_nonzero(buffer == ord("\n")) != rows or not (newlines == ord("\n")).all():
+        for line_num, line in enumerate(content.split(b"\n")[:-1], 1):
+            if len(line) != TWENTY_LINE_LENGTH:
+                raise ValueError(f"Line {line_num}: Expected {TWENTY_LINE_LENGTH} characters, got {len(line)}")
+
+    fields = buffer.reshape(rows, TWENTY_LINE_LENGTH + 1)[:, :TWENTY_LINE_LENGTH].copy().view(f"S{TWENTY_WIDTH}")
+    try:
+        return fields.astype(np.float64)
+    except ValueError:
+        for line_num, row in enumerate(fields, 1):
+            try:
+                [float(field) for field in row]
+            except ValueError as e:
+                raise ValueError(f"Line {line_num}: Could not parse as floats: {e}")
+        raise
+
+
+def read_sammy_twenty(twenty_file: Union[str, Path]) -> np.ndarray:
+    """
+    Read a SAMMY twenty format file, see parse_sammy_twenty.
+
+    Args:
+        twenty_file: Path to the twenty format file
+
+    Returns:
+        np.ndarray: Array of shape (n, 3) with energy, transmission and uncertainty
+
+    Raises:
+        FileNotFoundError: If the file does not exist
+        ValueError: If the file is not valid twenty format
+    """
+    return parse_sammy_twenty(Path(twenty_file).read_bytes())
+
+
+def render_sammy_twenty(csv_file: Union[str, Path]) -> str:
+    """
+    Convert transmission spectra from CSV to SAMMY twenty format in memory.
+
+    The content can be handed to a SammyJob (data_content) so that it is written
+    once, directly into the working directory of the run.
+
+    Args:
+        csv_file: Path to input CSV file, see read_transmission_csv
+
+    Returns:
+        str: Twenty format content
+    """
+    return format_sammy_twenty(read_transmission_csv(csv_file))
+
+
+def convert_csv_to_sammy_twenty(csv_file: Union[str, Path], twenty_file: Union[str, Path]) -> None:
+    """
+    Convert transmission spectra from CSV to SAMMY twenty format.
+
+    This function supports tab-, comma-, and space-separated files, with either two columns
+    (energy, transmission) or three columns (energy, transmission, uncertainty).
+    If only two columns are present, the uncertainty column will be filled with 0.0.
+
+    Args:
+        csv_file: Path to input CSV file with columns: energy_eV, transmission, [uncertainty]
+        twenty_file: Path to output SAMMY twenty format file
+
+    File Formats:
+        Input CSV (tab, comma, or space separated):
+            "energy_eV,transmission,uncertainty\n6.673,0.932,0.272\n"
+            or
+            "energy_eV\ttransmission\tuncertainty\n6.673\t0.932\t0.272\n"
+            or
+            "# Energy(eV)  Transmission  Uncertainty\n6.673240e+00 1.003460e+00 7.242967e-03\n"
+            or
+            "energy_eV,transmission\n6.673,0.932\n"
+        Output twenty:
+            "        6.6732397079        0.9323834777        0.2727669477\n"
+
+    Example:
+        >>> convert_csv_to_sammy_twenty(
+        ...     "transmission.txt",
+        ...     "transmission.twenty"
+        ... )
+        >>> convert_csv_to_sammy_twenty(
+        ...     "ineuit.csv",
+        ...     "ineuit_transmission.twenty"
+        ... )
+    """
+    logger.info(f"Converting {csv_file} to SAMMY twenty format: {twenty_file}")
+
+    data = read_transmission_csv(csv_file)
+
     # Check if output directory exists, create if not
     Path(twenty_file).parent.mkdir(parents=True, exist_ok=True)
 
     # Write to SAMMY twenty format (fixed-width columns)
-    with open(twenty_file, "w") as f:
-        for energy, transmission, uncertainty in data:
-            f.write(f"{energy:20.10f}{transmission:20.10f}{uncertainty:20.10f}\n")
+    write_sammy_twenty(data, twenty_file)
 
     logger.info(f"Converted {len(data)} data points to twenty format")
 
@@ -141,28 +349,14 @@ def validate_sammy_twenty_format(twenty_file: Union[str, Path]) -> bool:
         >>> print(f"File is valid: {is_valid}")
     """
     try:
-        with open(twenty_file, "r") as f:
-            for line_num, line in enumerate(f, 1):
-                # Remove newline for length check
-                line_content = line.rstrip("\n\r")
-
-                # Check line length (60 chars = 3 × 20-char columns)
-                if len(line_content) != 60:
-                    logger.error(f"Line {line_num}: Expected 60 characters, got {len(line_content)}")
-                    return False
-
-                # Try to parse as three floats
-                try:
-                    energy = float(line_content[0:20])
-                    transmission = float(line_content[20:40])
-                    uncertainty = float(line_content[40:60])
-                except ValueError as e:
-                    logger.error(f"Line {line_num}: Could not parse as floats: {e}")
-                    return False
-
-        logger.info(f"File {twenty_file} is valid SAMMY twenty format")
-        return True
-
+        # Checked and parsed as a whole, see parse_sammy_twenty
+        read_sammy_twenty(twenty_file)
+    except ValueError as e:
+        logger.error(str(e))
+        return False
     except Exception as e:
         logger.error(f"Error validating {twenty_file}: {e}")
         return False
+
+    logger.info(f"File {twenty_file} is valid SAMMY twenty format")
+    return True
@@ -1,21 +1,88 @@
 import re
+from bisect import bisect_right
 from collections import defaultdict
+from itertools import accumulate
+from typing import Dict, List, Optional, Sequence
 
 from pleiades.nuclear.isotopes.models import IsotopeInfo, IsotopeMassData
-from pleiades.nuclear.models import IsotopeParameters, RadiusParameters
+from pleiades.nuclear.models import IsotopeParameters, RadiusParameters, SpinGroupChannels, SpinGroups
+from pleiades.sammy.io.lpt_stream import iter_lpt_blocks
 from pleiades.sammy.results.models import FitResults, RunResults
 from pleiades.utils.helper import VaryFlag
 from pleiades.utils.logger import loguru_logger
 
 logger = loguru_logger.bind(name=__name__)
 
+# Patterns compiled once for all blocks of all LPT files
+_VALUE_AND_VARIED = re.compile(r"([-\d.Ee+]+)(\s*\([^)]+\))?")
+_LPT_VALUE = re.compile(r"[-+]?\d*\.\d+E[+-]?\d+(?:\s*\([^)]+\))?")
+_LEADING_DIGITS = re.compile(r"^\d+")
+_ISOTOPE_LINE = re.compile(r"^\s*(\d+)\s+([-\d.Ee]+)(\s*\([^)]+\))?\s+([-\d.Ee]+)\s+(.+)$")
+_RADIUS_LINE = re.compile(r"^([-\d.Ee]+)\s+([-\d.Ee]+)\s+(\d+)\s+#\s+(.+)$")
+_RADIUS_CONTINUATION_LINE = re.compile(r"^(\d+)\s+#\s+(.+)$")
+_CHI_SQUARED = re.compile(r"CUSTOMARY CHI SQUARED\s*=\s*([-\d.Ee+]+)")
+_REDUCED_CHI_SQUARED = re.compile(r"CUSTOMARY CHI SQUARED DIVIDED BY NDAT\s*=\s*([-\d.Ee+]+)")
+_DATA_POINTS = re.compile(r"Number of experimental data points\s*=\s*(\d+)")
+
+# Sections of an LPT block, by a keyword found in their header line
+ISOTOPE_SECTION = "isotopes"
+RADIUS_SECTION = "radii"
+BROADENING_SECTION = "broadening"
+NORMALIZATION_SECTION = "normalization"
+CHI_SQUARED_SECTION = "chi_squared"
+_SECTION_KEYWORDS = re.compile(
+    r"Isotopic abundance and mass for each nuclide|EFFECTIVE RADIUS|TEMPERATURE|NORMALIZATION"
+    r"|CUSTOMARY CHI SQUARED|Number of experimental data points"
+)
+# Section of each keyword, with the other words its header line must contain
+_SECTION_HEADERS = {
+    "Isotopic abundance and mass for each nuclide": (ISOTOPE_SECTION, ()),
+    "EFFECTIVE RADIUS": (RADIUS_SECTION, ("TRUE", "SPIN GROUP")),
+    "TEMPERATURE": (BROADENING_SECTION, ("THICKNESS",)),
+    "NORMALIZATION": (NORMALIZATION_SECTION, ("BCKG",)),
+    "CUSTOMARY CHI SQUARED": (CHI_SQUARED_SECTION, ()),
+    "Number of experimental data points": (CHI_SQUARED_SECTION, ()),
+}
+
+
+def index_lpt_sections(lines: Sequence[str]) -> Dict[str, List[int]]:
+    """
+    Find the header lines of every section of an LPT block in a single pass.
+
+    Args:
+        lines: Lines of an LPT block
+
+    Returns:
+        Dict mapping each section name (ISOTOPE_SECTION, ...) to the indices of its
+        header lines; chi-squared lines are all listed under CHI_SQUARED_SECTION
+    """
+    sections = {
+        ISOTOPE_SECTION: [],
+        RADIUS_SECTION: [],
+        BROADENING_SECTION: [],
+        NORMALIZATION_SECTION: [],
+        CHI_SQUARED_SECTION: [],
+    }
+    # Search the keywords in the whole block at once rather than line by line
+    text = "\n".join(lines)
+    line_starts = list(accumulate((len(line) + 1 for line in lines), initial=0))
+    for match in _SECTION_KEYWORDS.finditer(text):
+        idx = bisect_right(line_starts, match.start()) - 1
+        line = lines[idx]
+        section, words = _SECTION_HEADERS[match.group(0)]
+        if section == ISOTOPE_SECTION and line[: match.start() - line_starts[idx]].strip():
+            continue  # The isotope header starts the line
+        if all(word in line for word in words) and idx not in sections[section][-1:]:
+            sections[section].append(idx)
+    return sections
+
 
 def parse_value_and_varied(s: str) -> tuple[float, bool]:
     """
     Parse a value that may have a parenthesis indicating it was varied.
     Returns (float_value, varied_flag)
     """
-    match = re.match(r"([-\d.Ee+]+)(\s*\([^)]+\))?", s)
+    match = _VALUE_AND_VARIED.match(s)
     if match:
         value = float(match.group(1))
         varied = match.group(2) is not None
@@ -28,7 +95,7 @@ def split_lpt_values(line: str) -> list[str]:
     Splits a line into values, where each value may be followed by a parenthesis group.
     Example: '2.9660E+02(  4)  1.1592E-01(  5)' -> ['2.9660E+02(  4)', '1.1592E-01(  5)']
     """
-    return re.findall(r"[-+]?\d*\.\d+E[+-]?\d+(?:\s*\([^)]+\))?", line)
+    return _LPT_VALUE.findall(line)
 
 
 class LptManager:
@@ -105,59 +172,60 @@ class LptManager:
         if file_path:
             self.process_lpt_file(file_path, self.run_results)
 
-    def extract_isotope_info(self, lines, nuclear_data):
-        """Extract isotope info and update nuclear_data.isotopes."""
+    def extract_isotope_info(self, lines, nuclear_data, headers: Optional[Sequence[int]] = None):
+        """Extract isotope info and update nuclear_data.isotopes.
+
+        Args:
+            lines (list): Lines of an LPT block.
+            nuclear_data (nuclearParameters): Object receiving the isotopes.
+            headers (list, optional): Indices of the section header lines, see index_lpt_sections.
+        """
 
         logger.debug("Extracting isotope information...")
-        for idx, line in enumerate(lines):
-            if line.strip().startswith("Isotopic abundance and mass for each nuclide"):
-                i = idx + 2  # skip header
-                while i < len(lines):
-                    line_content = lines[i].strip()
-                    if not line_content or not re.match(r"^\d+", line_content):
-                        break  # End of isotope block
-                    # Match with optional parentheses for varied abundance
-                    match = re.match(r"^\s*(\d+)\s+([-\d.Ee]+)(\s*\([^)]+\))?\s+([-\d.Ee]+)\s+(.+)$", line_content)
-
-                    if match:
-                        abundance_str = match.group(2)
-                        abundance = float(abundance_str)
-                        abundance_paren = match.group(3)
-                        mass = float(match.group(4))
-                        spin_group_numbers = [int(s) for s in match.group(5).split()]
-
-                        # Set vary_abundance flag
-                        vary_abundance = VaryFlag.YES if abundance_paren else VaryFlag.NO
-
-                        # Create SpinGroups objects from integers
-                        from pleiades.nuclear.models import SpinGroups
-
-                        spin_groups = [
-                            SpinGroups(spin_group_number=sg_num, excluded=False) for sg_num in spin_group_numbers
-                        ]
-
-                        # Minial IsotopeMassData
-                        mass_data_info = IsotopeMassData(atomic_mass=mass)
-
-                        # Minimal IsotopeInfo
-                        isotope_info = IsotopeInfo(atomic_number=int(round(mass)), mass_data=mass_data_info)
-
-                        isotope = IsotopeParameters(
-                            isotope_infomation=isotope_info,
-                            abundance=abundance,
-                            spin_groups=spin_groups,
-                            vary_abundance=vary_abundance,
-                        )
-
-                        nuclear_data.isotopes.append(isotope)
-                    i += 1
+        if headers is None:
+            headers = index_lpt_sections(lines)[ISOTOPE_SECTION]
+        # Only the first isotope block is read
+        i = headers[0] + 2 if headers else len(lines)  # skip header
+        while i < len(lines):
+            line_content = lines[i].strip()
+            if not line_content or not _LEADING_DIGITS.match(line_content):
+                break  # End of isotope block
+            # Match with optional parentheses for varied abundance
+            match = _ISOTOPE_LINE.match(line_content)
+
+            if match:
+                abundance_str = match.group(2)
+                abundance = float(abundance_str)
+                abundance_paren = match.group(3)
+                mass = float(match.group(4))
+                spin_group_numbers = [int(s) for s in match.group(5).split()]
+
+                # Set vary_abundance flag
+                vary_abundance = VaryFlag.YES if abundance_paren else VaryFlag.NO
+
+                # Create SpinGroups objects from integers
+                spin_groups = [SpinGroups(spin_group_number=sg_num, excluded=False) for sg_num in spin_group_numbers]
+
+                # Minial IsotopeMassData
+                mass_data_info = IsotopeMassData(atomic_mass=mass)
+
+                # Minimal IsotopeInfo
+                isotope_info = IsotopeInfo(atomic_number=int(round(mass)), mass_data=mass_data_info)
+
+                isotope = IsotopeParameters(
+                    isotope_infomation=isotope_info,
+                    abundance=abundance,
+                    spin_groups=spin_groups,
+                    vary_abundance=vary_abundance,
+                )
 
-                break
+                nuclear_data.isotopes.append(isotope)
+            i += 1
 
         # if isotope info was found then return true
         return bool(nuclear_data.isotopes)
 
-    def extract_radius_info(self, lines, nuclear_data):
+    def extract_radius_info(self, lines, nuclear_data, headers: Optional[Sequence[int]] = None):
         """
         Extracts effective and true radii along with spin group numbers from the LPT file lines.
         The extracted data is grouped by isotopes and stored in the radius_parameters attribute
@@ -169,6 +237,7 @@ class LptManager:
         Args:
             lines (list): List of strings representing the lines of the LPT file.
             nuclear_data (nuclearParameters): Object containing nuclear data, including isotopes.
+            headers (list, optional): Indices of the section header lines, see index_lpt_sections.
 
         Updates:
             nuclear_data.isotopes: Each isotope's radius_parameters attribute is populated with
@@ -184,42 +253,40 @@ class LptManager:
         logger.debug("Extracting radius information...")
         radii = []
         last_radii = (None, None)
-        for idx, line in enumerate(lines):
-            if "EFFECTIVE RADIUS" in line and "TRUE" in line and "SPIN GROUP" in line:
-                in_block = True
-                i = idx + 2  # skip header and blank/label line
-                while i < len(lines):
-                    line_content = lines[i].strip()
-                    if not line_content or "#" not in line_content:
-                        break
-                    # Try to match full line with radii and spin group
-                    match = re.match(r"^([-\d.Ee]+)\s+([-\d.Ee]+)\s+(\d+)\s+#\s+(.+)$", line_content)
-                    if match:
-                        eff_radius = float(match.group(1))
-                        true_radius = float(match.group(2))
-                        spin_group = int(match.group(3))
-                        channels = [int(x) for x in match.group(4).split()]
-                        last_radii = (eff_radius, true_radius)
-                    else:
-                        # Try to match continuation line (just spin group and channels)
-                        match2 = re.match(r"^(\d+)\s+#\s+(.+)$", line_content)
-                        if match2 and all(last_radii):
-                            spin_group = int(match2.group(1))
-                            channels = [int(x) for x in match2.group(2).split()]
-                            eff_radius, true_radius = last_radii
-                        else:
-                            break  # End of block
-                    radii.append(
-                        {
-                            "effective_radius": eff_radius,
-                            "true_radius": true_radius,
-                            "spin_group": spin_group,
-                            "channels": channels,
-                        }
-                    )
-                    i += 1
-
+        if headers is None:
+            headers = index_lpt_sections(lines)[RADIUS_SECTION]
+        # Only the first radius block is read
+        i = headers[0] + 2 if headers else len(lines)  # skip header and blank/label line
+        while i < len(lines):
+            line_content = lines[i].strip()
+            if not line_content or "#" not in line_content:
                 break
+            # Try to match full line with radii and spin group
+            match = _RADIUS_LINE.match(line_content)
+            if match:
+                eff_radius = float(match.group(1))
+                true_radius = float(match.group(2))
+                spin_group = int(match.group(3))
+                channels = [int(x) for x in match.group(4).split()]
+                last_radii = (eff_radius, true_radius)
+            else:
+                # Try to match continuation line (just spin group and channels)
+                match2 = _RADIUS_CONTINUATION_LINE.match(line_content)
+                if match2 and all(last_radii):
+                    spin_group = int(match2.group(1))
+                    channels = [int(x) for x in match2.group(2).split()]
+                    eff_radius, true_radius = last_radii
+                else:
+                    break  # End of block
+            radii.append(
+                {
+                    "effective_radius": eff_radius,
+                    "true_radius": true_radius,
+                    "spin_group": spin_group,
+                    "channels": channels,
+                }
+            )
+            i += 1
 
         # For each isotope, group spin groups by (effective_radius, true_radius)
         for isotope in nuclear_data.isotopes:
@@ -235,8 +302,6 @@ class LptManager:
             isotope.radius_parameters = []
             for (eff_radius, true_radius), spin_groups in grouped.items():
                 # Convert integer spin groups to SpinGroupChannels objects
-                from pleiades.nuclear.models import SpinGroupChannels
-
                 spin_group_channels = [SpinGroupChannels(group_number=sg_num, channels=[]) for sg_num in spin_groups]
 
                 temp_radius_parameters = RadiusParameters(
@@ -247,7 +312,7 @@ class LptManager:
         # if radius info was found then return true
         return bool(radii)
 
-    def extract_broadening_info(self, lines, physics_data):
+    def extract_broadening_info(self, lines, physics_data, headers: Optional[Sequence[int]] = None):
         """
         Extracts the broadening parameters from an LPT file and stores them in
         physics_data.broadening_parameters. Also sets .*_varied attributes if present.
@@ -255,67 +320,66 @@ class LptManager:
         """
         logger.debug("Extracting broadening information...")
         paramters_found = False
-        for idx, line in enumerate(lines):
-            # Look for header line
-            if ("TEMPERATURE" in line and "THICKNESS" in line) or (
-                "RADIUS" in line and "TEMPERATURE" in line and "THICKNESS" in line
-            ):
-                header = line.strip().split()
-                next_line = lines[idx + 1].strip()
-                parts = split_lpt_values(next_line)
-                # Case with RADIUS
-                if "RADIUS" in header and len(parts) >= 3:
-                    paramters_found = True
-                    radius, radius_varied = parse_value_and_varied(parts[0])
-                    temp, temp_varied = parse_value_and_varied(parts[1])
-                    thick, thick_varied = parse_value_and_varied(parts[2])
-                    physics_data.broadening_parameters.crfn = radius
-                    physics_data.broadening_parameters.temp = temp
-                    physics_data.broadening_parameters.thick = thick
-                    if hasattr(physics_data.broadening_parameters, "radius_varied"):
-                        physics_data.broadening_parameters.flag_crfn = radius_varied
-                    if hasattr(physics_data.broadening_parameters, "temp_varied"):
-                        physics_data.broadening_parameters.flag_temp = temp_varied
-                    if hasattr(physics_data.broadening_parameters, "thick_varied"):
-                        physics_data.broadening_parameters.flag_thick = thick_varied
-                # Case without RADIUS
-                elif "TEMPERATURE" in header and "THICKNESS" in header and len(parts) >= 2:
-                    paramters_found = True
-                    temp, temp_varied = parse_value_and_varied(parts[0])
-                    thick, thick_varied = parse_value_and_varied(parts[1])
-                    physics_data.broadening_parameters.temp = temp
-                    physics_data.broadening_parameters.thick = thick
-                    if hasattr(physics_data.broadening_parameters, "temp_varied"):
-                        physics_data.broadening_parameters.temp_varied = temp_varied
-                    if hasattr(physics_data.broadening_parameters, "thick_varied"):
-                        physics_data.broadening_parameters.thick_varied = thick_varied
-                else:
-                    continue
-
-                # Find DELTA-L line
-                for j in range(idx + 2, min(idx + 6, len(lines))):
-                    if "DELTA-L" in lines[j]:
-                        delta_line = lines[j + 1].strip()
-                        delta_parts = split_lpt_values(delta_line)
-                        if len(delta_parts) >= 3:
-                            deltal, deltal_varied = parse_value_and_varied(delta_parts[0])
-                            deltag, deltag_varied = parse_value_and_varied(delta_parts[1])
-                            deltae, deltae_varied = parse_value_and_varied(delta_parts[2])
-                            physics_data.broadening_parameters.deltal = deltal
-                            physics_data.broadening_parameters.deltag = deltag
-                            physics_data.broadening_parameters.deltae = deltae
-                            if hasattr(physics_data.broadening_parameters, "deltal_varied"):
-                                physics_data.broadening_parameters.deltal_varied = deltal_varied
-                            if hasattr(physics_data.broadening_parameters, "deltag_varied"):
-                                physics_data.broadening_parameters.deltag_varied = deltag_varied
-                            if hasattr(physics_data.broadening_parameters, "deltae_varied"):
-                                physics_data.broadening_parameters.deltae_varied = deltae_varied
-                        break
-                break  # Only read the first block
+        if headers is None:
+            headers = index_lpt_sections(lines)[BROADENING_SECTION]
+        for idx in headers:
+            line = lines[idx]
+            header = line.strip().split()
+            next_line = lines[idx + 1].strip()
+            parts = split_lpt_values(next_line)
+            # Case with RADIUS
+            if "RADIUS" in header and len(parts) >= 3:
+                paramters_found = True
+                radius, radius_varied = parse_value_and_varied(parts[0])
+                temp, temp_varied = parse_value_and_varied(parts[1])
+                thick, thick_varied = parse_value_and_varied(parts[2])
+                physics_data.broadening_parameters.crfn = radius
+                physics_data.broadening_parameters.temp = temp
+                physics_data.broadening_parameters.thick = thick
+                if hasattr(physics_data.broadening_parameters, "radius_varied"):
+                    physics_data.broadening_parameters.flag_crfn = radius_varied
+                if hasattr(physics_data.broadening_parameters, "temp_varied"):
+                    physics_data.broadening_parameters.flag_temp = temp_varied
+                if hasattr(physics_data.broadening_parameters, "thick_varied"):
+                    physics_data.broadening_parameters.flag_thick = thick_varied
+            # Case without RADIUS
+            elif "TEMPERATURE" in header and "THICKNESS" in header and len(parts) >= 2:
+                paramters_found = True
+                temp, temp_varied = parse_value_and_varied(parts[0])
+                thick, thick_varied = parse_value_and_varied(parts[1])
+                physics_data.broadening_parameters.temp = temp
+                physics_data.broadening_parameters.thick = thick
+                if hasattr(physics_data.broadening_parameters, "temp_varied"):
+                    physics_data.broadening_parameters.temp_varied = temp_varied
+                if hasattr(physics_data.broadening_parameters, "thick_varied"):
+                    physics_data.broadening_parameters.thick_varied = thick_varied
+            else:
+                continue
+
+            # Find DELTA-L line
+            for j in range(idx + 2, min(idx + 6, len(lines))):
+                if "DELTA-L" in lines[j]:
+                    delta_line = lines[j + 1].strip()
+                    delta_parts = split_lpt_values(delta_line)
+                    if len(delta_parts) >= 3:
+                        deltal, deltal_varied = parse_value_and_varied(delta_parts[0])
+                        deltag, deltag_varied = parse_value_and_varied(delta_parts[1])
+                        deltae, deltae_varied = parse_value_and_varied(delta_parts[2])
+                        physics_data.broadening_parameters.deltal = deltal
+                        physics_data.broadening_parameters.deltag = deltag
+                        physics_data.broadening_parameters.deltae = deltae
+                        if hasattr(physics_data.broadening_parameters, "deltal_varied"):
+                            physics_data.broadening_parameters.deltal_varied = deltal_varied
+                        if hasattr(physics_data.broadening_parameters, "deltag_varied"):
+                            physics_data.broadening_parameters.deltag_varied = deltag_varied
+                        if hasattr(physics_data.broadening_parameters, "deltae_varied"):
+                            physics_data.broadening_parameters.deltae_varied = deltae_varied
+                    break
+            break  # Only read the first block
 
         return bool(paramters_found)
 
-    def extract_normalization_info(self, lines, physics_data):
+    def extract_normalization_info(self, lines, physics_data, headers: Optional[Sequence[int]] = None):
         """
         Extracts normalization parameters from an LPT file and stores them in
         physics_data.normalization_parameters (NormalizationParameters).
@@ -324,47 +388,47 @@ class LptManager:
 
         parameters_found = False
 
-        for idx, line in enumerate(lines):
-            # Look for the normalization header
-            if "NORMALIZATION" in line and "BCKG" in line:
-                next_line = lines[idx + 1].strip()
-                parts = split_lpt_values(next_line)
-                # There should be 4 values on this line
-                if len(parts) >= 4:
-                    parameters_found = True
-                    anorm, flag_anorm = parse_value_and_varied(parts[0])
-                    backa, flag_backa = parse_value_and_varied(parts[1])
-                    backb, flag_backb = parse_value_and_varied(parts[2])
-                    backc, flag_backc = parse_value_and_varied(parts[3])
-                    # Assign to the model
-                    norm_params = physics_data.normalization_parameters
-                    norm_params.anorm = anorm
-                    norm_params.flag_anorm = VaryFlag.YES if flag_anorm else VaryFlag.NO
-                    norm_params.backa = backa
-                    norm_params.flag_backa = VaryFlag.YES if flag_backa else VaryFlag.NO
-                    norm_params.backb = backb
-                    norm_params.flag_backb = VaryFlag.YES if flag_backb else VaryFlag.NO
-                    norm_params.backc = backc
-                    norm_params.flag_backc = VaryFlag.YES if flag_backc else VaryFlag.NO
-
-                # Look for the next background line (for backd, backf)
-                for j in range(idx + 2, min(idx + 6, len(lines))):
-                    if "BCKG*EXP" in lines[j]:
-                        bkg_line = lines[j + 1].strip()
-                        bkg_parts = split_lpt_values(bkg_line)
-                        if len(bkg_parts) >= 2:
-                            backd, flag_backd = parse_value_and_varied(bkg_parts[0])
-                            backf, flag_backf = parse_value_and_varied(bkg_parts[1])
-                            norm_params.backd = backd
-                            norm_params.flag_backd = VaryFlag.YES if flag_backd else VaryFlag.NO
-                            norm_params.backf = backf
-                            norm_params.flag_backf = VaryFlag.YES if flag_backf else VaryFlag.NO
-                        break
-                break  # Only read the first normalization block
+        if headers is None:
+            headers = index_lpt_sections(lines)[NORMALIZATION_SECTION]
+        for idx in headers:
+            next_line = lines[idx + 1].strip()
+            parts = split_lpt_values(next_line)
+            # There should be 4 values on this line
+            if len(parts) >= 4:
+                parameters_found = True
+                anorm, flag_anorm = parse_value_and_varied(parts[0])
+                backa, flag_backa = parse_value_and_varied(parts[1])
+                backb, flag_backb = parse_value_and_varied(parts[2])
+                backc, flag_backc = parse_value_and_varied(parts[3])
+                # Assign to the model
+                norm_params = physics_data.normalization_parameters
+                norm_params.anorm = anorm
+                norm_params.flag_anorm = VaryFlag.YES if flag_anorm else VaryFlag.NO
+                norm_params.backa = backa
+                norm_params.flag_backa = VaryFlag.YES if flag_backa else VaryFlag.NO
+                norm_params.backb = backb
+                norm_params.flag_backb = VaryFlag.YES if flag_backb else VaryFlag.NO
+                norm_params.backc = backc
+                norm_params.flag_backc = VaryFlag.YES if flag_backc else VaryFlag.NO
+
+            # Look for the next background line (for backd, backf)
+            for j in range(idx + 2, min(idx + 6, len(lines))):
+                if "BCKG*EXP" in lines[j]:
+                    bkg_line = lines[j + 1].strip()
+                    bkg_parts = split_lpt_values(bkg_line)
+                    if len(bkg_parts) >= 2:
+                        backd, flag_backd = parse_value_and_varied(bkg_parts[0])
+                        backf, flag_backf = parse_value_and_varied(bkg_parts[1])
+                        norm_params.backd = backd
+                        norm_params.flag_backd = VaryFlag.YES if flag_backd else VaryFlag.NO
+                        norm_params.backf = backf
+                        norm_params.flag_backf = VaryFlag.YES if flag_backf else VaryFlag.NO
+                    break
+            break  # Only read the first normalization block
 
         return parameters_found
 
-    def extract_chi_squared_info(self, lines, chi_squared_results):
+    def extract_chi_squared_info(self, lines, chi_squared_results, headers: Optional[Sequence[int]] = None):
         """
         Extracts chi-squared, reduced chi-squared, and dof from LPT file lines
         and fills the ChiSquaredResults object.
@@ -377,17 +441,20 @@ class LptManager:
         reduced_chi2 = None
         dof = None
 
-        for idx, line in enumerate(lines):
+        if headers is None:
+            headers = index_lpt_sections(lines)[CHI_SQUARED_SECTION]
+        for idx in headers:
+            line = lines[idx]
             # Chi-squared value
-            match_chi2 = re.search(r"CUSTOMARY CHI SQUARED\s*=\s*([-\d.Ee+]+)", line)
+            match_chi2 = _CHI_SQUARED.search(line)
             if match_chi2:
                 chi2 = float(match_chi2.group(1))
             # Reduced chi-squared value
-            match_red = re.search(r"CUSTOMARY CHI SQUARED DIVIDED BY NDAT\s*=\s*([-\d.Ee+]+)", line)
+            match_red = _REDUCED_CHI_SQUARED.search(line)
             if match_red:
                 reduced_chi2 = float(match_red.group(1))
             # Number of data points (dof)
-            match_dof = re.search(r"Number of experimental data points\s*=\s*(\d+)", line)
+            match_dof = _DATA_POINTS.search(line)
             if match_dof:
                 dof = int(match_dof.group(1))
 
@@ -403,23 +470,31 @@ class LptManager:
     def extract_results_from_string(self, lpt_block_string: str) -> FitResults:
         fit_results = FitResults()
         lines = lpt_block_string.splitlines()
+        # Find the headers of all sections in one pass, each extractor starts at its own
+        sections = index_lpt_sections(lines)
 
         # Call each extraction function in the order you want
-        isotpe_results_found = self.extract_isotope_info(lines, fit_results.nuclear_data)
+        isotpe_results_found = self.extract_isotope_info(lines, fit_results.nuclear_data, sections[ISOTOPE_SECTION])
         if not isotpe_results_found:
             logger.info("Isotope results not found.")
-        radius_results_found = self.extract_radius_info(lines, fit_results.nuclear_data)
+        radius_results_found = self.extract_radius_info(lines, fit_results.nuclear_data, sections[RADIUS_SECTION])
         if not radius_results_found:
             logger.info("Radius results not found.")
-        broadening_results_found = self.extract_broadening_info(lines, fit_results.physics_data)
+        broadening_results_found = self.extract_broadening_info(
+            lines, fit_results.physics_data, sections[BROADENING_SECTION]
+        )
         if not broadening_results_found:
             logger.info("Broadening results not found.")
 
-        normalization_results_found = self.extract_normalization_info(lines, fit_results.physics_data)
+        normalization_results_found = self.extract_normalization_info(
+            lines, fit_results.physics_data, sections[NORMALIZATION_SECTION]
+        )
         if not normalization_results_found:
             logger.info("Normalization results not found.")
 
-        chi_squared_results_found = self.extract_chi_squared_info(lines, fit_results.chi_squared_results)
+        chi_squared_results_found = self.extract_chi_squared_info(
+            lines, fit_results.chi_squared_results, sections[CHI_SQUARED_SECTION]
+        )
         if not chi_squared_results_found:
             logger.info("Chi-squared results not found.")
 
@@ -468,11 +543,7 @@ class LptManager:
             raise ValueError("A RunResults object must be provided to process_lpt_file.")
 
         try:
-            with open(file_path, "r") as file:
-                lpt_content = file.read()
-                # Log that the file was read successfully
-                logger.info(f"Successfully read the file: {file_path}")
-
+            file = open(file_path, "r")
         except FileNotFoundError:
             logger.error(f"File not found: {file_path}")
             return False
@@ -480,13 +551,15 @@ class LptManager:
             logger.error(f"An error occurred: {e}")
             return False
 
-        # Split the content into blocks based on the delimiter
-        blocks = self.split_lpt_blocks(lpt_content)
-        logger.debug(f"Split LPT content into {len(blocks)} blocks.")
-
-        for block_type, block_text in blocks:
-            # Extract results from the block
-            fit_results = self.extract_results_from_string(block_text)
-
-            # Append the fit results to the RunResults object
-            run_results.add_fit_result(fit_results)
+        # Read the file block by block instead of loading it whole, see lpt_stream
+        block_count = 0
+        with file:
+            logger.info(f"Successfully opened the file: {file_path}")
+            for block_type, block_text in iter_lpt_blocks(file):
+                # Extract results from the block
+                fit_results = self.extract_results_from_string(block_text)
+
+                # Append the fit results to the RunResults object
+                run_results.add_fit_result(fit_results)
+                block_count += 1
+        logger.debug(f"Split LPT content into {block_count} blocks.")
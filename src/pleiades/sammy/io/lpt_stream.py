@@ -0,0 +1,249 @@
+#!/usr/bin/env python
+"""
+Streaming reader of SAMMY LPT files.
+
+LptManager.process_lpt_file used to read a whole LPT file into memory before
+splitting it into fit blocks, and long fits write very large LPT files. The
+readers here consume the file line by line instead and yield the FitResults of
+every block (initial values, intermediate and new values of an iteration) as
+soon as the next block starts:
+
+- iter_lpt_results: blocks of a finished LPT file
+- follow_lpt_results: blocks of the LPT file of a running fit, as SAMMY writes them
+- read_final_lpt_block: only the last block, found by reading the file backwards
+"""
+
+import os
+import time
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, List, Optional, TextIO, Tuple, Union
+
+from pleiades.sammy.results.models import FitResults
+from pleiades.utils.logger import loguru_logger
+
+logger = loguru_logger.bind(name=__name__)
+
+# Markers starting a block of parameter values, see LptManager.lpt_delimiters
+BLOCK_MARKERS = (
+    "***** INITIAL VALUES FOR PARAMETERS",
+    "***** INTERMEDIATE VALUES FOR RESONANCE PARAMETERS",
+    "***** NEW VALUES FOR RESONANCE PARAMETERS",
+)
+MARKER_PREFIX = "***** "  # Common to all markers
+
+LptBlock = Tuple[str, str]  # (block type, block text), as LptManager.split_lpt_blocks returns them
+
+
+def _find_marker(line: str, start: int = 0) -> Tuple[int, Optional[str]]:
+    """Position and text of the first block marker in a line from start, or (-1, None)."""
+    found = (-1, None)
+    if line.find(MARKER_PREFIX, start) < 0:
+        # Most lines hold no marker
+        return found
+    for marker in BLOCK_MARKERS:
+        position = line.find(marker, start)
+        if position >= 0 and (found[0] < 0 or position < found[0]):
+            found = (position, marker)
+    return found
+
+
+class LptBlockSplitter:
+    """
+    Incremental splitter of LPT content into fit blocks.
+
+    Lines are fed one at a time; a block is complete when the next one starts or
+    when the input ends (flush). Lines before the first block marker are dropped.
+    Blocks are identical to those of LptManager.split_lpt_blocks.
+    """
+
+    def __init__(self):
+        self._block_type: Optional[str] = None
+        self._lines: List[str] = []
+
+    def feed(self, line: str) -> List[LptBlock]:
+        """
+        Consume one line, including its line terminator.
+
+        Args:
+            line: Line of the LPT file
+
+        Returns:
+            List[LptBlock]: Blocks completed by this line (usually none)
+        """
+        completed = []
+        offset = 0
+        position, marker = _find_marker(line)
+        while marker is not None:
+            if self._block_type is not None:
+                self._lines.append(line[offset:position])
+                completed.append(self._complete())
+            self._block_type, offset = marker, position
+            position, marker = _find_marker(line, position + len(marker))
+        if self._block_type is not None:
+            self._lines.append(line[offset:])
+        return completed
+
+    def flush(self) -> Optional[LptBlock]:
+        """Complete the current block at the end of the input, if any."""
+        if self._block_type is None:
+            return None
+        block = self._complete()
+        self._block_type = None
+        return block
+
+    def _complete(self) -> LptBlock:
+        block = (self._block_type, "".join(self._lines))
+        self._lines = []
+        return block
+
+
+def iter_lpt_blocks(lines: Iterable[str]) -> Iterator[LptBlock]:
+    """
+    Split LPT lines into fit blocks, lazily.
+
+    Args:
+        lines: Lines of an LPT file with their terminators, e.g. an open file
+
+    Yields:
+        LptBlock: (block type, block text) of every block, in file order
+    """
+    splitter = LptBlockSplitter()
+    for line in lines:
+        yield from splitter.feed(line)
+    block = splitter.flush()
+    if block is not None:
+        yield block
+
+
+def _extract(block: LptBlock, manager=None) -> FitResults:
+    if manager is None:
+        # Imported here as lpt_manager builds on this module
+        from pleiades.sammy.io.lpt_manager import LptManager
+
+        manager = LptManager()
+    return manager.extract_results_from_string(block[1])
+
+
+def iter_lpt_results(file_path: Union[str, Path], manager=None) -> Iterator[FitResults]:
+    """
+    Read an LPT file block by block.
+
+    Only the block being read is held in memory, so results of the first
+    iterations are available before the rest of the file is read.
+
+    Args:
+        file_path: Path to the LPT file
+        manager: LptManager extracting the block results (a new one by default)
+
+    Yields:
+        FitResults: Results of every block, in file order
+
+    Raises:
+        FileNotFoundError: If the file does not exist
+    """
+    with open(file_path, "r") as file:
+        for block in iter_lpt_blocks(file):
+            yield _extract(block, manager)
+
+
+def follow_lpt_results(
+    file_path: Union[str, Path],
+    is_running: Callable[[], bool],
+    poll_interval: float = 1.0,
+    manager=None,
+) -> Iterator[FitResults]:
+    """
+    Tail the LPT file of a running fit and yield its blocks as they are written.
+
+    A block is yielded once the next block starts, so the block being written is
+    never parsed half-way. When is_running returns False, the rest of the file is
+    read and the last block is yielded too.
+
+    Args:
+        file_path: Path to the LPT file, which may not exist yet
+        is_running: Callable telling whether SAMMY is still writing the file
+        poll_interval: Seconds to wait for more output at the end of the file
+        manager: LptManager extracting the block results (a new one by default)
+
+    Yields:
+        FitResults: Results of every block, in file order
+    """
+    if poll_interval <= 0:
+        raise ValueError(f"Invalid poll_interval: {poll_interval}")
+
+    file_path = Path(file_path)
+    while not file_path.is_file():
+        if not is_running():
+            logger.warning(f"No LPT file written at {file_path}")
+            return
+        time.sleep(poll_interval)
+
+    splitter = LptBlockSplitter()
+    with open(file_path, "r") as file:
+        for line in _follow_lines(file, is_running, poll_interval):
+            for block in splitter.feed(line):
+                yield _extract(block, manager)
+    block = splitter.flush()
+    if block is not None:
+        yield _extract(block, manager)
+
+
+def _follow_lines(file: TextIO, is_running: Callable[[], bool], poll_interval: float) -> Iterator[str]:
+    """Complete lines of a growing file, until it stops growing after is_running turns False."""
+    partial = ""
+    while True:
+        # Checked before reading, so that output written before SAMMY stopped is not missed
+        running = is_running()
+        line = file.readline()
+        while line:
+            if line.endswith("\n"):
+                yield partial + line
+                partial = ""
+            else:
+                # Line still being written
+                partial += line
+            line = file.readline()
+        if not running:
+            break
+        time.sleep(poll_interval)
+    if partial:
+        yield partial
+
+
+def read_final_lpt_block(file_path: Union[str, Path], chunk_size: int = 1 << 16, manager=None) -> Optional[FitResults]:
+    """
+    Read the last block of an LPT file without reading the blocks before it.
+
+    The file is read backwards in chunks from its end until a block marker is
+    found, which is much faster than parsing every block for long fits when only
+    the final parameters and chi-squared are needed.
+
+    Args:
+        file_path: Path to the LPT file
+        chunk_size: Number of bytes read at a time
+        manager: LptManager extracting the block results (a new one by default)
+
+    Returns:
+        FitResults of the last block, or None if the file has no block
+
+    Raises:
+        FileNotFoundError: If the file does not exist
+    """
+    markers = [marker.encode() for marker in BLOCK_MARKERS]
+    overlap = max(len(marker) for marker in markers) - 1
+
+    with open(file_path, "rb") as file:
+        start = file.seek(0, os.SEEK_END)
+        tail = b""
+        while start > 0:
+            size = min(chunk_size, start)
+            start -= size
+            file.seek(start)
+            tail = file.read(size) + tail
+            # The rest of the tail was searched already, except for markers across the chunk boundary
+            window = tail[: size + overlap]
+            position = max(window.rfind(marker) for marker in markers)
+            if position >= 0:
+                text = tail[position:].decode(errors="replace")
+                return _extract(next(iter_lpt_blocks(text.splitlines(keepends=True))), manager)
+    return None
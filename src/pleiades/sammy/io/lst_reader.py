@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+"""
+Fast reader of SAMMY LST files.
+
+An LST file is a whitespace-separated table of numbers, one row per data point,
+whose columns always come in the order of LST_COLUMN_NAMES (energy, cross
+sections, transmissions, ...), possibly truncated. read_lst parses it with
+NumPy's C tokenizer straight into a float array; LstTable exposes the columns as
+array views and only builds a pandas DataFrame when to_dataframe is called, so
+loading the LST files of a whole mapping campaign neither goes through the
+pandas parser nor imports pandas at all.
+"""
+
+import warnings
+from pathlib import Path
+from typing import List, Sequence, Union
+
+import numpy as np
+
+# All possible columns in a SAMMY.LST file (always in this order)
+LST_COLUMN_NAMES = (
+    "Energy",
+    "Experimental cross section (barns)",
+    "Absolute uncertainty in experimental cross section (barns)",
+    "Zeroth-order theoretical cross section as evaluated by SAMMY (barns)",
+    "Final theoretical cross section as evaluated by SAMMY (barns)",
+    "Experimental transmission (dimensionless)",
+    "Absolute uncertainty in experimental transmission",
+    "Zeroth-order theoretical transmission as evaluated by SAMMY (dimensionless)",
+    "Final theoretical transmission as evaluated by SAMMY (dimensionless)",
+    "Theoretical uncertainty on Zeroth-order theoretical cross section or transmission",
+    "Theoretical uncertainty on Final theoretical cross section or transmission",
+    "Adjusted energy initially",
+    "Adjusted energy finally",
+)
+
+
+class LstTable:
+    """
+    Columns of a SAMMY LST file.
+
+    Attributes:
+        values: (rows, columns) float64 array of the file
+        columns: Names of the columns, the first ones of LST_COLUMN_NAMES
+    """
+
+    def __init__(self, values: np.ndarray, columns: Sequence[str] = None):
+        self.values = np.asarray(values, dtype=np.float64)
+        if self.values.ndim != 2:
+            raise ValueError(f"LST values must be a 2-D array, got shape {self.values.shape}")
+        n_columns = self.values.shape[1]
+        if columns is None:
+            if n_columns > len(LST_COLUMN_NAMES):
+                raise ValueError(f"LST table has {n_columns} columns, at most {len(LST_COLUMN_NAMES)} are known")
+            columns = LST_COLUMN_NAMES[:n_columns]
+        if len(columns) != n_columns:
+            raise ValueError(f"{len(columns)} column names given for {n_columns} columns")
+        self.columns: List[str] = list(columns)
+        self._index = {name: i for i, name in enumerate(self.columns)}
+
+    def __len__(self) -> int:
+        return self.values.shape[0]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._index
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        """Column by name, as a view of values."""
+        try:
+            return self.values[:, self._index[name]]
+        except KeyError:
+            raise KeyError(f"No column {name!r} in LST table") from None
+
+    @property
+    def energy(self) -> np.ndarray:
+        return self["Energy"]
+
+    def to_dataframe(self):
+        """
+        Build a pandas DataFrame of the table.
+
+        Returns:
+            pandas.DataFrame: One column per LST column
+        """
+        # Imported here, reading LST files does not need pandas
+        import pandas as pd
+
+        return pd.DataFrame(self.values, columns=self.columns)
+
+
+def read_lst(lst_file: Union[str, Path]) -> LstTable:
+    """
+    Read a SAMMY LST file.
+
+    Args:
+        lst_file: Path to the LST file
+
+    Returns:
+        LstTable: Columns of the file
+
+    Raises:
+        FileNotFoundError: If the file does not exist
+        ValueError: If the file holds no data, rows of different lengths or non-numeric fields
+    """
+    with warnings.catch_warnings():
+        # An empty file is reported below
+        warnings.filterwarnings("ignore", message="loadtxt: input contained no data", category=UserWarning)
+        values = np.loadtxt(lst_file, comments="#", ndmin=2)
+    if values.size == 0:
+        raise ValueError(f"No data in LST file {lst_file}")
+    return LstTable(values)
@@ -0,0 +1,214 @@
+"""
+Single-pass card indexer for SAMMY parameter files.
+
+A SAMMY parameter file is a sequence of card sets separated by blank lines. Every
+card set except the resonances (Card 1) and the fudge factor (Card 2) starts with
+a header line, of which SAMMY only reads the first five characters. The fudge
+factor may be followed directly by a header line.
+
+ParCardIndex scans the lines of a parameter file once and records the line span
+of every card set. Parsers then work on the slices of the spans they need instead
+of re-scanning the whole file for their header, which keeps reading files with
+tens of thousands of resonances linear in the file size.
+"""
+
+import os
+from dataclasses import dataclass
+from enum import Enum
+from typing import Dict, List, Optional, Sequence, Tuple
+
+
+class Cards(Enum):
+    PAR_CARD_1 = "Parameter Card 1"  # Resonance data
+    PAR_CARD_2 = "Parameter Card 2"  # Fudge Factor
+    PAR_CARD_3 = "Parameter Card 3"  # External R-function parameters
+    PAR_CARD_3A = "Parameter Card 3a"  # alternative for External R-function parameters
+    PAR_CARD_4 = "Parameter Card 4"  # Broadening parameters
+    PAR_CARD_5 = "Parameter Card 5"  # Unused but correlated variables
+    PAR_CARD_6 = "Parameter Card 6"  # Normalization and background
+    PAR_CARD_7 = "Parameter Card 7"  # Radius parameters (default format)
+    PAR_CARD_7A = "Parameter Card 7a"  # Radius parameters (“key-word” format)
+    PAR_CARD_8 = "Parameter Card 8"  # Data reduction parameters
+    PAR_CARD_9 = "Parameter Card 9"  # ORRES
+    PAR_CARD_10 = "Parameter Card 10"  # Isotopic abundances and masses
+    PAR_CARD_11 = "Parameter Card 11"  # Miscellaneous parameters
+    PAR_CARD_12 = "Parameter Card 12"  # Paramagnetic cross section parameters
+    PAR_CARD_13 = "Parameter Card 13"  # Background functions
+    PAR_CARD_14 = "Parameter Card 14"  # RPI Resolution function
+    PAR_CARD_14A = "Parameter Card 14a"  # RPI Transmission resolution function
+    PAR_CARD_15 = "Parameter Card 15"  # DETECtor efficiencies
+    PAR_CARD_16 = "Parameter Card 16"  # USER-Defined resolution function
+    PAR_LAST_B = "Parameter Card Last B"  # EXPLIcit uncertainties and correlations follow
+    PAR_LAST_C = "Parameter Card Last C"  # RELATive uncertainties follow
+    PAR_LAST_D = "Parameter Card Last D"  # PRIOR uncertainties follow in key-word format
+
+    # If command “QUANTUM NUMBERS ARE inparameter file” is used, then
+    # the following input cards will be in the parameter file.
+    INP_CARD_4 = "Input Card 4"  # Particle pair definitions
+    INP_CARD_10_2 = "Input Card 10.2"  # Spin groups
+
+
+PAR_HEADER_MAP = {
+    "RESONANCES are listed next": Cards.PAR_CARD_1,
+    "EXTERnal R-function parameters follow": Cards.PAR_CARD_3,
+    "R-EXTernal parameters follow": Cards.PAR_CARD_3A,
+    "BROADening parameters may be varied": Cards.PAR_CARD_4,
+    "UNUSEd but correlated variables": Cards.PAR_CARD_5,
+    "NORMAlization and background": Cards.PAR_CARD_6,
+    "RADIUs parameters follow": Cards.PAR_CARD_7,
+    "RADII are in KEY-WORD format": Cards.PAR_CARD_7A,
+    "CHANNel radius parameters follow": Cards.PAR_CARD_7A,
+    "DATA reduction parameters are next": Cards.PAR_CARD_8,
+    "ORRES": Cards.PAR_CARD_9,
+    "ISOTOpic abundances and masses": Cards.PAR_CARD_10,
+    "NUCLIde abundances and masses": Cards.PAR_CARD_10,
+    "MISCEllaneous parameters follow": Cards.PAR_CARD_11,
+    "PARAMagnetic cross section parameters follow": Cards.PAR_CARD_12,
+    "BACKGround functions": Cards.PAR_CARD_13,
+    "RPI Resolution function": Cards.PAR_CARD_14,
+    "GEEL resolution function": Cards.PAR_CARD_14,
+    "GELINa resolution": Cards.PAR_CARD_14,
+    "NTOF resolution function": Cards.PAR_CARD_14,
+    "RPI Transmission resolution function": Cards.PAR_CARD_14A,
+    "RPI Capture resolution function": Cards.PAR_CARD_14A,
+    "GEEL DEFAUlts": Cards.PAR_CARD_14A,
+    "GELINa DEFAUlts": Cards.PAR_CARD_14A,
+    "NTOF DEFAUlts": Cards.PAR_CARD_14A,
+    "DETECtor efficiencies": Cards.PAR_CARD_15,
+    "USER-Defined resolution function": Cards.PAR_CARD_16,
+    "EXPLIcit uncertainties and correlations follow": Cards.PAR_LAST_B,
+    "RELATive uncertainties follow": Cards.PAR_LAST_C,
+    "PRIOR uncertainties follow in key-word format": Cards.PAR_LAST_D,
+    "PARTIcle pair definitions": Cards.INP_CARD_4,
+    "SPIN GROUPs": Cards.INP_CARD_10_2,
+}
+
+# Headers by their first five characters (upper case), the part SAMMY reads
+_HEADERS_BY_KEY: Dict[str, List[Tuple[str, Cards]]] = {}
+for _header, _card in PAR_HEADER_MAP.items():
+    _HEADERS_BY_KEY.setdefault(_header[:5].upper(), []).append((_header.upper(), _card))
+
+# Number of columns of the fudge factor field; resonance lines have data beyond it
+FUDGE_WIDTH = 11
+
+
+def header_card(line: str) -> Optional[Cards]:
+    """
+    Card announced by a header line.
+
+    Args:
+        line: Line of a parameter file
+
+    Returns:
+        The card whose header matches the first five characters of the line, or None
+    """
+    text = line.strip().upper()
+    headers = _HEADERS_BY_KEY.get(text[:5])
+    if headers is None:
+        return None
+    if len(headers) > 1:
+        # Several headers share the key (e.g. GEEL resolution function / GEEL DEFAUlts): take the closest
+        return max(headers, key=lambda header: len(os.path.commonprefix([header[0], text])))[1]
+    return headers[0][1]
+
+
+@dataclass(frozen=True)
+class CardSpan:
+    """Line span of a card set in a parameter file."""
+
+    card: Optional[Cards]  # None for unrecognized card sets
+    start: int  # Index of the first line (the header line, if any)
+    end: int  # Index after the last line (a blank line or the end of the file)
+    has_header: bool  # Whether the first line is a header line
+
+    def __len__(self) -> int:
+        return self.end - self.start
+
+
+class ParCardIndex:
+    """
+    Line spans of the card sets of a parameter file, found in a single pass.
+
+    Card sets with a header start at a header line following a blank line (or the
+    headerless resonance and fudge factor lines). Lines before the first header
+    are the resonances (Card 1) and the fudge factor (Card 2); any other card set
+    without a recognized header is recorded with card None.
+
+    Attributes:
+        lines: Lines of the parameter file
+        spans: Card set spans, in file order
+    """
+
+    def __init__(self, lines: Sequence[str]):
+        self.lines = lines
+        self.spans: List[CardSpan] = []
+        self._by_card: Dict[Cards, CardSpan] = {}
+        self._index()
+
+    def _index(self) -> None:
+        lines = self.lines
+        seen_header = False
+        start = None  # Start of the current span
+        card = None
+        has_header = False
+
+        for number, line in enumerate(lines):
+            if not line.strip():
+                if start is not None:
+                    self._add(card, start, number, has_header)
+                    start = None
+                continue
+
+            if start is not None and has_header:
+                # Lines of a card set with a header are never headers themselves (e.g. "Radii=" in Card 7a)
+                continue
+
+            # First line of a span, or data line before the first header: look for a header
+            line_card = header_card(line)
+            if line_card is not None:
+                if start is not None:
+                    # Fudge factor (or resonances) directly followed by a header
+                    self._add(card, start, number, has_header)
+                start, card, has_header = number, line_card, True
+                seen_header = seen_header or line_card is not Cards.PAR_CARD_1
+            elif start is None:
+                start, has_header = number, False
+                card = None if seen_header else Cards.PAR_CARD_1
+
+        if start is not None:
+            self._add(card, start, len(lines), has_header)
+
+    def _add(self, card: Optional[Cards], start: int, end: int, has_header: bool) -> None:
+        if card is Cards.PAR_CARD_1 and not has_header and end - start == 1:
+            # A single headerless line with nothing beyond the fudge factor field is Card 2
+            if not self.lines[start][FUDGE_WIDTH:].strip():
+                card = Cards.PAR_CARD_2
+        span = CardSpan(card=card, start=start, end=end, has_header=has_header)
+        self.spans.append(span)
+        if card is not None:
+            self._by_card.setdefault(card, span)
+
+    def find(self, *cards: Cards) -> Optional[CardSpan]:
+        """
+        First span of any of the given cards.
+
+        Args:
+            cards: Cards to look for
+
+        Returns:
+            The span of the first matching card set in the file, or None
+        """
+        spans = [self._by_card[card] for card in cards if card in self._by_card]
+        return min(spans, key=lambda span: span.start) if spans else None
+
+    def block(self, span: CardSpan) -> List[str]:
+        """Lines of a span, without trailing whitespace."""
+        return [line.rstrip() for line in self.lines[span.start : span.end]]
+
+    def cards(self) -> List[Cards]:
+        """
+        Cards present in the file, sorted by name.
+
+        Card 1 is always included as its lines may have no header.
+        """
+        return sorted(set(self._by_card) | {Cards.PAR_CARD_1}, key=lambda card: card.name)
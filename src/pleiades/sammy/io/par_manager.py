@@ -1,7 +1,7 @@
 # This file contains the ParManager class, which is responsible for managing the file input/output operations
 # around SAMMY parameter files. It handles reading, writing, and updating parameter files, using the FitConfig class.
-from enum import Enum
 from pathlib import Path
+from typing import List, Optional
 
 from pleiades.sammy.fitting.config import FitConfig
 from pleiades.sammy.io.card_formats.inp04_particlepairs import Card04 as InpCard04
@@ -12,77 +12,12 @@ from pleiades.sammy.io.card_formats.par06_normalization import Card06 as ParCard
 from pleiades.sammy.io.card_formats.par07_radii import Card07 as ParCard07
 from pleiades.sammy.io.card_formats.par07a_radii import Card07a as ParCard07a
 from pleiades.sammy.io.card_formats.par10_isotopes import Card10 as ParCard10
+from pleiades.sammy.io.par_index import PAR_HEADER_MAP, Cards, ParCardIndex  # noqa: F401 (re-exported)
 from pleiades.utils.logger import loguru_logger
 
 logger = loguru_logger.bind(name=__name__)
 
 
-class Cards(Enum):
-    PAR_CARD_1 = "Parameter Card 1"  # Resonance data
-    PAR_CARD_2 = "Parameter Card 2"  # Fudge Factor
-    PAR_CARD_3 = "Parameter Card 3"  # External R-function parameters
-    PAR_CARD_3A = "Parameter Card 3a"  # alternative for External R-function parameters
-    PAR_CARD_4 = "Parameter Card 4"  # Broadening parameters
-    PAR_CARD_5 = "Parameter Card 5"  # Unused but correlated variables
-    PAR_CARD_6 = "Parameter Card 6"  # Normalization and background
-    PAR_CARD_7 = "Parameter Card 7"  # Radius parameters (default format)
-    PAR_CARD_7A = "Parameter Card 7a"  # Radius parameters (“key-word” format)
-    PAR_CARD_8 = "Parameter Card 8"  # Data reduction parameters
-    PAR_CARD_9 = "Parameter Card 9"  # ORRES
-    PAR_CARD_10 = "Parameter Card 10"  # Isotopic abundances and masses
-    PAR_CARD_11 = "Parameter Card 11"  # Miscellaneous parameters
-    PAR_CARD_12 = "Parameter Card 12"  # Paramagnetic cross section parameters
-    PAR_CARD_13 = "Parameter Card 13"  # Background functions
-    PAR_CARD_14 = "Parameter Card 14"  # RPI Resolution function
-    PAR_CARD_14A = "Parameter Card 14a"  # RPI Transmission resolution function
-    PAR_CARD_15 = "Parameter Card 15"  # DETECtor efficiencies
-    PAR_CARD_16 = "Parameter Card 16"  # USER-Defined resolution function
-    PAR_LAST_B = "Parameter Card Last B"  # EXPLIcit uncertainties and correlations follow
-    PAR_LAST_C = "Parameter Card Last C"  # RELATive uncertainties follow
-    PAR_LAST_D = "Parameter Card Last D"  # PRIOR uncertainties follow in key-word format
-
-    # If command “QUANTUM NUMBERS ARE inparameter file” is used, then
-    # the following input cards will be in the parameter file.
-    INP_CARD_4 = "Input Card 4"  # Particle pair definitions
-    INP_CARD_10_2 = "Input Card 10.2"  # Spin groups
-
-
-PAR_HEADER_MAP = {
-    "RESONANCES are listed next": Cards.PAR_CARD_1,
-    "EXTERnal R-function parameters follow": Cards.PAR_CARD_3,
-    "R-EXTernal parameters follow": Cards.PAR_CARD_3A,
-    "BROADening parameters may be varied": Cards.PAR_CARD_4,
-    "UNUSEd but correlated variables": Cards.PAR_CARD_5,
-    "NORMAlization and background": Cards.PAR_CARD_6,
-    "RADIUs parameters follow": Cards.PAR_CARD_7,
-    "RADII are in KEY-WORD format": Cards.PAR_CARD_7A,
-    "CHANNel radius parameters follow": Cards.PAR_CARD_7A,
-    "DATA reduction parameters are next": Cards.PAR_CARD_8,
-    "ORRES": Cards.PAR_CARD_9,
-    "ISOTOpic abundances and masses": Cards.PAR_CARD_10,
-    "NUCLIde abundances and masses": Cards.PAR_CARD_10,
-    "MISCEllaneous parameters follow": Cards.PAR_CARD_11,
-    "PARAMagnetic cross section parameters follow": Cards.PAR_CARD_12,
-    "BACKGround functions": Cards.PAR_CARD_13,
-    "RPI Resolution function": Cards.PAR_CARD_14,
-    "GEEL resolution function": Cards.PAR_CARD_14,
-    "GELINa resolution": Cards.PAR_CARD_14,
-    "NTOF resolution function": Cards.PAR_CARD_14,
-    "RPI Transmission resolution function": Cards.PAR_CARD_14A,
-    "RPI Capture resolution function": Cards.PAR_CARD_14A,
-    "GEEL DEFAUlts": Cards.PAR_CARD_14A,
-    "GELINa DEFAUlts": Cards.PAR_CARD_14A,
-    "NTOF DEFAUlts": Cards.PAR_CARD_14A,
-    "DETECtor efficiencies": Cards.PAR_CARD_15,
-    "USER-Defined resolution function": Cards.PAR_CARD_16,
-    "EXPLIcit uncertainties and correlations follow": Cards.PAR_LAST_B,
-    "RELATive uncertainties follow": Cards.PAR_LAST_C,
-    "PRIOR uncertainties follow in key-word format": Cards.PAR_LAST_D,
-    "PARTIcle pair definitions": Cards.INP_CARD_4,
-    "SPIN GROUPs": Cards.INP_CARD_10_2,
-}
-
-
 class ParManager:
     def __init__(self, fit_config: FitConfig = None, par_file: Path = None):
         """
@@ -100,94 +35,73 @@ class ParManager:
         if par_file:
             self.read_par_file(par_file)
 
-    def extract_particle_pairs(self, lines) -> bool:
+    @staticmethod
+    def _card_block(lines, index: Optional[ParCardIndex], *cards: Cards) -> List[str]:
+        """
+        Lines of the first card set of the given types, header included.
+        Args:
+            lines (list): The lines of the SAMMY parameter file.
+            index (ParCardIndex): Card index of the lines, built here if None.
+            cards (Cards): Card types to look for.
+        Returns:
+            list: The lines of the card set, empty if the card is not in the file.
+        """
+        index = index if index is not None else ParCardIndex(lines)
+        span = index.find(*cards)
+        return index.block(span) if span is not None else []
+
+    def extract_particle_pairs(self, lines, index: ParCardIndex = None) -> bool:
         """
         Extract particle pair definitions from the lines of the SAMMY parameter file (Card 4).
         Process the particle pair data and update the FitConfig object.
         Args:
             lines (list): The lines of the SAMMY parameter file.
+            index (ParCardIndex): Card index of the lines, to avoid re-scanning them. default=None
         Returns:
             bool: True if particle pair data was successfully found and processed, False otherwise.
         """
 
-        block = []
-        in_block = False
-
-        for line in lines:
-            if not in_block and line.upper().startswith("PARTI"):
-                in_block = True
-                block.append(line.rstrip())
-                continue
-            if in_block:
-                # Stop at blank line or next section header
-                if not line.strip():
-                    break
-                block.append(line.rstrip())
-
+        block = self._card_block(lines, index, Cards.INP_CARD_4)
         if block:
             InpCard04.from_lines(block, self.fit_config)
             return True
         return False
 
-    def extract_broadening_parameters(self, lines) -> bool:
+    def extract_broadening_parameters(self, lines, index: ParCardIndex = None) -> bool:
         """
         Extract broadening parameters from the lines of the SAMMY parameter file (Card 4).
         Process the broadening data and update the FitConfig object.
         Args:
             lines (list): The lines of the SAMMY parameter file.
+            index (ParCardIndex): Card index of the lines, to avoid re-scanning them. default=None
         Returns:
             bool: True if broadening data was successfully found and processed, False otherwise.
         """
 
-        block = []
-        in_block = False
-
-        for line in lines:
-            if not in_block and line.upper().startswith("BROAD"):
-                in_block = True
-                block.append(line.rstrip())
-                continue
-            if in_block:
-                # Stop at blank line or next section header
-                if not line.strip():
-                    break
-                block.append(line.rstrip())
-
+        block = self._card_block(lines, index, Cards.PAR_CARD_4)
         if block:
             ParCard04.from_lines(block, self.fit_config)
             return True
         return False
 
-    def extract_normalization_parameters(self, lines) -> bool:
+    def extract_normalization_parameters(self, lines, index: ParCardIndex = None) -> bool:
         """
         Extract normalization parameters from the lines of the SAMMY parameter file (Card 6).
         Process the normalization data and update the FitConfig object.
         Args:
             lines (list): The lines of the SAMMY parameter file.
+            index (ParCardIndex): Card index of the lines, to avoid re-scanning them. default=None
         Returns:
             bool: True if normalization data was successfully found and processed, False otherwise.
         """
 
-        block = []
-        in_block = False
-
-        for line in lines:
-            if not in_block and line.upper().startswith("NORMA"):
-                in_block = True
-                block.append(line.rstrip())
-                continue
-            if in_block:
-                # Stop at blank line or next section header
-                if not line.strip():
-                    break
-                block.append(line.rstrip())
-
+        block = self._card_block(lines, index, Cards.PAR_CARD_6)
         if block:
             ParCard06.from_lines(block, self.fit_config)
             return True
         return False
 
-    def extract_radii_parameters(self, lines) -> bool:
+    def extract_radii_parameters(self, lines, index: ParCardIndex = None) -> bool:
         """
         Extract radius parameters from the lines of the SAMMY parameter file (Card 7).
         Process the radius data and update the FitConfig object.
@@ -199,67 +113,40 @@ class ParManager:
 
         Args:
             lines (list): The lines of the SAMMY parameter file.
+            index (ParCardIndex): Card index of the lines, to avoid re-scanning them. default=None
         Returns:
             bool: True if radius data was successfully found and processed, False otherwise.
         """
 
-        block = []
-        in_block = False
-        header_line = None
-
-        for line in lines:
-            first5 = line[:5].upper().strip()
-            # Start block if first 5 chars match or KEY-WORD in line
-            if not in_block and (first5 in ("RADIU", "RADII", "CHANN") or "KEY-WORD" in line):
-                in_block = True
-                header_line = line.rstrip()
-                block.append(line.rstrip())
-                continue
-            if in_block:
-                if not line.strip():
-                    break
-                block.append(line.rstrip())
+        index = index if index is not None else ParCardIndex(lines)
+        span = index.find(Cards.PAR_CARD_7, Cards.PAR_CARD_7A)
+        if span is None:
+            return False
 
         # Decide which parser to use
-        if block:
-            header = block[0].upper()
-            if header.startswith("RADIU"):
-                ParCard07.from_lines(block, self.fit_config)
-                return True
-            elif header.startswith("RADII") or header.startswith("CHANN") or "KEY-WORD" in header:
-                ParCard07a.from_lines(block, self.fit_config)
-                return True
-        return False
+        if span.card == Cards.PAR_CARD_7:
+            ParCard07.from_lines(index.block(span), self.fit_config)
+        else:
+            ParCard07a.from_lines(index.block(span), self.fit_config)
+        return True
 
-    def extract_isotopes_and_abundances(self, lines) -> bool:
+    def extract_isotopes_and_abundances(self, lines, index: ParCardIndex = None) -> bool:
         """
         Search for isotopes in the lines of the SAMMY parameter file. If found, update the FitConfig object with the isotope information.
         Args:
             lines (list): The lines of the SAMMY parameter file.
+            index (ParCardIndex): Card index of the lines, to avoid re-scanning them. default=None
         Returns:
             bool: True if isotope data was found and processed, False otherwise.
         """
 
-        block = []
-        in_block = False
-
-        for line in lines:
-            if not in_block and (line.upper().startswith("ISOTO") or line.upper().startswith("NUCLI")):
-                in_block = True
-                block.append(line.rstrip())
-                continue
-            if in_block:
-                # Stop at blank line or next section header
-                if not line.strip():
-                    break
-                block.append(line.rstrip())
-
+        block = self._card_block(lines, index, Cards.PAR_CARD_10)
         if block:
             ParCard10.from_lines(block, self.fit_config)
             return True
         return False
 
-    def extract_resonance_entries(self, lines) -> bool:
+    def extract_resonance_entries(self, lines, index: ParCardIndex = None) -> bool:
         """
         Extract resonance information from the lines of the SAMMY parameter file (Card 1).
         Process the resonance data and update the FitConfig object.
@@ -269,78 +156,36 @@ class ParManager:
 
         Args:
             lines (list): The lines of the SAMMY parameter file.
+            index (ParCardIndex): Card index of the lines, to avoid re-scanning them. default=None
         Returns:
             bool: True if resonance data was successfully found and processed, False otherwise.
         """
 
-        # Create a block to hold the lines of the resonance data
-        # and a flag to indicate if we are in the resonance block
-        block = []
-        in_block = False
-        header_found = False
-
-        # Check if the header is present
-        header_found = any(line.strip().upper().startswith("RESONANCES") for line in lines)
-
-        if header_found:
-            # If the header is present, we will read until the next blank line or the next section header.
-            # We will also skip the header line.
-            for line in lines:
-                if not in_block and line.strip().upper().startswith("RESONANCES"):
-                    in_block = True
-                    block.append(line.rstrip())
-                    continue
-                if in_block:
-                    # Stop at blank line or next section header
-                    if not line.strip():
-                        break
-                    block.append(line.rstrip())
-
-        # If the header is not present, we will just read the first lines of
-        # the card until we reach a blank line or the next section header.
-        else:
-            logger.debug("No header line found, assuming first line is data")
-            for line in lines:
-                if not in_block:
-                    in_block = True
-                    block.append(line.rstrip())
-                    continue
-                if in_block:
-                    # Stop at blank line or next section header
-                    if not line.strip():
-                        break
-                    block.append(line.rstrip())
+        index = index if index is not None else ParCardIndex(lines)
+        resonance_spans = [span for span in index.spans if span.card == Cards.PAR_CARD_1]
+        if not resonance_spans:
+            return False
 
-        if block:
-            ParCard01.from_lines(block, self.fit_config)
-            return True
+        # Prefer the card with a "RESONANCES are listed next" header over headerless lines
+        span = next((span for span in resonance_spans if span.has_header), resonance_spans[0])
+        if not span.has_header:
+            logger.debug("No header line found, assuming first line is data")
 
-        return False
+        ParCard01.from_lines(index.block(span), self.fit_config)
+        return True
 
-    def extract_spin_groups(self, lines) -> bool:
+    def extract_spin_groups(self, lines, index: ParCardIndex = None) -> bool:
         """
         Extract spin group definitions from the lines of the SAMMY parameter file (Input Card 10.2).
         Process the spin group data and update the FitConfig object.
         Args:
             lines (list): The lines of the SAMMY parameter file.
+            index (ParCardIndex): Card index of the lines, to avoid re-scanning them. default=None
         Returns:
             bool: True if spin group data was successfully found and processed, False otherwise.
         """
 
-        block = []
-        in_block = False
-
-        for line in lines:
-            if not in_block and line.upper().startswith("SPIN GROUPS"):
-                in_block = True
-                block.append(line.rstrip())
-                continue
-            if in_block:
-                # Stop at blank line or next section header
-                if not line.strip():
-                    break
-                block.append(line.rstrip())
-
+        block = self._card_block(lines, index, Cards.INP_CARD_10_2)
         if block:
             InpCard10p2.from_lines(block, self.fit_config)
             return True
@@ -349,10 +194,8 @@ class ParManager:
     def detect_par_cards(self, lines):
         """
         Scans a list of lines from a SAMMY parameter file to identify and collect parameter card headers.
-        This method iterates through each line in the provided list, checking for the presence of known
-        parameter card headers as defined in the `PAR_HEADER_MAP`. When a header is detected at the start
-        of a line (after stripping whitespace), the corresponding card enumeration is added to a set to
-        ensure uniqueness. The set is then sorted and returned as a list.
+        The lines are indexed in a single pass by ParCardIndex, which recognizes the headers defined in
+        `PAR_HEADER_MAP` by their first five characters at the start of each card set.
         NOTE:   By default, there should always be a Card 1 in the file, but there may not be a header line
                 for Card 1. Therefore, Card 1 will always be included in the detected cards.
 
@@ -363,19 +206,7 @@ class ParManager:
             list: A sorted list of detected parameter cards.
         """
 
-        found_cards = set()
-        for line in lines:
-            line_key = line.strip()[:5].upper()
-            for header, card_enum in PAR_HEADER_MAP.items():
-                header_key = header.strip()[:5].upper()
-                if line_key == header_key:
-                    found_cards.add(card_enum)
-
-        # If no Card 1 is found, add it to the list
-        if Cards.PAR_CARD_1 not in found_cards:
-            found_cards.add(Cards.PAR_CARD_1)
-
-        return sorted(found_cards, key=lambda x: x.name)
+        return ParCardIndex(lines).cards()
 
     def read_par_file(self, par_file: Path) -> None:
         """
@@ -393,13 +224,15 @@ class ParManager:
             logger.info(f"Reading parameter file {par_file}")
             lines = f.readlines()
 
-        detected = self.detect_par_cards(lines)
+        # Index the card sets once, every extractor works on its own span
+        index = ParCardIndex(lines)
+        detected = index.cards()
         logger.info(f"Detected cards in parFile: {detected}")
 
         # Always process Card 10 first if present as this
         # contains the spin groups for each isotope
         if Cards.PAR_CARD_10 in detected:
-            found_isotope_data = self.extract_isotopes_and_abundances(lines)
+            found_isotope_data = self.extract_isotopes_and_abundances(lines, index)
             if not found_isotope_data:
                 logger.error(f"Could not find isotope data in {par_file}.")
             else:
@@ -408,7 +241,7 @@ class ParManager:
         for cards in detected:
             # If Input Card 4 is present, it will be processed
             if cards == Cards.INP_CARD_4:
-                found_particle_pairs = self.extract_particle_pairs(lines)
+                found_particle_pairs = self.extract_particle_pairs(lines, index)
                 if not found_particle_pairs:
                     logger.error(f"Could not find particle pair data in {par_file}.")
                 else:
@@ -416,7 +249,7 @@ class ParManager:
 
             # Already processed Card 10 so skip it here.
             if cards == Cards.INP_CARD_10_2:
-                found_spin_groups = self.extract_spin_groups(lines)
+                found_spin_groups = self.extract_spin_groups(lines, index)
                 if not found_spin_groups:
                     logger.error(f"Could not find spin group data in {par_file}.")
                 else:
@@ -424,7 +257,7 @@ class ParManager:
 
             # Read Card 1 to get resonance data
             if cards == Cards.PAR_CARD_1:
-                found_resonance_data = self.extract_resonance_entries(lines)
+                found_resonance_data = self.extract_resonance_entries(lines, index)
                 if not found_resonance_data:
                     logger.error(f"Could not find resonance data in {par_file}.")
                 else:
@@ -432,7 +265,7 @@ class ParManager:
 
             # Read Card 7 to get radius data
             elif cards == Cards.PAR_CARD_7 or cards == Cards.PAR_CARD_7A:
-                found_radius_data = self.extract_radii_parameters(lines)
+                found_radius_data = self.extract_radii_parameters(lines, index)
                 if not found_radius_data:
                     logger.error(f"Could not find radius data in {par_file}.")
                 else:
@@ -440,7 +273,7 @@ class ParManager:
 
             # Read Card 6 to get normalization data
             elif cards == Cards.PAR_CARD_6:
-                found_normalization_data = self.extract_normalization_parameters(lines)
+                found_normalization_data = self.extract_normalization_parameters(lines, index)
                 if not found_normalization_data:
                     logger.error(f"Could not find normalization data in {par_file}.")
                 else:
@@ -448,7 +281,7 @@ class ParManager:
 
             # Read Card 4 to get broadening data
             elif cards == Cards.PAR_CARD_4:
-                found_broadening_data = self.extract_broadening_parameters(lines)
+                found_broadening_data = self.extract_broadening_parameters(lines, index)
                 if not found_broadening_data:
                     logger.error(f"Could not find broadening data in {par_file}.")
                 else:
@@ -0,0 +1,279 @@
+#!/usr/bin/env python
+"""
+Compiled templates of SAMMY parameter files.
+
+Parameter sweeps write thousands of variants of a parameter file that differ
+only in a few numeric fields, and every field of a card is a fixed-width float
+(see format_float). A ParTemplate renders the file once, records the byte offset
+and width of every templated field, and renders a variant by formatting the new
+values into those fields of a copy of the rendered file, without going through
+the card models again:
+
+    template = ParTemplate.from_file("base.par", ["broadening.parameters.thick"])
+    template.write("variant.par", {"broadening.parameters.thick": 0.2})
+
+Fields are named by their attribute path in SammyParameterFile, e.g.
+"broadening.parameters.thick" or "normalization.angle_sets.0.anorm". The cards
+holding templated fields are written as their models render them; all other
+cards are kept as the original text.
+
+The position of a field is found by rendering its card with two probe values
+whose formatted forms differ in their first and last characters, so no card
+needs to describe its layout; fields that are not rendered as a fixed-width
+float of format_float are rejected.
+"""
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple, Union
+
+from pleiades.sammy.io.par_index import ParCardIndex
+from pleiades.sammy.parfile import CardOrder, SammyParameterFile
+from pleiades.utils.helper import format_float
+from pleiades.utils.logger import loguru_logger
+
+logger = loguru_logger.bind(name=__name__)
+
+# Probe values: same layout in any width, every mantissa and exponent digit differs
+_PROBES = (1.1111111111111111e11, 2.2222222222222222e22)
+
+
+def split_path(path: str) -> Tuple[str, List[str]]:
+    """
+    Split an attribute path into its card field name and the path within the card.
+
+    Raises:
+        ValueError: If the path does not name a field within a card
+    """
+    card_field, _, rest = path.partition(".")
+    if not rest:
+        raise ValueError(f"Parameter '{path}' must name a card and a field, e.g. 'broadening.parameters.thick'")
+    return card_field, rest.split(".")
+
+
+def _resolve(card, parts: List[str]) -> Tuple[object, str]:
+    """Walk an attribute path within a card, returning the parent object and the last key."""
+    target = card
+    for part in parts[:-1]:
+        target = target[int(part)] if part.isdigit() else getattr(target, part)
+    return target, parts[-1]
+
+
+def read_field(card, parts: List[str]) -> object:
+    """Get the field at an attribute path within a card."""
+    parent, key = _resolve(card, parts)
+    return parent[int(key)] if key.isdigit() else getattr(parent, key)
+
+
+def assign_field(card, parts: List[str], value: float) -> None:
+    """Set the field at an attribute path within a card."""
+    parent, key = _resolve(card, parts)
+    if key.isdigit():
+        parent[int(key)] = value
+    else:
+        setattr(parent, key, value)
+
+
+def _card_lines(card) -> List[str]:
+    """Lines of a card as its model renders them, without trailing blank lines."""
+    lines = card.to_lines()
+    while lines and not lines[-1].strip():
+        lines.pop()
+    return lines
+
+
+@dataclass(frozen=True)
+class FieldSlot:
+    """Position of a fixed-width float field in a rendered parameter file."""
+
+    offset: int  # Byte offset of the first character of the field
+    width: int  # Number of characters of the field, as passed to format_float
+
+
+def _locate(card, parts: List[str], lines: List[str]) -> Tuple[int, int, int]:
+    """
+    Find a field in the rendered lines of its card.
+
+    Returns:
+        (line index, first column, width) of the field
+
+    Raises:
+        ValueError: If the field is not rendered as a single fixed-width float
+    """
+    renders = []
+    for probe in _PROBES:
+        probed = card.model_copy(deep=True)
+        assign_field(probed, parts, probe)
+        renders.append(_card_lines(probed))
+
+    for render in renders:
+        if [len(line) for line in render] != [len(line) for line in lines]:
+            raise ValueError("changing it changes the layout of the card")
+    changed = [number for number, (first, second) in enumerate(zip(*renders)) if first != second]
+    if len(changed) != 1:
+        raise ValueError("it is not rendered on a single line")
+
+    number = changed[0]
+    first, second = renders[0][number], renders[1][number]
+    columns = [column for column, (a, b) in enumerate(zip(first, second)) if a != b]
+    start, width = columns[0], columns[-1] + 1 - columns[0]
+    for probe, render in zip(_PROBES, renders):
+        if render[number][start : start + width] != format_float(probe, width=width):
+            raise ValueError("it is not rendered as a fixed-width float")
+    return number, start, width
+
+
+class ParTemplate:
+    """
+    Parameter file with the positions of its templated fields.
+
+    Attributes:
+        fields: Slot of every templated field, by attribute path
+        defaults: Value of every templated field in the compiled file (None for blank fields)
+    """
+
+    def __init__(self, text: str, fields: Mapping[str, FieldSlot], defaults: Mapping[str, Optional[float]]):
+        # Never modified, so that templates can render variants from several threads
+        self._content = text.encode()
+        self.fields: Dict[str, FieldSlot] = dict(fields)
+        self.defaults: Dict[str, Optional[float]] = dict(defaults)
+
+    @classmethod
+    def compile(cls, text: str, paths: Sequence[str]) -> "ParTemplate":
+        """
+        Compile the template of a parameter file.
+
+        Args:
+            text: Content of the parameter file
+            paths: Attribute paths of the templated fields
+
+        Returns:
+            ParTemplate: Template rendering the file with the given fields replaced
+
+        Raises:
+            ValueError: If a path does not name a fixed-width float field of a card
+                present in the file
+        """
+        paths_by_card: Dict[str, List[Tuple[str, List[str]]]] = {}
+        for path in paths:
+            card_field, parts = split_path(path)
+            paths_by_card.setdefault(card_field, []).append((path, parts))
+
+        lines = text.splitlines()
+        pieces: List[str] = []
+        offset = 0  # Byte offset of the end of pieces
+        fields, defaults = {}, {}
+
+        def add(piece: str) -> None:
+            nonlocal offset
+            pieces.append(piece)
+            offset += len(piece.encode())
+
+        segment_start = 0
+        for span in ParCardIndex(lines).spans:
+            if not span.has_header:
+                continue
+            card_type, card_class = SammyParameterFile._get_card_class_with_header(lines[span.start])
+            card_field = CardOrder.get_field_name(card_type) if card_type is not None else None
+            if card_field not in paths_by_card:
+                continue
+
+            try:
+                card = card_class.from_lines(lines[span.start : span.end])
+            except Exception as e:
+                raise ValueError(f"Cannot parse the {card_type.name} card: {str(e)}")
+            if card is None:
+                raise ValueError(f"The {card_type.name} card cannot be templated")
+
+            card_lines = _card_lines(card)
+            slots = {}
+            for path, parts in paths_by_card.pop(card_field):
+                try:
+                    value = read_field(card, parts)
+                except (AttributeError, IndexError, TypeError) as e:
+                    raise ValueError(f"Parameter '{path}' does not exist in the {card_type.name} card: {e}")
+                try:
+                    slots[path] = _locate(card, parts, card_lines)
+                except ValueError as e:
+                    raise ValueError(f"Parameter '{path}' of the {card_type.name} card cannot be templated: {e}")
+                defaults[path] = value
+
+            add("".join(f"{line}\n" for line in lines[segment_start : span.start]))
+            # Fields are ASCII, only the characters before them on their line may be wider
+            line_offsets = []
+            for line in card_lines:
+                line_offsets.append(offset)
+                add(f"{line}\n")
+            for path, (number, start, width) in slots.items():
+                column = len(card_lines[number][:start].encode())
+                fields[path] = FieldSlot(offset=line_offsets[number] + column, width=width)
+            segment_start = span.end
+
+        if paths_by_card:
+            missing = ", ".join(sorted(paths_by_card))
+            raise ValueError(f"Cards templated but not present in the parameter file: {missing}")
+        add("".join(f"{line}\n" for line in lines[segment_start:]))
+
+        logger.debug(f"Compiled parameter file template with {len(fields)} fields")
+        return cls("".join(pieces), fields, defaults)
+
+    @classmethod
+    def from_file(cls, filepath: Union[str, Path], paths: Sequence[str]) -> "ParTemplate":
+        """
+        Compile the template of a parameter file on disk.
+
+        Args:
+            filepath: Path to the parameter file
+            paths: Attribute paths of the templated fields
+
+        Returns:
+            ParTemplate: Template of the file
+
+        Raises:
+            FileNotFoundError: If the file does not exist
+            ValueError: If a path cannot be templated, see compile
+        """
+        filepath = Path(filepath)
+        try:
+            return cls.compile(filepath.read_text(), paths)
+        except ValueError as e:
+            raise ValueError(f"{filepath}: {str(e)}")
+
+    def render(self, values: Mapping[str, float]) -> bytes:
+        """
+        Render the parameter file with the given field values.
+
+        Each call patches its own copy of the compiled file, so a template may be
+        shared between threads.
+
+        Args:
+            values: Values by attribute path; fields not given keep their compiled value
+
+        Returns:
+            bytes: Content of the parameter file
+
+        Raises:
+            KeyError: If a value is given for a field that is not templated
+            ValueError: If a value does not fit in the width of its field
+        """
+        unknown = set(values) - set(self.fields)
+        if unknown:
+            raise KeyError(f"Fields not in the template: {', '.join(sorted(unknown))}")
+        # The compiled file already holds the default of every field
+        buffer = bytearray(self._content)
+        for path, value in values.items():
+            slot = self.fields[path]
+            if value is not None:
+                value = float(value)
+            buffer[slot.offset : slot.offset + slot.width] = format_float(value, width=slot.width).encode()
+        return bytes(buffer)
+
+    def write(self, filepath: Union[str, Path], values: Mapping[str, float]) -> None:
+        """
+        Write the parameter file with the given field values, see render.
+
+        Args:
+            filepath: Path of the parameter file to write
+            values: Values by attribute path
+        """
+        Path(filepath).write_bytes(self.render(values))
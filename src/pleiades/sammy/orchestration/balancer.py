@@ -0,0 +1,333 @@
+#!/usr/bin/env python
+"""
+Load balancing of SAMMY jobs across several backends.
+
+SammyFactory.auto_select picks a single backend by fixed priority. Large batches
+can use local cores, Docker containers and the NOVA service at the same time:
+a LoadBalancer holds one pool per configured backend, each with a capacity (the
+number of jobs it runs concurrently), and its `factory` is a RunnerFactory whose
+runners pick a backend when the job starts:
+
+    balancer = LoadBalancer([
+        BackendPool("local", factory_runner("local"), capacity=8),
+        BackendPool("docker", factory_runner("docker"), capacity=4),
+        BackendPool("nova", factory_runner("nova", url=..., api_key=...), capacity=32),
+    ])
+    BatchRunner(balancer.factory, index, workers=balancer.total_capacity).run(jobs)
+
+Each job goes to the pool with a free slot that is expected to finish it first,
+i.e. with the smallest (running jobs + 1) x mean runtime / capacity. Mean runtimes
+are measured per backend (exponentially weighted) and can be seeded from a
+TelemetryStore; backends without measurements are tried first.
+
+When a backend errors (preparation or execution raises, or the result reports a
+backend failure) the job fails over to the next best backend. A backend failing
+`failure_threshold` times in a row is put aside for `cooldown` seconds. Failures
+of SAMMY itself (no normal finish, timeout, ...) are returned as they are.
+"""
+
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from time import monotonic
+from typing import List, Optional, Set
+
+from pleiades.sammy.interface import (
+    BaseSammyConfig,
+    EnvironmentPreparationError,
+    SammyError,
+    SammyExecutionResult,
+    SammyFailureType,
+    SammyFiles,
+    SammyRunner,
+)
+from pleiades.sammy.orchestration.jobs import RunnerFactory
+from pleiades.sammy.orchestration.telemetry import TelemetryStore
+from pleiades.utils.logger import loguru_logger
+
+logger = loguru_logger.bind(name=__name__)
+
+# Failure types caused by the backend rather than by SAMMY, triggering a failover
+BACKEND_FAILURES = {SammyFailureType.BACKEND_ERROR, SammyFailureType.BACKEND_TRANSIENT}
+
+
+class NoBackendAvailableError(SammyError):
+    """Raised when no backend of a load balancer can take a job."""
+
+    pass
+
+
+@dataclass
+class BackendPool:
+    """One backend of a load balancer and its measured performance."""
+
+    name: str
+    runner_factory: RunnerFactory
+    capacity: int = 1  # Jobs run concurrently on this backend
+    active: int = 0
+    completed: int = 0
+    failures: int = 0  # Consecutive backend failures
+    mean_runtime: Optional[float] = None  # Exponentially weighted runtime of successful runs (seconds)
+    unavailable_until: float = 0.0  # Monotonic time until which the backend is put aside
+
+    def __post_init__(self):
+        if self.capacity < 1:
+            raise ValueError(f"Invalid capacity for backend {self.name}: {self.capacity}")
+
+    @property
+    def throughput(self) -> Optional[float]:
+        """Measured jobs per second at full capacity, None before the first measurement."""
+        if not self.mean_runtime:
+            return None
+        return self.capacity / self.mean_runtime
+
+    def expected_finish(self) -> float:
+        """Expected time until a job submitted now would finish (0 when not measured yet)."""
+        return (self.active + 1) * (self.mean_runtime or 0.0) / self.capacity
+
+
+class LoadBalancer:
+    """
+    Spread jobs across backend pools by capacity and measured throughput.
+
+    Attributes:
+        pools: Backend pools, in order of preference for ties
+        smoothing: Weight of the latest runtime in the runtime average
+        cooldown: Seconds a failing backend is put aside
+        failure_threshold: Consecutive failures putting a backend aside
+    """
+
+    def __init__(
+        self,
+        pools: List[BackendPool],
+        smoothing: float = 0.3,
+        cooldown: float = 60.0,
+        failure_threshold: int = 2,
+    ):
+        if not pools:
+            raise ValueError("A load balancer needs at least one backend")
+        names = [pool.name for pool in pools]
+        if len(set(names)) != len(names):
+            raise ValueError(f"Backend names must be unique: {names}")
+        if not 0 < smoothing <= 1:
+            raise ValueError(f"Invalid smoothing: {smoothing}")
+        if failure_threshold < 1:
+            raise ValueError(f"Invalid failure threshold: {failure_threshold}")
+        self.pools = pools
+        self.smoothing = smoothing
+        self.cooldown = cooldown
+        self.failure_threshold = failure_threshold
+        self._condition = threading.Condition()
+
+    @property
+    def total_capacity(self) -> int:
+        """Number of jobs all backends run concurrently, a sensible number of batch workers."""
+        return sum(pool.capacity for pool in self.pools)
+
+    def seed_from_telemetry(self, store: TelemetryStore) -> None:
+        """
+        Initialize the mean runtimes from the successful runs recorded in a telemetry store.
+
+        Args:
+            store: Telemetry store whose backend names match the pool names
+        """
+        summaries = {summary.group: summary for summary in store.summary(group_by="backend", success=True)}
+        with self._condition:
+            for pool in self.pools:
+                if pool.name in summaries:
+                    pool.mean_runtime = summaries[pool.name].mean_wall_time_seconds
+                    logger.debug(f"Backend {pool.name}: seeded mean runtime {pool.mean_runtime:.1f}s from telemetry")
+
+    def acquire(self, exclude: Optional[Set[str]] = None) -> BackendPool:
+        """
+        Reserve a slot on the backend expected to finish a new job first, waiting for a free slot.
+
+        Args:
+            exclude: Names of backends not to use (e.g. already failed for this job)
+
+        Returns:
+            BackendPool: Pool with a reserved slot, to be given back with release()
+
+        Raises:
+            NoBackendAvailableError: If every backend is excluded
+        """
+        exclude = exclude or set()
+        with self._condition:
+            while True:
+                candidates = [pool for pool in self.pools if pool.name not in exclude]
+                if not candidates:
+                    raise NoBackendAvailableError(f"No backend left to run the job (tried {sorted(exclude)})")
+                now = monotonic()
+                healthy = [pool for pool in candidates if pool.unavailable_until <= now]
+                if not healthy:
+                    # Every remaining backend is cooling down: use the one back first rather than fail
+                    healthy = [min(candidates, key=lambda pool: pool.unavailable_until)]
+                free = [pool for pool in healthy if pool.active < pool.capacity]
+                if free:
+                    pool = min(free, key=BackendPool.expected_finish)
+                    pool.active += 1
+                    return pool
+                self._condition.wait(timeout=1.0)
+
+    def release(self, pool: BackendPool, runtime: Optional[float] = None, failed: bool = False) -> None:
+        """
+        Give back a slot and record how the job went.
+
+        Args:
+            pool: Pool returned by acquire()
+            runtime: Runtime of a successful run, updating the mean runtime
+            failed: Whether the backend failed the job
+        """
+        with self._condition:
+            pool.active -= 1
+            if failed:
+                pool.failures += 1
+                if pool.failures >= self.failure_threshold:
+                    pool.unavailable_until = monotonic() + self.cooldown
+                    logger.warning(
+                        f"Backend {pool.name} failed {pool.failures} times in a row, "
+                        f"putting it aside for {self.cooldown:.0f}s"
+                    )
+            else:
+                pool.failures = 0
+                pool.completed += 1
+                if runtime is not None:
+                    pool.mean_runtime = (
+                        runtime
+                        if pool.mean_runtime is None
+                        else self.smoothing * runtime + (1 - self.smoothing) * pool.mean_runtime
+                    )
+            self._condition.notify_all()
+
+    def factory(self, working_dir: Path, output_dir: Path) -> "BalancedRunner":
+        """RunnerFactory of runners dispatching their job through this balancer."""
+        return BalancedRunner(BalancedRunnerConfig(working_dir=Path(working_dir), output_dir=Path(output_dir)), self)
+
+
+class BalancedRunnerConfig(BaseSammyConfig):
+    """Configuration of a balanced runner: the directories of its job."""
+
+
+class BalancedRunner(SammyRunner):
+    """
+    Runner executing its job on the backend chosen by a LoadBalancer, failing over on backend errors.
+
+    The backend slot is held from prepare_environment until cleanup.
+    """
+
+    def __init__(self, config: BalancedRunnerConfig, balancer: LoadBalancer):
+        super().__init__(config)
+        self.balancer = balancer
+        self._pool: Optional[BackendPool] = None
+        self._delegate: Optional[SammyRunner] = None
+        self._tried: Set[str] = set()
+        self._runtime: Optional[float] = None
+
+    @property
+    def backend(self) -> Optional[str]:
+        """Name of the backend running the job."""
+        return self._pool.name if self._pool is not None else None
+
+    def _start(self, files: SammyFiles) -> None:
+        """Prepare the job on the best backend not tried yet, failing over on errors."""
+        while True:
+            self._pool = self.balancer.acquire(exclude=self._tried)
+            self._tried.add(self._pool.name)
+            try:
+                self._delegate = self._pool.runner_factory(self.config.working_dir, self.config.output_dir)
+                self._delegate.prepare_environment(files)
+                self.logger.debug(f"Running in {self.config.working_dir} on backend {self._pool.name}")
+                return
+            except Exception as e:
+                self.logger.warning(f"Backend {self._pool.name} failed to prepare the job: {str(e)}")
+                self._abandon()
+                if len(self._tried) == len(self.balancer.pools):
+                    raise
+
+    def _abandon(self) -> None:
+        """Give up the current backend after a failure."""
+        if self._delegate is not None:
+            try:
+                self._delegate.cleanup()
+            except Exception as e:
+                self.logger.error(f"Cleanup on backend {self._pool.name} failed: {str(e)}")
+        self.balancer.release(self._pool, failed=True)
+        self._pool = None
+        self._delegate = None
+
+    def prepare_environment(self, files: SammyFiles) -> None:
+        """
+        Validate the inputs and prepare the job on the best available backend.
+
+        Raises:
+            EnvironmentPreparationError: If the inputs are invalid or no backend could prepare the job
+        """
+        try:
+            # Invalid inputs are the job's fault, they must not put backends aside
+            files.validate()
+        except Exception as e:
+            raise EnvironmentPreparationError(f"Environment preparation failed: {str(e)}")
+        try:
+            self._start(files)
+        except EnvironmentPreparationError:
+            raise
+        except Exception as e:
+            raise EnvironmentPreparationError(f"No backend could prepare the job: {str(e)}")
+
+    def execute_sammy(self, files: SammyFiles) -> SammyExecutionResult:
+        """Execute the job, moving it to another backend when the current one errors."""
+        if self._delegate is None:
+            # Every backend failed the previous attempt (e.g. retried by execute_with_retry): start over
+            self._tried.clear()
+            self._start(files)
+        while True:
+            start = monotonic()
+            try:
+                result = self._delegate.execute_sammy(files)
+            except Exception as e:
+                self.logger.warning(f"Backend {self._pool.name} failed to execute the job: {str(e)}")
+                if not self._failover(files):
+                    raise
+                continue
+
+            if result.failure_type in BACKEND_FAILURES:
+                self.logger.warning(f"Backend {self._pool.name} reported {result.failure_type.value}")
+                if self._failover(files):
+                    continue
+            elif result.success:
+                self._runtime = monotonic() - start
+            return result
+
+    def _failover(self, files: SammyFiles) -> bool:
+        """Move the job to the next backend; False if there is none left."""
+        self._abandon()
+        files.cleanup_working_files()
+        if len(self._tried) == len(self.balancer.pools):
+            return False
+        try:
+            self._start(files)
+        except Exception as e:
+            self.logger.error(f"Failover failed: {str(e)}")
+            return False
+        self.logger.info(f"Failed over to backend {self._pool.name}")
+        return True
+
+    def collect_outputs(self, result: SammyExecutionResult) -> None:
+        """Collect the outputs through the backend that ran the job."""
+        if self._delegate is not None:
+            self._delegate.collect_outputs(result)
+
+    def cleanup(self, files: Optional[SammyFiles] = None) -> None:
+        """Clean up on the backend and give its slot back."""
+        if self._pool is None:
+            return
+        try:
+            self._delegate.cleanup()
+        finally:
+            self.balancer.release(self._pool, runtime=self._runtime)
+            self._pool = None
+            self._delegate = None
+
+    def validate_config(self) -> bool:
+        """Validate the job directories."""
+        return self.config.validate()
@@ -0,0 +1,395 @@
+#!/usr/bin/env python
+"""
+Manifest-driven batch execution of SAMMY jobs on a single workstation.
+
+A manifest lists the input, parameter and data files of every job, either as a
+CSV file with a header row or as a JSON list of objects:
+
+    job_id,input_file,parameter_file,data_file
+    pixel_000,fits/p000.inp,fits/p000.par,data/p000.dat
+
+The short column names inp/par/dat are accepted as well, and optional
+working_dir/output_dir columns override the per-job directories. Relative paths
+are resolved against the manifest directory.
+
+Jobs are executed by a pool of worker threads, each job through its own runner.
+A JSON Lines results index is appended after every finished job, so that an
+interrupted batch can be resumed by skipping the jobs already recorded as
+successful. With a checkpoint journal (see checkpoint.py) the job specifications
+and start/completion events are journaled crash-safely as well, and outputs left
+by interrupted jobs are quarantined on restart.
+"""
+
+import csv
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+from pleiades.sammy.interface import RetryPolicy, SammyError
+from pleiades.sammy.orchestration.checkpoint import CheckpointJournal
+from pleiades.sammy.orchestration.jobs import RunnerFactory, SammyJob, read_reduced_chi_squared, run_job
+from pleiades.sammy.orchestration.telemetry import TelemetryStore
+from pleiades.utils.logger import loguru_logger
+
+logger = loguru_logger.bind(name=__name__)
+
+# Accepted manifest column names for each SammyJob field
+MANIFEST_COLUMNS = {
+    "input_file": ("input_file", "inp"),
+    "parameter_file": ("parameter_file", "par"),
+    "data_file": ("data_file", "dat"),
+}
+
+STATUS_SUCCESS = "success"  # SAMMY finished normally
+STATUS_FAILED = "failed"  # SAMMY or the backend reported a failure
+STATUS_ERROR = "error"  # An exception was raised while running the job
+
+
+class ManifestError(SammyError):
+    """Raised when a batch manifest cannot be read."""
+
+    pass
+
+
+def read_manifest(manifest_file: Path, work_root: Optional[Path] = None) -> List[SammyJob]:
+    """
+    Read the jobs described by a CSV or JSON manifest.
+
+    Args:
+        manifest_file: Manifest file (.csv or .json)
+        work_root: Parent of the per-job working directories, defaults to
+            a "work" directory next to the manifest
+
+    Returns:
+        List[SammyJob]: Jobs in manifest order
+
+    Raises:
+        ManifestError: If the manifest is malformed
+    """
+    manifest_file = Path(manifest_file)
+    base_dir = manifest_file.parent
+    work_root = Path(work_root) if work_root is not None else base_dir / "work"
+
+    try:
+        if manifest_file.suffix.lower() == ".json":
+            entries = json.loads(manifest_file.read_text())
+            if isinstance(entries, dict):
+                entries = entries.get("jobs", [])
+        else:
+            with open(manifest_file, newline="") as f:
+                entries = list(csv.DictReader(f))
+    except (OSError, ValueError) as e:
+        raise ManifestError(f"Failed to read manifest {manifest_file}: {str(e)}")
+
+    if not isinstance(entries, list):
+        raise ManifestError(f"Manifest {manifest_file} must contain a list of jobs")
+
+    def _resolve(value) -> Path:
+        path = Path(str(value).strip())
+        return path if path.is_absolute() else base_dir / path
+
+    jobs = []
+    seen_ids = set()
+    for index, entry in enumerate(entries):
+        if not isinstance(entry, dict):
+            raise ManifestError(f"Manifest entry {index} is not a mapping")
+
+        paths = {}
+        for field_name, aliases in MANIFEST_COLUMNS.items():
+            value = next((entry[alias] for alias in aliases if entry.get(alias)), None)
+            if value is None:
+                raise ManifestError(f"Manifest entry {index} has no {field_name}")
+            paths[field_name] = _resolve(value)
+
+        job_id = str(entry.get("job_id") or f"job_{index:06d}").strip()
+        if job_id in seen_ids:
+            raise ManifestError(f"Duplicate job id in manifest: {job_id}")
+        seen_ids.add(job_id)
+
+        working_dir = _resolve(entry["working_dir"]) if entry.get("working_dir") else work_root / job_id
+        output_dir = _resolve(entry["output_dir"]) if entry.get("output_dir") else None
+        jobs.append(SammyJob(job_id=job_id, working_dir=working_dir, output_dir=output_dir, **paths))
+
+    logger.info(f"Read {len(jobs)} jobs from {manifest_file}")
+    return jobs
+
+
+@dataclass
+class BatchRecord:
+    """One entry of the results index."""
+
+    job_id: str
+    status: str
+    runtime_seconds: Optional[float] = None
+    reduced_chi_squared: Optional[float] = None
+    output_dir: Optional[str] = None
+    failure_type: Optional[str] = None
+    error: Optional[str] = None
+    attempts: int = 1
+    finished_at: Optional[str] = None
+
+
+class ResultsIndex:
+    """
+    Append-only JSON Lines index of finished jobs.
+
+    Attributes:
+        path: Index file
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+    def read(self) -> Dict[str, BatchRecord]:
+        """
+        Read the index, the last record of a job taking precedence.
+
+        Truncated or invalid lines (e.g. from an interrupted write) are ignored.
+
+        Returns:
+            Dict mapping job id -> latest BatchRecord
+        """
+        records = {}
+        if not self.path.is_file():
+            return records
+        with open(self.path) as f:
+            for line_number, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    record = BatchRecord(**json.loads(line))
+                except (ValueError, TypeError) as e:
+                    logger.warning(f"Ignoring invalid line {line_number} of {self.path}: {str(e)}")
+                    continue
+                records[record.job_id] = record
+        return records
+
+    def completed(self) -> set:
+        """Ids of the jobs recorded as successful."""
+        return {job_id for job_id, record in self.read().items() if record.status == STATUS_SUCCESS}
+
+    def append(self, record: BatchRecord) -> None:
+        """Append a record and flush it to disk."""
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a") as f:
+                f.write(json.dumps(asdict(record)) + "\n")
+                f.flush()
+
+
+@dataclass
+class BatchSummary:
+    """Counts of a finished batch."""
+
+    total: int = 0
+    skipped: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    errors: int = 0
+
+
+class BatchRunner:
+    """
+    Run SAMMY jobs with a pool of workers, recording every outcome in a results index.
+
+    Attributes:
+        runner_factory: Callable creating a runner for each job's directories
+        index: ResultsIndex receiving one record per finished job
+        workers: Number of jobs executed concurrently
+        retry_policy: Optional policy retrying transient backend failures
+        scratch_root: Optional parent of temporary working directories (e.g. /dev/shm)
+        telemetry: Optional store recording the telemetry of every run
+        journal: Optional crash-safe checkpoint journal of the batch
+    """
+
+    def __init__(
+        self,
+        runner_factory: RunnerFactory,
+        index: ResultsIndex,
+        workers: int = 1,
+        retry_policy: Optional[RetryPolicy] = None,
+        scratch_root: Optional[Path] = None,
+        telemetry: Optional[TelemetryStore] = None,
+        journal: Optional[CheckpointJournal] = None,
+    ):
+        if workers < 1:
+            raise ValueError(f"Invalid number of workers: {workers}")
+        self.runner_factory = runner_factory
+        self.index = index
+        self.workers = workers
+        self.retry_policy = retry_policy
+        self.scratch_root = scratch_root
+        self.telemetry = telemetry
+        self.journal = journal
+
+    def run_one(self, job: SammyJob) -> BatchRecord:
+        """
+        Execute a single job and build its index record.
+
+        Exceptions are recorded instead of raised, so that one broken job does
+        not stop the batch.
+
+        Args:
+            job: Job to execute
+
+        Returns:
+            BatchRecord: Outcome of the job
+        """
+        if self.journal is not None:
+            self.journal.mark_started(job)
+        try:
+            result = run_job(
+                job,
+                self.runner_factory,
+                retry_policy=self.retry_policy,
+                scratch_root=self.scratch_root,
+                telemetry=self.telemetry,
+            )
+        except Exception as e:
+            logger.error(f"Job {job.job_id} raised an error: {str(e)}")
+            return BatchRecord(
+                job_id=job.job_id,
+                status=STATUS_ERROR,
+                output_dir=str(job.output_dir),
+                error=str(e),
+                finished_at=datetime.now().isoformat(),
+            )
+
+        return BatchRecord(
+            job_id=job.job_id,
+            status=STATUS_SUCCESS if result.success else STATUS_FAILED,
+            runtime_seconds=result.runtime_seconds,
+            reduced_chi_squared=read_reduced_chi_squared(job.output_dir),
+            output_dir=str(job.output_dir),
+            failure_type=result.failure_type.value if result.failure_type is not None else None,
+            error=result.error_message,
+            attempts=result.attempts,
+            finished_at=datetime.now().isoformat(),
+        )
+
+    def run(self, jobs: Sequence[SammyJob], resume: bool = True) -> BatchSummary:
+        """
+        Execute jobs, skipping those already completed when resuming.
+
+        Args:
+            jobs: Jobs to execute
+            resume: Skip jobs recorded as successful in the results index, or in
+                the checkpoint journal (with their outputs in place) if there is one
+
+        Returns:
+            BatchSummary: Counts of skipped, successful, failed and errored jobs
+        """
+        summary = BatchSummary(total=len(jobs))
+        if self.journal is not None:
+            self.journal.register(jobs)
+            completed = self.journal.recover() if resume else set()
+        else:
+            completed = self.index.completed() if resume else set()
+        pending = [job for job in jobs if job.job_id not in completed]
+        summary.skipped = len(jobs) - len(pending)
+        if summary.skipped:
+            logger.info(f"Resuming batch: skipping {summary.skipped} completed jobs")
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            futures = {executor.submit(self.run_one, job): job for job in pending}
+            for done, future in enumerate(as_completed(futures), start=1):
+                record = future.result()
+                self.index.append(record)
+                if self.journal is not None:
+                    job = futures[future]
+                    self.journal.mark_completed(job, record.status == STATUS_SUCCESS, record.status)
+                if record.status == STATUS_SUCCESS:
+                    summary.succeeded += 1
+                elif record.status == STATUS_FAILED:
+                    summary.failed += 1
+                else:
+                    summary.errors += 1
+                logger.info(f"[{done}/{len(pending)}] {record.job_id}: {record.status}")
+
+        logger.info(
+            f"Batch finished: {summary.succeeded} succeeded, {summary.failed} failed, "
+            f"{summary.errors} errors, {summary.skipped} skipped"
+        )
+        return summary
+
+
+def add_batch_parser(subparsers) -> None:
+    """
+    Register the `batch` subcommand of the pleiades CLI.
+
+    Args:
+        subparsers: Object returned by ArgumentParser.add_subparsers
+    """
+    parser = subparsers.add_parser("batch", help="Run SAMMY jobs listed in a CSV/JSON manifest")
+    parser.add_argument(
+        "manifest", type=Path, nargs="?", help="CSV or JSON manifest of inp/par/dat files (default: journal jobs)"
+    )
+    parser.add_argument("--backend", default="local", choices=["local", "docker", "nova"], help="SAMMY backend")
+    parser.add_argument("--workers", type=int, default=1, help="number of jobs run concurrently")
+    parser.add_argument("--index", type=Path, default=None, help="results index (default: <manifest>.results.jsonl)")
+    parser.add_argument("--work-root", type=Path, default=None, help="parent of the per-job working directories")
+    parser.add_argument("--no-resume", action="store_true", help="rerun jobs already recorded as successful")
+    parser.add_argument("--retries", type=int, default=1, help="attempts per job on transient backend failures")
+    parser.add_argument("--timeout", type=float, default=None, help="wall-clock limit per job in seconds")
+    parser.add_argument("--scratch", type=Path, default=None, help="scratch root for working directories")
+    parser.add_argument("--telemetry", type=Path, default=None, help="SQLite database recording run telemetry")
+    parser.add_argument("--journal", type=Path, default=None, help="crash-safe checkpoint journal of the batch")
+    parser.add_argument("--sammy-executable", default=None, help="SAMMY executable (local backend)")
+    parser.add_argument("--image-name", default=None, help="Docker image name (docker backend)")
+    parser.set_defaults(func=batch_command)
+
+
+def batch_command(args) -> int:
+    """
+    Run the `batch` subcommand.
+
+    Args:
+        args: Parsed command line arguments
+
+    Returns:
+        int: Exit code, 0 if every job succeeded
+    """
+    from pleiades.sammy.orchestration.jobs import factory_runner
+
+    backend_options = {}
+    if args.timeout is not None:
+        backend_options["timeout"] = args.timeout
+    if args.sammy_executable is not None:
+        backend_options["sammy_executable"] = args.sammy_executable
+    if args.image_name is not None:
+        backend_options["image_name"] = args.image_name
+
+    journal = CheckpointJournal(args.journal) if args.journal is not None else None
+    if args.manifest is not None:
+        jobs = read_manifest(args.manifest, work_root=args.work_root)
+    elif journal is not None:
+        # Restart a campaign from the job specifications recorded in its journal
+        jobs = journal.jobs()
+    else:
+        print("A manifest or a checkpoint journal (--journal) is required")
+        return 1
+    source = args.manifest if args.manifest is not None else args.journal
+    index_file = args.index if args.index is not None else source.with_suffix(".results.jsonl")
+    retry_policy = RetryPolicy(max_attempts=args.retries) if args.retries > 1 else None
+
+    runner = BatchRunner(
+        factory_runner(args.backend, **backend_options),
+        ResultsIndex(index_file),
+        workers=args.workers,
+        retry_policy=retry_policy,
+        scratch_root=args.scratch,
+        telemetry=TelemetryStore(args.telemetry) if args.telemetry is not None else None,
+        journal=journal,
+    )
+    summary = runner.run(jobs, resume=not args.no_resume)
+
+    print(
+        f"{summary.succeeded} succeeded, {summary.failed} failed, {summary.errors} errors, "
+        f"{summary.skipped} skipped (index: {index_file})"
+    )
+    return 0 if summary.failed == 0 and summary.errors == 0 else 1
@@ -0,0 +1,330 @@
+#!/usr/bin/env python
+"""
+Crash-safe checkpoint journal of SAMMY campaigns.
+
+A campaign of thousands of jobs must survive the death of the Python driver
+(killed session, node failure, out-of-memory). The checkpoint journal is an
+append-only JSON Lines file recording, in order:
+
+- the specification of every job of the campaign ("job" events), so that the
+  campaign can be restarted from the journal alone,
+- the start of each job ("started" events),
+- the completion of each job with its status and the output files collected
+  into its output directory ("completed" events).
+
+Every append is flushed and fsync'd before the call returns, so an event that
+was written survives a crash. A line truncated by a crash is cut off when the
+journal is reopened.
+
+On restart, `recover` replays the journal:
+
+- jobs completed successfully whose collected outputs are all still in their
+  output directory are skipped,
+- jobs that were started but never completed may have been interrupted while
+  running or while their outputs were being collected. Their partial outputs,
+  in the output directory or left in the working directory, are moved to the
+  quarantine directory output_dir/.interrupted, so that the rerun cannot
+  collect them as its own, and the job runs again.
+"""
+
+import base64
+import json
+import os
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from pleiades.sammy.orchestration.jobs import SammyJob
+from pleiades.sammy.staging import StagingStrategy, move_file
+from pleiades.utils.logger import loguru_logger
+
+logger = loguru_logger.bind(name=__name__)
+
+# Journal events
+EVENT_JOB = "job"
+EVENT_STARTED = "started"
+EVENT_COMPLETED = "completed"
+
+# Checkpoint states of a job
+STATE_PENDING = "pending"  # Registered, never started
+STATE_STARTED = "started"  # Started, no completion recorded (running or interrupted)
+STATE_COMPLETED = "completed"  # Completion recorded
+
+# SAMMY output files are the files starting with this prefix (see SammyRunner.collect_outputs)
+OUTPUT_PREFIX = "SAM"
+# Subdirectory of the output directory receiving the partial outputs of interrupted jobs
+INTERRUPTED_DIRNAME = ".interrupted"
+
+
+def _encode_content(content):
+    """Encode an in-memory input for JSON; bytes are stored as base64."""
+    if isinstance(content, bytes):
+        return {"base64": base64.b64encode(content).decode("ascii")}
+    return content
+
+
+def _decode_content(content):
+    if isinstance(content, dict):
+        return base64.b64decode(content["base64"])
+    return content
+
+
+def job_to_dict(job: SammyJob) -> dict:
+    """
+    Serialize a job specification to a JSON-compatible dictionary.
+
+    Args:
+        job: Job to serialize; its metadata must be JSON-serializable
+
+    Returns:
+        dict: Job specification
+    """
+    return {
+        "job_id": job.job_id,
+        "input_file": str(job.input_file),
+        "parameter_file": str(job.parameter_file),
+        "data_file": str(job.data_file),
+        "working_dir": str(job.working_dir),
+        "output_dir": str(job.output_dir),
+        "metadata": job.metadata,
+        "staging": job.staging.value,
+        "input_content": _encode_content(job.input_content),
+        "parameter_content": _encode_content(job.parameter_content),
+        "data_content": _encode_content(job.data_content),
+    }
+
+
+def job_from_dict(spec: dict) -> SammyJob:
+    """
+    Rebuild a job from its specification.
+
+    Args:
+        spec: Dictionary returned by job_to_dict
+
+    Returns:
+        SammyJob: Job equivalent to the serialized one
+    """
+    return SammyJob(
+        job_id=spec["job_id"],
+        input_file=Path(spec["input_file"]),
+        parameter_file=Path(spec["parameter_file"]),
+        data_file=Path(spec["data_file"]),
+        working_dir=Path(spec["working_dir"]),
+        output_dir=Path(spec["output_dir"]),
+        metadata=spec.get("metadata", {}),
+        staging=StagingStrategy(spec.get("staging", StagingStrategy.COPY.value)),
+        input_content=_decode_content(spec.get("input_content")),
+        parameter_content=_decode_content(spec.get("parameter_content")),
+        data_content=_decode_content(spec.get("data_content")),
+    )
+
+
+def list_outputs(output_dir: Path) -> List[str]:
+    """Names of the SAMMY output files in a directory, sorted."""
+    if not Path(output_dir).is_dir():
+        return []
+    with os.scandir(output_dir) as entries:
+        return sorted(entry.name for entry in entries if entry.name.startswith(OUTPUT_PREFIX) and entry.is_file())
+
+
+@dataclass
+class JobCheckpoint:
+    """Checkpoint state of a job, as replayed from the journal."""
+
+    job: SammyJob
+    state: str = STATE_PENDING
+    success: Optional[bool] = None
+    status: Optional[str] = None
+    outputs: List[str] = field(default_factory=list)  # Output files collected at completion
+
+
+class CheckpointJournal:
+    """
+    Append-only, fsync'd journal of job specifications and completion states.
+
+    Attributes:
+        path: Journal file
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._repair()
+
+    def _repair(self) -> None:
+        """Cut off a last line truncated by a crash, so that new events start on a fresh line."""
+        if not self.path.is_file():
+            return
+        with open(self.path, "rb+") as f:
+            content = f.read()
+            if not content or content.endswith(b"\n"):
+                return
+            keep = content.rfind(b"\n") + 1
+            logger.warning(f"Discarding {len(content) - keep} bytes of a truncated event at the end of {self.path}")
+            f.truncate(keep)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _append(self, events: List[dict]) -> None:
+        """Append events and wait until they are on disk."""
+        if not events:
+            return
+        with self._lock:
+            created = not self.path.exists()
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a") as f:
+                f.write("".join(json.dumps(event) + "\n" for event in events))
+                f.flush()
+                os.fsync(f.fileno())
+            if created and hasattr(os, "O_DIRECTORY"):
+                # Make the new directory entry durable as well
+                directory = os.open(self.path.parent, os.O_RDONLY | os.O_DIRECTORY)
+                try:
+                    os.fsync(directory)
+                finally:
+                    os.close(directory)
+
+    def _read_events(self) -> List[dict]:
+        events = []
+        if not self.path.is_file():
+            return events
+        with open(self.path) as f:
+            for line_number, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    events.append(json.loads(line))
+                except ValueError as e:
+                    logger.warning(f"Ignoring invalid line {line_number} of {self.path}: {str(e)}")
+        return events
+
+    def replay(self) -> Dict[str, JobCheckpoint]:
+        """
+        Rebuild the checkpoint state of every job from the journal.
+
+        A job registered again with a different specification starts over as pending.
+
+        Returns:
+            Dict mapping job id -> JobCheckpoint, in registration order
+        """
+        checkpoints: Dict[str, JobCheckpoint] = {}
+        for event in self._read_events():
+            kind = event.get("event")
+            if kind == EVENT_JOB:
+                job = job_from_dict(event["job"])
+                checkpoints[job.job_id] = JobCheckpoint(job=job)
+                continue
+
+            checkpoint = checkpoints.get(event.get("job_id"))
+            if checkpoint is None:
+                logger.warning(f"Ignoring {kind} event of unregistered job {event.get('job_id')}")
+            elif kind == EVENT_STARTED:
+                checkpoint.state = STATE_STARTED
+            elif kind == EVENT_COMPLETED:
+                checkpoint.state = STATE_COMPLETED
+                checkpoint.success = event["success"]
+                checkpoint.status = event.get("status")
+                checkpoint.outputs = event.get("outputs", [])
+        return checkpoints
+
+    def jobs(self) -> List[SammyJob]:
+        """Jobs of the campaign, in registration order."""
+        return [checkpoint.job for checkpoint in self.replay().values()]
+
+    def register(self, jobs: Iterable[SammyJob]) -> None:
+        """
+        Record the specification of jobs not yet in the journal (or whose specification changed).
+
+        Args:
+            jobs: Jobs of the campaign
+        """
+        known = {job_id: job_to_dict(checkpoint.job) for job_id, checkpoint in self.replay().items()}
+        events = []
+        for job in jobs:
+            # Compare in JSON form, as replayed (e.g. tuples in metadata come back as lists)
+            spec = json.loads(json.dumps(job_to_dict(job)))
+            if known.get(job.job_id) != spec:
+                events.append({"event": EVENT_JOB, "job": spec})
+                known[job.job_id] = spec
+        self._append(events)
+        if events:
+            logger.debug(f"Registered {len(events)} jobs in checkpoint journal {self.path}")
+
+    def mark_started(self, job: SammyJob) -> None:
+        """Record that a job is about to run."""
+        self._append([{"event": EVENT_STARTED, "job_id": job.job_id, "time": datetime.now().isoformat()}])
+
+    def mark_completed(self, job: SammyJob, success: bool, status: Optional[str] = None) -> None:
+        """
+        Record the completion of a job with the outputs collected into its output directory.
+
+        Args:
+            job: Finished job
+            success: Whether the job succeeded; only successful jobs are skipped on restart
+            status: Optional status label (e.g. the batch record status)
+        """
+        self._append(
+            [
+                {
+                    "event": EVENT_COMPLETED,
+                    "job_id": job.job_id,
+                    "success": success,
+                    "status": status,
+                    "outputs": list_outputs(job.output_dir),
+                    "time": datetime.now().isoformat(),
+                }
+            ]
+        )
+
+    @staticmethod
+    def _quarantine_outputs(job: SammyJob) -> List[str]:
+        """
+        Move the partial outputs of an interrupted job to output_dir/.interrupted.
+
+        Outputs left in the working directory are moved first, so that the ones
+        already collected into the output directory take precedence.
+
+        Returns:
+            Names of the quarantined outputs, sorted
+        """
+        quarantine = job.output_dir / INTERRUPTED_DIRNAME
+        moved = set()
+        for directory in (job.working_dir, job.output_dir):
+            for name in list_outputs(directory):
+                quarantine.mkdir(parents=True, exist_ok=True)
+                try:
+                    move_file(directory / name, quarantine / name)
+                    moved.add(name)
+                except OSError as e:
+                    logger.error(f"Failed to quarantine {name} of job {job.job_id}: {str(e)}")
+        return sorted(moved)
+
+    def recover(self) -> set:
+        """
+        Determine the jobs to skip on restart and clean up after interrupted ones.
+
+        Returns:
+            Ids of the jobs completed successfully whose collected outputs are all
+            still in their output directory
+        """
+        completed = set()
+        for job_id, checkpoint in self.replay().items():
+            job = checkpoint.job
+            if checkpoint.state == STATE_COMPLETED and checkpoint.success:
+                missing = set(checkpoint.outputs) - set(list_outputs(job.output_dir))
+                if not missing:
+                    completed.add(job_id)
+                else:
+                    logger.warning(f"Job {job_id} lost collected outputs {sorted(missing)}, it will run again")
+            elif checkpoint.state == STATE_STARTED:
+                quarantined = self._quarantine_outputs(job)
+                if quarantined:
+                    logger.warning(
+                        f"Job {job_id} was interrupted leaving {len(quarantined)} partial outputs, "
+                        f"moved them to {job.output_dir / INTERRUPTED_DIRNAME}"
+                    )
+                else:
+                    logger.info(f"Job {job_id} was interrupted, it will run again")
+        return completed
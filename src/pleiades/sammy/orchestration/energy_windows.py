@@ -0,0 +1,401 @@
+#!/usr/bin/env python
+"""
+Adaptive energy-window splitting of large SAMMY fits.
+
+The cost of a SAMMY fit grows quickly with the number of varied resonance
+parameters, so a single fit over a wide energy range of a dense resonance set
+(Hf, Ta, ...) is much slower than several fits over narrower ranges. This module
+partitions the data range into windows holding a bounded number of resonances,
+fits the windows as independent SAMMY jobs in parallel, and stitches the results
+back together:
+
+    fit = EnergyWindowFit(job, max_resonances=40, overlap=0.1)
+    result = fit.run(runner_factory, workers=8)
+    result.parameter_file  # stitched SAMNDF.PAR
+    result.lst_file  # stitched SAMMY.LST
+
+Each window owns the resonances of its core energy range. Its fit range extends
+the core by an overlap on both sides, so that resonances near a boundary are
+fitted with data on both of their sides. Every window parameter file keeps all
+resonances of Card 1 in their original order, but only those inside the fit
+range are varied; resonances outside it stay fixed and still contribute their
+tails. After the fits, each resonance is taken from the window owning it, and
+each LST data point from the window whose core contains its energy.
+
+Window boundaries are placed in the widest gap between resonances near the
+split point, away from resonance peaks. Resonances outside the data range (e.g.
+bound levels) belong to no window and keep their initial values.
+"""
+
+import math
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from pleiades.sammy.interface import RetryPolicy, SammyError, SammyExecutionResult
+from pleiades.sammy.io.card_formats.inp02_element import CARD02_FORMAT
+from pleiades.sammy.io.card_formats.par01_resonance_table import ResonanceTable
+from pleiades.sammy.io.par_index import Cards, ParCardIndex
+from pleiades.sammy.orchestration.jobs import RunnerFactory, SammyJob, run_job
+from pleiades.sammy.parameters.resonance import RESONANCE_FORMAT
+from pleiades.utils.logger import loguru_logger
+
+logger = loguru_logger.bind(name=__name__)
+
+# Output files of a window fit used for stitching
+WINDOW_PARAMETER_FILE = "SAMNDF.PAR"
+WINDOW_LST_FILE = "SAMMY.LST"
+
+# Columns of the vary flags of a Card 1 resonance line
+VARY_FLAGS = slice(RESONANCE_FORMAT["vary_energy"].start, RESONANCE_FORMAT["vary_channel3"].stop)
+FIXED_FLAGS = " 0" * 5
+
+# Fraction of a window's resonances, counted back from the split point, searched for the widest gap
+SPLIT_SEARCH_FRACTION = 0.25
+
+
+@dataclass
+class EnergyWindow:
+    """One energy window of a split fit."""
+
+    index: int
+    core_min: float  # Energy range owned by the window (eV)
+    core_max: float
+    fit_min: float  # Energy range fitted by the window, core plus overlap (eV)
+    fit_max: float
+    n_resonances: int  # Resonances inside the core range
+
+    def owns(self, energy: float, last: bool = False) -> bool:
+        """Whether an energy falls in the core range, the last window including its upper bound."""
+        return self.core_min <= energy < self.core_max or (last and energy == self.core_max)
+
+
+@dataclass
+class WindowFitResult:
+    """Outcome of a split fit."""
+
+    windows: List[EnergyWindow]
+    results: List[Optional[SammyExecutionResult]]  # One per window, in window order; None if the run raised
+    parameter_file: Optional[Path] = None  # Stitched parameters, None if a window failed
+    lst_file: Optional[Path] = None  # Stitched LST curves, None if a window failed
+    failed_windows: List[int] = field(default_factory=list)
+    errors: Dict[int, str] = field(default_factory=dict)  # Error raised by the run, by window index
+
+    @property
+    def success(self) -> bool:
+        return not self.failed_windows
+
+
+def plan_windows(
+    resonance_energies: Sequence[float],
+    energy_range: Tuple[float, float],
+    max_resonances: int = 50,
+    overlap: float = 0.1,
+) -> List[EnergyWindow]:
+    """
+    Partition an energy range into windows of at most `max_resonances` resonances.
+
+    Args:
+        resonance_energies: Resonance energies (eV), in any order
+        energy_range: (min, max) energy range of the data (eV)
+        max_resonances: Maximum number of resonances in a window core
+        overlap: Fit range extension on each side, as a fraction of the core width
+
+    Returns:
+        List[EnergyWindow]: Windows tiling energy_range, in increasing energy
+    """
+    if max_resonances < 1:
+        raise ValueError(f"Invalid max_resonances: {max_resonances}")
+    if overlap < 0:
+        raise ValueError(f"Invalid overlap: {overlap}")
+    min_energy, max_energy = energy_range
+    if max_energy <= min_energy:
+        raise ValueError(f"Invalid energy range: {energy_range}")
+
+    energies = np.sort(np.asarray(resonance_energies, dtype=float))
+    energies = energies[(energies >= min_energy) & (energies <= max_energy)]
+
+    # Split points between consecutive resonances
+    boundaries = [min_energy]
+    start = 0
+    while len(energies) - start > max_resonances:
+        stop = start + max_resonances  # First resonance of the next window at the latest
+        search_from = max(start + 1, stop - max(1, int(max_resonances * SPLIT_SEARCH_FRACTION)))
+        gaps = energies[search_from : stop + 1] - energies[search_from - 1 : stop]
+        split = search_from + int(np.argmax(gaps))
+        boundaries.append(0.5 * (energies[split - 1] + energies[split]))
+        start = split
+    boundaries.append(max_energy)
+
+    windows = []
+    for index, (core_min, core_max) in enumerate(zip(boundaries[:-1], boundaries[1:])):
+        margin = overlap * (core_max - core_min)
+        windows.append(
+            EnergyWindow(
+                index=index,
+                core_min=float(core_min),
+                core_max=float(core_max),
+                fit_min=float(max(min_energy, core_min - margin)),
+                fit_max=float(min(max_energy, core_max + margin)),
+                n_resonances=int(np.count_nonzero((energies >= core_min) & (energies < core_max))),
+            )
+        )
+    if windows:
+        windows[-1].n_resonances += int(np.count_nonzero(energies == max_energy))
+    return windows
+
+
+def _split_card1(lines: List[str]) -> Tuple[List[str], List[str], List[str]]:
+    """
+    Split parameter file lines around the Card 1 resonance lines, found with ParCardIndex.
+
+    Returns:
+        The lines before the resonances (the Card 1 header, if any), the resonance lines and the remaining lines
+
+    Raises:
+        ValueError: If the lines have no resonances
+    """
+    span = ParCardIndex(lines).find(Cards.PAR_CARD_1)
+    if span is None:
+        raise ValueError("Parameter file has no resonances (Card 1)")
+    start = span.start + span.has_header
+    return lines[:start], lines[start : span.end], lines[span.end :]
+
+
+def _format_card2_energy(value: float, round_up: bool) -> str:
+    """
+    Format an energy for a 10-column field of Card Set 2, rounded outward.
+
+    As many decimals as fit in 9 characters are kept, so that the field is
+    always separated from the next one.
+    """
+    decimals = max(0, 7 - len(str(int(abs(value)))))
+    scale = 10**decimals
+    rounded = (math.ceil if round_up else math.floor)(value * scale) / scale
+    # Fortran F fields without a decimal point would imply decimals
+    text = f"{rounded:.{decimals}f}" if decimals else f"{rounded:.0f}."
+    return text.ljust(10)
+
+
+def _data_energy(line: str) -> Optional[float]:
+    fields = line.split()
+    try:
+        return float(fields[0]) if fields else None
+    except ValueError:
+        return None
+
+
+class EnergyWindowFit:
+    """
+    Fit a spectrum as several energy windows run in parallel.
+
+    Attributes:
+        job: Job describing the full-range fit; its output directory receives the stitched results
+        max_resonances: Maximum number of resonances owned by a window
+        overlap: Fit range extension on each side of a window, as a fraction of its core width
+    """
+
+    def __init__(self, job: SammyJob, max_resonances: int = 50, overlap: float = 0.1):
+        self.job = job
+        self.max_resonances = max_resonances
+        self.overlap = overlap
+        self._par_lines = Path(job.parameter_file).read_text().splitlines()
+        self._card1_header, self._resonance_lines, self._other_par_lines = _split_card1(self._par_lines)
+        self._resonance_energies = ResonanceTable.from_lines(self._resonance_lines).data["resonance_energy"].tolist()
+        self._data_lines = Path(job.data_file).read_text().splitlines()
+
+    def data_range(self) -> Tuple[float, float]:
+        """Energy range covered by the data file."""
+        energies = [energy for energy in map(_data_energy, self._data_lines) if energy is not None]
+        if not energies:
+            raise ValueError(f"No data points in {self.job.data_file}")
+        return min(energies), max(energies)
+
+    def plan(self) -> List[EnergyWindow]:
+        """Plan the windows from the resonance energies and the data range."""
+        return plan_windows(self._resonance_energies, self.data_range(), self.max_resonances, self.overlap)
+
+    def build_jobs(self, windows: List[EnergyWindow]) -> List[SammyJob]:
+        """
+        Write the input, parameter and data files of every window.
+
+        Args:
+            windows: Windows returned by plan()
+
+        Returns:
+            List[SammyJob]: One job per window, under job.working_dir/windows
+        """
+        inp_lines = Path(self.job.input_file).read_text().splitlines()
+        card2 = f"{inp_lines[1]:<{CARD02_FORMAT['max_energy'].stop}}"
+        root = self.job.working_dir / "windows"
+
+        jobs = []
+        for window in windows:
+            name = f"window_{window.index:03d}"
+            inputs_dir = root / name / "inputs"
+            inputs_dir.mkdir(parents=True, exist_ok=True)
+
+            # Card Set 2 holds the energy range, rounded outward so that no fitted point is cut off
+            min_field = _format_card2_energy(window.fit_min, round_up=False)
+            max_field = _format_card2_energy(window.fit_max, round_up=True)
+            fit_min, fit_max = float(min_field), float(max_field)
+            window_inp = list(inp_lines)
+            window_inp[1] = (
+                card2[: CARD02_FORMAT["min_energy"].start]
+                + min_field
+                + max_field
+                + card2[CARD02_FORMAT["max_energy"].stop :]
+            ).rstrip()
+
+            resonance_lines = [
+                line
+                if fit_min <= energy <= fit_max
+                else f"{line:<{VARY_FLAGS.stop}}"[: VARY_FLAGS.start] + FIXED_FLAGS + line[VARY_FLAGS.stop :]
+                for line, energy in zip(self._resonance_lines, self._resonance_energies)
+            ]
+            # Non-numeric lines (headers) are kept, data points only inside the fit range
+            data_lines = [
+                line
+                for line in self._data_lines
+                if line.strip() and ((energy := _data_energy(line)) is None or fit_min <= energy <= fit_max)
+            ]
+
+            input_file = inputs_dir / f"{name}.inp"
+            input_file.write_text("\n".join(window_inp) + "\n")
+            parameter_file = inputs_dir / f"{name}.par"
+            parameter_file.write_text("\n".join(self._card1_header + resonance_lines + self._other_par_lines) + "\n")
+            data_file = inputs_dir / f"{name}{self.job.data_file.suffix}"
+            data_file.write_text("\n".join(data_lines) + "\n")
+
+            jobs.append(
+                SammyJob(
+                    job_id=f"{self.job.job_id}_{name}",
+                    input_file=input_file,
+                    parameter_file=parameter_file,
+                    data_file=data_file,
+                    working_dir=root / name,
+                    metadata={"window": window.index, "fit_range": (fit_min, fit_max)},
+                    staging=self.job.staging,
+                )
+            )
+        return jobs
+
+    def stitch_parameters(self, windows: List[EnergyWindow], parameter_files: List[Path], output_file: Path) -> Path:
+        """
+        Assemble the parameter file of the full range from the window fits.
+
+        Each resonance is taken from the window whose core contains its initial
+        energy; resonances outside the data range keep their initial values, and
+        the other cards are taken from the first window.
+
+        Raises:
+            ValueError: If a window parameter file does not have the original resonances
+        """
+        window_cards = []
+        for parameter_file in parameter_files:
+            header, resonance_lines, other_lines = _split_card1(Path(parameter_file).read_text().splitlines())
+            if len(resonance_lines) != len(self._resonance_lines):
+                raise ValueError(
+                    f"{parameter_file} has {len(resonance_lines)} resonances, expected {len(self._resonance_lines)}"
+                )
+            window_cards.append((header, resonance_lines, other_lines))
+
+        stitched = list(self._resonance_lines)
+        for index, energy in enumerate(self._resonance_energies):
+            for window in windows:
+                if window.owns(energy, last=window is windows[-1]):
+                    stitched[index] = window_cards[window.index][1][index]
+                    break
+
+        header, _, other_lines = window_cards[0]
+        output_file.write_text("\n".join(header + stitched + other_lines) + "\n")
+        return output_file
+
+    @staticmethod
+    def stitch_lst(windows: List[EnergyWindow], lst_files: List[Path], output_file: Path) -> Path:
+        """
+        Assemble the LST curves of the full range, each point from the window owning its energy.
+
+        Raises:
+            ValueError: If the window LST files have different columns
+        """
+        blocks = []
+        for window, lst_file in zip(windows, lst_files):
+            table = np.loadtxt(lst_file, ndmin=2)
+            owned = np.array([window.owns(energy, last=window is windows[-1]) for energy in table[:, 0]], dtype=bool)
+            blocks.append(table[owned])
+        if len({block.shape[1] for block in blocks}) > 1:
+            raise ValueError("Window LST files have different numbers of columns")
+
+        stitched = np.concatenate(blocks)
+        np.savetxt(output_file, stitched[np.argsort(stitched[:, 0], kind="stable")], fmt="%15.7E")
+        return output_file
+
+    def run(
+        self,
+        runner_factory: RunnerFactory,
+        workers: int = 4,
+        retry_policy: Optional[RetryPolicy] = None,
+        scratch_root: Optional[Path] = None,
+    ) -> WindowFitResult:
+        """
+        Plan, fit and stitch the windows.
+
+        Args:
+            runner_factory: Callable creating a runner for each window's directories
+            workers: Number of windows fitted concurrently
+            retry_policy: Optional policy retrying transient backend failures
+            scratch_root: Optional parent of temporary working directories
+
+        Returns:
+            WindowFitResult: Window results and the stitched files in job.output_dir.
+            A window raising a SammyError is reported in failed_windows and errors,
+            without stopping the other windows.
+        """
+        windows = self.plan()
+        jobs = self.build_jobs(windows)
+        logger.info(
+            f"Fitting {self.job.job_id} as {len(windows)} energy windows "
+            f"({len(self._resonance_lines)} resonances, {workers} workers)"
+        )
+
+        errors = {}
+
+        def run_window(window: EnergyWindow, job: SammyJob) -> Optional[SammyExecutionResult]:
+            try:
+                return run_job(job, runner_factory, retry_policy=retry_policy, scratch_root=scratch_root)
+            except SammyError as e:
+                logger.error(f"Energy window {window.index} of {self.job.job_id} raised an error: {str(e)}")
+                errors[window.index] = str(e)
+                return None
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(run_window, windows, jobs))
+
+        fit_result = WindowFitResult(windows=windows, results=results, errors=errors)
+        fit_result.failed_windows = [
+            window.index
+            for window, job, result in zip(windows, jobs, results)
+            if result is None
+            or not result.success
+            or not (job.output_dir / WINDOW_PARAMETER_FILE).is_file()
+            or not (job.output_dir / WINDOW_LST_FILE).is_file()
+        ]
+        if fit_result.failed_windows:
+            logger.error(f"Energy windows {fit_result.failed_windows} of {self.job.job_id} failed, nothing stitched")
+            return fit_result
+
+        self.job.output_dir.mkdir(parents=True, exist_ok=True)
+        fit_result.parameter_file = self.stitch_parameters(
+            windows,
+            [job.output_dir / WINDOW_PARAMETER_FILE for job in jobs],
+            self.job.output_dir / WINDOW_PARAMETER_FILE,
+        )
+        fit_result.lst_file = self.stitch_lst(
+            windows, [job.output_dir / WINDOW_LST_FILE for job in jobs], self.job.output_dir / WINDOW_LST_FILE
+        )
+        logger.info(f"Stitched {len(windows)} energy windows of {self.job.job_id} into {self.job.output_dir}")
+        return fit_result
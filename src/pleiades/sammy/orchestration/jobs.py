@@ -0,0 +1,241 @@
+#!/usr/bin/env python
+"""
+Job descriptions shared by the SAMMY orchestration tools.
+
+A campaign (per-pixel fits, time series, sweeps, ...) is a sequence of independent
+SAMMY runs. Each run is described by a SammyJob, and executed through a runner
+factory so that every job gets its own working and output directories.
+"""
+
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Optional, Tuple, Union
+
+from pleiades.sammy.interface import RetryPolicy, SammyExecutionResult, SammyFiles, SammyRunner
+from pleiades.sammy.io.lpt_manager import LptManager
+from pleiades.sammy.io.lpt_stream import read_final_lpt_block
+from pleiades.sammy.staging import StagingStrategy, scratch_directory
+from pleiades.utils.logger import loguru_logger
+
+if TYPE_CHECKING:
+    from pleiades.sammy.orchestration.telemetry import TelemetryStore
+
+logger = loguru_logger.bind(name=__name__)
+
+# Callable building a configured runner for a (working_dir, output_dir) pair
+RunnerFactory = Callable[[Path, Path], SammyRunner]
+
+# Log file collected from every SAMMY run
+LPT_FILE = "SAMMY.LPT"
+
+
+# Content of an input rendered in memory
+InputContent = Union[str, bytes]
+
+
+@dataclass
+class SammyJob:
+    """
+    Description of a single SAMMY run within a campaign.
+
+    Inputs may be rendered in memory instead of being read from disk, e.g. with
+    InpManager.generate_inp_content, ParManager.generate_par_content or
+    render_sammy_twenty. A rendered input is written once, under the name of the
+    corresponding file field, directly into the directory the job runs in (its
+    working or scratch directory), and used there without further staging.
+    """
+
+    job_id: str
+    input_file: Path
+    parameter_file: Path
+    data_file: Path
+    working_dir: Path
+    output_dir: Optional[Path] = None
+    metadata: dict = field(default_factory=dict)
+    staging: StagingStrategy = StagingStrategy.COPY  # How inputs are placed into the working directory
+    input_content: Optional[InputContent] = None  # Rendered input file, replaces reading input_file
+    parameter_content: Optional[InputContent] = None  # Rendered parameter file, replaces reading parameter_file
+    data_content: Optional[InputContent] = None  # Rendered data file, replaces reading data_file
+
+    def __post_init__(self):
+        self.input_file = Path(self.input_file)
+        self.parameter_file = Path(self.parameter_file)
+        self.data_file = Path(self.data_file)
+        self.working_dir = Path(self.working_dir)
+        # Default output directory follows the SammyFactory convention
+        self.output_dir = Path(self.output_dir) if self.output_dir is not None else self.working_dir / "output"
+
+    def to_files(self, parameter_file: Optional[Path] = None) -> SammyFiles:
+        """
+        Build the SammyFiles container for this job.
+
+        Args:
+            parameter_file: Optional parameter file overriding the job's default one
+
+        Returns:
+            SammyFiles: Fresh container pointing at the job's input files
+        """
+        return SammyFiles(
+            input_file=self.input_file,
+            parameter_file=Path(parameter_file) if parameter_file is not None else self.parameter_file,
+            data_file=self.data_file,
+            staging=self.staging,
+        )
+
+
+def read_reduced_chi_squared(output_dir: Path) -> Optional[float]:
+    """
+    Read the reduced chi-squared of the last fit block in a job LPT file.
+
+    Args:
+        output_dir: Output directory of a finished job
+
+    Returns:
+        Reduced chi-squared, or None if the LPT file is missing or unreadable
+    """
+    lpt_file = Path(output_dir) / LPT_FILE
+    if not lpt_file.is_file():
+        return None
+    try:
+        # The last block usually has it, no need to parse the whole file
+        final = read_final_lpt_block(lpt_file)
+        if final is not None and final.chi_squared_results.reduced_chi_squared is not None:
+            return final.chi_squared_results.reduced_chi_squared
+        fit_results = LptManager(str(lpt_file)).run_results.fit_results
+    except Exception as e:
+        logger.debug(f"Could not parse {lpt_file}: {str(e)}")
+        return None
+    for fit_result in reversed(fit_results):
+        if fit_result.chi_squared_results.reduced_chi_squared is not None:
+            return fit_result.chi_squared_results.reduced_chi_squared
+    return None
+
+
+def factory_runner(backend_type: str, **kwargs) -> RunnerFactory:
+    """
+    Create a RunnerFactory backed by SammyFactory.create_runner.
+
+    Args:
+        backend_type: Type of backend ("local", "docker", or "nova")
+        **kwargs: Backend-specific configuration options forwarded to create_runner
+
+    Returns:
+        RunnerFactory: Callable returning a configured runner for given directories
+    """
+    # Imported here to avoid pulling every backend in when only the job model is needed
+    from pleiades.sammy.factory import SammyFactory
+
+    def _create(working_dir: Path, output_dir: Path) -> SammyRunner:
+        return SammyFactory.create_runner(
+            backend_type=backend_type, working_dir=working_dir, output_dir=output_dir, **kwargs
+        )
+
+    return _create
+
+
+def run_job(
+    job: SammyJob,
+    runner_factory: RunnerFactory,
+    parameter_file: Optional[Path] = None,
+    retry_policy: Optional[RetryPolicy] = None,
+    scratch_root: Optional[Path] = None,
+    telemetry: Optional["TelemetryStore"] = None,
+) -> SammyExecutionResult:
+    """
+    Execute a single job through a freshly created runner.
+
+    The runner goes through the usual prepare/execute/collect/cleanup sequence.
+    Outputs are collected into job.output_dir even when SAMMY reports a failure,
+    so that the LPT file is available for diagnosis.
+
+    Args:
+        job: Job to execute
+        runner_factory: Callable building a runner for the job directories
+        parameter_file: Optional parameter file overriding the job's default one
+        retry_policy: Optional policy retrying transient backend failures
+        scratch_root: Optional parent directory (e.g. /dev/shm, see
+            staging.default_scratch_root) of a temporary working directory used
+            instead of job.working_dir and removed after the run
+        telemetry: Optional store recording the run's telemetry
+
+    Returns:
+        SammyExecutionResult: Result reported by the backend
+
+    Raises:
+        SammyError: If any stage of the execution fails
+    """
+    job.working_dir.mkdir(parents=True, exist_ok=True)
+    job.output_dir.mkdir(parents=True, exist_ok=True)
+
+    if scratch_root is None:
+        job, files = _job_files(job, job.working_dir, parameter_file)
+        return _execute(job, runner_factory, job.working_dir, files, retry_policy, telemetry)
+
+    with scratch_directory(scratch_root, prefix=f"sammy_{job.job_id}_") as scratch:
+        job, files = _job_files(job, scratch, parameter_file)
+        return _execute(job, runner_factory, scratch, files, retry_policy, telemetry)
+
+
+def _job_files(job: SammyJob, working_dir: Path, parameter_file: Optional[Path]) -> Tuple[SammyJob, SammyFiles]:
+    """
+    Build the files of a run, writing the job's rendered inputs into its working directory.
+
+    Returns:
+        The job with its file fields pointing at the inputs actually run, and the
+        SammyFiles container of the run
+    """
+    files = job.to_files(parameter_file)
+    contents = {
+        "input_file": job.input_content,
+        # A parameter file given explicitly (e.g. a warm start seed) takes precedence
+        "parameter_file": job.parameter_content if parameter_file is None else None,
+        "data_file": job.data_content,
+    }
+    rendered = {}
+    for field_name, content in contents.items():
+        if content is None:
+            # Inputs may be referenced from a different directory, so their paths must be absolute
+            setattr(files, field_name, getattr(files, field_name).absolute())
+            continue
+        path = working_dir / getattr(job, field_name).name
+        if isinstance(content, bytes):
+            path.write_bytes(content)
+        else:
+            path.write_text(content)
+        setattr(files, field_name, path)
+        rendered[field_name] = path
+
+    if rendered:
+        logger.debug(f"Wrote rendered inputs of job {job.job_id} into {working_dir}: {', '.join(rendered)}")
+        # Later stages (e.g. telemetry) read the inputs that were actually run
+        job = replace(job, **rendered)
+    return job, files
+
+
+def _execute(
+    job: SammyJob,
+    runner_factory: RunnerFactory,
+    working_dir: Path,
+    files: SammyFiles,
+    retry_policy: Optional[RetryPolicy],
+    telemetry: Optional["TelemetryStore"] = None,
+) -> SammyExecutionResult:
+    """Run the prepare/execute/collect/cleanup sequence in the given working directory."""
+    runner = runner_factory(working_dir, job.output_dir)
+    # Staging may repoint the files at their working directory copies
+    parameter_file = files.parameter_file
+
+    logger.debug(f"Running job {job.job_id} in {working_dir} with parameter file {files.parameter_file}")
+    try:
+        runner.prepare_environment(files)
+        if retry_policy is not None:
+            result = runner.execute_with_retry(files, retry_policy)
+        else:
+            result = runner.execute_sammy(files)
+        runner.collect_outputs(result)
+        if telemetry is not None:
+            # Recorded after collection so that the LPT file is in the output directory
+            telemetry.record_run(job, result, runner, parameter_file)
+        return result
+    finally:
+        runner.cleanup()
@@ -0,0 +1,239 @@
+#!/usr/bin/env python
+"""
+Builder for simultaneous SAMMY fits of several spectra.
+
+Spectra that share resonance parameters (e.g. several regions of interest of
+the same sample) can be fitted together in a single SAMMY run instead of one
+run per spectrum. SAMMY reads one data file per run, so the spectra are merged
+into a single energy-ordered twenty file, fitted against a shared parameter
+file, and the correlations between parameters determined from all spectra are
+kept in one covariance matrix.
+
+A sidecar JSON file records which merged data point comes from which spectrum,
+so the SAMMY.LST results can be split back per spectrum after the fit.
+
+Because a data file describes a single sample, spectra whose experimental
+conditions differ (thickness, temperature, ...) cannot be merged this way and
+are rejected.
+"""
+
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from pleiades.sammy.data.options import SammyData
+from pleiades.sammy.io.data_manager import format_sammy_twenty, read_transmission_csv
+from pleiades.sammy.io.inp_manager import InpManager
+from pleiades.sammy.io.par_manager import ParManager
+from pleiades.sammy.orchestration.jobs import SammyJob
+from pleiades.utils.logger import loguru_logger
+
+logger = loguru_logger.bind(name=__name__)
+
+# Subdirectory of the working directory holding the spectrum layout sidecar
+INPUTS_DIRNAME = "joint_inputs"
+# Sidecar file mapping merged data points to spectra
+SEGMENTS_FILE = "joint_segments.json"
+
+
+@dataclass
+class SpectrumSpec:
+    """One spectrum of a joint fit."""
+
+    name: str
+    data_file: Path  # CSV, twenty or whitespace-separated data file
+    energy_range: Optional[Tuple[float, float]] = None  # Keep only points in [min, max] (eV)
+    conditions: Dict[str, float] = field(default_factory=dict)  # Experimental conditions, e.g. thickness
+
+    def __post_init__(self):
+        self.data_file = Path(self.data_file)
+
+
+class JointFitBuilder:
+    """
+    Assemble the inputs of a single SAMMY run fitting several spectra with shared parameters.
+
+    Attributes:
+        parameter_source: Shared parameter file, or ParManager generating it
+        inp_source: Input file, or InpManager generating it
+        spectra: Spectra added so far
+    """
+
+    def __init__(self, parameter_source: Union[Path, ParManager], inp_source: Union[Path, InpManager]):
+        self.parameter_source = parameter_source
+        self.inp_source = inp_source
+        self.spectra: List[SpectrumSpec] = []
+
+    def add_spectrum(
+        self,
+        name: str,
+        data_file: Path,
+        energy_range: Optional[Tuple[float, float]] = None,
+        conditions: Optional[Dict[str, float]] = None,
+    ) -> "JointFitBuilder":
+        """
+        Add a spectrum to the joint fit.
+
+        Args:
+            name: Unique name of the spectrum
+            data_file: Data file (CSV, twenty or whitespace-separated columns)
+            energy_range: Optional (min, max) energy window in eV
+            conditions: Experimental conditions, must match the other spectra
+
+        Returns:
+            JointFitBuilder: self, for chaining
+        """
+        if any(spectrum.name == name for spectrum in self.spectra):
+            raise ValueError(f"Duplicate spectrum name: {name}")
+        self.spectra.append(SpectrumSpec(name, data_file, energy_range, dict(conditions or {})))
+        return self
+
+    def _check_compatible(self) -> None:
+        """Check that the spectra can share a data file."""
+        if len(self.spectra) < 2:
+            raise ValueError("A joint fit needs at least two spectra")
+        reference = self.spectra[0]
+        for spectrum in self.spectra[1:]:
+            if spectrum.conditions != reference.conditions:
+                raise ValueError(
+                    f"Spectra {reference.name} and {spectrum.name} have different experimental conditions "
+                    f"({reference.conditions} != {spectrum.conditions}) and cannot share one SAMMY data file"
+                )
+
+    def _load_spectrum(self, spectrum: SpectrumSpec) -> np.ndarray:
+        """Read a spectrum and return its (energy, value, uncertainty) rows."""
+        data = read_transmission_csv(spectrum.data_file)
+        if spectrum.energy_range is not None:
+            min_energy, max_energy = spectrum.energy_range
+            data = data[(data[:, 0] >= min_energy) & (data[:, 0] <= max_energy)]
+        if len(data) == 0:
+            raise ValueError(f"Spectrum {spectrum.name} has no data points in its energy range")
+        return data
+
+    def _render_inp(self, min_energy: float, max_energy: float) -> str:
+        """Render the input file, widening an InpManager energy range to cover every spectrum."""
+        manager = self.inp_source
+        if manager.isotope_info is not None:
+            isotope_info = dict(manager.isotope_info)
+            isotope_info["min_energy_eV"] = min(isotope_info.get("min_energy_eV", min_energy), min_energy)
+            isotope_info["max_energy_eV"] = max(isotope_info.get("max_energy_eV", max_energy), max_energy)
+            manager = InpManager(
+                manager.options,
+                title=manager.title,
+                isotope_info=isotope_info,
+                physical_constants=manager.physical_constants,
+                reaction_type=manager.reaction_type,
+            )
+        return manager.generate_inp_content()
+
+    def build(self, working_dir: Path, job_id: str = "joint_fit", output_dir: Optional[Path] = None) -> SammyJob:
+        """
+        Render the merged data, input and parameter files and describe the run as a job.
+
+        Rendered inputs are kept in memory by the job and written once into the
+        directory the job runs in; input and parameter files given as paths are
+        used as they are. Only the spectrum layout sidecar is written here.
+
+        Args:
+            working_dir: Working directory of the joint run
+            job_id: Identifier of the job
+            output_dir: Optional output directory (defaults to working_dir/output)
+
+        Returns:
+            SammyJob: Job running the joint fit, with the spectrum layout in its metadata
+
+        Raises:
+            ValueError: If the spectra cannot be fitted together
+        """
+        self._check_compatible()
+        working_dir = Path(working_dir)
+        inputs_dir = working_dir / INPUTS_DIRNAME
+        inputs_dir.mkdir(parents=True, exist_ok=True)
+
+        blocks = [self._load_spectrum(spectrum) for spectrum in self.spectra]
+        merged = np.concatenate(blocks)
+        spectrum_index = np.concatenate([np.full(len(block), i) for i, block in enumerate(blocks)])
+
+        # SAMMY expects increasing energies; a stable sort keeps each spectrum's own order
+        order = np.argsort(merged[:, 0], kind="stable")
+        merged = merged[order]
+        spectrum_index = spectrum_index[order]
+
+        data_content = format_sammy_twenty(merged)
+
+        parameter_file, parameter_content = working_dir / f"{job_id}.par", None
+        if isinstance(self.parameter_source, ParManager):
+            parameter_content = self.parameter_source.generate_par_content()
+        else:
+            parameter_file = Path(self.parameter_source)
+
+        input_file, input_content = working_dir / f"{job_id}.inp", None
+        if isinstance(self.inp_source, InpManager):
+            input_content = self._render_inp(float(merged[0, 0]), float(merged[-1, 0]))
+        else:
+            input_file = Path(self.inp_source)
+
+        layout = {
+            "spectra": [
+                {
+                    "name": spectrum.name,
+                    "source": str(spectrum.data_file),
+                    "conditions": spectrum.conditions,
+                    "n_points": len(block),
+                    "energy_min": float(block[:, 0].min()),
+                    "energy_max": float(block[:, 0].max()),
+                }
+                for spectrum, block in zip(self.spectra, blocks)
+            ],
+            "spectrum_index": spectrum_index.tolist(),
+        }
+        segments_file = inputs_dir / SEGMENTS_FILE
+        segments_file.write_text(json.dumps(layout))
+
+        logger.info(f"Built joint fit {job_id}: {len(self.spectra)} spectra, {len(merged)} data points")
+        return SammyJob(
+            job_id=job_id,
+            input_file=input_file,
+            parameter_file=parameter_file,
+            data_file=working_dir / f"{job_id}.twenty",
+            working_dir=working_dir,
+            output_dir=output_dir,
+            metadata={"spectra": [spectrum.name for spectrum in self.spectra], "segments_file": str(segments_file)},
+            input_content=input_content,
+            parameter_content=parameter_content,
+            data_content=data_content,
+        )
+
+
+def split_lst(lst_file: Path, segments_file: Path) -> Dict[str, pd.DataFrame]:
+    """
+    Split the SAMMY.LST of a joint fit back into one table per spectrum.
+
+    Args:
+        lst_file: SAMMY.LST written by the joint run
+        segments_file: Sidecar JSON written by JointFitBuilder.build
+
+    Returns:
+        Dict mapping spectrum name -> rows of the LST table for that spectrum
+
+    Raises:
+        ValueError: If the LST rows do not match the merged data points
+    """
+    layout = json.loads(Path(segments_file).read_text())
+    spectrum_index = np.asarray(layout["spectrum_index"])
+    table = SammyData(data_file=Path(lst_file)).data
+
+    if len(table) != len(spectrum_index):
+        raise ValueError(
+            f"{lst_file} has {len(table)} rows but the joint fit has {len(spectrum_index)} data points; "
+            "check that the energy range of the input file covers every spectrum"
+        )
+
+    return {
+        spectrum["name"]: table[spectrum_index == i].reset_index(drop=True)
+        for i, spectrum in enumerate(layout["spectra"])
+    }
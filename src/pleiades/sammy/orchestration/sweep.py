@@ -0,0 +1,245 @@
+#!/usr/bin/env python
+"""
+Parameter sweeps: the same SAMMY fit repeated over a grid of starting values.
+
+Sensitivity studies repeat a fit while varying experimental parameters such as
+the sample thickness, the effective temperature or the normalization. A sweep
+takes the value ranges of these parameters, generates one parameter file per
+point of their cartesian grid, runs all variants through a pool of runners and
+returns a table with one row per variant:
+
+    sweep = ParameterSweep(job, {"thickness": [0.1, 0.2, 0.3], "temperature": np.linspace(280, 320, 5)})
+    table = sweep.run(factory_runner("local"), workers=8)
+
+Parameters are named by their attribute path in SammyParameterFile, e.g.
+"broadening.parameters.thick" or "normalization.angle_sets.0.anorm", or by one
+of the shorthands in PARAMETER_ALIASES.
+
+Variants are rendered from a compiled template of the base parameter file (see
+ParTemplate): the cards holding swept parameters are rendered once, and every
+variant is written by formatting its values into the recorded fixed-width fields,
+so that a 10x10x100 grid renders no card at all after the template is compiled.
+The input and data files are shared by all variants.
+
+Variant job ids combine the grid position with a digest of the values (e.g.
+"si_004_1f3a9c2e"), so that re-running a sweep in the same directory with other
+values or another grid order reruns the changed variants instead of resuming
+from the records of different ones.
+"""
+
+import hashlib
+import json
+from pathlib import Path
+from typing import List, Mapping, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from pleiades.sammy.interface import RetryPolicy, SammyError
+from pleiades.sammy.io.par_template import ParTemplate
+from pleiades.sammy.orchestration.batch import BatchRunner, ResultsIndex
+from pleiades.sammy.orchestration.jobs import RunnerFactory, SammyJob
+from pleiades.sammy.orchestration.telemetry import TelemetryStore
+from pleiades.utils.logger import loguru_logger
+
+logger = loguru_logger.bind(name=__name__)
+
+# Shorthand names of common sweep parameters -> attribute path in SammyParameterFile
+PARAMETER_ALIASES = {
+    "thickness": "broadening.parameters.thick",
+    "temperature": "broadening.parameters.temp",
+    "normalization": "normalization.angle_sets.0.anorm",
+    "background": "normalization.angle_sets.0.backa",
+}
+
+# Subdirectory of the sweep directory holding the generated parameter files
+PARAMETERS_DIRNAME = "parameters"
+# Results index of the sweep runs, in the sweep directory
+INDEX_FILE = "sweep_results.jsonl"
+# Number of hexadecimal digits of the value digest in variant job ids
+DIGEST_LENGTH = 8
+# Columns of the results table, after the parameter columns
+RESULT_COLUMNS = [
+    "status",
+    "reduced_chi_squared",
+    "runtime_seconds",
+    "failure_type",
+    "error",
+    "attempts",
+    "output_dir",
+]
+
+
+class SweepError(SammyError):
+    """Raised when a sweep cannot be set up from the base parameter file."""
+
+    pass
+
+
+class ParameterSweep:
+    """
+    Run a SAMMY job over the cartesian grid of several parameter ranges.
+
+    Attributes:
+        job: Base job; its parameter file provides the cards and values that are not swept
+        parameters: Mapping of parameter name -> values, in grid order
+        sweep_dir: Directory of the generated parameter files, per-variant
+            working directories and results index (defaults to job.working_dir / "sweep")
+        index: Results index of the sweep runs
+        paths: Mapping of parameter name -> attribute path in SammyParameterFile
+        template: Compiled template of the base parameter file with the swept fields
+    """
+
+    def __init__(
+        self,
+        job: SammyJob,
+        parameters: Mapping[str, Sequence[float]],
+        sweep_dir: Optional[Path] = None,
+    ):
+        if not parameters:
+            raise ValueError("A sweep needs at least one parameter")
+        self.job = job
+        self.parameters = {}
+        for name, values in parameters.items():
+            values = np.atleast_1d(np.asarray(values, dtype=float))
+            if values.ndim != 1 or values.size == 0:
+                raise ValueError(f"Sweep parameter '{name}' needs a non-empty 1-D sequence of values")
+            self.parameters[name] = values
+        self.sweep_dir = Path(sweep_dir) if sweep_dir is not None else job.working_dir / "sweep"
+        self.index = ResultsIndex(self.sweep_dir / INDEX_FILE)
+        self.paths = {name: PARAMETER_ALIASES.get(name, name) for name in self.parameters}
+        try:
+            self.template = ParTemplate.from_file(job.parameter_file, list(self.paths.values()))
+        except ValueError as e:
+            raise SweepError(str(e))
+
+    @property
+    def size(self) -> int:
+        """Number of variants in the grid."""
+        return int(np.prod([values.size for values in self.parameters.values()]))
+
+    def variants(self) -> pd.DataFrame:
+        """
+        Points of the parameter grid, the last parameter varying fastest.
+
+        Returns:
+            DataFrame indexed by variant job id (see `variant_id`) with one column per parameter
+        """
+        grids = np.meshgrid(*self.parameters.values(), indexing="ij")
+        table = pd.DataFrame({name: grid.ravel() for name, grid in zip(self.parameters, grids)})
+        table.index = pd.Index(
+            [self.variant_id(i, values) for i, values in enumerate(table.to_dict("records"))], name="job_id"
+        )
+        return table
+
+    def variant_id(self, position: int, values: Mapping[str, float]) -> str:
+        """
+        Job id of a variant: base job id, grid position and a digest of the swept values.
+
+        Args:
+            position: Position of the variant in the grid
+            values: Mapping of parameter name -> value of the variant
+
+        Returns:
+            str: e.g. "si_004_1f3a9c2e"
+        """
+        width = max(len(str(self.size - 1)), 3)
+        key = json.dumps({self.paths[name]: float(value) for name, value in values.items()}, sort_keys=True)
+        digest = hashlib.sha256(key.encode()).hexdigest()[:DIGEST_LENGTH]
+        return f"{self.job.job_id}_{position:0{width}d}_{digest}"
+
+    def build_jobs(self, variants: Optional[pd.DataFrame] = None) -> List[SammyJob]:
+        """
+        Write the parameter file of every variant and build its job.
+
+        Args:
+            variants: Optional table of variants (as returned by `variants`),
+                e.g. a subset of the grid; defaults to the full grid
+
+        Returns:
+            One SammyJob per variant, in table order
+        """
+        if variants is None:
+            variants = self.variants()
+        parameters_dir = self.sweep_dir / PARAMETERS_DIRNAME
+        parameters_dir.mkdir(parents=True, exist_ok=True)
+
+        suffix = self.job.parameter_file.suffix or ".par"
+        jobs = []
+        for job_id, values in zip(variants.index, variants.to_dict("records")):
+            parameter_file = parameters_dir / f"{job_id}{suffix}"
+            self.template.write(parameter_file, {self.paths[name]: value for name, value in values.items()})
+
+            working_dir = self.sweep_dir / job_id
+            jobs.append(
+                SammyJob(
+                    job_id=job_id,
+                    input_file=self.job.input_file,
+                    parameter_file=parameter_file,
+                    data_file=self.job.data_file,
+                    working_dir=working_dir,
+                    output_dir=working_dir / "output",
+                    metadata={**self.job.metadata, **values},
+                    staging=self.job.staging,
+                )
+            )
+        logger.info(f"Generated {len(jobs)} sweep variants of {self.job.job_id} in {parameters_dir}")
+        return jobs
+
+    def results(self, variants: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+        """
+        Tidy table of the recorded results.
+
+        Args:
+            variants: Optional table of variants; defaults to the full grid
+
+        Returns:
+            DataFrame indexed by variant job id with the parameter columns followed
+            by RESULT_COLUMNS; variants without a record have a missing status
+        """
+        if variants is None:
+            variants = self.variants()
+        records = self.index.read()
+        table = pd.DataFrame(
+            [[getattr(records[job_id], column) for column in RESULT_COLUMNS] for job_id in records],
+            index=pd.Index(list(records), name="job_id"),
+            columns=RESULT_COLUMNS,
+        )
+        return variants.join(table, how="left")
+
+    def run(
+        self,
+        runner_factory: RunnerFactory,
+        workers: int = 1,
+        retry_policy: Optional[RetryPolicy] = None,
+        scratch_root: Optional[Path] = None,
+        telemetry: Optional[TelemetryStore] = None,
+        resume: bool = True,
+    ) -> pd.DataFrame:
+        """
+        Generate and run every variant of the sweep.
+
+        Args:
+            runner_factory: Callable creating a runner for each variant's directories
+            workers: Number of variants fitted concurrently
+            retry_policy: Optional policy retrying transient backend failures
+            scratch_root: Optional parent of temporary working directories (e.g. /dev/shm)
+            telemetry: Optional store recording the telemetry of every run
+            resume: Skip the variants already recorded as successful in the results index;
+                variants whose values changed have new job ids and are run again
+
+        Returns:
+            DataFrame of results, see `results`
+        """
+        variants = self.variants()
+        jobs = self.build_jobs(variants)
+        runner = BatchRunner(
+            runner_factory,
+            self.index,
+            workers=workers,
+            retry_policy=retry_policy,
+            scratch_root=scratch_root,
+            telemetry=telemetry,
+        )
+        runner.run(jobs, resume=resume)
+        return self.results(variants)
@@ -0,0 +1,434 @@
+#!/usr/bin/env python
+"""
+Execution telemetry of SAMMY runs.
+
+Every run executed through run_job (and therefore the batch runner) can be
+recorded in an append-only SQLite database together with what drives its cost:
+backend, hashes of the input files, number of data points and resonances,
+number of fit iterations, wall time, peak memory and outcome.
+
+The store answers questions such as "how long does a fit take per data point on
+the docker backend" or "how many workers fit in 64 GB":
+
+    store = TelemetryStore("telemetry.sqlite")
+    runs = store.query(backend="local", success=True)
+    print(format_summary(store.summary(group_by="backend")))
+    store.suggest_workers(memory_budget_mb=64_000, backend="local")
+
+Rows are only ever inserted, so concurrent writers (batch worker threads or
+separate processes) never conflict beyond SQLite's own locking.
+"""
+
+import hashlib
+import socket
+import sqlite3
+from contextlib import closing
+from dataclasses import asdict, dataclass, fields
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+
+from pleiades.sammy.interface import SammyExecutionResult, SammyRunner
+from pleiades.sammy.io.card_formats.par01_resonances import Card01
+from pleiades.sammy.io.lpt_stream import iter_lpt_blocks, read_final_lpt_block
+from pleiades.sammy.io.par_index import Cards, ParCardIndex
+from pleiades.sammy.orchestration.jobs import LPT_FILE, SammyJob
+from pleiades.utils.logger import loguru_logger
+
+logger = loguru_logger.bind(name=__name__)
+
+# Columns by which summaries can be grouped
+GROUP_BY_COLUMNS = ("backend", "host", "job_id", "success", "n_resonances")
+
+# Chunk size used when hashing input files
+HASH_CHUNK_SIZE = 1 << 20
+
+
+@dataclass
+class RunTelemetry:
+    """Telemetry of one SAMMY run."""
+
+    job_id: str
+    backend: str
+    success: bool
+    wall_time_seconds: float
+    started_at: str  # ISO timestamp
+    input_hash: Optional[str] = None  # SHA-256 of the input (.inp) file
+    parameter_hash: Optional[str] = None  # SHA-256 of the parameter (.par) file
+    data_hash: Optional[str] = None  # SHA-256 of the data file
+    n_data_points: Optional[int] = None
+    n_resonances: Optional[int] = None
+    n_iterations: Optional[int] = None  # Parameter blocks written to the LPT file
+    reduced_chi_squared: Optional[float] = None
+    peak_rss_mb: Optional[float] = None
+    failure_type: Optional[str] = None
+    attempts: int = 1
+    host: str = ""
+
+
+@dataclass
+class TelemetrySummary:
+    """Aggregated telemetry of a group of runs."""
+
+    group: str
+    runs: int
+    success_rate: float
+    total_wall_time_seconds: float
+    mean_wall_time_seconds: float
+    p95_wall_time_seconds: float
+    mean_seconds_per_data_point: Optional[float]
+    mean_iterations: Optional[float]
+    mean_peak_rss_mb: Optional[float]
+    p95_peak_rss_mb: Optional[float]
+
+
+def file_sha256(path: Path) -> Optional[str]:
+    """SHA-256 hex digest of a file, or None if it cannot be read."""
+    digest = hashlib.sha256()
+    try:
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+                digest.update(chunk)
+    except OSError:
+        return None
+    return digest.hexdigest()
+
+
+def count_data_points(data_file: Path) -> Optional[int]:
+    """Number of non-empty lines of a SAMMY data file (one point per line)."""
+    try:
+        with open(data_file) as f:
+            return sum(1 for line in f if line.strip())
+    except OSError:
+        return None
+
+
+def count_resonances(parameter_file: Path) -> Optional[int]:
+    """Number of resonances in Card 1 of a parameter file, counted as Card01.from_lines reads them."""
+    try:
+        with open(parameter_file) as f:
+            lines = f.read().splitlines()
+    except OSError:
+        return None
+    index = ParCardIndex(lines)
+    span = index.find(Cards.PAR_CARD_1)
+    if span is None:
+        return 0
+    return len(Card01.data_lines(lines[span.start + span.has_header : span.end]))
+
+
+def _read_fit_blocks(lpt_file: Path):
+    """
+    Return (number of fit blocks, last reduced chi-squared) of an LPT file.
+
+    Blocks are only counted, and only the last one is parsed.
+    """
+    if not lpt_file.is_file():
+        return None, None
+    try:
+        with open(lpt_file) as f:
+            n_blocks = sum(1 for _ in iter_lpt_blocks(f))
+        final = read_final_lpt_block(lpt_file) if n_blocks else None
+    except Exception as e:
+        logger.debug(f"Could not parse {lpt_file}: {str(e)}")
+        return None, None
+    reduced_chi_squared = final.chi_squared_results.reduced_chi_squared if final is not None else None
+    return n_blocks, reduced_chi_squared
+
+
+def backend_name(runner: SammyRunner) -> str:
+    """Short backend name of a runner, e.g. "local" for LocalSammyRunner."""
+    backend = getattr(runner, "backend", None)
+    if isinstance(backend, str):
+        # Composite runners (see balancer.BalancedRunner) report the backend that ran the job
+        return backend
+    name = type(runner).__name__
+    return name[: -len("SammyRunner")].lower() if name.endswith("SammyRunner") else name
+
+
+def collect_run_telemetry(
+    job: SammyJob, result: SammyExecutionResult, backend: str, parameter_file: Optional[Path] = None
+) -> RunTelemetry:
+    """
+    Gather the telemetry of a finished job from its inputs, outputs and result.
+
+    Args:
+        job: Executed job (its output directory holds the collected LPT file)
+        result: Result reported by the backend
+        backend: Backend name
+        parameter_file: Parameter file actually run (e.g. a warm start seed),
+            defaults to job.parameter_file
+
+    Returns:
+        RunTelemetry: Telemetry record of the run
+    """
+    if parameter_file is None:
+        parameter_file = job.parameter_file
+    n_iterations, reduced_chi_squared = _read_fit_blocks(job.output_dir / LPT_FILE)
+    return RunTelemetry(
+        job_id=job.job_id,
+        backend=backend,
+        success=result.success,
+        wall_time_seconds=result.runtime_seconds,
+        started_at=result.start_time.isoformat(),
+        input_hash=file_sha256(job.input_file),
+        parameter_hash=file_sha256(parameter_file),
+        data_hash=file_sha256(job.data_file),
+        n_data_points=count_data_points(job.data_file),
+        n_resonances=count_resonances(parameter_file),
+        n_iterations=n_iterations,
+        reduced_chi_squared=reduced_chi_squared,
+        peak_rss_mb=result.peak_rss_mb,
+        failure_type=result.failure_type.value if result.failure_type is not None else None,
+        attempts=result.attempts,
+        host=socket.gethostname(),
+    )
+
+
+_SQL_TYPES = {bool: "INTEGER", int: "INTEGER", float: "REAL", str: "TEXT"}
+
+
+def _sql_type(annotation) -> str:
+    for python_type, sql_type in _SQL_TYPES.items():
+        if annotation is python_type or annotation == Optional[python_type]:
+            return sql_type
+    return "TEXT"
+
+
+class TelemetryStore:
+    """
+    Append-only SQLite store of RunTelemetry records.
+
+    Attributes:
+        path: Database file, created on first use
+    """
+
+    TABLE = "runs"
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        columns = ", ".join(f"{f.name} {_sql_type(f.type)}" for f in fields(RunTelemetry))
+        with closing(self._connect()) as connection, connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(f"CREATE TABLE IF NOT EXISTS {self.TABLE} (id INTEGER PRIMARY KEY, {columns})")
+            connection.execute(f"CREATE INDEX IF NOT EXISTS idx_{self.TABLE}_backend ON {self.TABLE} (backend)")
+
+    def _connect(self) -> sqlite3.Connection:
+        # One connection per operation, so that the store can be shared between threads
+        return sqlite3.connect(self.path, timeout=30)
+
+    def record(self, telemetry: RunTelemetry) -> None:
+        """Insert one record."""
+        values = asdict(telemetry)
+        placeholders = ", ".join("?" for _ in values)
+        with closing(self._connect()) as connection, connection:
+            connection.execute(
+                f"INSERT INTO {self.TABLE} ({', '.join(values)}) VALUES ({placeholders})", list(values.values())
+            )
+
+    def record_run(
+        self,
+        job: SammyJob,
+        result: SammyExecutionResult,
+        runner: SammyRunner,
+        parameter_file: Optional[Path] = None,
+    ) -> Optional[RunTelemetry]:
+        """
+        Collect and insert the telemetry of a finished job.
+
+        Telemetry must never break a fitting campaign, so errors are logged and ignored.
+
+        Args:
+            job: Executed job
+            result: Result reported by the backend
+            runner: Runner that executed the job
+            parameter_file: Parameter file actually run, defaults to job.parameter_file
+
+        Returns:
+            The recorded telemetry, or None if it could not be recorded
+        """
+        try:
+            telemetry = collect_run_telemetry(job, result, backend_name(runner), parameter_file)
+            self.record(telemetry)
+        except Exception as e:
+            logger.warning(f"Failed to record telemetry of job {job.job_id}: {str(e)}")
+            return None
+        return telemetry
+
+    def query(
+        self,
+        backend: Optional[str] = None,
+        job_id: Optional[str] = None,
+        success: Optional[bool] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        limit: Optional[int] = None,
+    ) -> List[RunTelemetry]:
+        """
+        Select records, oldest first.
+
+        Args:
+            backend: Only runs of this backend
+            job_id: Only runs of this job
+            success: Only successful (True) or failed (False) runs
+            since: Only runs started at or after this time
+            until: Only runs started before this time
+            limit: Maximum number of records, the most recent ones being kept
+
+        Returns:
+            List[RunTelemetry]: Matching records
+        """
+        conditions, parameters = [], []
+        for column, value in (("backend", backend), ("job_id", job_id), ("success", success)):
+            if value is not None:
+                conditions.append(f"{column} = ?")
+                parameters.append(value)
+        if since is not None:
+            conditions.append("started_at >= ?")
+            parameters.append(since.isoformat())
+        if until is not None:
+            conditions.append("started_at < ?")
+            parameters.append(until.isoformat())
+
+        names = [f.name for f in fields(RunTelemetry)]
+        sql = f"SELECT {', '.join(names)} FROM {self.TABLE}"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY id DESC"
+        if limit is not None:
+            sql += f" LIMIT {int(limit)}"
+
+        with closing(self._connect()) as connection:
+            rows = connection.execute(sql, parameters).fetchall()
+        records = [RunTelemetry(**dict(zip(names, row))) for row in reversed(rows)]
+        for record in records:
+            record.success = bool(record.success)
+        return records
+
+    def summary(self, group_by: str = "backend", **filters) -> List[TelemetrySummary]:
+        """
+        Aggregate the records per group.
+
+        Args:
+            group_by: Column to group by, one of GROUP_BY_COLUMNS
+            **filters: Filters passed to query()
+
+        Returns:
+            List[TelemetrySummary]: One summary per group, sorted by total wall time (largest first)
+        """
+        if group_by not in GROUP_BY_COLUMNS:
+            raise ValueError(f"Cannot group telemetry by {group_by!r}, expected one of {GROUP_BY_COLUMNS}")
+
+        groups = {}
+        for record in self.query(**filters):
+            groups.setdefault(str(getattr(record, group_by)), []).append(record)
+
+        summaries = [_summarize(group, records) for group, records in groups.items()]
+        return sorted(summaries, key=lambda summary: summary.total_wall_time_seconds, reverse=True)
+
+    def suggest_workers(self, memory_budget_mb: float, backend: Optional[str] = None, max_workers: int = 64) -> int:
+        """
+        Suggest how many concurrent runs fit in a memory budget.
+
+        Uses the 95th percentile of the recorded peak memory of successful runs.
+
+        Args:
+            memory_budget_mb: Memory available to SAMMY runs, in MB
+            backend: Only consider runs of this backend
+            max_workers: Upper bound of the suggestion
+
+        Returns:
+            int: Suggested number of workers (at least 1); max_workers if no memory was recorded
+        """
+        peaks = [record.peak_rss_mb for record in self.query(backend=backend, success=True) if record.peak_rss_mb]
+        if not peaks:
+            return max_workers
+        per_run = float(np.percentile(peaks, 95))
+        return max(1, min(max_workers, int(memory_budget_mb // per_run)))
+
+
+def _mean(values) -> Optional[float]:
+    return float(np.mean(values)) if values else None
+
+
+def _summarize(group: str, records: List[RunTelemetry]) -> TelemetrySummary:
+    wall_times = [record.wall_time_seconds for record in records]
+    peaks = [record.peak_rss_mb for record in records if record.peak_rss_mb is not None]
+    per_point = [
+        record.wall_time_seconds / record.n_data_points for record in records if record.success and record.n_data_points
+    ]
+    return TelemetrySummary(
+        group=group,
+        runs=len(records),
+        success_rate=sum(record.success for record in records) / len(records),
+        total_wall_time_seconds=float(np.sum(wall_times)),
+        mean_wall_time_seconds=float(np.mean(wall_times)),
+        p95_wall_time_seconds=float(np.percentile(wall_times, 95)),
+        mean_seconds_per_data_point=_mean(per_point),
+        mean_iterations=_mean([record.n_iterations for record in records if record.n_iterations is not None]),
+        mean_peak_rss_mb=_mean(peaks),
+        p95_peak_rss_mb=float(np.percentile(peaks, 95)) if peaks else None,
+    )
+
+
+def format_summary(summaries: List[TelemetrySummary]) -> str:
+    """Format summaries as a plain-text table."""
+
+    def _fmt(value, spec):
+        return format(value, spec) if value is not None else "-"
+
+    header = (
+        f"{'group':<20} {'runs':>6} {'success':>8} {'total [s]':>11} {'mean [s]':>10} {'p95 [s]':>10} "
+        f"{'ms/point':>9} {'iter':>6} {'RSS [MB]':>9} {'p95 RSS':>9}"
+    )
+    lines = [header, "-" * len(header)]
+    for summary in summaries:
+        per_point = summary.mean_seconds_per_data_point
+        lines.append(
+            f"{summary.group[:20]:<20} {summary.runs:>6} {summary.success_rate:>8.1%} "
+            f"{summary.total_wall_time_seconds:>11.1f} {summary.mean_wall_time_seconds:>10.2f} "
+            f"{summary.p95_wall_time_seconds:>10.2f} {_fmt(per_point * 1000 if per_point else None, '>9.3f')} "
+            f"{_fmt(summary.mean_iterations, '>6.1f')} {_fmt(summary.mean_peak_rss_mb, '>9.1f')} "
+            f"{_fmt(summary.p95_peak_rss_mb, '>9.1f')}"
+        )
+    return "\n".join(lines)
+
+
+def add_telemetry_parser(subparsers) -> None:
+    """
+    Register the `telemetry` subcommand of the pleiades CLI.
+
+    Args:
+        subparsers: Object returned by ArgumentParser.add_subparsers
+    """
+    parser = subparsers.add_parser("telemetry", help="Summarize recorded SAMMY run telemetry")
+    parser.add_argument("database", type=Path, help="telemetry SQLite database")
+    parser.add_argument("--group-by", default="backend", choices=GROUP_BY_COLUMNS, help="grouping column")
+    parser.add_argument("--backend", default=None, help="only runs of this backend")
+    parser.add_argument("--memory-budget", type=float, default=None, help="suggest a worker count for this many MB")
+    parser.set_defaults(func=telemetry_command)
+
+
+def telemetry_command(args) -> int:
+    """
+    Run the `telemetry` subcommand.
+
+    Args:
+        args: Parsed command line arguments
+
+    Returns:
+        int: Exit code
+    """
+    if not args.database.is_file():
+        print(f"No telemetry database at {args.database}")
+        return 1
+    store = TelemetryStore(args.database)
+    print(format_summary(store.summary(group_by=args.group_by, backend=args.backend)))
+    if args.memory_budget is not None:
+        print(
+            f"Suggested workers for {args.memory_budget:.0f} MB: {store.suggest_workers(args.memory_budget, args.backend)}"
+        )
+    return 0
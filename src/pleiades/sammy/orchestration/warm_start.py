@@ -0,0 +1,279 @@
+#!/usr/bin/env python
+"""
+Warm-start chaining of SAMMY fits.
+
+Neighbouring pixels of an image, or consecutive runs of a time series, usually
+converge to very similar resonance parameters. Starting each fit from the
+converged SAMNDF.PAR of an already finished neighbour instead of the same default
+parameter file lets SAMMY converge in fewer iterations.
+
+A seed is only used when it looks sane (the neighbour succeeded, its SAMNDF.PAR
+parses with ParManager, all resonance values are finite and the resonance count
+matches the default start). A warm-started fit that diverges, or raises a
+SammyError, is rerun from the default parameter file; a job that still raises is
+recorded as not converged and the chain continues.
+"""
+
+import math
+import shutil
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+from pleiades.sammy.interface import SammyError, SammyExecutionResult
+from pleiades.sammy.io.par_manager import ParManager
+from pleiades.sammy.orchestration.jobs import RunnerFactory, SammyJob, read_reduced_chi_squared, run_job
+from pleiades.utils.logger import loguru_logger
+
+logger = loguru_logger.bind(name=__name__)
+
+# Updated parameter file written by SAMMY at the end of a fit
+CONVERGED_PARAMETER_FILE = "SAMNDF.PAR"
+# Subdirectory of the job working directory holding the seeded parameter file
+SEED_DIRNAME = "warm_start"
+
+
+@dataclass
+class WarmStartPolicy:
+    """Rules deciding when a converged neighbour may seed a fit."""
+
+    # Reject seeds (and warm-started results) above this reduced chi-squared, if set
+    max_reduced_chi_squared: Optional[float] = None
+    # Require the seed to have as many resonances as the default parameter file
+    require_same_resonance_count: bool = True
+    # Rerun from the default parameter file when a warm-started fit diverges
+    fallback_on_divergence: bool = True
+
+
+@dataclass
+class WarmStartOutcome:
+    """Result of one job in a warm-start chain."""
+
+    job_id: str
+    result: Optional[SammyExecutionResult]  # None if the run raised an error
+    seeded_from: Optional[str] = None  # job id providing the seed, None for a cold start
+    fell_back: bool = False  # True if a warm start diverged and the job was rerun cold
+    converged: bool = False  # True if the job output can seed its successors
+    notes: List[str] = field(default_factory=list)
+
+    @property
+    def warm_started(self) -> bool:
+        """Whether the final result comes from a warm-started fit."""
+        return self.seeded_from is not None and not self.fell_back
+
+
+def serpentine_predecessors(job_ids: Sequence[Sequence[str]]) -> Tuple[List[str], Dict[str, Optional[str]]]:
+    """
+    Order a 2D grid of job ids so that every job follows a spatial neighbour.
+
+    Rows are walked alternately left-to-right and right-to-left, hence two
+    consecutive jobs are always adjacent pixels.
+
+    Args:
+        job_ids: Grid of job ids, indexed as job_ids[row][column]
+
+    Returns:
+        Tuple of (execution order, mapping job id -> predecessor job id)
+
+    Example:
+        >>> order, pred = serpentine_predecessors([["a", "b"], ["c", "d"]])
+        >>> order
+        ['a', 'b', 'd', 'c']
+        >>> pred["d"]
+        'b'
+    """
+    order = []
+    for row_index, row in enumerate(job_ids):
+        row = list(row)
+        order.extend(row if row_index % 2 == 0 else reversed(row))
+
+    predecessors = {job_id: (order[i - 1] if i > 0 else None) for i, job_id in enumerate(order)}
+    return order, predecessors
+
+
+def sequential_predecessors(job_ids: Sequence[str]) -> Dict[str, Optional[str]]:
+    """
+    Chain jobs of a time series, each one seeded by the previous run.
+
+    Args:
+        job_ids: Job ids in execution order
+
+    Returns:
+        Dict mapping job id -> predecessor job id
+    """
+    return {job_id: (job_ids[i - 1] if i > 0 else None) for i, job_id in enumerate(job_ids)}
+
+
+class WarmStartChain:
+    """
+    Run a sequence of SAMMY jobs, seeding each one from a converged predecessor.
+
+    Attributes:
+        runner_factory: Callable creating a runner for each job's directories
+        policy: WarmStartPolicy controlling seed acceptance and fallback
+    """
+
+    def __init__(self, runner_factory: RunnerFactory, policy: Optional[WarmStartPolicy] = None):
+        self.runner_factory = runner_factory
+        self.policy = policy if policy is not None else WarmStartPolicy()
+        # Resonance counts of default parameter files, keyed by path
+        self._default_resonance_counts: Dict[Path, Optional[int]] = {}
+
+    @staticmethod
+    def _read_resonances(par_file: Path) -> Optional[list]:
+        """Read all resonance entries of a parameter file with ParManager, None if unreadable."""
+        try:
+            manager = ParManager(par_file=par_file)
+        except Exception as e:
+            logger.debug(f"Could not parse {par_file}: {str(e)}")
+            return None
+        return [resonance for isotope in manager.fit_config.nuclear_params.isotopes for resonance in isotope.resonances]
+
+    def _default_resonance_count(self, par_file: Path) -> Optional[int]:
+        """Resonance count of a default parameter file (cached)."""
+        if par_file not in self._default_resonance_counts:
+            resonances = self._read_resonances(par_file)
+            self._default_resonance_counts[par_file] = len(resonances) if resonances is not None else None
+        return self._default_resonance_counts[par_file]
+
+    def check_converged(self, job: SammyJob, result: SammyExecutionResult) -> Tuple[bool, str]:
+        """
+        Decide whether a finished job converged and can seed its successors.
+
+        Args:
+            job: Finished job
+            result: Execution result of the job
+
+        Returns:
+            Tuple of (converged flag, reason)
+        """
+        if not result.success:
+            return False, "SAMMY run failed"
+
+        converged_par = job.output_dir / CONVERGED_PARAMETER_FILE
+        if not converged_par.is_file():
+            return False, f"{CONVERGED_PARAMETER_FILE} not found"
+
+        resonances = self._read_resonances(converged_par)
+        if not resonances:
+            return False, f"{CONVERGED_PARAMETER_FILE} has no readable resonances"
+
+        for resonance in resonances:
+            values = (
+                resonance.resonance_energy,
+                resonance.capture_width,
+                resonance.channel1_width,
+                resonance.channel2_width,
+                resonance.channel3_width,
+            )
+            if any(value is not None and not math.isfinite(value) for value in values):
+                return False, f"non-finite resonance parameters in {CONVERGED_PARAMETER_FILE}"
+
+        if self.policy.require_same_resonance_count:
+            expected = self._default_resonance_count(job.parameter_file)
+            if expected is not None and expected != len(resonances):
+                return False, f"resonance count changed ({expected} -> {len(resonances)})"
+
+        if self.policy.max_reduced_chi_squared is not None:
+            reduced_chi2 = read_reduced_chi_squared(job.output_dir)
+            if reduced_chi2 is None:
+                return False, "reduced chi-squared not available"
+            if reduced_chi2 > self.policy.max_reduced_chi_squared:
+                return False, f"reduced chi-squared {reduced_chi2:.4g} above limit"
+
+        return True, "converged"
+
+    def seed_parameter_file(self, job: SammyJob, source: SammyJob) -> Path:
+        """
+        Stage the converged parameter file of a source job as the start of another job.
+
+        The seed is written to a subdirectory of the job working directory, so the
+        runner can still copy it to the working directory under its usual name.
+
+        Args:
+            job: Job to seed
+            source: Converged job providing SAMNDF.PAR
+
+        Returns:
+            Path: Seeded parameter file
+        """
+        seed_dir = job.working_dir / SEED_DIRNAME
+        seed_dir.mkdir(parents=True, exist_ok=True)
+        seed_file = seed_dir / job.parameter_file.name
+        shutil.copyfile(source.output_dir / CONVERGED_PARAMETER_FILE, seed_file)
+        logger.debug(f"Seeded {job.job_id} from {source.job_id}: {seed_file}")
+        return seed_file
+
+    def _run_job(self, job: SammyJob, seed_file: Optional[Path], notes: List[str]) -> Optional[SammyExecutionResult]:
+        """Run a job, recording a SammyError in the notes instead of raising it."""
+        try:
+            return run_job(job, self.runner_factory, seed_file)
+        except SammyError as e:
+            logger.error(f"Job {job.job_id} raised an error: {str(e)}")
+            notes.append(f"error: {str(e)}")
+            return None
+
+    def _check(self, job: SammyJob, result: Optional[SammyExecutionResult]) -> Tuple[bool, str]:
+        """check_converged, for a run that may have raised."""
+        if result is None:
+            return False, "SAMMY run raised an error"
+        return self.check_converged(job, result)
+
+    def run(
+        self, jobs: Sequence[SammyJob], predecessors: Optional[Mapping[str, Optional[str]]] = None
+    ) -> Dict[str, WarmStartOutcome]:
+        """
+        Run jobs in order, warm-starting each from its converged predecessor.
+
+        A job raising a SammyError does not stop the chain: it is recorded as not
+        converged, with the error in its notes.
+
+        Args:
+            jobs: Jobs in execution order
+            predecessors: Mapping job id -> job id to seed from. Defaults to the
+                previous job in the sequence (time-series chaining).
+
+        Returns:
+            Dict mapping job id -> WarmStartOutcome, in execution order
+        """
+        if predecessors is None:
+            predecessors = sequential_predecessors([job.job_id for job in jobs])
+
+        jobs_by_id = {job.job_id: job for job in jobs}
+        outcomes: Dict[str, WarmStartOutcome] = {}
+
+        for job in jobs:
+            source_id = predecessors.get(job.job_id)
+            source = outcomes.get(source_id) if source_id is not None else None
+            notes = []
+
+            seed_file = None
+            if source is not None and source.converged:
+                seed_file = self.seed_parameter_file(job, jobs_by_id[source_id])
+            elif source_id is not None:
+                notes.append(f"cold start: predecessor {source_id} not converged or not run yet")
+
+            result = self._run_job(job, seed_file, notes)
+            converged, reason = self._check(job, result)
+            outcome = WarmStartOutcome(
+                job_id=job.job_id,
+                result=result,
+                seeded_from=source_id if seed_file is not None else None,
+                converged=converged,
+                notes=notes,
+            )
+
+            if seed_file is not None and not converged and self.policy.fallback_on_divergence:
+                logger.warning(f"Warm start of {job.job_id} diverged ({reason}), rerunning from default start")
+                outcome.notes.append(f"warm start diverged: {reason}")
+                outcome.result = self._run_job(job, None, outcome.notes)
+                outcome.converged, reason = self._check(job, outcome.result)
+                outcome.fell_back = True
+
+            if not outcome.converged:
+                outcome.notes.append(reason)
+            outcomes[job.job_id] = outcome
+
+        n_warm = sum(outcome.warm_started for outcome in outcomes.values())
+        logger.info(f"Warm-start chain finished: {len(outcomes)} jobs, {n_warm} warm-started")
+        return outcomes
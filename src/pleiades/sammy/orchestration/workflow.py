@@ -0,0 +1,356 @@
+#!/usr/bin/env python
+"""
+Dependency-aware workflow of file-producing tasks.
+
+An analysis such as ENDF retrieval -> input generation -> ENDF-mode SAMMY run ->
+fitting run -> LPT/LST parsing -> plotting is a chain of stages, each reading
+some files and writing others. Declaring the stages as tasks with their input
+and output files lets the workflow
+
+- derive the dependencies between tasks (a task depends on the tasks producing
+  its inputs),
+- skip tasks whose outputs are up to date, i.e. whose inputs, parameters and
+  outputs have the same content hashes as when they last ran,
+- run independent branches concurrently.
+
+Example:
+
+    workflow = Workflow(state_file=work / "workflow_state.json")
+    workflow.add(Task("endf", fetch_endf, outputs=[work / "Hf.par"], params={"isotope": "Hf-177"}))
+    workflow.add(Task("inp", write_inp, inputs=[config], outputs=[work / "fit.inp"]))
+    workflow.add(Task("fit", run_fit, inputs=[work / "Hf.par", work / "fit.inp"], outputs=[work / "SAMMY.LPT"]))
+    workflow.add(Task("report", plot, inputs=[work / "SAMMY.LPT"], outputs=[work / "fit.png"]))
+    report = workflow.run(workers=4)
+
+Every action receives its Task and must write the task outputs. After a small
+change (e.g. a new fit.inp) only the tasks downstream of the change run again.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from pleiades.sammy.interface import SammyError
+from pleiades.utils.logger import loguru_logger
+
+logger = loguru_logger.bind(name=__name__)
+
+STATUS_RAN = "ran"  # The action ran and produced its outputs
+STATUS_SKIPPED = "skipped"  # The outputs were up to date
+STATUS_FAILED = "failed"  # The action raised or did not produce its outputs
+STATUS_BLOCKED = "blocked"  # Not run because a dependency failed
+
+# Chunk size used when hashing files
+HASH_CHUNK_SIZE = 1 << 20
+
+
+class WorkflowError(SammyError):
+    """Raised when a workflow definition is invalid."""
+
+    pass
+
+
+@dataclass
+class Task:
+    """
+    One stage of a workflow.
+
+    Attributes:
+        name: Unique task name
+        action: Callable receiving the task and writing its outputs
+        inputs: Files (or directories) read by the action
+        outputs: Files (or directories) written by the action
+        params: Parameters of the action; changing them makes the task out of date
+        version: Bump to force a rerun after changing the action code
+    """
+
+    name: str
+    action: Callable[["Task"], Any]
+    inputs: List[Path] = field(default_factory=list)
+    outputs: List[Path] = field(default_factory=list)
+    params: Dict[str, Any] = field(default_factory=dict)
+    version: str = "1"
+
+    def __post_init__(self):
+        self.inputs = [Path(path) for path in self.inputs]
+        self.outputs = [Path(path) for path in self.outputs]
+
+
+@dataclass
+class WorkflowReport:
+    """Outcome of a workflow run."""
+
+    status: Dict[str, str] = field(default_factory=dict)  # Task name -> STATUS_*
+    errors: Dict[str, str] = field(default_factory=dict)  # Task name -> error message
+    durations: Dict[str, float] = field(default_factory=dict)  # Task name -> seconds, for tasks that ran
+
+    @property
+    def success(self) -> bool:
+        return all(status in (STATUS_RAN, STATUS_SKIPPED) for status in self.status.values())
+
+    def tasks_with_status(self, status: str) -> List[str]:
+        return [name for name, task_status in self.status.items() if task_status == status]
+
+
+class FileHasher:
+    """
+    SHA-256 of files and directories, cached by size and modification time.
+
+    Unchanged files are not read again, which keeps up-to-date checks cheap for
+    large data files.
+    """
+
+    def __init__(self):
+        self._cache: Dict[Tuple[str, int, int], str] = {}
+        self._lock = threading.Lock()
+
+    def file_hash(self, path: Path) -> str:
+        stat = path.stat()
+        key = (str(path.resolve()), stat.st_size, stat.st_mtime_ns)
+        with self._lock:
+            cached = self._cache.get(key)
+        if cached is not None:
+            return cached
+
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+                digest.update(chunk)
+        with self._lock:
+            self._cache[key] = digest.hexdigest()
+        return digest.hexdigest()
+
+    def hash(self, path: Path) -> Optional[str]:
+        """Hash of a file, or of all files below a directory; None if the path does not exist."""
+        if path.is_file():
+            return self.file_hash(path)
+        if not path.is_dir():
+            return None
+        digest = hashlib.sha256()
+        for file_path in sorted(p for p in path.rglob("*") if p.is_file()):
+            digest.update(str(file_path.relative_to(path)).encode())
+            digest.update(self.file_hash(file_path).encode())
+        return digest.hexdigest()
+
+
+class Workflow:
+    """
+    Set of tasks executed in dependency order, skipping up-to-date tasks.
+
+    Attributes:
+        state_file: JSON file recording the hashes of the last successful run of every task
+        tasks: Tasks by name, in insertion order
+    """
+
+    def __init__(self, state_file: Path):
+        self.state_file = Path(state_file)
+        self.tasks: Dict[str, Task] = {}
+        self._hasher = FileHasher()
+        self._state_lock = threading.Lock()
+
+    def add(self, task: Task) -> Task:
+        """
+        Add a task.
+
+        Raises:
+            WorkflowError: If the name is taken or an output is already produced by another task
+        """
+        if task.name in self.tasks:
+            raise WorkflowError(f"Duplicate task name: {task.name}")
+        producers = self._producers()
+        for output in task.outputs:
+            if output.resolve() in producers:
+                raise WorkflowError(f"{output} is produced by both {producers[output.resolve()]} and {task.name}")
+        self.tasks[task.name] = task
+        return task
+
+    def task(
+        self,
+        name: Optional[str] = None,
+        inputs: Optional[List[Path]] = None,
+        outputs: Optional[List[Path]] = None,
+        params: Optional[Dict[str, Any]] = None,
+        version: str = "1",
+    ) -> Callable:
+        """Decorator adding a function as a task."""
+
+        def _decorator(action: Callable[[Task], Any]) -> Callable[[Task], Any]:
+            self.add(Task(name or action.__name__, action, inputs or [], outputs or [], params or {}, version))
+            return action
+
+        return _decorator
+
+    def _producers(self) -> Dict[Path, str]:
+        return {output.resolve(): task.name for task in self.tasks.values() for output in task.outputs}
+
+    def dependencies(self) -> Dict[str, List[str]]:
+        """
+        Tasks each task depends on, i.e. the producers of its inputs.
+
+        Raises:
+            WorkflowError: If the dependencies contain a cycle
+        """
+        producers = self._producers()
+        dependencies = {
+            name: sorted({producers[path.resolve()] for path in task.inputs if path.resolve() in producers} - {name})
+            for name, task in self.tasks.items()
+        }
+        self._check_acyclic(dependencies)
+        return dependencies
+
+    @staticmethod
+    def _check_acyclic(dependencies: Dict[str, List[str]]) -> None:
+        visiting, done = set(), set()
+
+        def _visit(name: str, path: List[str]) -> None:
+            if name in done:
+                return
+            if name in visiting:
+                raise WorkflowError(f"Dependency cycle: {' -> '.join(path + [name])}")
+            visiting.add(name)
+            for dependency in dependencies[name]:
+                _visit(dependency, path + [name])
+            visiting.discard(name)
+            done.add(name)
+
+        for name in dependencies:
+            _visit(name, [])
+
+    def _load_state(self) -> Dict[str, Any]:
+        if not self.state_file.is_file():
+            return {}
+        try:
+            return json.loads(self.state_file.read_text())
+        except ValueError as e:
+            logger.warning(f"Ignoring unreadable workflow state {self.state_file}: {str(e)}")
+            return {}
+
+    def _save_state(self, state: Dict[str, Any]) -> None:
+        # Write-then-rename, so that an interrupted run never leaves a truncated state file
+        self.state_file.parent.mkdir(parents=True, exist_ok=True)
+        temp_file = self.state_file.with_name(self.state_file.name + ".tmp")
+        temp_file.write_text(json.dumps(state, indent=2, sort_keys=True))
+        os.replace(temp_file, self.state_file)
+
+    def fingerprint(self, task: Task) -> Optional[str]:
+        """Hash of a task's definition, parameters and input contents; None if an input is missing."""
+        digest = hashlib.sha256()
+        digest.update(json.dumps([task.name, task.version, task.params], sort_keys=True, default=str).encode())
+        for path in task.inputs:
+            content_hash = self._hasher.hash(path)
+            if content_hash is None:
+                return None
+            digest.update(f"{path}:{content_hash}".encode())
+        return digest.hexdigest()
+
+    def _output_hashes(self, task: Task) -> Optional[Dict[str, str]]:
+        hashes = {}
+        for path in task.outputs:
+            content_hash = self._hasher.hash(path)
+            if content_hash is None:
+                return None
+            hashes[str(path)] = content_hash
+        return hashes
+
+    def is_up_to_date(self, task: Task, state: Optional[Dict[str, Any]] = None) -> bool:
+        """Whether the task's inputs and outputs are unchanged since its last successful run."""
+        state = self._load_state() if state is None else state
+        recorded = state.get(task.name)
+        if recorded is None or not task.outputs:
+            return False
+        fingerprint = self.fingerprint(task)
+        return (
+            fingerprint is not None
+            and fingerprint == recorded["fingerprint"]
+            and self._output_hashes(task) == recorded["outputs"]
+        )
+
+    def _execute(self, task: Task) -> Tuple[str, float, Optional[str]]:
+        """Run a task action and check its outputs; returns (status, seconds, error)."""
+        start = perf_counter()
+        try:
+            for output in task.outputs:
+                output.parent.mkdir(parents=True, exist_ok=True)
+            task.action(task)
+            missing = [str(path) for path in task.outputs if not path.exists()]
+            if missing:
+                return STATUS_FAILED, perf_counter() - start, f"Outputs not produced: {', '.join(missing)}"
+        except Exception as e:
+            logger.exception(f"Task {task.name} failed")
+            return STATUS_FAILED, perf_counter() - start, str(e)
+        return STATUS_RAN, perf_counter() - start, None
+
+    def run(self, workers: int = 4, force: bool = False) -> WorkflowReport:
+        """
+        Run the out-of-date tasks, independent tasks concurrently.
+
+        A task is rerun if it never ran successfully, its inputs, parameters or
+        version changed, or its outputs changed or disappeared. Since inputs are
+        compared by content, a rerun dependency producing identical outputs does
+        not trigger its dependents. Dependents of a failed task are blocked.
+
+        Args:
+            workers: Maximum number of tasks running at the same time
+            force: Rerun every task
+
+        Returns:
+            WorkflowReport: Status of every task
+        """
+        dependencies = self.dependencies()
+        state = self._load_state()
+        report = WorkflowReport()
+        remaining = dict(dependencies)
+        running: Dict[Future, Task] = {}
+
+        def _record(task: Task, status: str, error: Optional[str] = None) -> None:
+            report.status[task.name] = status
+            if error is not None:
+                report.errors[task.name] = error
+                logger.error(f"Task {task.name}: {status} ({error})")
+            else:
+                logger.info(f"Task {task.name}: {status}")
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            while remaining or running:
+                for name in [name for name, deps in remaining.items() if all(dep in report.status for dep in deps)]:
+                    task = self.tasks[name]
+                    del remaining[name]
+                    dependency_status = [report.status[dep] for dep in dependencies[name]]
+                    if any(status in (STATUS_FAILED, STATUS_BLOCKED) for status in dependency_status):
+                        _record(task, STATUS_BLOCKED, "a dependency failed")
+                    elif not force and self.is_up_to_date(task, state):
+                        _record(task, STATUS_SKIPPED)
+                    else:
+                        running[executor.submit(self._execute, task)] = task
+
+                if not running:
+                    continue
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    task = running.pop(future)
+                    status, seconds, error = future.result()
+                    report.durations[task.name] = seconds
+                    _record(task, status, error)
+                    with self._state_lock:
+                        if status == STATUS_RAN:
+                            state[task.name] = {
+                                "fingerprint": self.fingerprint(task),
+                                "outputs": self._output_hashes(task),
+                            }
+                        else:
+                            state.pop(task.name, None)
+                        self._save_state(state)
+
+        logger.info(
+            f"Workflow finished: {len(report.tasks_with_status(STATUS_RAN))} ran, "
+            f"{len(report.tasks_with_status(STATUS_SKIPPED))} skipped, "
+            f"{len(report.tasks_with_status(STATUS_FAILED))} failed, "
+            f"{len(report.tasks_with_status(STATUS_BLOCKED))} blocked"
+        )
+        return report
@@ -3,10 +3,11 @@
 
 import pathlib
 from enum import Enum, auto
-from typing import List, Optional, Union
+from typing import Dict, List, Optional, Sequence, Tuple, Union
 
 from pydantic import BaseModel, Field
 
+from pleiades.sammy.io.par_index import Cards, CardSpan, ParCardIndex
 from pleiades.sammy.parameters import (
     BroadeningParameterCard,
     DataReductionCard,
@@ -156,10 +157,6 @@ class SammyParameterFile(BaseModel):
             field_name = CardOrder.get_field_name(card_type)
             value = getattr(self, field_name)
 
-            print(
-                f"{where_am_i}: Processing card type: {card_type.name} with field name: {field_name} and value: {value}"
-            )
-
             # Skip None values (optional cards not present)
             if value is None:
                 continue
@@ -229,7 +226,7 @@ class SammyParameterFile(BaseModel):
         # Split content into lines
         lines = content.splitlines()
 
-        logger.info(f"{where_am_i}: Attempting to parse parameter file content from string {lines}")
+        logger.info(f"{where_am_i}: Attempting to parse parameter file content from string ({len(lines)} lines)")
 
         # Early exit for empty content
         if not lines:
@@ -239,108 +236,101 @@ class SammyParameterFile(BaseModel):
         # Initialize parameters
         params = {}
 
-        resonance_or_fudge_factor_content = []
+        # Index the card sets in a single pass, each card is parsed from its own span
+        index = ParCardIndex(lines)
 
-        # read and append lines to resonance_or_fudge_factor_content until we find a header line
-        for line in lines:
-            # Check if line matches any keys in parFile_header_card_class
-            if line in parFile_header_card_class.keys():
-                card_type, card_class = cls._get_card_class_with_header(line)
+        # Lines before the first header card are resonances and the fudge factor
+        headerless = [
+            span for span in index.spans if span.card in (Cards.PAR_CARD_1, Cards.PAR_CARD_2) and not span.has_header
+        ]
+        card_spans = [span for span in index.spans if span not in headerless]
+        resonances_entries, fudge_factor = cls._split_headerless_lines(lines, headerless)
 
-                # if so then you have pasted the resonances and fudge factor
-                if card_class:
-                    break
-            # if not then append the line to resonance_or_fudge_factor_content
-            else:
-                resonance_or_fudge_factor_content.append(line)
+        logger.info(f"{where_am_i}: {len(resonances_entries)} resonance entries, fudge factor: {fudge_factor}")
 
-        logger.info(f"{where_am_i}: res_fudge_content: {resonance_or_fudge_factor_content}")
+        # attempt to assign fudge factor to params
+        if fudge_factor:
+            params["fudge"] = cls._parse_fudge(fudge_factor)
 
-        # need to split further into resonances and fudge factor
-        resonances_entries = []
-        fudge_factor = None
+        # if resonance_entries is not empty then attempt to assign to params
+        if resonances_entries:
+            params["resonance"] = cls._parse_resonances(resonances_entries)
 
-        for line in resonance_or_fudge_factor_content:
-            # check if anycharacters exists beyond 1-11
-            if line[11:].strip():
-                # if so, then it is a resonance entry
-                resonances_entries.append(line)
-            # check if line is just newline char
-            elif not line.strip():
-                continue
+        # Process each card set with a header
+        for span in card_spans:
+            field_name, card = cls._parse_card_set(lines[span.start : span.end])
+            params[field_name] = card
 
-            # Otherwise it is a fudge factor
-            else:
-                # strip line of "\n" and convert to float
-                fudge_factor = line.strip()
+        logger.info(f"{where_am_i}: Successfully parsed all parameter file content from string\n {'=' * 80}")
+        return cls(**params)
 
-        logger.info(f"{where_am_i}: resonances_entries: {resonances_entries}")
-        logger.info(f"{where_am_i}: fudge_factor: {fudge_factor}")
+    @staticmethod
+    def _split_headerless_lines(lines: Sequence[str], spans: Sequence[CardSpan]) -> Tuple[List[str], Optional[str]]:
+        """Split the lines of headerless spans into resonance entries and the fudge factor."""
+        resonances_entries = []
+        fudge_factor = None
+        for span in spans:
+            for line in lines[span.start : span.end]:
+                # check if any characters exist beyond 1-11
+                if line[11:].strip():
+                    # if so, then it is a resonance entry
+                    resonances_entries.append(line)
+                # Otherwise it is a fudge factor
+                else:
+                    fudge_factor = line.strip()
+        return resonances_entries, fudge_factor
+
+    @staticmethod
+    def _parse_fudge(fudge_factor: str) -> float:
+        """Parse the fudge factor line."""
+        try:
+            fudge = float(fudge_factor)
+            logger.info(f"SammyParameterFile._parse_fudge(): Successfully parsed fudge factor\n {'-' * 80}")
+            return fudge
+        except ValueError as e:
+            logger.error(f"Failed to parse fudge factor: {str(e)}\nLines: {fudge_factor}")
+            raise ValueError(f"Failed to parse fudge factor: {str(e)}\nLines: {fudge_factor}")
+
+    @staticmethod
+    def _parse_resonances(resonances_entries: List[str]) -> ResonanceCard:
+        """Parse the resonance entries (Card 1)."""
+        try:
+            resonance = ResonanceCard.from_lines(resonances_entries)
+            logger.info(f"SammyParameterFile._parse_resonances(): Successfully parsed resonance table\n {'-' * 80}")
+            return resonance
+        except Exception as e:
+            logger.error(f"Failed to parse resonance table: {str(e)}")
+            raise ValueError(f"Failed to parse resonance table: {str(e)}")
 
-        # attempt to assign fudge factor to params
-        if fudge_factor:
-            try:
-                params["fudge"] = float(fudge_factor)
-                logger.info(f"{where_am_i}: Successfully parsed fudge factor\n {'-' * 80}")
-            except ValueError as e:
-                logger.error(f"Failed to parse fudge factor: {str(e)}\nLines: {fudge_factor}")
-                raise ValueError(f"Failed to parse fudge factor: {str(e)}\nLines: {fudge_factor}")
+    @classmethod
+    def _parse_card_set(cls, group: List[str]) -> Tuple[str, object]:
+        """Parse a card set starting with a header line.
 
-        # if resonance_entries is not empty then attempt to assign to params
-        if resonances_entries:
-            try:
-                params["resonance"] = ResonanceCard.from_lines(resonances_entries)
-                logger.info(f"{where_am_i}: Successfully parsed resonance table\n {'-' * 80}")
-            except Exception as e:
-                logger.error(f"Failed to parse resonance table: {str(e)}\nLines: {resonances_entries}")
-                raise ValueError(f"Failed to parse resonance table: {str(e)}\nLines: {resonances_entries}")
-
-        # remove the resonance_or_fudge_factor_content from the lines
-        lines = lines[len(resonance_or_fudge_factor_content) :]
-
-        # Second, partition lines into group of lines based on blank lines
-        card_groups = []
-        current_group = []
-
-        for line in lines:
-            if line.strip():
-                current_group.append(line)
-            else:
-                # Only add non-empty groups
-                if current_group:
-                    card_groups.append(current_group)
-                    current_group = []
-
-        # Don't forget last group
-        if current_group:
-            card_groups.append(current_group)
-
-        # Process each group of lines
-        for group in card_groups:
-            # Skip empty groups
-            if not group:
-                continue
+        Args:
+            group: Lines of the card set, header included
 
-            # Check first line for header to determine card type
-            card_type, card_class = cls._get_card_class_with_header(group[0])
+        Returns:
+            tuple: (field name in SammyParameterFile, parsed card)
 
-            # Check if card type is implemented
-            if card_class:
-                # Process card with header
-                try:
-                    params[CardOrder.get_field_name(card_type)] = card_class.from_lines(group)
-                    logger.info(f"{where_am_i}: Successfully parsed {card_type.name} card\n {'-' * 80}")
-                except Exception as e:
-                    logger.error(f"Failed to parse {card_type.name} card: {str(e)}\nLines: {group}")
-                    raise ValueError(f"Failed to parse {card_type.name} card: {str(e)}\nLines: {group}")
+        Raises:
+            ValueError: If the card is not implemented or cannot be parsed
+        """
+        # Check first line for header to determine card type
+        card_type, card_class = cls._get_card_class_with_header(group[0])
 
-            # If card type is not implemented, then throw an error stating card type is not implemented yet
-            else:
-                logger.error(f"{where_am_i}: Card type not implemented: {group[0]}")
-                raise ValueError(f"Card type not implemented: {group[0]}")
+        # If card type is not implemented, then throw an error stating card type is not implemented yet
+        if not card_class:
+            logger.error(f"SammyParameterFile._parse_card_set(): Card type not implemented: {group[0]}")
+            raise ValueError(f"Card type not implemented: {group[0]}")
 
-        logger.info(f"{where_am_i}: Successfully parsed all parameter file content from string\n {'=' * 80}")
-        return cls(**params)
+        # Process card with header
+        try:
+            card = card_class.from_lines(group)
+            logger.info(f"SammyParameterFile._parse_card_set(): Successfully parsed {card_type.name} card\n {'-' * 80}")
+        except Exception as e:
+            logger.error(f"Failed to parse {card_type.name} card: {str(e)}\nLines: {group}")
+            raise ValueError(f"Failed to parse {card_type.name} card: {str(e)}\nLines: {group}")
+        return CardOrder.get_field_name(card_type), card
 
     @classmethod
     def _parse_card(cls, card_type: CardOrder, lines: List[str]):
@@ -480,6 +470,122 @@ class SammyParameterFile(BaseModel):
                         print("  No format detection available for this card.")
 
 
+class LazySammyParameterFile:
+    """Parameter file whose cards are parsed on first access.
+
+    Loading only indexes the card sets of the file (see ParCardIndex). A card is
+    parsed and validated the first time its attribute is read, e.g. `isotope` or
+    `normalization`, and cached; the other cards are never parsed. Attributes are
+    those of SammyParameterFile, None for cards absent from the file.
+
+    Errors of a card (unimplemented card types, invalid values) are raised when
+    it is accessed, or by to_parameter_file, which parses every card.
+    """
+
+    def __init__(self, lines: Sequence[str]):
+        self._lines = lines
+        self._cards: Dict[str, object] = {}
+        self._headerless: List[CardSpan] = []  # Resonances and fudge factor
+        self._headerless_lines: Optional[Tuple[List[str], Optional[str]]] = None
+        self._spans: Dict[str, CardSpan] = {}  # Card sets with a header, by field name
+        self._unknown: List[CardSpan] = []  # Card sets without an implemented card class
+
+        for span in ParCardIndex(lines).spans:
+            if span.card in (Cards.PAR_CARD_1, Cards.PAR_CARD_2) and not span.has_header:
+                self._headerless.append(span)
+                continue
+            card_type, _ = SammyParameterFile._get_card_class_with_header(lines[span.start])
+            if card_type is None:
+                self._unknown.append(span)
+            else:
+                # As in SammyParameterFile.from_string, a repeated card replaces the previous one
+                self._spans[CardOrder.get_field_name(card_type)] = span
+
+    @classmethod
+    def from_string(cls, content: str) -> "LazySammyParameterFile":
+        """Index the cards of a parameter file content.
+
+        Args:
+            content: Content of the parameter file.
+
+        Raises:
+            ValueError: If the content is empty
+        """
+        lines = content.splitlines()
+        if not lines:
+            raise ValueError("Empty parameter file content")
+        return cls(lines)
+
+    @classmethod
+    def from_file(cls, filepath: Union[str, pathlib.Path]) -> "LazySammyParameterFile":
+        """Index the cards of a parameter file on disk.
+
+        Args:
+            filepath: Path to parameter file
+
+        Raises:
+            FileNotFoundError: If file does not exist
+            ValueError: If the file is empty
+        """
+        filepath = pathlib.Path(filepath)
+        if not filepath.exists():
+            raise FileNotFoundError(f"Parameter file not found: {filepath}")
+        return cls.from_string(filepath.read_text())
+
+    def cards(self) -> List[str]:
+        """Field names of the cards present in the file, in standard card order, without parsing them."""
+        present = set(self._spans)
+        resonances_entries, fudge_factor = self._split_headerless()
+        if resonances_entries:
+            present.add("resonance")
+        if fudge_factor:
+            present.add("fudge")
+        return [
+            CardOrder.get_field_name(card_type)
+            for card_type in CardOrder
+            if CardOrder.get_field_name(card_type) in present
+        ]
+
+    def __getattr__(self, name: str):
+        if name not in SammyParameterFile.model_fields:
+            raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+        if name not in self._cards:
+            card = self._parse(name)
+            if card is not None:
+                # Validated as a field of SammyParameterFile, e.g. the range of the fudge factor
+                card = getattr(SammyParameterFile(**{name: card}), name)
+            self._cards[name] = card
+        return self._cards[name]
+
+    def _split_headerless(self) -> Tuple[List[str], Optional[str]]:
+        if self._headerless_lines is None:
+            self._headerless_lines = SammyParameterFile._split_headerless_lines(self._lines, self._headerless)
+        return self._headerless_lines
+
+    def _parse(self, name: str):
+        if name in ("resonance", "fudge"):
+            resonances_entries, fudge_factor = self._split_headerless()
+            if name == "fudge":
+                return SammyParameterFile._parse_fudge(fudge_factor) if fudge_factor else None
+            return SammyParameterFile._parse_resonances(resonances_entries) if resonances_entries else None
+        span = self._spans.get(name)
+        if span is None:
+            return None
+        return SammyParameterFile._parse_card_set(list(self._lines[span.start : span.end]))[1]
+
+    def to_parameter_file(self) -> SammyParameterFile:
+        """Parse every card into a SammyParameterFile.
+
+        Raises:
+            ValueError: If a card is not implemented or cannot be parsed
+        """
+        for span in self._unknown:
+            # Raises for the card type, as SammyParameterFile.from_string does
+            SammyParameterFile._parse_card_set(list(self._lines[span.start : span.end]))
+        params = {name: getattr(self, name) for name in SammyParameterFile.model_fields}
+        return SammyParameterFile(**{name: card for name, card in params.items() if card is not None})
+
+
 if __name__ == "__main__":
     # TODO: Add usage example for SAMMY parameter file handling
     raise NotImplementedError("Example usage not yet implemented")
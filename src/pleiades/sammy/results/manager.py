@@ -4,6 +4,12 @@ from pathlib import Path
 from pleiades.sammy.io.lpt_manager import LptManager
 from pleiades.sammy.io.lst_manager import LstManager
 from pleiades.sammy.results.models import FitResults, RunResults
+from pleiades.sammy.results.sidecar import (
+    default_sidecar_path,
+    read_results_sidecar,
+    source_stamps,
+    write_results_sidecar,
+)
 from pleiades.utils.logger import loguru_logger
 
 logger = loguru_logger.bind(name=__name__)
@@ -13,8 +19,13 @@ class ResultsManager:
     """
     A class to manage and extract results from SAMMY calculations.
 
+    Parsed results can be cached in a binary sidecar next to the output files
+    (write_sidecar=True, see pleiades.sammy.results.sidecar), which later
+    instances read instead of the output files as long as those have not changed.
+
     Attributes:
         run_results (RunResults): A container for multiple fit results.
+        sidecar_path (Path): Path of the results sidecar, None if not used.
     """
 
     # Initialize a LptManager object to manage the LPT file
@@ -22,8 +33,22 @@ class ResultsManager:
         self,
         lpt_file_path: Path = None,
         lst_file_path: Path = None,
+        use_sidecar: bool = True,
+        sidecar_path: Path = None,
+        write_sidecar: bool = False,
     ):
+        """
+        Args:
+            lpt_file_path (Path, optional): Path to the SAMMY LPT file.
+            lst_file_path (Path, optional): Path to the SAMMY LST file.
+            use_sidecar (bool): If True, read the results from the sidecar when it is fresh.
+            sidecar_path (Path, optional): Path of the sidecar, next to the LPT
+                (or LST) file by default, e.g. SAMMY.results.npz.
+            write_sidecar (bool): If True, write the sidecar after parsing the output
+                files, so that later instances can read it.
+        """
         self.run_results = RunResults()
+        self.sidecar_path = None
 
         # Convert to Path if passed as string
         if lpt_file_path is not None and not isinstance(lpt_file_path, Path):
@@ -31,6 +56,23 @@ class ResultsManager:
         if lst_file_path is not None and not isinstance(lst_file_path, Path):
             lst_file_path = Path(lst_file_path)
 
+        # The sidecar is only used when every given output file exists,
+        # missing files are reported by the managers below
+        sources = {"lpt": lpt_file_path, "lst": lst_file_path}
+        given = [path for path in sources.values() if path is not None]
+        stamps = None
+        if (use_sidecar or write_sidecar) and given and all(path.is_file() for path in given):
+            self.sidecar_path = Path(sidecar_path) if sidecar_path is not None else default_sidecar_path(given[0])
+            stamps = source_stamps(sources)
+            cached = read_results_sidecar(self.sidecar_path, sources) if use_sidecar else None
+            if cached is not None:
+                self.run_results = cached
+                if lpt_file_path is not None:
+                    self.lpt_manager = LptManager(run_results=self.run_results)
+                if lst_file_path is not None:
+                    self.lst_manager = LstManager(run_results=self.run_results)
+                return
+
         # Initialize the managers based on the provided file paths
         # If a file path is provided, process the file and extract results.
         if lpt_file_path is not None:
@@ -38,6 +80,17 @@ class ResultsManager:
         if lst_file_path is not None:
             self.lst_manager = LstManager(lst_file_path, self.run_results)
 
+        if not write_sidecar or stamps is None:
+            # No sidecar was read, and none is written
+            self.sidecar_path = None
+            return
+        try:
+            write_results_sidecar(self.sidecar_path, self.run_results, stamps)
+        except OSError as e:
+            # e.g. read-only output directory, results are still available
+            logger.warning(f"Could not write results sidecar {self.sidecar_path}: {e}")
+            self.sidecar_path = None
+
     def add_fit_result(self, fit_result: FitResults):
         """Add a FitResults object to the RunResults."""
         self.run_results.add_fit_result(fit_result)
@@ -0,0 +1,203 @@
+#!/usr/bin/env python
+"""
+Binary sidecar of parsed SAMMY results.
+
+Reopening the results of a fit means parsing SAMMY.LPT and SAMMY.LST again,
+which takes seconds for large result sets. ResultsManager(write_sidecar=True)
+stores what it parsed in an uncompressed .npz file next to the outputs, which
+later instances read instead:
+
+- fit_results: the FitResults of every LPT block, as JSON
+- lst_values, lst_columns, lst_meta: the LST columns as a float64 array, their
+  names and the SammyData settings (data type, units)
+- sources: name, size and modification time of every parsed file
+- pleiades_version: version of PLEIADES that wrote the sidecar
+
+A sidecar is used only if it was written by the running version of PLEIADES
+and the size and modification time of every source file are those recorded,
+so an upgrade or a new fit in the same directory invalidates it. The sidecar
+holds no pickled objects: fit results are validated again when read, except
+that parameters absent from the LPT file stay None (see rebuild_model).
+"""
+
+import json
+import os
+import types
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Type, TypeVar, Union, get_args, get_origin
+
+import numpy as np
+from pydantic import BaseModel, TypeAdapter, ValidationError
+
+from pleiades import __version__
+from pleiades.sammy.data.options import SammyData
+from pleiades.sammy.io.lst_reader import LstTable
+from pleiades.sammy.results.models import FitResults, RunResults
+from pleiades.utils.logger import loguru_logger
+
+logger = loguru_logger.bind(name=__name__)
+
+SIDECAR_VERSION = 2
+SIDECAR_SUFFIX = ".results.npz"
+
+SourceStamps = Dict[str, List]  # role ("lpt", "lst") -> [file name, size, mtime in ns]
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
+@lru_cache(maxsize=None)
+def _adapter(annotation) -> TypeAdapter:
+    return TypeAdapter(annotation)
+
+
+def _rebuild_value(annotation, value: Any) -> Any:
+    """Rebuild a dumped field value, see rebuild_model."""
+    if value is None:
+        return None
+    origin = get_origin(annotation)
+    args = get_args(annotation)
+    if origin in (Union, types.UnionType):
+        members = [arg for arg in args if arg is not type(None)]
+        if len(members) == 1:
+            return _rebuild_value(members[0], value)
+    elif origin is list and len(args) == 1 and isinstance(value, list):
+        return [_rebuild_value(args[0], item) for item in value]
+    elif isinstance(annotation, type) and issubclass(annotation, BaseModel) and isinstance(value, dict):
+        return rebuild_model(annotation, value)
+    return _adapter(annotation).validate_python(value)
+
+
+def rebuild_model(model: Type[ModelT], data: Dict[str, Any]) -> ModelT:
+    """
+    Rebuild a model from its model_dump(mode="json").
+
+    Models parsed from LPT files hold None for the parameters the file does not
+    report, even in required fields, so they do not always validate. A model that
+    fails validation is built with model_construct from its fields, each of which
+    is validated (or rebuilt the same way) unless it is None.
+
+    Args:
+        model: Model class
+        data: Dumped model
+
+    Returns:
+        The rebuilt model
+
+    Raises:
+        ValidationError: If a value other than None is invalid
+    """
+    try:
+        return model.model_validate(data)
+    except ValidationError:
+        pass
+    values = {
+        name: _rebuild_value(field.annotation, data[name]) for name, field in model.model_fields.items() if name in data
+    }
+    return model.model_construct(**values)
+
+
+def default_sidecar_path(output_file: Union[str, Path]) -> Path:
+    """Sidecar of the results parsed from an output file, e.g. SAMMY.results.npz for SAMMY.LPT."""
+    output_file = Path(output_file)
+    return output_file.with_name(output_file.stem + SIDECAR_SUFFIX)
+
+
+def source_stamps(sources: Dict[str, Optional[Path]]) -> SourceStamps:
+    """
+    Record the state of the source files of a sidecar.
+
+    Args:
+        sources: Paths of the parsed files by role, None for files not parsed
+
+    Returns:
+        SourceStamps: Name, size and modification time of every given file
+
+    Raises:
+        FileNotFoundError: If a given file does not exist
+    """
+    stamps = {}
+    for role, path in sources.items():
+        if path is None:
+            continue
+        stat = os.stat(path)
+        stamps[role] = [Path(path).name, stat.st_size, stat.st_mtime_ns]
+    return stamps
+
+
+def write_results_sidecar(sidecar_path: Union[str, Path], run_results: RunResults, stamps: SourceStamps) -> Path:
+    """
+    Write the sidecar of parsed results.
+
+    The file is written next to its final path and moved in place, so readers
+    never see a partial sidecar.
+
+    Args:
+        sidecar_path: Path of the sidecar
+        run_results: Results parsed from the source files
+        stamps: State of the source files before they were parsed, see source_stamps
+
+    Returns:
+        Path: Path of the sidecar
+    """
+    sidecar_path = Path(sidecar_path)
+    arrays = {
+        "version": np.array(SIDECAR_VERSION),
+        "pleiades_version": np.array(__version__),
+        "sources": np.array(json.dumps(stamps)),
+        "fit_results": np.array(json.dumps([fit.model_dump(mode="json") for fit in run_results.fit_results])),
+    }
+    data = run_results.data
+    if "lst" in stamps and data is not None and data.data is not None:
+        arrays["lst_values"] = data.data.to_numpy(dtype=np.float64)
+        arrays["lst_columns"] = np.array([str(column) for column in data.data.columns])
+        arrays["lst_meta"] = np.array(data.model_dump_json(exclude={"data_file"}))
+
+    temporary_path = sidecar_path.with_name(sidecar_path.name + ".tmp")
+    with open(temporary_path, "wb") as file:
+        np.savez(file, **arrays)
+    os.replace(temporary_path, sidecar_path)
+    logger.debug(f"Wrote results sidecar {sidecar_path}")
+    return sidecar_path
+
+
+def read_results_sidecar(sidecar_path: Union[str, Path], sources: Dict[str, Optional[Path]]) -> Optional[RunResults]:
+    """
+    Read the sidecar of parsed results if it is fresh.
+
+    Args:
+        sidecar_path: Path of the sidecar
+        sources: Paths of the files the results are wanted for, by role
+
+    Returns:
+        RunResults, or None if the sidecar is missing, unreadable, invalid or was
+        written by another version of PLEIADES or for other versions of the files
+    """
+    sidecar_path = Path(sidecar_path)
+    if not sidecar_path.is_file():
+        return None
+
+    try:
+        with np.load(sidecar_path, allow_pickle=False) as sidecar:
+            if int(sidecar["version"]) != SIDECAR_VERSION or str(sidecar["pleiades_version"]) != __version__:
+                logger.debug(f"Results sidecar {sidecar_path} has another version, ignoring it")
+                return None
+            if json.loads(str(sidecar["sources"])) != source_stamps(sources):
+                logger.debug(f"Results sidecar {sidecar_path} is stale, ignoring it")
+                return None
+
+            fit_results = [rebuild_model(FitResults, fit) for fit in json.loads(str(sidecar["fit_results"]))]
+            run_results = RunResults(fit_results=fit_results)
+            if "lst_values" in sidecar:
+                table = LstTable(sidecar["lst_values"], columns=sidecar["lst_columns"].tolist())
+                # Built without data_file, which would parse the LST file again
+                data = SammyData(**json.loads(str(sidecar["lst_meta"])))
+                data.data_file = Path(sources["lst"])
+                data.data = table.to_dataframe()
+                run_results.data = data
+    except Exception as e:
+        logger.warning(f"Could not read results sidecar {sidecar_path}: {e}")
+        return None
+
+    logger.debug(f"Read results from sidecar {sidecar_path}")
+    return run_results
@@ -0,0 +1,142 @@
+#!/usr/bin/env python
+"""
+File staging helpers for SAMMY working directories.
+
+Every SAMMY run stages its input files into a working directory and moves its
+outputs out of it afterwards. With thousands of small jobs, on a network
+filesystem in particular, these metadata operations dominate the run time. This
+module provides cheaper alternatives to plain copies:
+
+- hardlinks and reflinks (copy-on-write clones) instead of copies of the inputs,
+  falling back to a copy when the filesystem does not support them,
+- scratch working directories on a RAM-backed filesystem (/dev/shm),
+- single-rename moves of output files, falling back to copy+delete across devices.
+"""
+
+import errno
+import os
+import shutil
+import tempfile
+from contextlib import contextmanager
+from enum import Enum
+from pathlib import Path
+from typing import Iterator, Optional
+
+from pleiades.utils.logger import loguru_logger
+
+logger = loguru_logger.bind(name=__name__)
+
+# Linux ioctl cloning a whole file (btrfs, xfs, ...)
+FICLONE = 0x40049409
+# RAM-backed filesystem used for scratch working directories
+SHM_ROOT = Path("/dev/shm")
+
+
+class StagingStrategy(Enum):
+    """How input files are placed into the working directory."""
+
+    COPY = "copy"  # Full copy (default, always works)
+    HARDLINK = "hardlink"  # Hardlink, falls back to a copy across filesystems
+    REFLINK = "reflink"  # Copy-on-write clone, falls back to a copy if unsupported
+
+
+def _reflink(source: Path, destination: Path) -> None:
+    """Clone a file with the FICLONE ioctl, raising OSError when unsupported."""
+    try:
+        import fcntl
+    except ImportError:
+        raise OSError(errno.EOPNOTSUPP, "reflink not supported on this platform")
+
+    with open(source, "rb") as src, open(destination, "wb") as dst:
+        try:
+            fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+        except OSError:
+            dst.close()
+            destination.unlink()
+            raise
+    shutil.copystat(source, destination)
+
+
+def stage_file(source: Path, destination: Path, strategy: StagingStrategy = StagingStrategy.COPY) -> StagingStrategy:
+    """
+    Place a file at destination using the given strategy.
+
+    The destination must not exist. Hardlinked files share their content with the
+    source, so they must not be modified in place.
+
+    Args:
+        source: Existing file
+        destination: Path of the staged file
+        strategy: Preferred staging strategy
+
+    Returns:
+        StagingStrategy: Strategy actually used (COPY after a fallback)
+    """
+    if strategy == StagingStrategy.HARDLINK:
+        try:
+            os.link(source, destination)
+            return StagingStrategy.HARDLINK
+        except OSError as e:
+            logger.debug(f"Hardlink {source} -> {destination} failed ({str(e)}), copying instead")
+    elif strategy == StagingStrategy.REFLINK:
+        try:
+            _reflink(source, destination)
+            return StagingStrategy.REFLINK
+        except OSError as e:
+            logger.debug(f"Reflink {source} -> {destination} failed ({str(e)}), copying instead")
+
+    shutil.copy2(source, destination)
+    return StagingStrategy.COPY
+
+
+def move_file(source: Path, destination: Path) -> None:
+    """
+    Move a file, replacing any existing destination.
+
+    Uses a single rename when source and destination share a filesystem, and a
+    copy followed by a delete otherwise (e.g. from a /dev/shm scratch directory).
+
+    Args:
+        source: File to move
+        destination: Target path
+    """
+    try:
+        os.replace(source, destination)
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+        shutil.copy2(source, destination)
+        os.unlink(source)
+
+
+def default_scratch_root() -> Optional[Path]:
+    """
+    Return the RAM-backed scratch root if it is usable.
+
+    Returns:
+        Path to /dev/shm if it exists and is writable, None otherwise
+    """
+    if SHM_ROOT.is_dir() and os.access(SHM_ROOT, os.W_OK):
+        return SHM_ROOT
+    return None
+
+
+@contextmanager
+def scratch_directory(root: Optional[Path] = None, prefix: str = "sammy_") -> Iterator[Path]:
+    """
+    Create a temporary working directory, removed on exit.
+
+    Args:
+        root: Parent directory, defaults to /dev/shm when available, else the system temp dir
+        prefix: Prefix of the directory name
+
+    Yields:
+        Path: Scratch directory
+    """
+    root = root if root is not None else default_scratch_root()
+    scratch = Path(tempfile.mkdtemp(prefix=prefix, dir=root))
+    logger.debug(f"Created scratch directory {scratch}")
+    try:
+        yield scratch
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
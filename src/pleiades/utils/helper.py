@@ -3,7 +3,9 @@
 
 import re
 from enum import Enum
-from typing import Optional
+from typing import Optional, Sequence, Union
+
+import numpy as np
 
 
 class VaryFlag(Enum):
@@ -14,6 +16,10 @@ class VaryFlag(Enum):
     USE_FROM_OTHERS = -2  # do not vary, use value from other sources (INP, COV, etc.)
 
 
+# Mantissa and exponent of a float written without E, with or without a dot before the sign
+_PSEUDO_SCIENTIFIC = re.compile(r"^([+-]?\d*\.?\d+)\.?([+-]\d+)$")
+
+
 def check_pseudo_scientific(val: str) -> float:
     """Check for pseudo scientific notation sometimes found in SAMMY files.
 
@@ -21,37 +27,90 @@ def check_pseudo_scientific(val: str) -> float:
         val (str): The input string potentially containing pseudo scientific notation.
 
     Returns:
-        str: The fixed string with proper scientific notation.
-
-    Examples:
+        float: The value, reading 5.00000-5 or 5.00000.-5 as 5.00000e-5.
 
+    Raises:
+        ValueError: If the string is not a number.
     """
-    import re
-
     s = str(val).strip()
-    # Case 1: 5.00000.-5 or -1.23.+4 (dot before sign)
-    m = re.match(r"^([+-]?\d*\.?\d+)\.(\+|\-)(\d+)$", s)
+    # 5.00000.-5 or -1.23.+4 (dot before sign), 5.00000-5 or -1.23+4 (no dot before sign, no E)
+    m = _PSEUDO_SCIENTIFIC.match(s)
     if m:
-        s_fixed = f"{m.group(1)}e{m.group(2)}{m.group(3)}"
-        try:
-            return float(s_fixed)
-        except (ValueError, TypeError):
-            raise ValueError(f"Cannot convert pseudo-scientific string '{val}' to float (fixed: '{s_fixed}')")
-    # Case 2: 5.00000-5 or -1.23+4 (no dot before sign, no E)
-    m2 = re.match(r"^([+-]?\d*\.?\d+)([+-]\d+)$", s)
-    if m2:
-        s_fixed = f"{m2.group(1)}e{m2.group(2)}"
-        try:
-            return float(s_fixed)
-        except (ValueError, TypeError):
-            raise ValueError(f"Cannot convert pseudo-scientific string '{val}' to float (fixed: '{s_fixed}')")
-    # Case 3: already valid scientific notation or normal float
+        return float(f"{m.group(1)}e{m.group(2)}")
+    # Already valid scientific notation or normal float
     try:
         return float(s)
     except (ValueError, TypeError) as e:
         raise ValueError(f"Cannot convert string '{val}' to float. Original error: {e}")
 
 
+def _insert_exponent(fields: np.ndarray) -> np.ndarray:
+    """Rewrite the 1.234-5 and 1.234.-5 fields of a bytes array as 1.234e-5, column-wise."""
+    width = fields.dtype.itemsize
+    sign = np.maximum(np.char.rfind(fields, b"-"), np.char.rfind(fields, b"+"))
+    rows = np.flatnonzero((sign > 0) & (np.char.find(np.char.upper(fields), b"E") < 0))
+    fixed = fields.astype(f"S{width + 1}")
+    if not len(rows):
+        return fixed
+
+    # One character per column, plus an empty column for the inserted 'e'
+    chars = np.zeros((len(rows), width + 1), dtype="S1")
+    chars[:, :width] = np.ascontiguousarray(fields[rows]).view("S1").reshape(len(rows), width)
+    sign = sign[rows, np.newaxis]
+    # A dot right before the sign is replaced by the 'e', otherwise the 'e' is inserted
+    dot = np.take_along_axis(chars, sign - 1, axis=1) == b"."
+    exponent = sign - dot
+    columns = np.arange(width + 1)
+    source = np.where(columns > exponent, columns - ~dot, columns)
+    shifted = np.take_along_axis(chars, source, axis=1)
+    shifted[columns == exponent] = b"e"
+    # Two dots before the sign (1..-5) are not a number, those fields are left to fail
+    valid = ~(dot & (np.take_along_axis(chars, np.maximum(sign - 2, 0), axis=1) == b".")).ravel()
+    fixed[rows[valid]] = shifted[valid].view(f"S{width + 1}").ravel()
+    return fixed
+
+
+def parse_pseudo_scientific(fields: Union[Sequence[str], np.ndarray, bytes], width: Optional[int] = None) -> np.ndarray:
+    """Parse a column of fixed-width float fields, in pseudo scientific notation or not.
+
+    Instead of calling check_pseudo_scientific for every field, the whole column is
+    converted at once: when it holds only plain floats it goes straight through
+    NumPy, otherwise the exponent marker is inserted into every pseudo scientific
+    field with array operations before converting again.
+
+    Args:
+        fields: Field strings (str or bytes), or a raw byte block of concatenated fields.
+        width: Field width, required to split a raw byte block.
+
+    Returns:
+        np.ndarray: float64 values; blank fields are NaN.
+
+    Raises:
+        ValueError: If a field is not a number.
+    """
+    if isinstance(fields, (bytes, bytearray, memoryview)):
+        if width is None:
+            raise ValueError("width is required to split a byte block into fields")
+        fields = np.frombuffer(bytes(fields), dtype=f"S{width}")
+    fields = np.char.strip(np.asarray(fields, dtype=bytes))
+    fields = np.where(fields == b"", b"nan", fields)
+    try:
+        return fields.astype(np.float64)
+    except ValueError:
+        pass
+
+    fixed = _insert_exponent(fields)
+    try:
+        return fixed.astype(np.float64)
+    except ValueError:
+        for field, value in zip(fields.tolist(), fixed.tolist()):
+            try:
+                float(value)
+            except ValueError:
+                raise ValueError(f"Cannot convert string '{field.decode(errors='replace')}' to float") from None
+        raise
+
+
 def safe_parse(s: str, as_int: bool = False) -> Optional[float]:
     """Helper function to safely parse numeric values
 
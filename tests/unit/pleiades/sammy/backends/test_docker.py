@@ -10,7 +10,10 @@ from pleiades.sammy.backends.docker import DockerSammyRunner
 from pleiades.sammy.config import DockerSammyConfig
 from pleiades.sammy.interface import (
     EnvironmentPreparationError,
+    RetryPolicy,
+    SammyFailureType,
     SammyFiles,
+    TransientBackendError,
 )
 
 
@@ -138,6 +141,65 @@ class TestDockerSammyRunner:
 
         assert not result.success
         assert "Docker execution failed" in result.error_message
+        assert result.failure_type == SammyFailureType.SAMMY_FAILURE
+
+    def test_execute_sammy_timeout(self, docker_config, mock_sammy_files, mock_docker_command, monkeypatch):
+        """Should kill the container and report a timeout."""
+        _ = mock_docker_command  # implicitly used via fixture
+        commands = []
+
+        def mock_run(*args, **kwargs):
+            commands.append(args[0])
+            if args[0][:2] == ["docker", "run"]:
+                raise subprocess.TimeoutExpired(args[0], kwargs["timeout"], output="partial")
+            return subprocess.CompletedProcess(args=args, returncode=0, stdout="", stderr="")
+
+        monkeypatch.setattr(subprocess, "run", mock_run)
+        docker_config.timeout = 5
+        docker_config.memory_limit = 2**30
+        runner = DockerSammyRunner(docker_config)
+        files = SammyFiles(**mock_sammy_files)
+
+        runner.prepare_environment(files)
+        result = runner.execute_sammy(files)
+
+        run_cmd = next(cmd for cmd in commands if cmd[:2] == ["docker", "run"])
+        container_name = run_cmd[run_cmd.index("--name") + 1]
+        assert run_cmd[run_cmd.index("--memory") + 1] == str(2**30)
+        assert ["docker", "kill", container_name] in commands
+        assert not result.success
+        assert result.failure_type == SammyFailureType.TIMEOUT
+        assert result.console_output == "partial"
+
+    def test_execute_sammy_daemon_error_is_retried(
+        self, docker_config, mock_sammy_files, mock_docker_command, mock_sammy_output, monkeypatch
+    ):
+        """Should raise a transient error on daemon failures and succeed on retry."""
+        _ = mock_docker_command  # implicitly used via fixture
+        runs = []
+
+        def mock_run(*args, **kwargs):
+            _ = kwargs  # Unused
+            if args[0][:2] != ["docker", "run"]:
+                return subprocess.CompletedProcess(args=args, returncode=0, stdout="", stderr="")
+            runs.append(args[0])
+            if len(runs) == 1:
+                stderr = "docker: Cannot connect to the Docker daemon at unix:///var/run/docker.sock."
+                return subprocess.CompletedProcess(args=args, returncode=125, stdout="", stderr=stderr)
+            return subprocess.CompletedProcess(args=args, returncode=0, stdout=mock_sammy_output, stderr="")
+
+        monkeypatch.setattr(subprocess, "run", mock_run)
+        runner = DockerSammyRunner(docker_config)
+        files = SammyFiles(**mock_sammy_files)
+        runner.prepare_environment(files)
+
+        with pytest.raises(TransientBackendError):
+            runner.execute_sammy(files)
+
+        result = runner.execute_with_retry(files, RetryPolicy(backoff_seconds=0))
+        assert result.success
+        assert result.attempts == 1
+        assert len(runs) == 2
 
     def test_collect_outputs(
         self, docker_config, mock_sammy_files, mock_subprocess_docker, mock_docker_command, mock_sammy_results
@@ -1,15 +1,23 @@
 #!/usr/bin/env python
 """Unit tests for local SAMMY backend."""
 
+import io
+import resource
+import signal
 import subprocess
 from pathlib import Path
-from unittest.mock import MagicMock
 
 import pytest
 
 from pleiades.sammy.backends.local import LocalSammyRunner
 from pleiades.sammy.config import LocalSammyConfig
-from pleiades.sammy.interface import EnvironmentPreparationError, SammyExecutionError, SammyFiles, SammyFilesMultiMode
+from pleiades.sammy.interface import (
+    EnvironmentPreparationError,
+    SammyExecutionError,
+    SammyFailureType,
+    SammyFiles,
+    SammyFilesMultiMode,
+)
 
 
 @pytest.fixture
@@ -40,35 +48,50 @@ def local_config(temp_working_dir, mock_sammy_executable):
     return local_sammy_config
 
 
+class FakePopen:
+    """Stand-in for subprocess.Popen replaying a canned console output."""
+
+    def __init__(self, args, output="", returncode=0, **kwargs):
+        _ = kwargs
+        self.args = args
+        self.pid = 4242
+        self.stdin = io.StringIO()
+        self.stdin.close = lambda: None  # keep written input readable by tests
+        self.stdout = io.StringIO(output)
+        self.returncode = returncode
+        self.killed = False
+
+    def wait(self, timeout=None):
+        _ = timeout
+        return self.returncode
+
+    def poll(self):
+        return self.returncode
+
+    def kill(self):
+        self.killed = True
+
+
 @pytest.fixture
 def mock_subprocess_run(monkeypatch, mock_sammy_output):
-    """Mock subprocess.run to avoid actual SAMMY execution."""
+    """Mock subprocess.Popen to avoid actual SAMMY execution."""
 
-    def mock_run(*args, **kwargs):
-        _ = kwargs
-        result = subprocess.CompletedProcess(args=args, returncode=0, stdout=mock_sammy_output, stderr="")
-        return result
+    def mock_popen(*args, **kwargs):
+        return FakePopen(*args, output=mock_sammy_output, returncode=0, **kwargs)
 
-    monkeypatch.setattr(subprocess, "run", mock_run)
-    return mock_run
+    monkeypatch.setattr(subprocess, "Popen", mock_popen)
+    return mock_popen
 
 
 @pytest.fixture
 def mock_subprocess_fail(monkeypatch, mock_sammy_error_output):
-    """Mock subprocess.run to simulate SAMMY failure."""
+    """Mock subprocess.Popen to simulate SAMMY failure."""
 
-    def mock_run(*args, **kwargs):
-        _ = kwargs
-        result = subprocess.CompletedProcess(
-            args=args,
-            returncode=1,
-            stdout="",
-            stderr=mock_sammy_error_output,
-        )
-        return result
+    def mock_popen(*args, **kwargs):
+        return FakePopen(*args, output=mock_sammy_error_output, returncode=1, **kwargs)
 
-    monkeypatch.setattr(subprocess, "run", mock_run)
-    return mock_run
+    monkeypatch.setattr(subprocess, "Popen", mock_popen)
+    return mock_popen
 
 
 class TestLocalSammyRunner:
@@ -126,16 +149,17 @@ class TestLocalSammyRunner:
 
         assert not result.success
         assert "SAMMY execution failed" in result.error_message
+        assert result.failure_type == SammyFailureType.SAMMY_FAILURE
 
     def test_execute_sammy_crash(self, local_config, mock_sammy_files, monkeypatch):
         """Should handle subprocess crash."""
 
-        def mock_run(*args, **kwargs):
+        def mock_popen(*args, **kwargs):
             _ = args
             _ = kwargs
             raise subprocess.SubprocessError("Mock crash")
 
-        monkeypatch.setattr(subprocess, "run", mock_run)
+        monkeypatch.setattr(subprocess, "Popen", mock_popen)
 
         runner = LocalSammyRunner(local_config)
         files = SammyFiles(**mock_sammy_files)
@@ -145,6 +169,124 @@ class TestLocalSammyRunner:
             runner.execute_sammy(files)
         assert "Mock crash" in str(exc.value)
 
+    def test_execute_sammy_streams_console(self, local_config, mock_sammy_files, mock_subprocess_run):
+        """Should stream the console to a log file and keep a bounded tail."""
+        _ = mock_subprocess_run  # make pre-commit happy
+        local_config.console_tail_lines = 2
+        runner = LocalSammyRunner(local_config)
+        files = SammyFiles(**mock_sammy_files)
+
+        runner.prepare_environment(files)
+        result = runner.execute_sammy(files)
+
+        assert result.success
+        assert result.console_log_file == local_config.output_dir / "sammy_console.log"
+        assert "SAMMY execution log" in result.console_log_file.read_text()
+        assert "SAMMY execution log" not in result.console_output
+        assert len(result.console_output.splitlines()) == 2
+
+    def test_execute_sammy_aborts_on_fatal_error(self, local_config, mock_sammy_files, monkeypatch):
+        """Should abort and fail when a fatal error is printed."""
+        processes = []
+
+        def mock_popen(*args, **kwargs):
+            output = "Fortran runtime error: bad input\n Normal finish to SAMMY\n"
+            processes.append(FakePopen(*args, output=output, returncode=-9, **kwargs))
+            return processes[-1]
+
+        monkeypatch.setattr(subprocess, "Popen", mock_popen)
+        runner = LocalSammyRunner(local_config)
+        files = SammyFiles(**mock_sammy_files)
+
+        runner.prepare_environment(files)
+        result = runner.execute_sammy(files)
+
+        assert processes[0].killed
+        assert not result.success
+        assert "Fortran runtime error" in result.error_message
+        assert result.failure_type == SammyFailureType.FATAL_ERROR
+
+    @pytest.mark.skipif(not hasattr(resource, "prlimit"), reason="resource.prlimit is Linux only")
+    def test_execute_sammy_cpu_limit(self, local_config, mock_sammy_files, monkeypatch):
+        """Should apply rlimits to the started process and classify a CPU limit kill."""
+        popen_kwargs = {}
+        limits = []
+
+        def mock_popen(*args, **kwargs):
+            popen_kwargs.update(kwargs)
+            return FakePopen(*args, output="Iterating\n", returncode=-signal.SIGKILL, **kwargs)
+
+        monkeypatch.setattr(subprocess, "Popen", mock_popen)
+        monkeypatch.setattr(resource, "prlimit", lambda pid, limit, values: limits.append((pid, limit, values)))
+        local_config.cpu_time_limit = 10
+        local_config.memory_limit = 2**30
+        runner = LocalSammyRunner(local_config)
+        files = SammyFiles(**mock_sammy_files)
+
+        runner.prepare_environment(files)
+        result = runner.execute_sammy(files)
+
+        assert "preexec_fn" not in popen_kwargs
+        assert limits == [(4242, resource.RLIMIT_CPU, (10, 10)), (4242, resource.RLIMIT_AS, (2**30, 2**30))]
+        assert not result.success
+        assert result.failure_type == SammyFailureType.RESOURCE_LIMIT
+
+    @pytest.mark.skipif(not hasattr(resource, "prlimit"), reason="resource.prlimit is Linux only")
+    def test_execute_sammy_limits_real_process(self, local_config, mock_sammy_files, tmp_path):
+        """Should set the limits before SAMMY reads its input."""
+        executable = tmp_path / "fake_sammy"
+        executable.write_text(
+            '#!/bin/sh\ncat > /dev/null\necho "CPU limit $(ulimit -t)"\necho " Normal finish to SAMMY"\n'
+        )
+        executable.chmod(0o755)
+        local_config.sammy_executable = executable
+        local_config.cpu_time_limit = 10
+        runner = LocalSammyRunner(local_config)
+        files = SammyFiles(**mock_sammy_files)
+
+        runner.prepare_environment(files)
+        result = runner.execute_sammy(files)
+
+        assert result.success
+        assert "CPU limit 10" in result.console_output
+
+    def test_execute_sammy_without_limits(self, local_config, mock_sammy_files, monkeypatch):
+        """Should not set rlimits when no limit is configured."""
+        popen_kwargs = {}
+
+        def mock_popen(*args, **kwargs):
+            popen_kwargs.update(kwargs)
+            return FakePopen(*args, output=" Normal finish to SAMMY\n", **kwargs)
+
+        monkeypatch.setattr(subprocess, "Popen", mock_popen)
+        monkeypatch.setattr(resource, "prlimit", lambda *args: pytest.fail("rlimit set without a limit"), raising=False)
+        runner = LocalSammyRunner(local_config)
+        files = SammyFiles(**mock_sammy_files)
+
+        runner.prepare_environment(files)
+        result = runner.execute_sammy(files)
+
+        assert "preexec_fn" not in popen_kwargs
+        assert result.success
+        assert result.failure_type is None
+
+    def test_execute_sammy_progress_callback(self, local_config, mock_sammy_files, monkeypatch):
+        """Should forward live progress updates."""
+
+        def mock_popen(*args, **kwargs):
+            output = " CUSTOMARY CHI SQUARED DIVIDED BY NDAT =   3.47939\n Normal finish to SAMMY\n"
+            return FakePopen(*args, output=output, **kwargs)
+
+        monkeypatch.setattr(subprocess, "Popen", mock_popen)
+        updates = []
+        runner = LocalSammyRunner(local_config, progress_callback=updates.append)
+        files = SammyFiles(**mock_sammy_files)
+
+        runner.prepare_environment(files)
+        runner.execute_sammy(files)
+
+        assert updates[-1].reduced_chi_squared == pytest.approx(3.47939)
+
     def test_collect_outputs(self, local_config, mock_sammy_files, mock_subprocess_run, mock_sammy_results):
         """Should collect output files."""
         _ = mock_subprocess_run  # make pre-commit happy
@@ -240,23 +382,22 @@ class TestLocalSammyRunnerJsonMode:
         executed_commands = []
         captured_inputs = []
 
-        def mock_run(command, **kwargs):
+        processes = []
+
+        def mock_popen(command, **kwargs):
             executed_commands.append(command)
-            if "input" in kwargs:
-                captured_inputs.append(kwargs["input"])
-            mock_result = MagicMock()
-            mock_result.returncode = 0
-            mock_result.stdout = ""
-            mock_result.stderr = " Normal finish to SAMMY"
-            return mock_result
+            process = FakePopen(command, output=" Normal finish to SAMMY\n", **kwargs)
+            processes.append(process)
+            return process
 
-        monkeypatch.setattr(subprocess, "run", mock_run)
+        monkeypatch.setattr(subprocess, "Popen", mock_popen)
 
         runner = LocalSammyRunner(local_config)
         files = SammyFilesMultiMode(**mock_multimode_files)
 
         # Execute (will be mocked)
         runner.execute_sammy(files)
+        captured_inputs.extend(process.stdin.getvalue() for process in processes)
 
         # Verify command format - now using list format without shell
         assert len(executed_commands) == 1
@@ -2,14 +2,16 @@
 """Unit tests for NOVA SAMMY backend implementation (updated for new API)."""
 
 import os
+import threading
 import zipfile
 from unittest import mock
 
 import pytest
+import requests
 
 from pleiades.sammy.backends.nova_ornl import NovaSammyRunner
 from pleiades.sammy.config import NovaSammyConfig
-from pleiades.sammy.interface import SammyFiles
+from pleiades.sammy.interface import SammyExecutionError, SammyFailureType, SammyFiles, TransientBackendError
 
 # Mock environment variables
 os.environ["NOVA_URL"] = "https://mock_nova_url"
@@ -126,6 +128,44 @@ class TestNovaSammyRunner:
         assert not result.success
         assert result.error_message == "SAMMY execution failed"
 
+    def test_execute_sammy_timeout(self, nova_config, mock_sammy_files, mock_connection, mock_tool):
+        """Should cancel the tool and report a timeout when NOVA does not answer in time."""
+        cancelled = threading.Event()
+        mock_tool.run.side_effect = lambda **kwargs: cancelled.wait(5)
+        mock_tool.cancel.side_effect = cancelled.set
+        nova_config.timeout = 0.1
+        runner = NovaSammyRunner(nova_config)
+        files = SammyFiles(**mock_sammy_files)
+
+        runner.prepare_environment(files)
+        result = runner.execute_sammy(files)
+
+        assert cancelled.is_set()
+        assert not result.success
+        assert result.failure_type == SammyFailureType.TIMEOUT
+
+    @pytest.mark.parametrize(
+        "error, transient",
+        [
+            (requests.ConnectionError("connection reset"), True),
+            (requests.HTTPError("bad gateway", response=mock.MagicMock(status_code=502)), True),
+            (requests.HTTPError("forbidden", response=mock.MagicMock(status_code=403)), False),
+            (ValueError("unknown tool"), False),
+        ],
+    )
+    def test_execute_sammy_error_classification(
+        self, nova_config, mock_sammy_files, mock_connection, mock_tool, error, transient
+    ):
+        """Should raise TransientBackendError only for temporary HTTP problems."""
+        mock_tool.run.side_effect = error
+        runner = NovaSammyRunner(nova_config)
+        files = SammyFiles(**mock_sammy_files)
+
+        runner.prepare_environment(files)
+        with pytest.raises(SammyExecutionError) as exc:
+            runner.execute_sammy(files)
+        assert isinstance(exc.value, TransientBackendError) == transient
+
     def test_collect_outputs(self, nova_config, mock_sammy_files, mock_connection, mock_tool, dummy_download):
         """Should collect output files."""
         runner = NovaSammyRunner(nova_config)
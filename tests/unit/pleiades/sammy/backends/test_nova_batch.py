@@ -0,0 +1,294 @@
+#!/usr/bin/env python
+"""Unit tests for concurrent NOVA submissions, run against a local HTTP stand-in of the service."""
+
+import inspect
+import io
+import json
+import threading
+import urllib.request
+import zipfile
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from time import monotonic
+from unittest import mock
+
+import pytest
+from nova.galaxy import Connection, Dataset, Datastore, Outputs, Tool
+
+from pleiades.sammy.backends.nova_batch import NovaBatchItem, NovaBatchRunner
+from pleiades.sammy.config import NovaSammyConfig
+from pleiades.sammy.interface import EnvironmentPreparationError, SammyFailureType, SammyFiles
+
+
+class StandInService:
+    """
+    Minimal job service: jobs run for `duration` seconds, inputs named bad* end in error.
+
+    Records the peak number of jobs active at the same time and the cancelled jobs.
+    """
+
+    def __init__(self, duration):
+        self.duration = duration
+        self.jobs = {}
+        self.cancelled = set()
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def _active(self, job, now):
+        return job["id"] not in self.cancelled and now - job["started"] < self.duration
+
+    def submit(self, inp_name):
+        with self.lock:
+            now = monotonic()
+            job = {"id": str(len(self.jobs)), "inp": inp_name, "started": now}
+            self.jobs[job["id"]] = job
+            self.peak = max(self.peak, sum(self._active(other, now) for other in self.jobs.values()))
+            return job["id"]
+
+    def state(self, job_id):
+        job = self.jobs[job_id]
+        if job_id in self.cancelled:
+            return "deleted"
+        if self._active(job, monotonic()):
+            return "running"
+        return "error" if job["inp"].startswith("bad") else "finished"
+
+    def outputs_zip(self, job_id):
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w") as zf:
+            zf.writestr("outputs/SAMMY.LPT", f"fit of {self.jobs[job_id]['inp']}")
+            zf.writestr("outputs/SAMMY.PAR", "parameters")
+        return buffer.getvalue()
+
+
+def make_handler(service):
+    class Handler(BaseHTTPRequestHandler):
+        def _send(self, body, content_type="application/json"):
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_POST(self):
+            parts = self.path.strip("/").split("/")
+            if parts == ["jobs"]:
+                payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                self._send(json.dumps({"id": service.submit(payload["inp"])}).encode())
+            else:
+                service.cancelled.add(parts[1])
+                self._send(b"{}")
+
+        def do_GET(self):
+            parts = self.path.strip("/").split("/")
+            if len(parts) == 2:
+                self._send(json.dumps({"state": service.state(parts[1])}).encode())
+            elif parts[2] == "console":
+                self._send(b" Normal finish to SAMMY", "text/plain")
+            else:
+                self._send(service.outputs_zip(parts[1]), "application/zip")
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+class StandInOutput(Dataset):
+    """Output dataset of the stand-in, downloaded from the service like a nova.galaxy Dataset."""
+
+    def __init__(self, name, url):
+        super().__init__(name=name)
+        self.url = url
+
+    def get_content(self):
+        with urllib.request.urlopen(self.url) as response:
+            return response.read().decode()
+
+    def download(self, path):
+        with urllib.request.urlopen(self.url) as response, open(path, "wb") as f:
+            f.write(response.read())
+
+
+class StandInTool:
+    """Client of the stand-in service with the nova.galaxy Tool interface."""
+
+    def __init__(self, base_url):
+        self.base_url = base_url
+        self.job_id = None
+        self.data_store = None
+
+    def _request(self, path, payload=None):
+        data = json.dumps(payload).encode() if payload is not None else None
+        with urllib.request.urlopen(f"{self.base_url}{path}", data=data) as response:
+            return json.loads(response.read())
+
+    def run(self, data_store, params=None, wait=True):
+        assert isinstance(data_store, Datastore)
+        assert not wait
+        self.data_store = data_store
+        self.job_id = self._request("/jobs", {"inp": params.inputs["inp"].name})["id"]
+
+    def get_status(self):
+        return self._request(f"/jobs/{self.job_id}")["state"]
+
+    def get_results(self):
+        prefix = f"{self.base_url}/jobs/{self.job_id}"
+        outputs = Outputs()
+        outputs.add_output(StandInOutput("sammy_console_output", f"{prefix}/console"))
+        outputs.add_output(StandInOutput("sammy_output_files", f"{prefix}/outputs"))
+        return outputs
+
+    def cancel(self):
+        self._request(f"/jobs/{self.job_id}/cancel", {})
+
+
+class StandInConnection:
+    """nova.galaxy Connection handing out data stores without a Galaxy server."""
+
+    instances = []
+
+    def __init__(self, galaxy_url=None, galaxy_key=None):
+        self.galaxy_url = galaxy_url
+        self.galaxy_api_key = galaxy_key
+        self.stores = []
+        self.closed = False
+        self.instances.append(self)
+
+    @contextmanager
+    def connect(self):
+        yield self
+        self.closed = True
+
+    def create_data_store(self, name):
+        store = Datastore(name, self, history_id=str(len(self.stores)))
+        self.stores.append(store)
+        return store
+
+
+@pytest.fixture
+def service():
+    """Start stand-in services on local ports; each call returns (service, base_url)."""
+
+    def _start(duration):
+        state = StandInService(duration)
+        server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(state))
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return state, f"http://127.0.0.1:{server.server_address[1]}"
+
+    servers = []
+    yield _start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture
+def nova_config(temp_working_dir):
+    config = NovaSammyConfig(
+        url="https://mock_nova_url",
+        api_key="mock_api_key",
+        working_dir=temp_working_dir,
+        output_dir=temp_working_dir / "output",
+    )
+    config.validate()
+    return config
+
+
+@pytest.fixture(autouse=True)
+def connections():
+    """Connections opened by the runners of a test."""
+    StandInConnection.instances = []
+    with mock.patch("pleiades.sammy.backends.nova_batch.Connection", StandInConnection):
+        yield StandInConnection.instances
+
+
+@pytest.mark.parametrize(
+    "stand_in,real,methods",
+    [
+        (StandInTool, Tool, ["run", "get_status", "get_results", "cancel"]),
+        (StandInConnection, Connection, ["__init__", "connect"]),
+    ],
+)
+def test_stand_ins_match_nova_galaxy(stand_in, real, methods):
+    def parameters(function):
+        return [(name, param.default) for name, param in inspect.signature(function).parameters.items()]
+
+    for method in methods:
+        assert parameters(getattr(stand_in, method)) == parameters(getattr(real, method)), method
+
+
+def make_items(mock_sammy_files, tmp_path, names):
+    items = []
+    for name in names:
+        input_file = mock_sammy_files["input_file"].with_name(f"{name}.inp")
+        input_file.write_text(mock_sammy_files["input_file"].read_text())
+        files = SammyFiles(input_file, mock_sammy_files["parameter_file"], mock_sammy_files["data_file"])
+        items.append(NovaBatchItem(name, files, tmp_path / "fits" / name))
+    return items
+
+
+def make_runner(nova_config, base_url, **kwargs):
+    runner = NovaBatchRunner(nova_config, poll_interval=0.02, tool_factory=lambda: StandInTool(base_url), **kwargs)
+    runner.prepare_environment()
+    return runner
+
+
+def test_jobs_run_concurrently(service, connections, nova_config, mock_sammy_files, tmp_path):
+    state, base_url = service(duration=0.3)
+    items = make_items(mock_sammy_files, tmp_path, [f"p{i}" for i in range(6)])
+    runner = make_runner(nova_config, base_url, max_in_flight=3, workers=3)
+
+    streamed = []
+    start = monotonic()
+    results = runner.run(items, on_result=lambda item, result: streamed.append(item.item_id))
+    elapsed = monotonic() - start
+    runner.cleanup()
+
+    assert list(results) == [item.item_id for item in items]
+    assert all(result.success for result in results.values())
+    assert sorted(streamed) == sorted(results)
+    assert (tmp_path / "fits/p4/SAMMY.LPT").read_text() == "fit of p4.inp"
+    # Never more than max_in_flight remote jobs, and faster than running them one by one
+    assert 1 < state.peak <= 3
+    assert elapsed < 6 * 0.3
+    # One data store per job, deleted when the connection is closed
+    (connection,) = connections
+    assert connection.galaxy_url == nova_config.url
+    assert connection.galaxy_api_key == nova_config.api_key
+    assert [store.name for store in connection.stores] == [f"sammy_{item.item_id}" for item in items]
+    assert not any(store.persist_store for store in connection.stores)
+    assert connection.closed
+
+
+def test_failures_are_reported_per_item(service, nova_config, mock_sammy_files, tmp_path):
+    _, base_url = service(duration=0.05)
+    good, bad, missing = make_items(mock_sammy_files, tmp_path, ["good", "bad", "missing"])
+    missing.files.input_file.unlink()
+
+    results = make_runner(nova_config, base_url).run([good, bad, missing])
+
+    assert results["good"].success
+    assert results["bad"].failure_type == SammyFailureType.SAMMY_FAILURE
+    assert results["missing"].failure_type == SammyFailureType.BACKEND_ERROR
+    assert "not found" in results["missing"].error_message
+
+
+def test_timeout_cancels_remote_job(service, nova_config, mock_sammy_files, tmp_path):
+    state, base_url = service(duration=10)
+    nova_config.timeout = 0.1
+
+    results = make_runner(nova_config, base_url).run(make_items(mock_sammy_files, tmp_path, ["slow"]))
+
+    assert results["slow"].failure_type == SammyFailureType.TIMEOUT
+    assert state.cancelled == {"0"}
+
+
+def test_run_requires_prepared_environment(nova_config):
+    with pytest.raises(EnvironmentPreparationError):
+        NovaBatchRunner(nova_config).run([])
+
+
+if __name__ == "__main__":
+    pytest.main(["-v", __file__])
@@ -0,0 +1,114 @@
+#!/usr/bin/env python
+"""Unit tests for streaming capture of SAMMY console output."""
+
+import os
+import sys
+import time
+
+import pytest
+
+from pleiades.sammy.backends.streaming import ConsoleStream, run_streaming
+
+
+class TestConsoleStream:
+    """Tests for ConsoleStream."""
+
+    def test_tail_is_bounded(self):
+        """Should keep only the last lines in memory."""
+        stream = ConsoleStream(tail_lines=3)
+        for i in range(10):
+            stream.feed(f"line {i}\n")
+        assert stream.tail == "line 7\nline 8\nline 9\n"
+        assert stream.line_count == 10
+
+    def test_log_file_receives_all_lines(self, tmp_path):
+        """Should write every line to the log file."""
+        log_file = tmp_path / "logs" / "console.log"
+        stream = ConsoleStream(log_file=log_file, tail_lines=1)
+        for i in range(5):
+            stream.feed(f"line {i}\n")
+        stream.close()
+        assert log_file.read_text().count("\n") == 5
+
+    def test_normal_finish_detected(self):
+        """Should flag the SAMMY success message."""
+        stream = ConsoleStream()
+        stream.feed(" Normal finish to SAMMY\n")
+        assert stream.normal_finish
+
+    def test_progress_callback(self):
+        """Should report iterations and chi-squared values."""
+        updates = []
+        stream = ConsoleStream(progress_callback=updates.append)
+        stream.feed(" CUSTOMARY CHI SQUARED =   188355.\n")
+        stream.feed(" CUSTOMARY CHI SQUARED DIVIDED BY NDAT =   11.9697\n")
+        stream.feed(" ***** INTERMEDIATE VALUES FOR RESONANCE PARAMETERS\n")
+        stream.feed(" unrelated line\n")
+
+        assert len(updates) == 3
+        assert updates[0].chi_squared == pytest.approx(188355.0)
+        assert updates[1].reduced_chi_squared == pytest.approx(11.9697)
+        assert updates[2].iteration == 1
+
+    def test_failing_callback_is_ignored(self):
+        """Should not propagate callback exceptions."""
+
+        def broken(progress):
+            raise RuntimeError("boom")
+
+        stream = ConsoleStream(progress_callback=broken)
+        stream.feed(" CUSTOMARY CHI SQUARED =   1.0\n")
+
+    def test_fatal_error_detected(self):
+        """Should report the first fatal error line."""
+        stream = ConsoleStream()
+        assert stream.feed("ok\n") is None
+        assert stream.feed("Program received signal SIGSEGV\n") == "Program received signal SIGSEGV"
+        assert stream.fatal_error == "Program received signal SIGSEGV"
+
+
+class TestRunStreaming:
+    """Tests for run_streaming with a real subprocess."""
+
+    def test_streams_process_output(self, tmp_path):
+        """Should read stdin-driven output of a process line by line."""
+        script = "import sys\nfor line in sys.stdin: print(line.strip().upper())\nprint(' Normal finish to SAMMY')"
+        stream = ConsoleStream(log_file=tmp_path / "console.log")
+        run = run_streaming([sys.executable, "-c", script], "a.inp\nb.par\n", cwd=tmp_path, env=None, stream=stream)
+        assert run.returncode == 0
+        assert not run.aborted
+        assert not run.timed_out
+        assert stream.normal_finish
+        assert "A.INP" in (tmp_path / "console.log").read_text()
+
+    def test_aborts_on_fatal_error(self, tmp_path):
+        """Should kill the process when a fatal error is printed."""
+        script = "import time\nprint('Fortran runtime error: boom', flush=True)\ntime.sleep(30)"
+        stream = ConsoleStream()
+        run = run_streaming([sys.executable, "-c", script], "", cwd=tmp_path, env=None, stream=stream)
+        assert run.aborted
+        assert run.returncode != 0
+
+    def test_kills_on_timeout(self, tmp_path):
+        """Should kill a hung process once the wall-clock timeout expires."""
+        script = "import time\nprint('started', flush=True)\ntime.sleep(30)"
+        stream = ConsoleStream()
+        start = time.monotonic()
+        run = run_streaming([sys.executable, "-c", script], "", cwd=tmp_path, env=None, stream=stream, timeout=0.5)
+        assert run.timed_out
+        assert not run.aborted
+        assert run.returncode != 0
+        assert time.monotonic() - start < 10
+        assert "started" in stream.tail
+
+    @pytest.mark.skipif(not hasattr(os, "wait4"), reason="peak RSS requires os.wait4")
+    def test_reports_peak_rss(self, tmp_path):
+        """Should report the peak memory of the process itself."""
+        script = "block = bytearray(200 * 1024 * 1024)\nprint(len(block))"
+        run = run_streaming([sys.executable, "-c", script], "", cwd=tmp_path, env=None, stream=ConsoleStream())
+        assert run.returncode == 0
+        assert run.peak_rss_kb > 200 * 1024
+
+
+if __name__ == "__main__":
+    pytest.main(["-v", __file__])
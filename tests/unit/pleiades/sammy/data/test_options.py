@@ -536,10 +536,10 @@ class TestEdgeCases:
         assert fig is not None
         plt.close(fig)
 
-    @patch("pandas.read_csv")
-    def test_load_with_io_error(self, mock_read_csv):
+    @patch("pleiades.sammy.data.options.read_lst")
+    def test_load_with_io_error(self, mock_read_lst):
         """Test handling of I/O errors during load."""
-        mock_read_csv.side_effect = IOError("Cannot read file")
+        mock_read_lst.side_effect = IOError("Cannot read file")
 
         sammy_data = SammyData()
         sammy_data.data_file = Path("/test/file.lst")
@@ -0,0 +1,98 @@
+"""Unit tests for the columnar Card 1 resonance table."""
+
+import numpy as np
+import pytest
+from pydantic import ValidationError
+
+from pleiades.sammy.fitting.config import FitConfig
+from pleiades.sammy.io.card_formats.par01_resonance_table import RESONANCE_DTYPE, ResonanceTable
+from pleiades.sammy.io.card_formats.par01_resonances import Card01
+from pleiades.utils.helper import VaryFlag
+
+
+def assert_tables_equal(table, other):
+    for name in RESONANCE_DTYPE.names:
+        np.testing.assert_array_equal(table.data[name], other.data[name])
+
+
+@pytest.fixture
+def resonance_lines():
+    return [
+        "-3661600.00 158770.000 3698500.+3  0.0000               0 0 1 0   1",
+        "31739.99805 1000.00000 15.6670000  0.0000     0.0000    0 0 0 0 0 5",
+        "-61367.0000 2000.00000 43910000.0                       1 0 1     1 5000.00000",
+        "20024.00000 370.000000 1388.50000                       0-1 0     2",
+    ]
+
+
+def test_from_lines(resonance_lines):
+    table = ResonanceTable.from_lines(resonance_lines)
+    data = table.data
+
+    assert len(table) == 4
+    # Pseudo-scientific notation
+    assert data["channel1_width"][0] == pytest.approx(3698500.0e3)
+    np.testing.assert_array_equal(data["igroup"], [1, 5, 1, 2])
+    # Blank widths are NaN, blank flags are 0
+    assert np.isnan(data["channel2_width"][2]) and np.isnan(data["channel3_width"][0])
+    assert data["channel3_width"][1] == 0.0
+    np.testing.assert_array_equal(data["vary_channel3"], [0, 0, 0, 0])
+    assert data["vary_capture_width"][3] == VaryFlag.USE_FROM_PARFILE.value
+
+    assert ResonanceTable.from_lines([]).data.shape == (0,)
+
+
+@pytest.mark.parametrize(
+    "line",
+    [
+        "            1000.00000 15.6670000                       0 0 0 0   1",
+        "20024.00000            1388.50000                       0 0 0     2",
+        "20024.00000 370.000000 1388.50000                       7 0 0     2",
+        "20024.00000 370.abc000 1388.50000                       0 0 0     2",
+    ],
+)
+def test_from_lines_invalid(resonance_lines, line):
+    with pytest.raises(ValueError):
+        ResonanceTable.from_lines(resonance_lines + [line])
+
+
+def test_from_lines_reports_missing_values(resonance_lines):
+    with pytest.raises(ValueError, match="Missing capture width on line 5"):
+        ResonanceTable.from_lines(resonance_lines + ["20024.00000            1388.50000"])
+    with pytest.raises(ValueError, match="Missing resonance energy on line 1"):
+        ResonanceTable.from_lines(["            1000.00000"])
+
+
+def test_entries_validate_missing_values(resonance_lines):
+    table = ResonanceTable.from_lines(resonance_lines)
+    table.data["capture_width"][1] = np.nan
+
+    assert table[0].capture_width == pytest.approx(158770.0)
+    with pytest.raises(ValidationError, match="capture_width"):
+        table[1]
+
+
+def test_entries(resonance_lines):
+    table = ResonanceTable.from_lines(resonance_lines)
+    entries = table.entries()
+
+    assert entries[1].resonance_energy == pytest.approx(31739.99805)
+    assert entries[0].channel3_width is None
+    assert entries[2].vary_energy == VaryFlag.YES
+    assert entries[3] == table[3]
+
+    assert_tables_equal(ResonanceTable.from_entries(entries), table)
+    assert len(table.select(table.data["igroup"] == 1)) == 2
+
+
+def test_to_lines_matches_card01(resonance_lines):
+    table = ResonanceTable.from_lines(resonance_lines)
+    config = FitConfig()
+    Card01.from_lines(["RESONANCES are listed next"] + resonance_lines, config)
+
+    assert table.to_lines() == Card01.to_lines(config)[1:-1]
+    assert ResonanceTable().to_lines() == []
+
+
+if __name__ == "__main__":
+    pytest.main(["-v", __file__])
@@ -0,0 +1,101 @@
+"""Unit tests for the SAMMY twenty format writer and reader."""
+
+import numpy as np
+import pytest
+
+from pleiades.sammy.io.data_manager import (
+    convert_csv_to_sammy_twenty,
+    encode_sammy_twenty,
+    format_sammy_twenty,
+    parse_sammy_twenty,
+    read_sammy_twenty,
+    validate_sammy_twenty_format,
+    write_sammy_twenty,
+)
+
+
+def python_twenty(data):
+    """Twenty format as formatted row by row by Python."""
+    return "".join(
+        f"{energy:20.10f}{transmission:20.10f}{uncertainty:20.10f}\n" for energy, transmission, uncertainty in data
+    )
+
+
+def test_encode_matches_python_formatting():
+    rng = np.random.default_rng(42)
+    data = np.concatenate(
+        [
+            rng.random((500, 3)) * 10.0 ** rng.integers(-12, 9, (500, 3)),
+            -rng.random((500, 3)) * 10.0 ** rng.integers(-12, 8, (500, 3)),
+            # Exact ties and carries into the integer part
+            rng.integers(-(10**6), 10**6, (500, 3)) * 5e-11,
+            np.array([[0.0, -0.0, -1e-12], [np.nan, np.inf, -np.inf], [99999999.99999999, 0.99999999999, 1.5e-10]]),
+        ]
+    )
+
+    assert encode_sammy_twenty(data) == python_twenty(data).encode()
+    assert format_sammy_twenty(data) == python_twenty(data)
+    assert format_sammy_twenty(np.array([[6.67324, 0.932, 0.272]])) == (
+        "        6.6732400000        0.9320000000        0.2720000000\n"
+    )
+
+
+def test_encode_wide_values_and_shapes():
+    # Values wider than a field are written as Python formats them
+    data = np.array([[1e12, 1.0, 2.0], [3.0, 4.0, 5.0]])
+    assert encode_sammy_twenty(data) == python_twenty(data).encode()
+
+    assert encode_sammy_twenty(np.empty((0, 3))) == b""
+    with pytest.raises(ValueError, match="shape"):
+        encode_sammy_twenty(np.zeros((2, 2)))
+
+
+def test_write_and_read(tmp_path):
+    data = np.column_stack([np.linspace(1.0, 100.0, 1000), np.full(1000, 0.9), np.full(1000, 0.01)])
+    twenty_file = tmp_path / "data.twenty"
+
+    write_sammy_twenty(data, twenty_file)
+
+    np.testing.assert_allclose(read_sammy_twenty(twenty_file), data, rtol=0, atol=1e-10)
+    assert validate_sammy_twenty_format(twenty_file)
+
+
+def test_parse_line_endings():
+    content = encode_sammy_twenty(np.array([[1.0, 2.0, 3.0], [4.0, 5.0, 6.0]]))
+    expected = np.array([[1.0, 2.0, 3.0], [4.0, 5.0, 6.0]])
+
+    np.testing.assert_array_equal(parse_sammy_twenty(content.replace(b"\n", b"\r\n")), expected)
+    np.testing.assert_array_equal(parse_sammy_twenty(content[:-1]), expected)
+    assert parse_sammy_twenty(b"").shape == (0, 3)
+
+
+def test_parse_reports_first_invalid_line():
+    lines = encode_sammy_twenty(np.array([[1.0, 2.0, 3.0]] * 3)).splitlines(keepends=True)
+
+    with pytest.raises(ValueError, match="Line 2: Expected 60 characters, got 59"):
+        parse_sammy_twenty(lines[0] + lines[1][1:] + lines[2])
+    with pytest.raises(ValueError, match="Line 2: Expected 60 characters, got 0"):
+        parse_sammy_twenty(lines[0] + b"\n" + lines[1][:-1])
+    with pytest.raises(ValueError, match="Line 3: Could not parse as floats"):
+        parse_sammy_twenty(lines[0] + lines[1] + b"x" + lines[2][1:])
+
+
+def test_validate_invalid_files(tmp_path):
+    twenty_file = tmp_path / "data.twenty"
+    twenty_file.write_text("1.0 2.0 3.0\n")
+    assert not validate_sammy_twenty_format(twenty_file)
+    assert not validate_sammy_twenty_format(tmp_path / "missing.twenty")
+
+
+def test_convert_csv_to_sammy_twenty(tmp_path):
+    csv_file = tmp_path / "transmission.csv"
+    csv_file.write_text("energy_eV,transmission\n6.673,0.932\n7.5,0.95\n")
+    twenty_file = tmp_path / "out" / "transmission.twenty"
+
+    convert_csv_to_sammy_twenty(csv_file, twenty_file)
+
+    np.testing.assert_allclose(read_sammy_twenty(twenty_file), [[6.673, 0.932, 0.0], [7.5, 0.95, 0.0]])
+
+
+if __name__ == "__main__":
+    pytest.main(["-v", __file__])
@@ -6,7 +6,13 @@ from unittest.mock import MagicMock, mock_open, patch
 import pytest
 
 from pleiades.sammy.io.lpt_manager import (
+    BROADENING_SECTION,
+    CHI_SQUARED_SECTION,
+    ISOTOPE_SECTION,
+    NORMALIZATION_SECTION,
+    RADIUS_SECTION,
     LptManager,
+    index_lpt_sections,
     parse_value_and_varied,
     split_lpt_values,
 )
@@ -650,3 +656,50 @@ class TestEdgeCases:
 
         result = manager.extract_isotope_info(lines, nuclear_data)
         assert result is False  # Should not crash, just fail to extract
+
+
+class TestSectionIndex:
+    """Test single-pass indexing of LPT block sections."""
+
+    def test_index_lpt_sections(self):
+        """Test header lines of every section are found in one pass."""
+        lines = [
+            " Isotopic abundance and mass for each nuclide --",
+            " Not an Isotopic abundance and mass for each nuclide header",
+            "   EFFECTIVE RADIUS    TRUE    SPIN GROUP",
+            "     RADIUS   TEMPERATURE  THICKNESS",
+            "  TEMPERATURE only",
+            "  NORMALIZATION    BCKG*CONST",
+            " CUSTOMARY CHI SQUARED =   188355.",
+            " CUSTOMARY CHI SQUARED DIVIDED BY NDAT =   11.9697",
+            " Number of experimental data points =  15736",
+        ]
+
+        assert index_lpt_sections(lines) == {
+            ISOTOPE_SECTION: [0],
+            RADIUS_SECTION: [2],
+            BROADENING_SECTION: [3],
+            NORMALIZATION_SECTION: [5],
+            CHI_SQUARED_SECTION: [6, 7, 8],
+        }
+        assert index_lpt_sections([]) == {
+            ISOTOPE_SECTION: [],
+            RADIUS_SECTION: [],
+            BROADENING_SECTION: [],
+            NORMALIZATION_SECTION: [],
+            CHI_SQUARED_SECTION: [],
+        }
+
+    def test_extractors_use_given_headers(self):
+        """Test extractors start at the given header lines instead of searching the block."""
+        manager = LptManager()
+        chi_squared_results = MagicMock()
+        lines = [
+            " CUSTOMARY CHI SQUARED =   100.0",
+            " CUSTOMARY CHI SQUARED DIVIDED BY NDAT =   2.0",
+            " Number of experimental data points =  50",
+        ]
+
+        assert manager.extract_chi_squared_info(lines, chi_squared_results, headers=[0, 1, 2])
+        assert chi_squared_results.reduced_chi_squared == 2.0
+        assert not manager.extract_chi_squared_info(lines, MagicMock(), headers=[0, 1])
@@ -0,0 +1,103 @@
+"""Unit tests for the streaming LPT reader."""
+
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from pleiades.sammy.io.lpt_manager import LptManager
+from pleiades.sammy.io.lpt_stream import (
+    LptBlockSplitter,
+    follow_lpt_results,
+    iter_lpt_blocks,
+    iter_lpt_results,
+    read_final_lpt_block,
+)
+
+LPT_FILE = Path(__file__).parents[4] / "data" / "ex012" / "answers" / "ex012aa.lpt"
+
+
+@pytest.fixture
+def lpt_text():
+    return LPT_FILE.read_text()
+
+
+def test_blocks_match_split_lpt_blocks(lpt_text):
+    blocks = list(iter_lpt_blocks(lpt_text.splitlines(keepends=True)))
+
+    assert blocks == LptManager().split_lpt_blocks(lpt_text)
+    assert [block_type.split()[1] for block_type, _ in blocks] == ["INITIAL", "INTERMEDIATE", "NEW"]
+
+
+def test_splitter_markers_within_lines():
+    text = "header\nA ***** NEW VALUES FOR RESONANCE PARAMETERS x ***** INITIAL VALUES FOR PARAMETERS y\nz\n"
+    splitter = LptBlockSplitter()
+
+    assert splitter.feed("header\n") == []
+    assert splitter.feed(text.splitlines(keepends=True)[1]) == [
+        ("***** NEW VALUES FOR RESONANCE PARAMETERS", "***** NEW VALUES FOR RESONANCE PARAMETERS x ")
+    ]
+    assert splitter.feed("z\n") == []
+    assert splitter.flush() == ("***** INITIAL VALUES FOR PARAMETERS", "***** INITIAL VALUES FOR PARAMETERS y\nz\n")
+    assert splitter.flush() is None
+    assert list(iter_lpt_blocks(text.splitlines(keepends=True))) == LptManager().split_lpt_blocks(text)
+
+
+def test_iter_lpt_results_is_lazy():
+    results = iter_lpt_results(LPT_FILE)
+    first = next(results)
+
+    assert first.chi_squared_results.reduced_chi_squared == pytest.approx(11.9697)
+    rest = list(results)
+    assert len(rest) == 2
+    assert rest[-1].chi_squared_results.reduced_chi_squared == pytest.approx(3.43868)
+
+
+@pytest.mark.parametrize("chunk_size", [16, 100, 1 << 16])
+def test_read_final_lpt_block(chunk_size):
+    final = read_final_lpt_block(LPT_FILE, chunk_size=chunk_size)
+    last = LptManager(str(LPT_FILE)).run_results.fit_results[-1]
+
+    assert final.model_dump() == last.model_dump()
+
+
+def test_read_final_lpt_block_without_blocks(tmp_path):
+    lpt_file = tmp_path / "SAMMY.LPT"
+    lpt_file.write_text("no fit blocks\n")
+
+    assert read_final_lpt_block(lpt_file) is None
+    with pytest.raises(FileNotFoundError):
+        read_final_lpt_block(tmp_path / "missing.LPT")
+
+
+def test_follow_lpt_results(lpt_text, tmp_path):
+    lpt_file = tmp_path / "SAMMY.LPT"
+    done = threading.Event()
+
+    def write():
+        # SAMMY writes the file in pieces, lines included
+        with open(lpt_file, "w") as file:
+            for start in range(0, len(lpt_text), 997):
+                file.write(lpt_text[start : start + 997])
+                file.flush()
+                time.sleep(0.001)
+        done.set()
+
+    writer = threading.Thread(target=write)
+    writer.start()
+    results = list(follow_lpt_results(lpt_file, is_running=lambda: not done.is_set(), poll_interval=0.005))
+    writer.join()
+
+    expected = [fit.model_dump() for fit in iter_lpt_results(LPT_FILE)]
+    assert [fit.model_dump() for fit in results] == expected
+
+
+def test_follow_lpt_results_without_file(tmp_path):
+    assert list(follow_lpt_results(tmp_path / "SAMMY.LPT", is_running=lambda: False)) == []
+    with pytest.raises(ValueError, match="poll_interval"):
+        list(follow_lpt_results(tmp_path / "SAMMY.LPT", is_running=lambda: False, poll_interval=0))
+
+
+if __name__ == "__main__":
+    pytest.main(["-v", __file__])
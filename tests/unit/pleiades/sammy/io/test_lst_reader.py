@@ -0,0 +1,67 @@
+"""Unit tests for the fast SAMMY LST reader."""
+
+import numpy as np
+import pytest
+
+from pleiades.sammy.io.lst_reader import LST_COLUMN_NAMES, LstTable, read_lst
+
+
+@pytest.fixture
+def lst_file(tmp_path):
+    path = tmp_path / "SAMMY.LST"
+    path.write_text(
+        "# comment line\n"
+        "  1.0000000E+00  2.0000000E+00  3.0000000E-01  4.0000000E+00  5.0000000E+00  9.1000000E-01\n"
+        "  2.0000000E+00  2.5000000E+00  3.5000000E-01  4.5000000E+00  5.5000000E+00  9.2000000E-01\n"
+        "  3.0000000E+00  2.7000000E+00  3.7000000E-01  4.7000000E+00  5.7000000E+00  9.3000000E-01\n"
+    )
+    return path
+
+
+def test_read_lst(lst_file):
+    table = read_lst(lst_file)
+
+    assert len(table) == 3
+    assert table.columns == list(LST_COLUMN_NAMES[:6])
+    np.testing.assert_array_equal(table.energy, [1.0, 2.0, 3.0])
+    np.testing.assert_array_equal(table["Experimental transmission (dimensionless)"], [0.91, 0.92, 0.93])
+    assert "Adjusted energy finally" not in table
+    with pytest.raises(KeyError, match="Adjusted energy finally"):
+        table["Adjusted energy finally"]
+
+
+def test_to_dataframe(lst_file):
+    table = read_lst(lst_file)
+    frame = table.to_dataframe()
+
+    assert list(frame.columns) == table.columns
+    np.testing.assert_array_equal(frame.to_numpy(), table.values)
+
+
+def test_read_lst_single_row_and_errors(tmp_path):
+    path = tmp_path / "single.lst"
+    path.write_text("1.0 2.0 3.0\n")
+    assert read_lst(path).values.shape == (1, 3)
+
+    path.write_text("# only a comment\n")
+    with pytest.raises(ValueError, match="No data"):
+        read_lst(path)
+
+    path.write_text("1.0 2.0\n1.0\n")
+    with pytest.raises(ValueError):
+        read_lst(path)
+
+    with pytest.raises(FileNotFoundError):
+        read_lst(tmp_path / "missing.lst")
+
+
+def test_lst_table_columns():
+    with pytest.raises(ValueError, match="at most 13"):
+        LstTable(np.zeros((2, 14)))
+    with pytest.raises(ValueError, match="2 column names"):
+        LstTable(np.zeros((2, 3)), columns=["a", "b"])
+    assert LstTable(np.zeros((2, 2)), columns=["a", "b"])["b"].shape == (2,)
+
+
+if __name__ == "__main__":
+    pytest.main(["-v", __file__])
@@ -0,0 +1,81 @@
+"""Unit tests for the single-pass card indexer of SAMMY parameter files."""
+
+import pytest
+
+from pleiades.sammy.io.par_index import Cards, ParCardIndex, header_card
+from pleiades.sammy.io.par_manager import ParManager
+
+
+@pytest.fixture
+def par_lines():
+    return [
+        "-3661600.00 158770.000 3698500.+3  0.0000               0 0 1 0   1",
+        "-873730.000 1025.30000 101.510000  0.0000               0 0 1 0   1",
+        "",
+        ".100000000",
+        "Channel radii in key-word format",
+        "Radii=  6.303510,  6.303510    Flags=0, 0",
+        "   Group=  1   Chan=  1,",
+        "Radii=  4.233810,  4.233810    Flags=0, 0",
+        "   Group=  2   Chan=  1,",
+        "",
+        "NUCLIDE MASSES AND ABUNDANCES FOLLOW",
+        "57.9350000 1.0000000 5.00000-5 0 1 2",
+        "",
+        "COVARIANCE MATRIX IS IN BINARY FORM",
+        "",
+    ]
+
+
+def test_header_card():
+    assert header_card("BROADening parameters may be varied") == Cards.PAR_CARD_4
+    assert header_card("  nuclide masses and abundances follow\n") == Cards.PAR_CARD_10
+    # Headers sharing their first five characters
+    assert header_card("GEEL resolution function") == Cards.PAR_CARD_14
+    assert header_card("GEEL DEFAUlts") == Cards.PAR_CARD_14A
+    assert header_card("-873730.000 1025.30000 101.510000") is None
+
+
+def test_spans(par_lines):
+    index = ParCardIndex(par_lines)
+
+    assert [(span.card, span.start, span.end, span.has_header) for span in index.spans] == [
+        (Cards.PAR_CARD_1, 0, 2, False),
+        # The fudge factor is directly followed by a header line
+        (Cards.PAR_CARD_2, 3, 4, False),
+        (Cards.PAR_CARD_7A, 4, 9, True),
+        (Cards.PAR_CARD_10, 10, 12, True),
+        (None, 13, 14, False),
+    ]
+    assert index.cards() == [Cards.PAR_CARD_1, Cards.PAR_CARD_10, Cards.PAR_CARD_2, Cards.PAR_CARD_7A]
+
+    # "Radii=" lines inside the card are not headers
+    assert index.block(index.find(Cards.PAR_CARD_7, Cards.PAR_CARD_7A)) == par_lines[4:9]
+    assert index.find(Cards.PAR_CARD_4) is None
+
+
+def test_headers_only_start_card_sets():
+    lines = ["RESONANCES are listed next", "1.0000E+00 1.0000E+00 1.0000E+00", "", "0.1", "", "BROADening"]
+    index = ParCardIndex([f"{line}\n" for line in lines])
+
+    assert [span.card for span in index.spans] == [Cards.PAR_CARD_1, Cards.PAR_CARD_2, Cards.PAR_CARD_4]
+    assert index.block(index.spans[0]) == lines[:2]
+    assert ParCardIndex([]).spans == []
+
+
+def test_par_manager_scans_file_once(par_lines, monkeypatch):
+    manager = ParManager()
+    calls = []
+    original = ParCardIndex.__init__
+
+    def counting_init(self, lines):
+        calls.append(len(lines))
+        original(self, lines)
+
+    monkeypatch.setattr(ParCardIndex, "__init__", counting_init)
+    index = ParCardIndex(par_lines)
+    assert manager.extract_radii_parameters(par_lines, index)
+    assert manager.extract_isotopes_and_abundances(par_lines, index)
+    assert calls == [len(par_lines)]
+
+    assert manager.detect_par_cards(par_lines) == index.cards()
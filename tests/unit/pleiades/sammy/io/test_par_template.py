@@ -0,0 +1,107 @@
+"""Unit tests for compiled parameter file templates."""
+
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from pleiades.sammy.io.par_template import ParTemplate
+from pleiades.sammy.parameters import BroadeningParameterCard, NormalizationBackgroundCard
+from pleiades.sammy.parameters.broadening import BroadeningParameters
+from pleiades.sammy.parameters.normalization import NormalizationParameters
+
+PAR_FILE = Path(__file__).parents[4] / "data" / "ex012" / "ex012a.par"
+
+THICK = "broadening.parameters.thick"
+ANORM = "normalization.angle_sets.0.anorm"
+D_BACKA = "normalization.angle_sets.0.d_backa"
+
+
+@pytest.fixture
+def cards():
+    broadening = BroadeningParameterCard(
+        parameters=BroadeningParameters(crfn=4.2, temp=300.0, thick=0.347162, deltal=0.182233, deltag=0.0, deltae=0.0)
+    )
+    normalization = NormalizationBackgroundCard(
+        angle_sets=[
+            NormalizationParameters(
+                anorm=1.0, backa=0.0, backb=0.0, backc=0.0, backd=0.0, backf=0.0, d_anorm=0.01, d_backa=0.02
+            )
+        ]
+    )
+    return broadening, normalization
+
+
+@pytest.fixture
+def par_text(cards):
+    broadening, normalization = cards
+    return PAR_FILE.read_text().rstrip("\n") + "\n\n" + "\n".join(broadening.to_lines() + normalization.to_lines())
+
+
+def render_cards(text, cards, thick, anorm, d_backa):
+    """Parameter file with the cards rendered from their models."""
+    broadening, normalization = (card.model_copy(deep=True) for card in cards)
+    broadening.parameters.thick = thick
+    normalization.angle_sets[0].anorm = anorm
+    normalization.angle_sets[0].d_backa = d_backa
+    base = text[: text.index("BROAD")]
+    lines = broadening.to_lines()[:-1] + [""] + normalization.to_lines()[:-1]
+    return base + "\n".join(lines) + "\n"
+
+
+def test_render_matches_card_models(par_text, cards):
+    template = ParTemplate.compile(par_text, [THICK, ANORM, D_BACKA])
+
+    # Values as read back from the file, 9 characters wide
+    assert template.defaults == pytest.approx({THICK: 0.3472, ANORM: 1.0, D_BACKA: 0.02})
+    assert set(template.fields) == {THICK, ANORM, D_BACKA}
+    assert template.render({}).decode() == render_cards(par_text, cards, 0.3472, 1.0, 0.02)
+    for thick, anorm, d_backa in [(0.2, 1.1, 0.5), (-3.5, 12345.6, 1e-7), (1e-30, 0.9, 0.0)]:
+        rendered = template.render({THICK: thick, ANORM: anorm, D_BACKA: d_backa}).decode()
+        assert rendered == render_cards(par_text, cards, thick, anorm, d_backa)
+
+    # Fields not given are reset to their compiled value
+    assert template.render({THICK: 0.2}).decode() == render_cards(par_text, cards, 0.2, 1.0, 0.02)
+
+
+def test_render_from_threads(par_text):
+    template = ParTemplate.compile(par_text, [THICK, ANORM, D_BACKA])
+    variants = [{THICK: 0.001 * i, ANORM: 1.0 + 0.01 * i} if i % 2 else {D_BACKA: 0.5 * i} for i in range(400)]
+    expected = [template.render(values) for values in variants]
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        assert list(executor.map(template.render, variants)) == expected
+    assert template.render({}) == ParTemplate.compile(par_text, [THICK]).render({})
+
+
+def test_write(par_text, cards, tmp_path):
+    template = ParTemplate.compile(par_text, [THICK])
+    template.write(tmp_path / "variant.par", {THICK: 0.25})
+
+    lines = (tmp_path / "variant.par").read_text().splitlines()
+    start = next(i for i, line in enumerate(lines) if line.startswith("BROAD"))
+    card = BroadeningParameterCard.from_lines(lines[start : start + 2])
+    assert card.parameters.thick == pytest.approx(0.25)
+    assert card.parameters.temp == pytest.approx(300.0)
+
+
+def test_invalid_fields(par_text, tmp_path):
+    with pytest.raises(ValueError, match="must name a card"):
+        ParTemplate.compile(par_text, ["fudge"])
+    with pytest.raises(ValueError, match="does not exist"):
+        ParTemplate.compile(par_text, ["broadening.parameters.thickness"])
+    with pytest.raises(ValueError, match="cannot be templated"):
+        # Vary flags are not floats
+        ParTemplate.compile(par_text, ["broadening.parameters.flag_thick"])
+    with pytest.raises(ValueError, match="not present"):
+        ParTemplate.compile(PAR_FILE.read_text(), [THICK])
+    with pytest.raises(ValueError, match="ex012a.par"):
+        ParTemplate.from_file(PAR_FILE, [THICK])
+
+    template = ParTemplate.compile(par_text, [THICK])
+    with pytest.raises(KeyError, match="temp"):
+        template.render({"broadening.parameters.temp": 280.0})
+
+
+if __name__ == "__main__":
+    pytest.main(["-v", __file__])
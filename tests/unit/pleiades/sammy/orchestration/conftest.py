@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+"""Shared fixtures for the SAMMY orchestration tests."""
+
+from datetime import datetime
+from typing import Callable
+
+import pytest
+
+from pleiades.sammy.interface import BaseSammyConfig, SammyExecutionResult, SammyFiles, SammyRunner
+
+
+class FakeConfig(BaseSammyConfig):
+    """Minimal configuration for the fake runner."""
+
+
+class FakeSammyRunner(SammyRunner):
+    """
+    Runner staging its inputs like a local runner, with SAMMY replaced by a function.
+
+    Keyword arguments given to the runner are set as attributes, for the execute
+    function to use (e.g. a list recording the calls).
+
+    Attributes:
+        execute: Called as execute(runner, files) instead of running SAMMY; it writes
+            the outputs into the working directory and returns the execution result
+    """
+
+    def __init__(
+        self, config: FakeConfig, execute: Callable[["FakeSammyRunner", SammyFiles], SammyExecutionResult], **attributes
+    ):
+        super().__init__(config)
+        self.execute = execute
+        for name, value in attributes.items():
+            setattr(self, name, value)
+
+    @property
+    def job_id(self) -> str:
+        """Id of the running job, the name of the job directory holding the output directory."""
+        return self.config.output_dir.parent.name
+
+    def result(self, success: bool = True, **kwargs) -> SammyExecutionResult:
+        """Execution result finishing now."""
+        now = datetime.now()
+        kwargs.setdefault("execution_id", self.job_id)
+        return SammyExecutionResult(success=success, start_time=now, end_time=now, console_output="", **kwargs)
+
+    def prepare_environment(self, files):
+        files.move_to_working_dir(self.config.working_dir)
+
+    def execute_sammy(self, files):
+        return self.execute(self, files)
+
+    def cleanup(self, files=None):
+        self._moved_files = []
+
+    def validate_config(self):
+        return self.config.validate()
+
+
+@pytest.fixture
+def make_factory():
+    """
+    Build runner factories (see jobs.RunnerFactory) of fake runners.
+
+    Called as make_factory(execute, **attributes), see FakeSammyRunner.
+    """
+
+    def _make(execute, **attributes):
+        def _create(working_dir, output_dir):
+            config = FakeConfig(working_dir=working_dir, output_dir=output_dir)
+            config.validate()
+            return FakeSammyRunner(config, execute, **attributes)
+
+        return _create
+
+    return _make
@@ -0,0 +1,165 @@
+#!/usr/bin/env python
+"""Unit tests for load balancing of SAMMY jobs across backends."""
+
+import threading
+import time
+from collections import Counter
+
+import pytest
+
+from pleiades.sammy.interface import SammyFailureType
+from pleiades.sammy.orchestration.balancer import BackendPool, LoadBalancer, NoBackendAvailableError
+from pleiades.sammy.orchestration.batch import STATUS_SUCCESS, BatchRunner, ResultsIndex
+from pleiades.sammy.orchestration.jobs import SammyJob, run_job
+from pleiades.sammy.orchestration.telemetry import TelemetryStore, backend_name
+
+
+def run_on_backend(runner, files):
+    """Run a job on the fake backend of the runner, recording the job and the concurrency."""
+    backend = runner.fake
+    with backend.lock:
+        backend.running += 1
+        backend.peak = max(backend.peak, backend.running)
+    try:
+        time.sleep(backend.delay)
+        if backend.error is not None:
+            raise backend.error
+        backend.jobs.append(runner.job_id)
+        (runner.config.working_dir / "SAMMY.LPT").write_text(f"{runner.job_id}\n")
+        return runner.result(
+            success=backend.failure_type is None,
+            error_message=None if backend.failure_type is None else "backend failed",
+            failure_type=backend.failure_type,
+        )
+    finally:
+        with backend.lock:
+            backend.running -= 1
+
+
+class FakeBackend:
+    """Runner factory of a fake backend, holding the jobs it ran and its peak concurrency."""
+
+    def __init__(self, make_factory, delay=0.0, error=None, failure_type=None):
+        self.delay = delay
+        self.error = error
+        self.failure_type = failure_type
+        self.jobs = []
+        self.running = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+        self._factory = make_factory(run_on_backend, fake=self)
+
+    def __call__(self, working_dir, output_dir):
+        return self._factory(working_dir, output_dir)
+
+
+@pytest.fixture
+def fake_backend(make_factory):
+    """Create fake backends, called as fake_backend(delay=..., error=..., failure_type=...)."""
+
+    def _make(**kwargs):
+        return FakeBackend(make_factory, **kwargs)
+
+    return _make
+
+
+@pytest.fixture
+def make_jobs(mock_sammy_files, tmp_path):
+    def _make(count):
+        return [SammyJob(job_id=f"j{i}", working_dir=tmp_path / f"j{i}", **mock_sammy_files) for i in range(count)]
+
+    return _make
+
+
+def test_jobs_spread_by_capacity(make_jobs, fake_backend, tmp_path):
+    small, large = fake_backend(delay=0.05), fake_backend(delay=0.05)
+    balancer = LoadBalancer([BackendPool("small", small, capacity=1), BackendPool("large", large, capacity=3)])
+    index = ResultsIndex(tmp_path / "index.jsonl")
+
+    summary = BatchRunner(balancer.factory, index, workers=balancer.total_capacity).run(make_jobs(16))
+
+    assert summary.succeeded == 16
+    assert len(small.jobs) + len(large.jobs) == 16
+    assert small.peak == 1 and large.peak <= 3
+    # The larger backend takes most of the jobs
+    assert len(large.jobs) > len(small.jobs) > 0
+    assert all(pool.active == 0 and pool.mean_runtime for pool in balancer.pools)
+
+
+def test_faster_backend_is_preferred(fake_backend):
+    balancer = LoadBalancer([BackendPool("slow", fake_backend(), capacity=4), BackendPool("fast", fake_backend())])
+    slow, fast = balancer.pools
+    slow.mean_runtime, fast.mean_runtime = 100.0, 1.0
+
+    # The fast backend finishes a queue of 10 jobs before the slow one finishes a single job
+    assert balancer.acquire() is fast
+    balancer.release(fast, runtime=1.0)
+    assert fast.throughput == pytest.approx(1.0)
+    assert slow.throughput == pytest.approx(0.04)
+
+    # Without a free slot on the fast backend, the slow one takes the job
+    assert balancer.acquire() is fast
+    assert balancer.acquire() is slow
+    with pytest.raises(NoBackendAvailableError):
+        balancer.acquire(exclude={"slow", "fast"})
+
+
+def test_failover_to_another_backend(make_jobs, fake_backend, tmp_path):
+    broken = fake_backend(error=RuntimeError("connection refused"))
+    busy = fake_backend(failure_type=SammyFailureType.BACKEND_TRANSIENT)
+    working = fake_backend()
+    balancer = LoadBalancer(
+        [BackendPool("broken", broken), BackendPool("busy", busy), BackendPool("working", working)],
+        failure_threshold=1,
+        cooldown=60.0,
+    )
+    telemetry = TelemetryStore(tmp_path / "telemetry.db")
+    job = make_jobs(1)[0]
+
+    result = run_job(job, balancer.factory, telemetry=telemetry)
+
+    assert result.success
+    assert working.jobs == ["j0"] and busy.jobs == ["j0"]
+    assert (job.output_dir / "SAMMY.LPT").is_file()
+    assert [run.backend for run in telemetry.query()] == ["working"]
+    # Failing backends are put aside, the next job goes straight to the working one
+    broken_pool, busy_pool, working_pool = balancer.pools
+    assert broken_pool.failures == busy_pool.failures == 1
+    assert broken_pool.unavailable_until > time.monotonic()
+    assert balancer.acquire() is working_pool
+
+
+def test_all_backends_failing_returns_last_failure(make_jobs, fake_backend, tmp_path):
+    balancer = LoadBalancer(
+        [
+            BackendPool("a", fake_backend(failure_type=SammyFailureType.BACKEND_ERROR)),
+            BackendPool("b", fake_backend(failure_type=SammyFailureType.BACKEND_ERROR)),
+        ]
+    )
+    index = ResultsIndex(tmp_path / "index.jsonl")
+
+    summary = BatchRunner(balancer.factory, index).run(make_jobs(2))
+
+    assert summary.failed == 2
+    assert Counter(record.failure_type for record in index.read().values()) == {"backend_error": 2}
+    assert all(pool.active == 0 and pool.failures == 2 for pool in balancer.pools)
+
+
+def test_seed_from_telemetry_and_backend_name(make_jobs, fake_backend, tmp_path):
+    telemetry = TelemetryStore(tmp_path / "telemetry.db")
+    balancer = LoadBalancer([BackendPool("local", fake_backend(delay=0.01), capacity=2)])
+    index = ResultsIndex(tmp_path / "index.jsonl")
+    assert BatchRunner(balancer.factory, index, telemetry=telemetry).run(make_jobs(2)).succeeded == 2
+    assert {record.status for record in index.read().values()} == {STATUS_SUCCESS}
+
+    seeded = LoadBalancer([BackendPool("local", fake_backend()), BackendPool("nova", fake_backend())])
+    seeded.seed_from_telemetry(telemetry)
+    assert seeded.pools[0].mean_runtime is not None
+    assert seeded.pools[1].mean_runtime is None
+
+    runner = balancer.factory(tmp_path / "w", tmp_path / "o")
+    assert backend_name(runner) == "BalancedRunner"
+
+
+if __name__ == "__main__":
+    pytest.main(["-v", __file__])
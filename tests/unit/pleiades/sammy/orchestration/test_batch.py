@@ -0,0 +1,125 @@
+#!/usr/bin/env python
+"""Unit tests for manifest-driven batch execution of SAMMY jobs."""
+
+import json
+import shutil
+
+import pytest
+
+from pleiades import main
+from pleiades.sammy.orchestration import jobs as jobs_module
+from pleiades.sammy.orchestration.batch import (
+    STATUS_ERROR,
+    STATUS_FAILED,
+    STATUS_SUCCESS,
+    BatchRecord,
+    BatchRunner,
+    ManifestError,
+    ResultsIndex,
+    read_manifest,
+)
+
+
+def copy_lpt(runner, files):
+    """Copy a canned LPT file instead of running SAMMY."""
+    runner.calls.append(runner.job_id)
+    if runner.job_id in runner.failing:
+        raise RuntimeError("backend exploded")
+    shutil.copyfile(runner.lpt_file, runner.config.working_dir / "SAMMY.LPT")
+    return runner.result()
+
+
+@pytest.fixture
+def manifest_csv(tmp_path, test_data_dir):
+    """CSV manifest of three jobs sharing the ex012 inputs, using relative paths."""
+    inputs = tmp_path / "inputs"
+    shutil.copytree(test_data_dir, inputs, ignore=shutil.ignore_patterns("answers"))
+    manifest = tmp_path / "manifest.csv"
+    rows = ["job_id,inp,par,dat"] + [f"p{i},inputs/ex012a.inp,inputs/ex012a.par,inputs/ex012a.dat" for i in range(3)]
+    manifest.write_text("\n".join(rows) + "\n")
+    return manifest
+
+
+@pytest.fixture
+def fake_factory(make_factory, test_data_dir):
+    """Build fake runner factories recording the executed jobs."""
+
+    def _make(calls, failing=()):
+        return make_factory(copy_lpt, lpt_file=test_data_dir / "answers/ex012aa.lpt", calls=calls, failing=failing)
+
+    return _make
+
+
+def test_read_manifest_csv(manifest_csv, tmp_path):
+    jobs = read_manifest(manifest_csv)
+    assert [job.job_id for job in jobs] == ["p0", "p1", "p2"]
+    assert jobs[0].input_file == tmp_path / "inputs/ex012a.inp"
+    assert jobs[1].working_dir == tmp_path / "work/p1"
+    assert jobs[1].output_dir == tmp_path / "work/p1/output"
+
+
+def test_read_manifest_json(tmp_path):
+    manifest = tmp_path / "manifest.json"
+    entries = [{"input_file": "/abs/a.inp", "parameter_file": "a.par", "data_file": "a.dat", "output_dir": "out"}]
+    manifest.write_text(json.dumps({"jobs": entries}))
+
+    jobs = read_manifest(manifest, work_root=tmp_path / "scratch")
+    assert jobs[0].job_id == "job_000000"
+    assert str(jobs[0].input_file) == "/abs/a.inp"
+    assert jobs[0].working_dir == tmp_path / "scratch/job_000000"
+    assert jobs[0].output_dir == tmp_path / "out"
+
+
+def test_read_manifest_missing_column(tmp_path):
+    manifest = tmp_path / "manifest.csv"
+    manifest.write_text("inp,par\na.inp,a.par\n")
+    with pytest.raises(ManifestError, match="data_file"):
+        read_manifest(manifest)
+
+
+def test_results_index_ignores_truncated_lines(tmp_path):
+    index = ResultsIndex(tmp_path / "index.jsonl")
+    index.append(BatchRecord(job_id="a", status=STATUS_FAILED))
+    index.append(BatchRecord(job_id="a", status=STATUS_SUCCESS))
+    with open(index.path, "a") as f:
+        f.write('{"job_id": "b", "sta')
+
+    assert index.read()["a"].status == STATUS_SUCCESS
+    assert index.completed() == {"a"}
+
+
+def test_batch_runs_and_resumes(manifest_csv, fake_factory, tmp_path):
+    jobs = read_manifest(manifest_csv)
+    index = ResultsIndex(tmp_path / "index.jsonl")
+
+    calls = []
+    summary = BatchRunner(fake_factory(calls, failing={"p1"}), index, workers=2).run(jobs)
+    assert sorted(calls) == ["p0", "p1", "p2"]
+    assert (summary.succeeded, summary.errors) == (2, 1)
+
+    records = index.read()
+    assert records["p1"].status == STATUS_ERROR
+    assert records["p0"].reduced_chi_squared == pytest.approx(3.43868)
+    assert records["p0"].output_dir == str(jobs[0].output_dir)
+
+    # Resume: only the failed job runs again
+    calls = []
+    summary = BatchRunner(fake_factory(calls), index, workers=2).run(jobs)
+    assert calls == ["p1"]
+    assert (summary.skipped, summary.succeeded) == (2, 1)
+    assert index.completed() == {"p0", "p1", "p2"}
+
+
+def test_cli_batch(manifest_csv, fake_factory, monkeypatch, tmp_path):
+    calls = []
+    monkeypatch.setattr(jobs_module, "factory_runner", lambda backend_type, **kwargs: fake_factory(calls))
+
+    exit_code = main(["batch", str(manifest_csv), "--workers", "2"])
+
+    assert exit_code == 0
+    assert sorted(calls) == ["p0", "p1", "p2"]
+    assert ResultsIndex(tmp_path / "manifest.results.jsonl").completed() == {"p0", "p1", "p2"}
+
+
+if __name__ == "__main__":
+    pytest.main(["-v", __file__])
@@ -0,0 +1,172 @@
+#!/usr/bin/env python
+"""Unit tests for the crash-safe checkpoint journal of SAMMY campaigns."""
+
+import pytest
+
+from pleiades import main
+from pleiades.sammy.orchestration import jobs as jobs_module
+from pleiades.sammy.orchestration.batch import BatchRunner, ResultsIndex
+from pleiades.sammy.orchestration.checkpoint import (
+    INTERRUPTED_DIRNAME,
+    STATE_COMPLETED,
+    STATE_PENDING,
+    STATE_STARTED,
+    CheckpointJournal,
+    job_from_dict,
+    job_to_dict,
+    list_outputs,
+)
+from pleiades.sammy.orchestration.jobs import SammyJob
+
+
+def write_outputs(runner, files):
+    """Write fake SAMMY outputs holding the job id instead of running SAMMY."""
+    runner.calls.append(runner.job_id)
+    for name in ("SAMMY.LPT", "SAMMY.LST"):
+        (runner.config.working_dir / name).write_text(f"{runner.job_id}\n")
+    return runner.result()
+
+
+@pytest.fixture
+def campaign(mock_sammy_files, tmp_path):
+    """Three jobs sharing the ex012 inputs."""
+    return [SammyJob(job_id=f"p{i}", working_dir=tmp_path / f"work/p{i}", **mock_sammy_files) for i in range(3)]
+
+
+@pytest.fixture
+def calls():
+    """Job ids run by the fake runners, in call order."""
+    return []
+
+
+@pytest.fixture
+def factory(make_factory, calls):
+    return make_factory(write_outputs, calls=calls)
+
+
+def test_job_spec_round_trip(mock_sammy_files, tmp_path):
+    job = SammyJob(
+        job_id="p0",
+        working_dir=tmp_path / "p0",
+        metadata={"pixel": [1, 2]},
+        input_content="rendered\n",
+        data_content=b"\x00binary",
+        **mock_sammy_files,
+    )
+    assert job_from_dict(job_to_dict(job)) == job
+
+
+def test_replay_states(campaign, tmp_path):
+    journal = CheckpointJournal(tmp_path / "campaign.journal")
+    journal.register(campaign)
+    journal.register(campaign)  # Already known, nothing appended
+    journal.mark_started(campaign[0])
+    journal.mark_started(campaign[1])
+    journal.mark_completed(campaign[0], success=True, status="success")
+
+    checkpoints = journal.replay()
+    assert list(checkpoints) == ["p0", "p1", "p2"]
+    assert [checkpoint.state for checkpoint in checkpoints.values()] == [STATE_COMPLETED, STATE_STARTED, STATE_PENDING]
+    assert checkpoints["p0"].success
+    assert journal.jobs() == campaign
+    assert len(journal.path.read_text().splitlines()) == 6
+
+    # A job registered again with another specification starts over
+    campaign[0].metadata = {"retry": True}
+    journal.register(campaign)
+    assert journal.replay()["p0"].state == STATE_PENDING
+
+
+def test_truncated_event_is_discarded(campaign, tmp_path):
+    journal = CheckpointJournal(tmp_path / "campaign.journal")
+    journal.register(campaign[:1])
+    with open(journal.path, "a") as f:
+        f.write('{"event": "started", "job_')  # Driver killed in the middle of a write
+
+    journal = CheckpointJournal(journal.path)
+    journal.mark_completed(campaign[0], success=False)
+
+    assert journal.replay()["p0"].state == STATE_COMPLETED
+    assert all(line.endswith("}") for line in journal.path.read_text().splitlines())
+
+
+def test_recover_quarantines_interrupted_outputs(campaign, tmp_path):
+    journal = CheckpointJournal(tmp_path / "campaign.journal")
+    journal.register(campaign)
+    for job in campaign:
+        job.output_dir.mkdir(parents=True, exist_ok=True)
+        (job.output_dir / "SAMMY.LPT").write_text("log\n")
+    # p0 completed, p1 interrupted while its outputs were collected, p2 lost an output afterwards
+    journal.mark_started(campaign[0])
+    journal.mark_completed(campaign[0], success=True)
+    journal.mark_started(campaign[1])
+    journal.mark_started(campaign[2])
+    (campaign[2].output_dir / "SAMMY.LST").write_text("listing\n")
+    journal.mark_completed(campaign[2], success=True)
+    (campaign[2].output_dir / "SAMMY.LST").unlink()
+
+    campaign[1].working_dir.mkdir(parents=True, exist_ok=True)
+    (campaign[1].working_dir / "SAMNDF.PAR").write_text("partial\n")
+
+    assert journal.recover() == {"p0"}
+    assert not (campaign[1].output_dir / "SAMMY.LPT").exists()
+    assert not (campaign[1].working_dir / "SAMNDF.PAR").exists()
+    quarantine = campaign[1].output_dir / INTERRUPTED_DIRNAME
+    assert (quarantine / "SAMMY.LPT").read_text() == "log\n"
+    assert (quarantine / "SAMNDF.PAR").read_text() == "partial\n"
+
+
+def test_failed_rerun_does_not_collect_interrupted_outputs(campaign, make_factory, tmp_path):
+    journal = CheckpointJournal(tmp_path / "campaign.journal")
+    job = campaign[0]
+    journal.register([job])
+    journal.mark_started(job)
+    # Interrupted while its outputs were collected
+    job.working_dir.mkdir(parents=True)
+    job.output_dir.mkdir(parents=True, exist_ok=True)
+    (job.working_dir / "SAMMY.LPT").write_text("stale\n")
+    (job.output_dir / "SAMNDF.PAR").write_text("stale\n")
+    journal.recover()
+
+    def failing_execute(runner, files):
+        return runner.result(success=False, error_message="crash")
+
+    result = jobs_module.run_job(job, make_factory(failing_execute))
+
+    assert not result.success
+    assert list_outputs(job.output_dir) == []
+    assert list_outputs(job.working_dir) == []
+
+
+def test_batch_restarts_from_journal(campaign, factory, calls, tmp_path):
+    journal = CheckpointJournal(tmp_path / "campaign.journal")
+    index = ResultsIndex(tmp_path / "index.jsonl")
+    BatchRunner(factory, index, journal=journal).run(campaign[:2])
+    assert sorted(calls) == ["p0", "p1"]
+    assert journal.replay()["p0"].outputs == ["SAMMY.LPT", "SAMMY.LST"]
+
+    # The driver died while p2 was running
+    journal.register(campaign)
+    journal.mark_started(campaign[2])
+
+    calls.clear()
+    summary = BatchRunner(factory, index, journal=journal).run(journal.jobs())
+    assert calls == ["p2"]
+    assert (summary.skipped, summary.succeeded) == (2, 1)
+    assert journal.recover() == {"p0", "p1", "p2"}
+
+
+def test_cli_batch_from_journal(campaign, factory, calls, monkeypatch, tmp_path):
+    monkeypatch.setattr(jobs_module, "factory_runner", lambda backend_type, **kwargs: factory)
+    journal_file = tmp_path / "campaign.journal"
+    CheckpointJournal(journal_file).register(campaign)
+
+    assert main(["batch", "--journal", str(journal_file)]) == 0
+    assert sorted(calls) == ["p0", "p1", "p2"]
+    assert ResultsIndex(tmp_path / "campaign.results.jsonl").completed() == {"p0", "p1", "p2"}
+
+    assert main(["batch"]) == 1
+
+
+if __name__ == "__main__":
+    pytest.main(["-v", __file__])
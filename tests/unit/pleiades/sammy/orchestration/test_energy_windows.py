@@ -0,0 +1,149 @@
+#!/usr/bin/env python
+"""Unit tests for adaptive energy-window splitting of SAMMY fits."""
+
+import shutil
+
+import numpy as np
+import pytest
+
+from pleiades.sammy.interface import SammyError
+from pleiades.sammy.orchestration.energy_windows import EnergyWindowFit, plan_windows
+from pleiades.sammy.orchestration.jobs import SammyJob
+
+
+def echo_window(runner, files):
+    """Echo the window parameters and write an LST tagged with the window number."""
+    working_dir = runner.config.working_dir
+    window = int(runner.job_id.split("_")[-1])
+    shutil.copyfile(files.parameter_file, working_dir / "SAMNDF.PAR")
+    energies = np.loadtxt(files.data_file, ndmin=2)[:, 0]
+    np.savetxt(working_dir / "SAMMY.LST", np.column_stack([energies, np.full(len(energies), window)]))
+    return runner.result()
+
+
+@pytest.fixture
+def window_factory(make_factory):
+    return make_factory(echo_window)
+
+
+@pytest.fixture
+def job(test_data_dir, tmp_path):
+    return SammyJob(
+        job_id="ex012",
+        input_file=test_data_dir / "ex012a.inp",
+        parameter_file=test_data_dir / "ex012a.par",
+        data_file=test_data_dir / "ex012a.dat",
+        working_dir=tmp_path / "work",
+    )
+
+
+def test_plan_windows_splits_in_widest_gap():
+    energies = [1.0, 2.0, 3.0, 4.0, 10.0, 11.0, 12.0, 13.0]
+    windows = plan_windows(energies, (0.0, 20.0), max_resonances=5, overlap=0.1)
+
+    assert [(window.core_min, window.core_max) for window in windows] == [(0.0, 7.0), (7.0, 20.0)]
+    assert [window.n_resonances for window in windows] == [4, 4]
+    assert (windows[0].fit_min, windows[0].fit_max) == (0.0, pytest.approx(7.7))
+    assert windows[1].fit_min == pytest.approx(5.7)
+
+
+def test_plan_windows_bounds_resonances_per_window():
+    energies = np.linspace(1.0, 100.0, 95)
+    windows = plan_windows(energies, (0.0, 101.0), max_resonances=10)
+
+    assert all(window.n_resonances <= 10 for window in windows)
+    assert sum(window.n_resonances for window in windows) == 95
+    assert windows[0].core_min == 0.0 and windows[-1].core_max == 101.0
+    assert all(a.core_max == b.core_min for a, b in zip(windows[:-1], windows[1:]))
+
+    with pytest.raises(ValueError, match="max_resonances"):
+        plan_windows(energies, (0.0, 101.0), max_resonances=0)
+
+
+def test_build_jobs_writes_window_inputs(job):
+    fit = EnergyWindowFit(job, max_resonances=20)
+    windows = fit.plan()
+    jobs = fit.build_jobs(windows)
+
+    assert len(jobs) == len(windows) > 1
+    fit_min, fit_max = jobs[1].metadata["fit_range"]
+    assert fit_min <= windows[1].fit_min and fit_max >= windows[1].fit_max
+
+    # Card Set 2 carries the window energy range in its fixed columns
+    card2 = jobs[1].input_file.read_text().splitlines()[1]
+    assert (float(card2[20:30]), float(card2[30:40])) == (fit_min, fit_max)
+
+    energies = np.loadtxt(jobs[1].data_file)[:, 0]
+    assert energies.min() >= fit_min and energies.max() <= fit_max
+
+    # Resonances outside the fit range are kept but fixed
+    par_lines = jobs[1].parameter_file.read_text().splitlines()
+    assert len(par_lines) == len(job.parameter_file.read_text().splitlines())
+    for line in par_lines[:162]:
+        if not fit_min <= float(line[:11]) <= fit_max:
+            assert line[55:65] == " 0 0 0 0 0"
+
+
+def test_run_stitches_windows(job, window_factory):
+    fit = EnergyWindowFit(job, max_resonances=20, overlap=0.2)
+    result = fit.run(window_factory, workers=3)
+
+    assert result.success
+    # Every data point appears once, taken from the window owning its energy
+    stitched = np.loadtxt(result.lst_file)
+    data_energies = np.loadtxt(job.data_file)[:, 0]
+    assert np.allclose(stitched[:, 0], np.sort(data_energies))
+    for window in result.windows:
+        owned = (stitched[:, 0] >= window.core_min) & (stitched[:, 0] < window.core_max)
+        assert np.all(stitched[owned, 1] == window.index)
+
+    # Each resonance comes from the window fitting it, hence with its original vary flags
+    assert result.parameter_file.read_text() == job.parameter_file.read_text()
+
+
+def test_run_keeps_card1_header(job, window_factory, tmp_path):
+    # Card 1 is found as ParManager finds it, after its optional header line
+    parameter_file = tmp_path / "headed.par"
+    parameter_file.write_text("RESONANCES are listed next\n" + job.parameter_file.read_text())
+    job.parameter_file = parameter_file
+
+    fit = EnergyWindowFit(job, max_resonances=20)
+    assert len(fit.plan()) > 1
+    assert fit.build_jobs(fit.plan())[0].parameter_file.read_text().startswith("RESONANCES")
+
+    result = fit.run(window_factory)
+
+    assert result.parameter_file.read_text() == parameter_file.read_text()
+
+
+def test_run_reports_failed_windows(job, make_factory):
+    def failing_window(runner, files):
+        result = echo_window(runner, files)
+        result.success = runner.job_id != "window_001"
+        return result
+
+    result = EnergyWindowFit(job, max_resonances=20).run(make_factory(failing_window))
+
+    assert result.failed_windows == [1]
+    assert result.parameter_file is None
+
+
+def test_run_reports_raising_windows(job, make_factory):
+    def raising_window(runner, files):
+        if runner.job_id == "window_001":
+            raise SammyError("SAMMY crashed")
+        return echo_window(runner, files)
+
+    result = EnergyWindowFit(job, max_resonances=20).run(make_factory(raising_window), workers=2)
+
+    assert result.failed_windows == [1]
+    assert result.errors == {1: "SAMMY crashed"}
+    assert result.results[1] is None
+    # The other windows still finished
+    assert all(r.success for i, r in enumerate(result.results) if i != 1)
+    assert len(result.results) == len(result.windows) > 2
+    assert result.parameter_file is None
+
+
+if __name__ == "__main__":
+    pytest.main(["-v", __file__])
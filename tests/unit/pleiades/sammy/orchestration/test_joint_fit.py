@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+"""Unit tests for the multi-spectrum joint fit builder."""
+
+import io
+import json
+
+import numpy as np
+import pytest
+
+from pleiades.sammy.io.inp_manager import InpManager
+from pleiades.sammy.orchestration.joint_fit import JointFitBuilder, split_lst
+
+
+@pytest.fixture
+def spectra(tmp_path):
+    """Two transmission spectra with interleaved energies."""
+    roi1 = tmp_path / "roi1.csv"
+    roi1.write_text("energy_eV,transmission,uncertainty\n1.0,0.91,0.01\n3.0,0.93,0.01\n5.0,0.95,0.01\n")
+    roi2 = tmp_path / "roi2.txt"
+    roi2.write_text("# Energy Transmission\n2.0 0.81\n4.0 0.83\n6.0 0.85\n")
+    return roi1, roi2
+
+
+def test_build_merges_spectra(spectra, test_data_dir, tmp_path):
+    builder = JointFitBuilder(test_data_dir / "ex012a.par", test_data_dir / "ex012a.inp")
+    builder.add_spectrum("roi1", spectra[0]).add_spectrum("roi2", spectra[1], energy_range=(0.0, 5.0))
+
+    job = builder.build(tmp_path / "joint")
+
+    data = np.loadtxt(io.StringIO(job.data_content))
+    assert data[:, 0].tolist() == [1.0, 2.0, 3.0, 4.0, 5.0]
+    assert data[1, 2] == 0.0  # missing uncertainty column filled with zeros
+    assert job.data_file == tmp_path / "joint" / "joint_fit.twenty"
+    # Parameter and input files given as paths are used as they are
+    assert job.parameter_file == test_data_dir / "ex012a.par"
+    assert job.parameter_content is None
+    assert job.metadata["spectra"] == ["roi1", "roi2"]
+
+    layout = json.loads(open(job.metadata["segments_file"]).read())
+    assert layout["spectrum_index"] == [0, 1, 0, 1, 0]
+    assert [spectrum["n_points"] for spectrum in layout["spectra"]] == [3, 2]
+
+
+def test_build_widens_inp_energy_range(spectra, test_data_dir, tmp_path):
+    inp = InpManager(isotope_info={"element": "Si", "atomic_mass_amu": 28.0, "min_energy_eV": 2.5})
+    builder = JointFitBuilder(test_data_dir / "ex012a.par", inp)
+    builder.add_spectrum("roi1", spectra[0]).add_spectrum("roi2", spectra[1])
+
+    job = builder.build(tmp_path / "joint")
+
+    # Card Set 2 line holds the energy range
+    fields = job.input_content.splitlines()[1].split()
+    assert (float(fields[2]), float(fields[3])) == (1.0, 6.0)
+    assert inp.isotope_info["min_energy_eV"] == 2.5
+
+
+def test_build_rejects_different_conditions(spectra, test_data_dir, tmp_path):
+    builder = JointFitBuilder(test_data_dir / "ex012a.par", test_data_dir / "ex012a.inp")
+    builder.add_spectrum("thin", spectra[0], conditions={"thickness_mm": 1.0})
+    builder.add_spectrum("thick", spectra[1], conditions={"thickness_mm": 5.0})
+
+    with pytest.raises(ValueError, match="different experimental conditions"):
+        builder.build(tmp_path / "joint")
+
+
+def test_split_lst(spectra, test_data_dir, tmp_path):
+    builder = JointFitBuilder(test_data_dir / "ex012a.par", test_data_dir / "ex012a.inp")
+    builder.add_spectrum("roi1", spectra[0]).add_spectrum("roi2", spectra[1])
+    job = builder.build(tmp_path / "joint")
+
+    # Fake LST: energy, 4 cross-section columns and 4 transmission columns per data point
+    energies = np.loadtxt(io.StringIO(job.data_content))[:, 0]
+    lst_file = tmp_path / "SAMMY.LST"
+    lst_file.write_text("".join(f"{e} 1 0.1 1 1 {e / 10} 0.01 0.5 0.5\n" for e in energies))
+
+    tables = split_lst(lst_file, job.metadata["segments_file"])
+    assert tables["roi1"]["Energy"].tolist() == [1.0, 3.0, 5.0]
+    assert tables["roi2"]["Energy"].tolist() == [2.0, 4.0, 6.0]
+
+    lst_file.write_text("1.0 1 0.1 1 1 0.1 0.01 0.5 0.5\n")
+    with pytest.raises(ValueError, match="rows"):
+        split_lst(lst_file, job.metadata["segments_file"])
+
+
+if __name__ == "__main__":
+    pytest.main(["-v", __file__])
@@ -0,0 +1,184 @@
+#!/usr/bin/env python
+"""Unit tests for parameter sweeps over SAMMY parameter files."""
+
+import shutil
+from datetime import datetime
+from unittest import mock
+
+import numpy as np
+import pytest
+
+from pleiades.sammy.interface import SammyExecutionResult
+from pleiades.sammy.orchestration.batch import STATUS_FAILED, STATUS_SUCCESS
+from pleiades.sammy.orchestration.jobs import SammyJob
+from pleiades.sammy.orchestration.sweep import ParameterSweep, SweepError
+from pleiades.sammy.parameters import BroadeningParameterCard, NormalizationBackgroundCard
+from pleiades.sammy.parameters.broadening import BroadeningParameters
+from pleiades.sammy.parameters.normalization import NormalizationParameters
+
+
+@pytest.fixture
+def base_job(mock_sammy_files, temp_working_dir):
+    """Job whose parameter file is ex012a.par followed by broadening and normalization cards."""
+    broadening = BroadeningParameterCard(
+        parameters=BroadeningParameters(crfn=4.2, temp=300.0, thick=0.347162, deltal=0.182233, deltag=0.0, deltae=0.0)
+    )
+    normalization = NormalizationBackgroundCard(
+        angle_sets=[NormalizationParameters(anorm=1.0, backa=0.0, backb=0.0, backc=0.0, backd=0.0, backf=0.0)]
+    )
+    parameter_file = temp_working_dir / "base.par"
+    parameter_file.write_text(
+        mock_sammy_files["parameter_file"].read_text().rstrip("\n")
+        + "\n\n"
+        + "\n".join(broadening.to_lines() + normalization.to_lines())
+    )
+    return SammyJob(
+        job_id="si",
+        input_file=mock_sammy_files["input_file"],
+        parameter_file=parameter_file,
+        data_file=mock_sammy_files["data_file"],
+        working_dir=temp_working_dir / "si",
+    )
+
+
+def test_variants_form_the_cartesian_grid(base_job):
+    sweep = ParameterSweep(base_job, {"thickness": [0.1, 0.2, 0.3], "temperature": [280.0, 320.0]})
+
+    variants = sweep.variants()
+
+    assert sweep.size == 6
+    assert [job_id[: -len("_12345678")] for job_id in variants.index] == [f"si_{i:03d}" for i in range(6)]
+    assert variants.index.is_unique
+    assert list(variants["thickness"]) == [0.1, 0.1, 0.2, 0.2, 0.3, 0.3]
+    assert list(variants["temperature"]) == [280.0, 320.0] * 3
+
+
+def test_only_varied_cards_are_rendered(base_job):
+    sweep = ParameterSweep(
+        base_job,
+        {"thickness": [0.1, 0.2, 0.3], "temperature": [280.0, 320.0], "normalization.angle_sets.0.anorm": [0.9, 1.1]},
+    )
+    base_lines = base_job.parameter_file.read_text().splitlines()
+
+    with mock.patch.object(
+        BroadeningParameterCard, "to_lines", autospec=True, side_effect=BroadeningParameterCard.to_lines
+    ) as broadening_to_lines:
+        jobs = sweep.build_jobs()
+
+    assert len(jobs) == 12
+    # Variants are patched into the compiled template, no card is rendered per variant
+    assert broadening_to_lines.call_count == 0
+
+    job = jobs[7]  # thickness 0.2, temperature 320, anorm 1.1
+    assert job.metadata == {"thickness": 0.2, "temperature": 320.0, "normalization.angle_sets.0.anorm": 1.1}
+    assert job.input_file == base_job.input_file
+    lines = job.parameter_file.read_text().splitlines()
+    broadening_start = next(i for i, line in enumerate(lines) if line.startswith("BROAD"))
+    # Resonances, radii and isotopes are copied verbatim
+    assert lines[:broadening_start] == base_lines[:broadening_start]
+    assert len(lines) == len(base_lines)
+
+    card = BroadeningParameterCard.from_lines(lines[broadening_start : broadening_start + 2])
+    assert card.parameters.thick == pytest.approx(0.2)
+    assert card.parameters.temp == pytest.approx(320.0)
+    assert card.parameters.crfn == pytest.approx(4.2)
+    normalization = NormalizationBackgroundCard.from_lines(lines[broadening_start + 3 :])
+    assert normalization.angle_sets[0].anorm == pytest.approx(1.1)
+
+
+def test_invalid_parameters_are_rejected(base_job, mock_sammy_files):
+    with pytest.raises(SweepError, match="does not exist"):
+        ParameterSweep(base_job, {"broadening.parameters.thickness": [0.1]})
+    with pytest.raises(SweepError, match="must name a card"):
+        ParameterSweep(base_job, {"fudge": [0.1]})
+    with pytest.raises(ValueError, match="non-empty"):
+        ParameterSweep(base_job, {"thickness": []})
+
+    base_job.parameter_file = mock_sammy_files["parameter_file"]
+    with pytest.raises(SweepError, match="not present"):
+        ParameterSweep(base_job, {"thickness": [0.1]})
+
+
+class ThicknessRunner:
+    """Runner copying a canned LPT file, failing when the thickness of its parameter file is too large."""
+
+    def __init__(self, output_dir, lpt_file, calls):
+        self.output_dir = output_dir
+        self.lpt_file = lpt_file
+        self.calls = calls
+
+    def prepare_environment(self, files):
+        self.parameter_file = files.parameter_file
+
+    def execute_sammy(self, files):
+        self.calls.append(files.parameter_file.stem)
+        lines = files.parameter_file.read_text().splitlines()
+        start = next(i for i, line in enumerate(lines) if line.startswith("BROAD"))
+        thick = BroadeningParameterCard.from_lines(lines[start : start + 2]).parameters.thick
+        now = datetime.now()
+        return SammyExecutionResult(
+            success=thick < 0.3,
+            execution_id="fake",
+            start_time=now,
+            end_time=now,
+            console_output="",
+            error_message=None if thick < 0.3 else "failed",
+        )
+
+    def collect_outputs(self, result):
+        shutil.copyfile(self.lpt_file, self.output_dir / "SAMMY.LPT")
+
+    def cleanup(self):
+        pass
+
+
+def test_run_returns_one_row_per_variant(base_job, test_data_dir):
+    sweep = ParameterSweep(base_job, {"thickness": np.array([0.1, 0.2, 0.3]), "temperature": [300.0]})
+
+    calls = []
+
+    def runner_factory(working_dir, output_dir):
+        return ThicknessRunner(output_dir, test_data_dir / "answers/ex012aa.lpt", calls)
+
+    table = sweep.run(runner_factory, workers=3)
+    failed = table.index[2]
+
+    assert list(table.columns[:2]) == ["thickness", "temperature"]
+    assert list(table["status"]) == [STATUS_SUCCESS, STATUS_SUCCESS, STATUS_FAILED]
+    assert table["reduced_chi_squared"].iloc[1] == pytest.approx(3.43868)
+    assert table.loc[failed, "error"] == "failed"
+    assert (sweep.sweep_dir / failed / "output" / "SAMMY.LPT").is_file()
+
+    # Resuming only reruns the failed variant
+    calls.clear()
+    sweep.run(runner_factory)
+    assert calls == [failed]
+
+
+def test_rerun_with_changed_grid_runs_changed_variants(base_job, test_data_dir):
+    calls = []
+
+    def runner_factory(working_dir, output_dir):
+        return ThicknessRunner(output_dir, test_data_dir / "answers/ex012aa.lpt", calls)
+
+    first = ParameterSweep(base_job, {"thickness": [0.1, 0.2]}).run(runner_factory)
+    assert list(first["status"]) == [STATUS_SUCCESS, STATUS_SUCCESS]
+
+    # Same sweep directory, the grid reordered and one value changed
+    calls.clear()
+    table = ParameterSweep(base_job, {"thickness": [0.3, 0.1]}).run(runner_factory)
+
+    assert sorted(calls) == sorted(table.index)
+    assert not set(table.index) & set(first.index)
+    assert list(table["thickness"]) == [0.3, 0.1]
+    assert list(table["status"]) == [STATUS_FAILED, STATUS_SUCCESS]
+
+    # Variants with the same values in the same grid position resume
+    calls.clear()
+    sweep = ParameterSweep(base_job, {"thickness": [0.1, 0.25]})
+    sweep.run(runner_factory)
+    assert calls == [sweep.variants().index[1]]
+
+
+if __name__ == "__main__":
+    pytest.main(["-v", __file__])
@@ -0,0 +1,159 @@
+#!/usr/bin/env python
+"""Unit tests for the SAMMY run telemetry store."""
+
+import shutil
+from datetime import datetime, timedelta
+
+import pytest
+
+from pleiades import main
+from pleiades.sammy.interface import SammyExecutionResult, SammyFailureType
+from pleiades.sammy.orchestration.jobs import SammyJob, run_job
+from pleiades.sammy.orchestration.telemetry import (
+    RunTelemetry,
+    TelemetryStore,
+    count_resonances,
+    file_sha256,
+    format_summary,
+)
+
+
+def copy_lpt(runner, files):
+    """Copy a canned LPT file instead of running SAMMY, in 30 s and 120 MB."""
+    shutil.copyfile(runner.lpt_file, runner.config.working_dir / "SAMMY.LPT")
+    start = datetime(2024, 5, 1, 12, 0, 0)
+    return SammyExecutionResult(
+        success=True,
+        execution_id=runner.job_id,
+        start_time=start,
+        end_time=start + timedelta(seconds=30),
+        console_output="",
+        peak_rss_mb=120.0,
+    )
+
+
+def make_record(job_id, backend="local", success=True, wall_time=10.0, peak_rss_mb=100.0, day=1):
+    return RunTelemetry(
+        job_id=job_id,
+        backend=backend,
+        success=success,
+        wall_time_seconds=wall_time,
+        started_at=datetime(2024, 5, day).isoformat(),
+        n_data_points=1000,
+        n_iterations=3,
+        peak_rss_mb=peak_rss_mb,
+        failure_type=None if success else SammyFailureType.TIMEOUT.value,
+    )
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = TelemetryStore(tmp_path / "telemetry.sqlite")
+    store.record(make_record("a", wall_time=10.0, peak_rss_mb=100.0, day=1))
+    store.record(make_record("b", wall_time=30.0, peak_rss_mb=300.0, day=2))
+    store.record(make_record("c", success=False, wall_time=600.0, peak_rss_mb=None, day=3))
+    store.record(make_record("d", backend="docker", wall_time=20.0, day=4))
+    return store
+
+
+def test_count_resonances(test_data_dir, tmp_path):
+    assert count_resonances(test_data_dir / "ex012a.par") == 162
+    assert count_resonances(test_data_dir / "missing.par") is None
+
+    # Header, comments and lines without digits are not resonances, as in Card01.from_lines
+    lines = (test_data_dir / "ex012a.par").read_text().splitlines(keepends=True)
+    annotated = tmp_path / "annotated.par"
+    annotated.write_text(
+        "".join(["RESONANCES are listed next\n", "# first resonances\n", *lines[:3], "-----\n"] + lines[3:])
+    )
+    assert count_resonances(annotated) == 162
+
+
+@pytest.fixture
+def job(test_data_dir, tmp_path):
+    return SammyJob(
+        job_id="p0",
+        input_file=test_data_dir / "ex012a.inp",
+        parameter_file=test_data_dir / "ex012a.par",
+        data_file=test_data_dir / "ex012a.dat",
+        working_dir=tmp_path / "work",
+    )
+
+
+@pytest.fixture
+def factory(make_factory, test_data_dir):
+    return make_factory(copy_lpt, lpt_file=test_data_dir / "answers/ex012aa.lpt")
+
+
+def test_run_job_records_telemetry(job, factory, tmp_path):
+    store = TelemetryStore(tmp_path / "telemetry.sqlite")
+
+    run_job(job, factory, telemetry=store)
+
+    (record,) = store.query()
+    assert (record.job_id, record.backend, record.success) == ("p0", "fake", True)
+    assert record.wall_time_seconds == 30.0
+    assert record.peak_rss_mb == 120.0
+    assert record.n_data_points == 15736
+    assert record.n_resonances == 162
+    assert record.n_iterations == 3
+    assert record.reduced_chi_squared == pytest.approx(3.43868)
+    assert record.parameter_hash == file_sha256(job.parameter_file)
+
+
+def test_run_job_records_parameter_file_override(job, factory, tmp_path):
+    store = TelemetryStore(tmp_path / "telemetry.sqlite")
+    seed = tmp_path / "seed" / "ex012a.par"
+    seed.parent.mkdir()
+    lines = job.parameter_file.read_text().splitlines(keepends=True)
+    seed.write_text("".join(lines[10:]))
+
+    run_job(job, factory, parameter_file=seed, telemetry=store)
+
+    (record,) = store.query()
+    assert record.parameter_hash == file_sha256(seed)
+    assert record.n_resonances == 152
+
+
+def test_query_filters(store):
+    assert [record.job_id for record in store.query(backend="local")] == ["a", "b", "c"]
+    assert [record.job_id for record in store.query(success=False)] == ["c"]
+    assert [record.job_id for record in store.query(since=datetime(2024, 5, 2), until=datetime(2024, 5, 4))] == [
+        "b",
+        "c",
+    ]
+    assert [record.job_id for record in store.query(limit=2)] == ["c", "d"]
+    assert store.query(job_id="a")[0].success is True
+
+
+def test_summary(store):
+    local, docker = store.summary(group_by="backend")
+
+    assert (local.group, local.runs, docker.group) == ("local", 3, "docker")
+    assert local.success_rate == pytest.approx(2 / 3)
+    assert local.total_wall_time_seconds == 640.0
+    # Failed runs do not count towards the time per data point
+    assert local.mean_seconds_per_data_point == pytest.approx(0.02)
+    assert local.mean_peak_rss_mb == 200.0
+    assert "local" in format_summary([local, docker])
+
+    with pytest.raises(ValueError, match="Cannot group"):
+        store.summary(group_by="input_hash")
+
+
+def test_suggest_workers(store):
+    # p95 of the local peaks (100, 300 MB) is 290 MB
+    assert store.suggest_workers(1000, backend="local") == 3
+    assert store.suggest_workers(100, backend="local") == 1
+    assert TelemetryStore(store.path.with_name("empty.sqlite")).suggest_workers(1000, max_workers=8) == 8
+
+
+def test_cli_telemetry(store, capsys):
+    assert main(["telemetry", str(store.path), "--memory-budget", "1000", "--backend", "local"]) == 0
+    output = capsys.readouterr().out
+    assert "local" in output
+    assert "Suggested workers for 1000 MB: 3" in output
+
+
+if __name__ == "__main__":
+    pytest.main(["-v", __file__])
@@ -0,0 +1,172 @@
+#!/usr/bin/env python
+"""Unit tests for warm-start chaining of SAMMY fits."""
+
+import shutil
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+from pleiades.sammy.interface import SammyError, SammyExecutionResult
+from pleiades.sammy.orchestration.jobs import SammyJob
+from pleiades.sammy.orchestration.warm_start import (
+    WarmStartChain,
+    WarmStartPolicy,
+    sequential_predecessors,
+    serpentine_predecessors,
+)
+
+
+def copy_parameters(runner, files):
+    """Copy the parameter file to SAMNDF.PAR instead of running SAMMY."""
+    seeded = files._original_parameter_file.parent.name == "warm_start"
+    runner.calls.append((runner.job_id, seeded))
+    if (runner.raise_seeded and seeded) or runner.job_id in runner.raise_jobs:
+        raise SammyError("SAMMY crashed")
+    shutil.copyfile(files.parameter_file, runner.config.working_dir / "SAMNDF.PAR")
+    return runner.result(success=not (runner.fail_seeded and seeded))
+
+
+@pytest.fixture
+def default_par(test_data_dir):
+    """Parameter file readable by ParManager."""
+    return test_data_dir / "answers/ex012aa.par"
+
+
+@pytest.fixture
+def make_jobs(tmp_path, test_data_dir, default_par):
+    """Build jobs sharing the same default inputs."""
+
+    def _make(job_ids):
+        return [
+            SammyJob(
+                job_id=job_id,
+                input_file=test_data_dir / "ex012a.inp",
+                parameter_file=default_par,
+                data_file=test_data_dir / "ex012a.dat",
+                working_dir=tmp_path / job_id,
+            )
+            for job_id in job_ids
+        ]
+
+    return _make
+
+
+@pytest.fixture
+def fake_factory(make_factory):
+    """Build factories of runners copying the parameter file, recording (job id, seeded) calls."""
+
+    def _make(calls, fail_seeded=False, raise_seeded=False, raise_jobs=()):
+        return make_factory(
+            copy_parameters, calls=calls, fail_seeded=fail_seeded, raise_seeded=raise_seeded, raise_jobs=raise_jobs
+        )
+
+    return _make
+
+
+def test_serpentine_predecessors_are_neighbours():
+    order, predecessors = serpentine_predecessors([["a", "b", "c"], ["d", "e", "f"]])
+    assert order == ["a", "b", "c", "f", "e", "d"]
+    assert predecessors["a"] is None
+    assert predecessors["f"] == "c"
+    assert predecessors["d"] == "e"
+
+
+def test_sequential_predecessors():
+    assert sequential_predecessors(["t0", "t1", "t2"]) == {"t0": None, "t1": "t0", "t2": "t1"}
+
+
+def test_chain_seeds_from_previous_job(make_jobs, fake_factory):
+    calls = []
+    chain = WarmStartChain(fake_factory(calls))
+    outcomes = chain.run(make_jobs(["t0", "t1", "t2"]))
+
+    assert calls == [("t0", False), ("t1", True), ("t2", True)]
+    assert outcomes["t0"].seeded_from is None
+    assert outcomes["t1"].seeded_from == "t0"
+    assert outcomes["t2"].warm_started
+    assert all(outcome.converged for outcome in outcomes.values())
+
+
+def test_chain_falls_back_on_divergence(make_jobs, fake_factory):
+    calls = []
+    chain = WarmStartChain(fake_factory(calls, fail_seeded=True))
+    outcomes = chain.run(make_jobs(["t0", "t1"]))
+
+    assert calls == [("t0", False), ("t1", True), ("t1", False)]
+    assert outcomes["t1"].fell_back
+    assert not outcomes["t1"].warm_started
+    assert outcomes["t1"].result.success
+
+
+def test_chain_without_fallback_keeps_failed_result(make_jobs, fake_factory):
+    calls = []
+    chain = WarmStartChain(fake_factory(calls, fail_seeded=True), WarmStartPolicy(fallback_on_divergence=False))
+    outcomes = chain.run(make_jobs(["t0", "t1", "t2"]))
+
+    # t1 diverged, so t2 starts cold from the default parameter file
+    assert calls == [("t0", False), ("t1", True), ("t2", False)]
+    assert not outcomes["t1"].result.success
+    assert outcomes["t2"].seeded_from is None
+
+
+def test_chain_continues_after_errors(make_jobs, fake_factory):
+    calls = []
+    chain = WarmStartChain(fake_factory(calls, raise_seeded=True, raise_jobs=("t2",)))
+    outcomes = chain.run(make_jobs(["t0", "t1", "t2", "t3"]))
+
+    # Raising warm starts are rerun cold; t2 raises again, so t3 starts cold
+    assert calls == [("t0", False), ("t1", True), ("t1", False), ("t2", True), ("t2", False), ("t3", False)]
+    assert outcomes["t1"].fell_back
+    assert outcomes["t1"].converged
+    assert "error: SAMMY crashed" in outcomes["t1"].notes
+    assert outcomes["t2"].result is None
+    assert not outcomes["t2"].converged
+    assert "error: SAMMY crashed" in outcomes["t2"].notes
+    assert outcomes["t3"].converged
+
+
+def test_check_converged_rejects_missing_par(make_jobs, fake_factory):
+    job = make_jobs(["t0"])[0]
+    job.output_dir.mkdir(parents=True)
+    now = datetime.now()
+    result = SammyExecutionResult(success=True, execution_id="x", start_time=now, end_time=now, console_output="")
+
+    converged, reason = WarmStartChain(fake_factory([])).check_converged(job, result)
+    assert not converged
+    assert "SAMNDF.PAR" in reason
+
+
+def test_check_converged_rejects_resonance_count_change(make_jobs, default_par, fake_factory):
+    job = make_jobs(["t0"])[0]
+    job.output_dir.mkdir(parents=True)
+    lines = Path(default_par).read_text().splitlines()
+    # Drop the first resonance line
+    (job.output_dir / "SAMNDF.PAR").write_text("\n".join(lines[1:]) + "\n")
+    now = datetime.now()
+    result = SammyExecutionResult(success=True, execution_id="x", start_time=now, end_time=now, console_output="")
+
+    converged, reason = WarmStartChain(fake_factory([])).check_converged(job, result)
+    assert not converged
+    assert "resonance count" in reason
+
+
+def test_check_converged_chi_squared_limit(make_jobs, default_par, test_data_dir, fake_factory):
+    job = make_jobs(["t0"])[0]
+    job.output_dir.mkdir(parents=True)
+    shutil.copyfile(default_par, job.output_dir / "SAMNDF.PAR")
+    shutil.copyfile(test_data_dir / "answers/ex012aa.lpt", job.output_dir / "SAMMY.LPT")
+    now = datetime.now()
+    result = SammyExecutionResult(success=True, execution_id="x", start_time=now, end_time=now, console_output="")
+
+    strict = WarmStartChain(fake_factory([]), WarmStartPolicy(max_reduced_chi_squared=1.0))
+    converged, reason = strict.check_converged(job, result)
+    assert not converged
+    assert "chi-squared" in reason
+
+    loose = WarmStartChain(fake_factory([]), WarmStartPolicy(max_reduced_chi_squared=100.0))
+    assert loose.check_converged(job, result)[0]
+
+
+if __name__ == "__main__":
+    pytest.main(["-v", __file__])
@@ -0,0 +1,133 @@
+#!/usr/bin/env python
+"""Unit tests for the dependency-aware workflow engine."""
+
+import threading
+
+import pytest
+
+from pleiades.sammy.orchestration.workflow import (
+    STATUS_BLOCKED,
+    STATUS_FAILED,
+    STATUS_RAN,
+    STATUS_SKIPPED,
+    Task,
+    Workflow,
+    WorkflowError,
+)
+
+
+@pytest.fixture
+def pipeline(tmp_path):
+    """Diamond workflow: source -> (upper, lower) -> merged, recording the tasks that ran."""
+    source = tmp_path / "source.txt"
+    source.write_text("resonance\n")
+    calls = []
+
+    def transform(function):
+        def _action(task):
+            calls.append(task.name)
+            text = "".join(path.read_text() for path in task.inputs)
+            task.outputs[0].write_text(function(text) + task.params.get("suffix", ""))
+
+        return _action
+
+    workflow = Workflow(tmp_path / "state.json")
+    workflow.add(Task("upper", transform(str.upper), inputs=[source], outputs=[tmp_path / "upper.txt"]))
+    workflow.add(Task("lower", transform(str.lower), inputs=[source], outputs=[tmp_path / "lower.txt"]))
+    workflow.add(
+        Task(
+            "merged",
+            transform(str.strip),
+            inputs=[tmp_path / "upper.txt", tmp_path / "lower.txt"],
+            outputs=[tmp_path / "merged.txt"],
+        )
+    )
+    return workflow, source, calls
+
+
+def test_dependencies_from_files(pipeline):
+    workflow, _, _ = pipeline
+    assert workflow.dependencies() == {"upper": [], "lower": [], "merged": ["lower", "upper"]}
+
+
+def test_run_then_skip_up_to_date(pipeline, tmp_path):
+    workflow, _, calls = pipeline
+
+    report = workflow.run()
+    assert report.success
+    assert calls[-1] == "merged" and sorted(calls) == ["lower", "merged", "upper"]
+    assert (tmp_path / "merged.txt").read_text() == "RESONANCE\nresonance"
+
+    calls.clear()
+    report = workflow.run()
+    assert calls == []
+    assert report.tasks_with_status(STATUS_SKIPPED) == ["upper", "lower", "merged"]
+
+
+def test_only_changed_branches_rerun(pipeline, tmp_path):
+    workflow, source, calls = pipeline
+    workflow.run()
+
+    # A parameter change reruns the task; unchanged outputs do not propagate
+    calls.clear()
+    workflow.tasks["lower"].params = {"suffix": ""}
+    workflow.run()
+    assert calls == ["lower"]
+
+    # A modified output is regenerated
+    calls.clear()
+    (tmp_path / "upper.txt").write_text("tampered")
+    workflow.run()
+    assert calls == ["upper"]
+
+    # A new source content reruns everything downstream
+    calls.clear()
+    source.write_text("gap\n")
+    report = workflow.run()
+    assert sorted(calls) == ["lower", "merged", "upper"]
+    assert set(report.status.values()) == {STATUS_RAN}
+
+
+def test_independent_tasks_run_concurrently(tmp_path):
+    barrier = threading.Barrier(2, timeout=5)
+
+    def meet(task):
+        barrier.wait()  # Deadlocks (and times out) unless both tasks run at the same time
+        task.outputs[0].write_text(task.name)
+
+    workflow = Workflow(tmp_path / "state.json")
+    workflow.add(Task("a", meet, outputs=[tmp_path / "a.txt"]))
+    workflow.add(Task("b", meet, outputs=[tmp_path / "b.txt"]))
+
+    assert workflow.run(workers=2).success
+
+
+def test_failure_blocks_dependents(tmp_path):
+    workflow = Workflow(tmp_path / "state.json")
+
+    @workflow.task(outputs=[tmp_path / "never.txt"])
+    def broken(task):
+        pass  # does not write its output
+
+    @workflow.task(inputs=[tmp_path / "never.txt"], outputs=[tmp_path / "after.txt"])
+    def after(task):
+        task.outputs[0].write_text("x")
+
+    report = workflow.run()
+    assert report.status == {"broken": STATUS_FAILED, "after": STATUS_BLOCKED}
+    assert "never.txt" in report.errors["broken"]
+
+
+def test_invalid_definitions(tmp_path):
+    workflow = Workflow(tmp_path / "state.json")
+    workflow.add(Task("a", print, inputs=[tmp_path / "b.txt"], outputs=[tmp_path / "a.txt"]))
+    with pytest.raises(WorkflowError, match="produced by both"):
+        workflow.add(Task("other", print, outputs=[tmp_path / "a.txt"]))
+
+    workflow.add(Task("b", print, inputs=[tmp_path / "a.txt"], outputs=[tmp_path / "b.txt"]))
+    with pytest.raises(WorkflowError, match="cycle"):
+        workflow.run()
+
+
+if __name__ == "__main__":
+    pytest.main(["-v", __file__])
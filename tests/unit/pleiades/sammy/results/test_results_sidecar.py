@@ -0,0 +1,155 @@
+"""Unit tests for the binary sidecar of parsed SAMMY results."""
+
+import os
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pytest
+from pydantic import ValidationError
+
+from pleiades.sammy.data.options import DataTypeOptions
+from pleiades.sammy.results import sidecar
+from pleiades.sammy.results.manager import ResultsManager
+from pleiades.sammy.results.models import ChiSquaredResults, FitResults
+from pleiades.sammy.results.sidecar import (
+    default_sidecar_path,
+    read_results_sidecar,
+    rebuild_model,
+    source_stamps,
+    write_results_sidecar,
+)
+
+LPT_FILE = Path(__file__).parents[4] / "data" / "ex012" / "answers" / "ex012aa.lpt"
+
+
+@pytest.fixture
+def outputs(tmp_path):
+    lpt_file = tmp_path / "SAMMY.LPT"
+    shutil.copy(LPT_FILE, lpt_file)
+    lst_file = tmp_path / "SAMMY.LST"
+    energies = np.linspace(1.0, 100.0, 50)
+    rows = np.column_stack([energies] + [np.full_like(energies, 0.1 * i) for i in range(1, 11)])
+    np.savetxt(lst_file, rows, fmt="%15.7E")
+    return {"lpt": lpt_file, "lst": lst_file}
+
+
+def parse(outputs, monkeypatch):
+    """ResultsManager for the outputs, failing if it parses them."""
+
+    def fail(*args, **kwargs):
+        raise AssertionError("output files parsed again")
+
+    monkeypatch.setattr("pleiades.sammy.results.manager.LptManager.process_lpt_file", fail)
+    monkeypatch.setattr("pleiades.sammy.results.manager.LstManager.process_lst_file", fail)
+    return ResultsManager(lpt_file_path=outputs["lpt"], lst_file_path=outputs["lst"])
+
+
+def test_default_sidecar_path():
+    assert default_sidecar_path("results/SAMMY.LPT") == Path("results/SAMMY.results.npz")
+
+
+def write(outputs):
+    """ResultsManager parsing the outputs and writing their sidecar."""
+    return ResultsManager(lpt_file_path=outputs["lpt"], lst_file_path=outputs["lst"], write_sidecar=True)
+
+
+def test_results_manager_reads_fresh_sidecar(outputs, monkeypatch):
+    first = write(outputs)
+    assert first.sidecar_path == outputs["lpt"].parent / "SAMMY.results.npz"
+    assert first.sidecar_path.is_file()
+
+    second = parse(outputs, monkeypatch)
+
+    assert [fit.model_dump() for fit in second.run_results.fit_results] == [
+        fit.model_dump() for fit in first.run_results.fit_results
+    ]
+    assert second.run_results.data.data_file == outputs["lst"]
+    assert second.run_results.data.data_type == DataTypeOptions.TRANSMISSION
+    assert second.run_results.data.data.equals(first.run_results.data.data)
+    assert second.lpt_manager.run_results is second.run_results
+    # Absent LPT parameters stay None
+    assert second.run_results.fit_results[0].physics_data.normalization_parameters.anorm is None
+
+
+def test_sidecar_holds_no_pickles(outputs):
+    with np.load(write(outputs).sidecar_path, allow_pickle=False) as arrays:
+        assert all(arrays[name].dtype != object for name in arrays.files)
+        assert arrays["fit_results"].dtype.kind == "U"
+
+
+def test_sidecar_of_other_pleiades_version_is_ignored(outputs, monkeypatch):
+    sidecar_path = write(outputs).sidecar_path
+    assert read_results_sidecar(sidecar_path, outputs) is not None
+
+    monkeypatch.setattr(sidecar, "__version__", "0.0.1")
+    assert read_results_sidecar(sidecar_path, outputs) is None
+
+
+def test_rebuild_model():
+    fit = FitResults(chi_squared_results=ChiSquaredResults(chi_squared=2.0, dof=10))
+    assert rebuild_model(FitResults, fit.model_dump(mode="json")) == fit
+
+    # Required broadening parameters are None when absent from the LPT file
+    data = fit.model_dump(mode="json")
+    data["physics_data"]["broadening_parameters"] = {"crfn": None, "temp": 300.0}
+    rebuilt = rebuild_model(FitResults, data)
+    assert rebuilt.physics_data.broadening_parameters.crfn is None
+    assert rebuilt.physics_data.broadening_parameters.temp == 300.0
+    assert rebuilt.chi_squared_results.dof == 10
+
+    data["physics_data"]["broadening_parameters"]["temp"] = "hot"
+    with pytest.raises(ValidationError):
+        rebuild_model(FitResults, data)
+
+
+def test_stale_sidecar_is_rewritten(outputs):
+    first = write(outputs)
+
+    # A new fit rewrites the LST file
+    values = np.loadtxt(outputs["lst"])[:10]
+    np.savetxt(outputs["lst"], values, fmt="%15.7E")
+    stat = os.stat(outputs["lst"])
+    os.utime(outputs["lst"], ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert read_results_sidecar(first.sidecar_path, outputs) is None
+
+    second = write(outputs)
+    assert len(second.run_results.data.data) == 10
+    assert len(read_results_sidecar(second.sidecar_path, outputs).data.data) == 10
+
+
+def test_sidecar_written_for_other_sources(outputs):
+    sidecar_path = outputs["lpt"].parent / "results.npz"
+    write_results_sidecar(sidecar_path, ResultsManager(use_sidecar=False).run_results, source_stamps(outputs))
+
+    assert read_results_sidecar(sidecar_path, outputs).fit_results == []
+    assert read_results_sidecar(sidecar_path, {"lpt": outputs["lpt"]}) is None
+
+
+def test_unreadable_sidecar_is_ignored(outputs):
+    sidecar_path = default_sidecar_path(outputs["lpt"])
+    sidecar_path.write_bytes(b"not a sidecar")
+
+    assert read_results_sidecar(sidecar_path, outputs) is None
+    manager = write(outputs)
+    assert len(manager.run_results.fit_results) == 3
+    assert read_results_sidecar(sidecar_path, outputs) is not None
+
+
+def test_results_manager_without_sidecar(outputs, tmp_path):
+    # Writing the sidecar is opt-in
+    for manager in (
+        ResultsManager(lpt_file_path=outputs["lpt"], lst_file_path=outputs["lst"]),
+        ResultsManager(lpt_file_path=outputs["lpt"], use_sidecar=False),
+    ):
+        assert manager.sidecar_path is None
+        assert len(manager.run_results.fit_results) == 3
+        assert not default_sidecar_path(outputs["lpt"]).exists()
+
+    with pytest.raises(FileNotFoundError):
+        ResultsManager(lst_file_path=tmp_path / "missing.LST")
+    assert not default_sidecar_path(tmp_path / "missing.LST").exists()
+
+
+if __name__ == "__main__":
+    pytest.main(["-v", __file__])
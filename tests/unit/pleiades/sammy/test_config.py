@@ -65,6 +65,18 @@ class TestLocalSammyConfig:
             config.validate()
         assert "Shell not found" in str(exc.value)
 
+    @pytest.mark.parametrize("limit", ["timeout", "cpu_time_limit", "memory_limit"])
+    def test_validate_invalid_limits(self, temp_working_dir, monkeypatch, limit):
+        """Should raise error for non-positive execution limits."""
+        monkeypatch.setattr("shutil.which", lambda _: "/usr/local/bin/sammy")
+        config = LocalSammyConfig(
+            working_dir=temp_working_dir, output_dir=temp_working_dir / "output", sammy_executable=Path("sammy")
+        )
+        setattr(config, limit, 0)
+        with pytest.raises(ConfigurationError) as exc:
+            config.validate()
+        assert "Invalid" in str(exc.value)
+
 
 class TestDockerSammyConfig:
     """Tests for DockerSammyConfig."""
@@ -18,6 +18,34 @@ from pleiades.sammy.interface import SammyRunner
 from pleiades.utils.logger import loguru_logger
 
 
+@pytest.fixture(autouse=True)
+def clear_factory_cache():
+    """Start every test with empty probe and runner caches, since tests mock the probes."""
+    SammyFactory.invalidate_cache()
+    yield
+    SammyFactory.invalidate_cache()
+
+
+@pytest.fixture
+def count_probes(monkeypatch):
+    """Count shutil.which and docker info calls, with every backend available."""
+    calls = {"which": 0, "docker info": 0}
+
+    def _mock_which(cmd):
+        calls["which"] += 1
+        return f"/usr/bin/{cmd}"
+
+    def _mock_run(*args, **kwargs):
+        _ = kwargs  # Unused
+        if args[0] == ["docker", "info"]:
+            calls["docker info"] += 1
+        return subprocess.CompletedProcess(args=args, returncode=0)
+
+    monkeypatch.setattr(shutil, "which", _mock_which)
+    monkeypatch.setattr(subprocess, "run", _mock_run)
+    return calls
+
+
 # Create a fixture to capture loguru logs for test assertions
 @pytest.fixture
 def loguru_caplog():
@@ -132,6 +160,42 @@ def mock_sammy_runner(monkeypatch):
 class TestSammyFactory:
     """Tests for SammyFactory."""
 
+    def test_probe_cached(self, count_probes):
+        """Should probe docker once for many availability checks."""
+        for _ in range(100):
+            assert SammyFactory.is_backend_available(BackendType.DOCKER)
+        assert count_probes["docker info"] == 1
+
+    def test_probe_lazy(self, count_probes, tmp_path):
+        """Should only probe the requested backend."""
+        for i in range(20):
+            SammyFactory.create_runner("local", tmp_path / f"job{i}")
+        assert count_probes["docker info"] == 0
+
+    def test_probe_ttl_and_invalidation(self, count_probes, monkeypatch):
+        """Should re-probe after the TTL expires or the cache is invalidated."""
+        SammyFactory.list_available_backends()
+        SammyFactory.invalidate_cache(BackendType.DOCKER)
+        SammyFactory.list_available_backends()
+        assert count_probes["docker info"] == 2
+
+        monkeypatch.setattr(SammyFactory, "probe_ttl", 0.0)
+        SammyFactory.list_available_backends()
+        assert count_probes["docker info"] == 3
+
+        SammyFactory.list_available_backends(use_cache=False)
+        assert count_probes["docker info"] == 4
+
+    def test_get_runner_reuses_runner(self, count_probes, tmp_path):
+        """Should return the same runner for identical configurations."""
+        _ = count_probes  # implicitly used by the fixture
+        runner = SammyFactory.get_runner("local", tmp_path)
+        assert SammyFactory.get_runner("local", tmp_path, tmp_path / "output") is runner
+        assert SammyFactory.get_runner("local", tmp_path, timeout=10) is not runner
+
+        SammyFactory.invalidate_cache(BackendType.LOCAL)
+        assert SammyFactory.get_runner("local", tmp_path) is not runner
+
     def test_list_available_backends_all_available(self, mock_which, mock_subprocess_run, mock_nova_env_vars):
         """All backends should be available."""
         _ = mock_which, mock_subprocess_run, mock_nova_env_vars  # implicitly used by the fixture
@@ -7,11 +7,15 @@ import pytest
 
 from pleiades.sammy.interface import (
     BaseSammyConfig,
+    ConfigurationError,
     EnvironmentPreparationError,
+    RetryPolicy,
     SammyExecutionResult,
+    SammyFailureType,
     SammyFiles,
     SammyFilesMultiMode,
     SammyRunner,
+    TransientBackendError,
 )
 
 
@@ -245,6 +249,81 @@ class TestSammyRunner:
         assert runner.validate_config()
 
 
+class FlakyRunner(MockSammyRunner):
+    """Runner failing with the given outcomes before succeeding."""
+
+    def __init__(self, config, outcomes):
+        super().__init__(config)
+        self.outcomes = list(outcomes)
+        self.calls = 0
+
+    def execute_sammy(self, files: SammyFiles) -> SammyExecutionResult:
+        _ = files  # deal with unused variable warning
+        self.calls += 1
+        outcome = self.outcomes.pop(0) if self.outcomes else None
+        if isinstance(outcome, Exception):
+            raise outcome
+        return SammyExecutionResult(
+            success=outcome is None,
+            execution_id=f"run{self.calls}",
+            start_time=datetime.now(),
+            end_time=datetime.now(),
+            console_output="",
+            failure_type=outcome,
+        )
+
+
+class TestRetryPolicy:
+    """Tests for RetryPolicy and SammyRunner.execute_with_retry."""
+
+    @pytest.fixture
+    def config(self, temp_working_dir):
+        return MockSammyConfig(working_dir=temp_working_dir, output_dir=temp_working_dir / "output")
+
+    @pytest.fixture(autouse=True)
+    def no_sleep(self, monkeypatch):
+        """Skip backoff delays."""
+        monkeypatch.setattr("pleiades.sammy.interface.time.sleep", lambda _: None)
+
+    def test_delay_backoff(self):
+        """Should grow the delay exponentially up to the maximum."""
+        policy = RetryPolicy(backoff_seconds=1.0, backoff_factor=2.0, max_backoff_seconds=5.0)
+        assert [policy.delay(attempt) for attempt in (1, 2, 3, 4)] == [1.0, 2.0, 4.0, 5.0]
+
+    def test_invalid_policy(self):
+        """Should reject a policy without any attempt."""
+        with pytest.raises(ConfigurationError):
+            RetryPolicy(max_attempts=0)
+
+    def test_retries_transient_result(self, config, mock_sammy_files):
+        """Should retry transient failures until success."""
+        runner = FlakyRunner(config, [SammyFailureType.BACKEND_TRANSIENT, TransientBackendError("daemon down")])
+        result = runner.execute_with_retry(SammyFiles(**mock_sammy_files))
+        assert result.success
+        assert result.attempts == 3
+
+    def test_does_not_retry_permanent_failure(self, config, mock_sammy_files):
+        """Should return non-retryable failures immediately."""
+        runner = FlakyRunner(config, [SammyFailureType.TIMEOUT])
+        result = runner.execute_with_retry(SammyFiles(**mock_sammy_files))
+        assert not result.success
+        assert result.failure_type == SammyFailureType.TIMEOUT
+        assert runner.calls == 1
+
+    def test_retry_on_timeout_when_configured(self, config, mock_sammy_files):
+        """Should honour the failure types listed in retry_on."""
+        runner = FlakyRunner(config, [SammyFailureType.TIMEOUT])
+        policy = RetryPolicy(retry_on=frozenset({SammyFailureType.TIMEOUT}))
+        assert runner.execute_with_retry(SammyFiles(**mock_sammy_files), policy).success
+
+    def test_raises_when_attempts_exhausted(self, config, mock_sammy_files):
+        """Should reraise the transient error after the last attempt."""
+        runner = FlakyRunner(config, [TransientBackendError("down")] * 2)
+        with pytest.raises(TransientBackendError):
+            runner.execute_with_retry(SammyFiles(**mock_sammy_files), RetryPolicy(max_attempts=2))
+        assert runner.calls == 2
+
+
 class TestSammyFilesMultiMode:
     """Tests for SammyFilesMultiMode data structure."""
 
@@ -20,7 +20,7 @@ from pleiades.sammy.parameters import (
     UnusedCorrelatedCard,
     UserResolutionParameters,
 )
-from pleiades.sammy.parfile import CardOrder, SammyParameterFile
+from pleiades.sammy.parfile import CardOrder, LazySammyParameterFile, SammyParameterFile
 
 
 class TestCardOrder:
@@ -454,3 +454,50 @@ NORMAlization and background
 
             # Compare
             assert abs(loaded.fudge - 0.666) < 0.0001
+
+
+class TestLazySammyParameterFile:
+    """Test the lazily parsed parameter file."""
+
+    PAR_FILE = Path(__file__).parents[3] / "data" / "ex012" / "ex012a.par"
+
+    def test_matches_eager_parsing(self):
+        """Test that cards parsed on access equal those of SammyParameterFile."""
+        eager = SammyParameterFile.from_file(self.PAR_FILE)
+        lazy = LazySammyParameterFile.from_file(self.PAR_FILE)
+
+        assert lazy.cards() == ["resonance", "radius", "isotope"]
+        assert lazy.isotope == eager.isotope
+        assert lazy.broadening is None
+        assert lazy.to_parameter_file().model_dump() == eager.model_dump()
+
+    def test_cards_parsed_on_first_access(self):
+        """Test that only the accessed card is parsed, once."""
+        lazy = LazySammyParameterFile.from_file(self.PAR_FILE)
+
+        with (
+            patch.object(ResonanceCard, "from_lines") as mock_res_from_lines,
+            patch.object(IsotopeCard, "from_lines", side_effect=IsotopeCard.from_lines) as mock_iso_from_lines,
+        ):
+            assert lazy.isotope is lazy.isotope
+            mock_iso_from_lines.assert_called_once()
+            mock_res_from_lines.assert_not_called()
+
+    def test_errors_raised_on_access(self):
+        """Test that invalid cards only fail when they are accessed."""
+        lazy = LazySammyParameterFile.from_string("1.5000\n\nMISCEllaneous parameters follow\nsome data\n")
+
+        assert lazy.cards() == ["fudge"]
+        with pytest.raises(ValidationError):
+            lazy.fudge
+        with pytest.raises(ValueError, match="Card type not implemented"):
+            lazy.to_parameter_file()
+        with pytest.raises(AttributeError):
+            lazy.not_a_card
+
+    def test_empty_and_missing_files(self):
+        """Test empty content and missing files."""
+        with pytest.raises(ValueError, match="Empty parameter file content"):
+            LazySammyParameterFile.from_string("")
+        with pytest.raises(FileNotFoundError):
+            LazySammyParameterFile.from_file("/nonexistent/file.par")
@@ -0,0 +1,195 @@
+#!/usr/bin/env python
+"""Unit tests for SAMMY working-directory staging helpers."""
+
+import errno
+import os
+from datetime import datetime
+from unittest import mock
+
+import pytest
+
+from pleiades.sammy.interface import BaseSammyConfig, SammyExecutionResult, SammyFiles, SammyRunner
+from pleiades.sammy.orchestration.jobs import SammyJob, run_job
+from pleiades.sammy.staging import StagingStrategy, move_file, scratch_directory, stage_file
+
+
+@pytest.fixture
+def source_file(tmp_path):
+    source = tmp_path / "source.par"
+    source.write_text("parameters\n")
+    return source
+
+
+class TestStageFile:
+    """Tests for stage_file."""
+
+    def test_copy(self, source_file, tmp_path):
+        """Should copy the file."""
+        destination = tmp_path / "copy.par"
+        assert stage_file(source_file, destination) == StagingStrategy.COPY
+        assert destination.read_text() == "parameters\n"
+        assert not os.path.samefile(source_file, destination)
+
+    def test_hardlink(self, source_file, tmp_path):
+        """Should hardlink the file on the same filesystem."""
+        destination = tmp_path / "link.par"
+        assert stage_file(source_file, destination, StagingStrategy.HARDLINK) == StagingStrategy.HARDLINK
+        assert os.path.samefile(source_file, destination)
+
+    def test_hardlink_falls_back_to_copy(self, source_file, tmp_path, monkeypatch):
+        """Should copy when hardlinking fails (e.g. across filesystems)."""
+
+        def cross_device_link(*args):
+            raise OSError(errno.EXDEV, "Invalid cross-device link")
+
+        monkeypatch.setattr(os, "link", cross_device_link)
+        destination = tmp_path / "link.par"
+        assert stage_file(source_file, destination, StagingStrategy.HARDLINK) == StagingStrategy.COPY
+        assert destination.read_text() == "parameters\n"
+
+    def test_reflink_or_copy(self, source_file, tmp_path):
+        """Should clone the file, or copy it when the filesystem cannot clone."""
+        destination = tmp_path / "clone.par"
+        used = stage_file(source_file, destination, StagingStrategy.REFLINK)
+        assert used in (StagingStrategy.REFLINK, StagingStrategy.COPY)
+        assert destination.read_text() == "parameters\n"
+
+
+class TestMoveFile:
+    """Tests for move_file."""
+
+    def test_replaces_existing(self, source_file, tmp_path):
+        """Should overwrite an existing destination."""
+        destination = tmp_path / "SAMMY.PAR"
+        destination.write_text("old\n")
+        move_file(source_file, destination)
+        assert destination.read_text() == "parameters\n"
+        assert not source_file.exists()
+
+    def test_cross_device(self, source_file, tmp_path, monkeypatch):
+        """Should copy and delete when a rename is not possible."""
+
+        def cross_device_replace(*args):
+            raise OSError(errno.EXDEV, "Invalid cross-device link")
+
+        monkeypatch.setattr(os, "replace", cross_device_replace)
+        destination = tmp_path / "SAMMY.PAR"
+        move_file(source_file, destination)
+        assert destination.read_text() == "parameters\n"
+        assert not source_file.exists()
+
+
+def test_scratch_directory_removed(tmp_path):
+    """Should create the scratch directory under the root and remove it on exit."""
+    with scratch_directory(tmp_path, prefix="job_") as scratch:
+        assert scratch.parent == tmp_path
+        (scratch / "SAMMY.LPT").write_text("log\n")
+    assert not scratch.exists()
+
+
+def test_files_hardlink_staging(mock_sammy_files, tmp_path):
+    """Should hardlink inputs into the working directory and keep originals on cleanup."""
+    files = SammyFiles(**mock_sammy_files, staging=StagingStrategy.HARDLINK)
+    original_par = files.parameter_file
+    working_dir = tmp_path / "work"
+    working_dir.mkdir()
+
+    files.move_to_working_dir(working_dir)
+    assert os.path.samefile(files.parameter_file, original_par)
+    assert files.data_file.is_symlink()
+
+    files.cleanup_working_files()
+    assert original_par.exists()
+    assert not (working_dir / original_par.name).exists()
+
+
+def test_files_already_in_working_dir_used_in_place(mock_sammy_files, tmp_path):
+    """Should neither stage nor remove inputs that already are in the working directory."""
+    working_dir = tmp_path / "work"
+    working_dir.mkdir()
+    rendered_inp = working_dir / "rendered.inp"
+    rendered_inp.write_text("rendered\n")
+    files = SammyFiles(rendered_inp, mock_sammy_files["parameter_file"], mock_sammy_files["data_file"])
+
+    files.move_to_working_dir(working_dir)
+    assert files.input_file == rendered_inp
+    assert rendered_inp.read_text() == "rendered\n"
+
+    files.cleanup_working_files()
+    assert rendered_inp.exists()
+    assert not (working_dir / mock_sammy_files["parameter_file"].name).exists()
+
+
+class ScratchConfig(BaseSammyConfig):
+    """Minimal configuration for the scratch runner."""
+
+
+class ScratchRunner(SammyRunner):
+    """Runner writing a fake SAMMY output in its working directory."""
+
+    def prepare_environment(self, files):
+        files.move_to_working_dir(self.config.working_dir)
+
+    def execute_sammy(self, files):
+        self.inputs = {name: getattr(files, name) for name in ("input_file", "parameter_file", "data_file")}
+        self.input_text = files.input_file.read_text()
+        (self.config.working_dir / "SAMMY.LPT").write_text(f"ran in {self.config.working_dir}\n")
+        now = datetime.now()
+        return SammyExecutionResult(success=True, execution_id="x", start_time=now, end_time=now, console_output="")
+
+    def cleanup(self, files=None):
+        pass
+
+    def validate_config(self):
+        return self.config.validate()
+
+
+def test_run_job_in_scratch(mock_sammy_files, tmp_path):
+    """Should run in a scratch directory and collect outputs into the job output directory."""
+    job = SammyJob(job_id="p0", working_dir=tmp_path / "p0", **mock_sammy_files)
+    scratch_root = tmp_path / "shm"
+    scratch_root.mkdir()
+
+    def factory(working_dir, output_dir):
+        return ScratchRunner(ScratchConfig(working_dir=working_dir, output_dir=output_dir))
+
+    result = run_job(job, factory, scratch_root=scratch_root)
+
+    assert result.success
+    assert str(scratch_root) in (job.output_dir / "SAMMY.LPT").read_text()
+    assert list(scratch_root.iterdir()) == []
+
+
+def test_run_job_writes_rendered_inputs_once(mock_sammy_files, tmp_path):
+    """Should write rendered inputs directly into the scratch directory instead of staging them."""
+    job = SammyJob(
+        job_id="p0",
+        working_dir=tmp_path / "p0",
+        input_content="rendered inp\n",
+        data_content=b"        1.0000000000        0.9000000000        0.0100000000\n",
+        **mock_sammy_files,
+    )
+    scratch_root = tmp_path / "shm"
+    scratch_root.mkdir()
+    runners = []
+
+    def factory(working_dir, output_dir):
+        runners.append(ScratchRunner(ScratchConfig(working_dir=working_dir, output_dir=output_dir)))
+        return runners[0]
+
+    with mock.patch("pleiades.sammy.interface.stage_file", wraps=stage_file) as staged:
+        assert run_job(job, factory, scratch_root=scratch_root).success
+
+    inputs = runners[0].inputs
+    scratch = runners[0].config.working_dir
+    assert inputs["input_file"] == scratch / job.input_file.name
+    assert runners[0].input_text == "rendered inp\n"
+    assert inputs["data_file"] == scratch / job.data_file.name
+    assert not inputs["data_file"].is_symlink()
+    # Only the parameter file, read from disk, was staged
+    assert [call.args[0] for call in staged.call_args_list] == [job.parameter_file.absolute()]
+    assert list(scratch_root.iterdir()) == []
+
+
+if __name__ == "__main__":
+    pytest.main(["-v", __file__])
@@ -0,0 +1,57 @@
+"""Unit tests for the parameter file helper functions."""
+
+import numpy as np
+import pytest
+
+from pleiades.utils.helper import check_pseudo_scientific, parse_pseudo_scientific
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("5.00000-5", 5.0e-5),
+        ("5.00000.-5", 5.0e-5),
+        ("-1.23+4", -1.23e4),
+        (" 3698500.+3 ", 3698500.0e3),
+        ("1.5E-05", 1.5e-5),
+        ("-873730.000", -873730.0),
+    ],
+)
+def test_check_pseudo_scientific(text, expected):
+    assert check_pseudo_scientific(text) == pytest.approx(expected)
+
+
+def test_check_pseudo_scientific_invalid():
+    with pytest.raises(ValueError, match="Cannot convert"):
+        check_pseudo_scientific("1.2.3-4")
+
+
+def test_parse_pseudo_scientific():
+    fields = ["5.00000-5", " 5.00000.-5", "-1.23+4", "1.5E-05", "", "  -873730.000", "7"]
+    values = parse_pseudo_scientific(fields)
+
+    assert values.dtype == np.float64
+    np.testing.assert_allclose(values, [5.0e-5, 5.0e-5, -1.23e4, 1.5e-5, np.nan, -873730.0, 7.0])
+    # Same values as the per-field helper
+    filled = [field for field in fields if field.strip()]
+    assert parse_pseudo_scientific(filled).tolist() == [check_pseudo_scientific(field) for field in filled]
+    # Columns without pseudo scientific notation take the plain NumPy path
+    np.testing.assert_array_equal(parse_pseudo_scientific(np.array([b"1.0", b" 2.5"])), [1.0, 2.5])
+    assert parse_pseudo_scientific([]).shape == (0,)
+
+
+def test_parse_pseudo_scientific_byte_block():
+    block = b"".join(field.ljust(10) for field in (b"1.00000-2", b"2.5", b"-3.0000.+1", b""))
+    np.testing.assert_allclose(parse_pseudo_scientific(block, width=10), [1.0e-2, 2.5, -30.0, np.nan])
+
+    with pytest.raises(ValueError, match="width"):
+        parse_pseudo_scientific(block)
+
+
+def test_parse_pseudo_scientific_invalid():
+    with pytest.raises(ValueError, match="'1.2.3-4'"):
+        parse_pseudo_scientific(["1.0-2", "1.2.3-4"])
+
+
+if __name__ == "__main__":
+    pytest.main(["-v", __file__])